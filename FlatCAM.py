@@ -1,10 +1,8 @@
 import sys
 import os
+import getopt
 
-from PyQt5 import QtWidgets
-from PyQt5.QtCore import QSettings, Qt
-from app_Main import App
-from appGUI import VisPyPatches
+from PyQt5 import QtCore
 
 from multiprocessing import freeze_support
 # import copyreg
@@ -29,6 +27,27 @@ def debug_trace():
     # set_trace()
 
 
+def headless_script():
+    """
+    The Tcl script to run without the GUI: FlatCAM was started with --headless=1 and --shellfile.
+
+    :return: (shellfile, shellvar) or None
+    """
+    try:
+        cmd_line_options, args = getopt.getopt(sys.argv[1:], "h:", ["shellfile=",
+                                                                    "shellvar=",
+                                                                    "headless=",
+                                                                    "multiprocessing-fork="])
+    except getopt.GetoptError:
+        # the App prints the help
+        return None
+
+    options = dict(cmd_line_options)
+    if options.get('--headless') != '1' or not options.get('--shellfile'):
+        return None
+    return options['--shellfile'], options.get('--shellvar', '')
+
+
 if __name__ == '__main__':
     # All X11 calling should be thread safe otherwise we have strange issues
     # QtCore.QCoreApplication.setAttribute(QtCore.Qt.AA_X11InitThreads)
@@ -54,6 +73,19 @@ if __name__ == '__main__':
               "Your Python version is: %s.%s" % (MIN_VERSION_MAJOR, MIN_VERSION_MINOR, str(major_v), str(minor_v)))
         sys.exit(0)
 
+    # run a Tcl script with the headless batch engine: no GUI, no canvas and no display (appHeadless.py)
+    batch_script = headless_script()
+    if batch_script is not None:
+        core_app = QtCore.QCoreApplication(sys.argv)
+
+        from appHeadless import run_headless
+        sys.exit(run_headless(*batch_script))
+
+    from PyQt5 import QtWidgets
+    from PyQt5.QtCore import QSettings, Qt
+    from app_Main import App
+    from appGUI import VisPyPatches
+
     debug_trace()
     VisPyPatches.apply_patches()
 
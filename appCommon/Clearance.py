@@ -0,0 +1,234 @@
+# ##########################################################
+# FlatCAM: 2D Post-processing for Manufacturing            #
+# Date: 10/18/2026                                         #
+# MIT Licence                                              #
+# ##########################################################
+
+"""
+Minimum clearance between the copper features of a Gerber object.
+
+Used by the Optimal Tool and by the 'find the safe tool diameter' of the NCC and Isolation Tools. Instead of
+measuring the distance between every two features, only the k smallest distances are searched:
+
+* the boundaries of the features are sampled (NumPy) and the distance between close samples of two different
+  features gives an upper limit for the search distance
+* only the pairs of features closer than the search distance are measured; the candidate pairs are found with a
+  spatial index (DesignRules.candidate_pairs(): STRtree with Shapely 2.0, RTree before)
+* the search stops when the k smallest distances are stable: a pair not yet measured is farther than the search
+  distance, so it can't change them. Otherwise the search distance is doubled and only the new pairs are measured.
+
+The distances and the coordinates are rounded to a number of decimals and the pairs at the same (rounded) distance
+are grouped, as the Optimal Tool shows them.
+"""
+
+import logging
+
+import numpy as np
+
+from shapely.geometry import MultiPolygon
+from shapely.ops import nearest_points
+
+from appCommon.DesignRules import candidate_pairs, flatten
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
+try:
+    from shapely import STRtree, distance as distances, shortest_line, get_coordinates
+except ImportError:
+    STRtree = None
+
+log = logging.getLogger('base')
+
+
+def gerber_polygons(apertures):
+    """
+    :param apertures:   the apertures storage of a Gerber object
+    :return:            list of the polygons made by the union of the valid 'solid' geometries
+    """
+    total_geo = []
+    for ap in list(apertures.keys()):
+        if 'geometry' in apertures[ap]:
+            for geo_el in apertures[ap]['geometry']:
+                if 'solid' in geo_el and geo_el['solid'] is not None and geo_el['solid'].is_valid:
+                    total_geo.append(geo_el['solid'])
+
+    return [geo for geo in flatten(MultiPolygon(flatten(total_geo)).buffer(0)) if geo.geom_type == 'Polygon']
+
+
+def sample_boundaries(polygons, max_points=200000):
+    """
+    Samples the boundaries (exteriors and interiors) of the polygons: the vertices and, on the segments longer than
+    the sampling step, points at equal distances.
+
+    :param polygons:    list of Polygons
+    :param max_points:  approximate maximum number of samples; sets the sampling step
+    :return:            (array of (x, y) samples, array with the index of the polygon of each sample)
+    """
+    starts = []
+    ends = []
+    owners = []
+    for k, pol in enumerate(polygons):
+        for ring in [pol.exterior] + list(pol.interiors):
+            coords = np.asarray(ring.coords, dtype=np.float64)[:, :2]
+            starts.append(coords[:-1])
+            ends.append(coords[1:])
+            owners.append(np.full(len(coords) - 1, k, dtype=np.int64))
+
+    if not starts:
+        return np.zeros((0, 2)), np.zeros(0, dtype=np.int64)
+
+    starts = np.concatenate(starts)
+    ends = np.concatenate(ends)
+    owners = np.concatenate(owners)
+
+    lengths = np.hypot(*(ends - starts).T)
+    step = max(lengths.sum() / max_points, np.finfo(np.float64).eps)
+    # number of samples on each segment, the start vertex included
+    counts = np.maximum(np.ceil(lengths / step).astype(np.int64), 1)
+
+    seg = np.repeat(np.arange(len(counts)), counts)
+    first = np.repeat(np.cumsum(counts) - counts, counts)
+    t = (np.arange(len(seg)) - first) / counts[seg]
+
+    points = starts[seg] + (ends[seg] - starts[seg]) * t[:, None]
+    return points, owners[seg]
+
+
+def search_distance(polygons, k):
+    """
+    Finds a distance for which at least k pairs of polygons are closer, from the distances between the close samples
+    of the boundaries of two different polygons.
+
+    :param polygons:    list of Polygons
+    :param k:           number of pairs
+    :return:            the search distance or None if it can't be found
+    """
+    points, owners = sample_boundaries(polygons)
+    if len(points) < 2:
+        return None
+
+    if cKDTree is not None:
+        # the nearest samples of each sample; those of the same polygon are skipped
+        nr = min(8, len(points))
+        dist, idx = cKDTree(points).query(points, k=nr)
+        first = np.repeat(owners[:, None], nr, axis=1)
+        second = owners[idx]
+    else:
+        # the samples next to each other in X (no KD-tree)
+        order = np.lexsort((points[:, 1], points[:, 0]))
+        pts = points[order]
+        dist = np.hypot(*(pts[1:] - pts[:-1]).T)
+        first = owners[order][:-1]
+        second = owners[order][1:]
+
+    other = first != second
+    if not np.any(other):
+        return None
+
+    pair_a = np.minimum(first, second)[other]
+    pair_b = np.maximum(first, second)[other]
+    dist = dist[other]
+
+    # the smallest distance of each pair of polygons
+    order = np.lexsort((dist, pair_b, pair_a))
+    pair_a, pair_b, dist = pair_a[order], pair_b[order], dist[order]
+    keep = np.ones(len(dist), dtype=bool)
+    keep[1:] = (pair_a[1:] != pair_a[:-1]) | (pair_b[1:] != pair_b[:-1])
+    dist = np.sort(dist[keep])
+
+    return float(dist[min(k, len(dist)) - 1])
+
+
+def measure(polygons, idx_a, idx_b):
+    """
+    :return:    the distance between the polygons of each pair and the coordinates of their nearest points, as an
+                array of (x1, y1, x2, y2)
+    """
+    if STRtree is not None:
+        arr = np.asarray(polygons, dtype=object)
+        dist = distances(arr[idx_a], arr[idx_b])
+        pts = get_coordinates(shortest_line(arr[idx_a], arr[idx_b])).reshape(-1, 4)
+        return np.asarray(dist, dtype=np.float64), pts
+
+    dist = np.empty(len(idx_a), dtype=np.float64)
+    pts = np.empty((len(idx_a), 4), dtype=np.float64)
+    for i, (a, b) in enumerate(zip(idx_a, idx_b)):
+        dist[i] = polygons[a].distance(polygons[b])
+        loc_1, loc_2 = nearest_points(polygons[a], polygons[b])
+        pts[i] = (loc_1.x, loc_1.y, loc_2.x, loc_2.y)
+    return dist, pts
+
+
+def smallest_gaps(polygons, k=1, decimals=4, check_abort=None):
+    """
+    Finds the k smallest distances between two polygons.
+
+    :param polygons:        list of Polygons
+    :param k:               number of (different, after rounding) distances to find
+    :param decimals:        number of decimals for the distances and the coordinates
+    :param check_abort:     function called between the search steps; it raises an exception to abort
+    :return:                list of (distance, [((x1, y1), (x2, y2)), ...]) sorted by distance, with the nearest
+                            points of the pairs of polygons at that distance
+    """
+    polygons = list(polygons)
+    if len(polygons) < 2 or k < 1:
+        return []
+
+    bounds = np.array([pol.bounds for pol in polygons], dtype=np.float64)
+    # the distance between two polygons is never larger than the diagonal of the whole bounding box
+    max_dist = float(np.hypot(bounds[:, 2].max() - bounds[:, 0].min(), bounds[:, 3].max() - bounds[:, 1].min()))
+    # pairs at the same rounded distance are complete only if the search distance is past the rounding
+    half_step = 0.5 * 10 ** -decimals
+
+    size = search_distance(polygons, k)
+    if size is None or size <= 0:
+        size = max(max_dist / max(len(polygons), 1), half_step)
+    size = min(size + half_step, max_dist + half_step)
+
+    measured = np.zeros(0, dtype=np.int64)
+    found_dist = []
+    found_pts = []
+    nr_pol = len(polygons)
+    while True:
+        if check_abort is not None:
+            check_abort()
+
+        idx_a, idx_b = candidate_pairs(polygons, None, size)
+        keys = idx_a * nr_pol + idx_b
+        new = ~np.isin(keys, measured)
+        measured = keys
+        if np.any(new):
+            dist, pts = measure(polygons, idx_a[new], idx_b[new])
+            found_dist.append(dist)
+            found_pts.append(pts)
+        log.debug("Clearance.smallest_gaps(). Search distance: %s, measured pairs: %s" % (str(size), str(len(keys))))
+
+        dist = np.round(np.concatenate(found_dist), decimals) if found_dist else np.zeros(0)
+        complete = np.unique(dist[dist + half_step <= size])
+        if len(complete) >= k or size > max_dist:
+            break
+        size *= 2
+
+    dist = np.round(np.concatenate(found_dist), decimals) if found_dist else np.zeros(0)
+    pts = np.round(np.concatenate(found_pts), decimals) if found_pts else np.zeros((0, 4))
+
+    gaps = []
+    for value in np.unique(dist)[:k]:
+        locations = [((float(x1), float(y1)), (float(x2), float(y2))) for x1, y1, x2, y2 in pts[dist == value]]
+        gaps.append((float(value), locations))
+    return gaps
+
+
+def minimum_clearance(apertures, decimals=4):
+    """
+    Task that can run in the app pool: the minimum distance between the copper features of a Gerber object.
+
+    :param apertures:   the apertures storage of a Gerber object
+    :param decimals:    number of decimals for the distance
+    :return:            the minimum distance or None if the object has less than two polygons
+    """
+    gaps = smallest_gaps(gerber_polygons(apertures), k=1, decimals=decimals)
+    return gaps[0][0] if gaps else None
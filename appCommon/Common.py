@@ -12,13 +12,13 @@
 # ##########################################################
 from PyQt5 import QtCore
 
-from shapely.geometry import Polygon, Point, LineString
+from shapely.geometry import Polygon
 from shapely.ops import unary_union
 
 from appGUI.VisPyVisuals import ShapeCollection
+from appCommon.TravelRouting import TravelRouter
 from appTool import AppTool
 
-from copy import deepcopy
 import collections
 
 import numpy as np
@@ -271,6 +271,10 @@ class ExclusionAreas(QtCore.QObject):
         '''
         self.exclusion_areas_storage = []
 
+        # the travel routers (TravelRouter) for each tool diameter and units, with the exclusion areas they were made
+        # for; see travel_router()
+        self.travel_routers = {}
+
         self.mouse_is_dragging = False
 
         self.solid_geometry = []
@@ -385,6 +389,7 @@ class ExclusionAreas(QtCore.QObject):
                         "overz": self.over_z_button.get_value()
                     }
                     self.exclusion_areas_storage.append(new_el)
+                    self.travel_routers.clear()
 
                     if self.obj_type == 'excellon':
                         color = "#FF7400"
@@ -448,6 +453,7 @@ class ExclusionAreas(QtCore.QObject):
                                 "overz": self.over_z_button.get_value()
                             }
                             self.exclusion_areas_storage.append(new_el)
+                            self.travel_routers.clear()
 
                             if self.obj_type == 'excellon':
                                 color = "#FF7400"
@@ -541,6 +547,7 @@ class ExclusionAreas(QtCore.QObject):
         self.points = []
         self.poly_drawn = False
         self.exclusion_areas_storage = []
+        self.travel_routers.clear()
 
         AppTool.delete_moving_selection_shape(self)
         # AppTool.delete_tool_selection_shape(self, shapes_storage=self.exclusion_shapes)
@@ -656,6 +663,7 @@ class ExclusionAreas(QtCore.QObject):
         if self.exclusion_areas_storage:
             self.app.inform.emit('%s' % _("All exclusion zones deleted."))
         self.exclusion_areas_storage.clear()
+        self.travel_routers.clear()
         AppTool.delete_moving_selection_shape(self)
         self.app.delete_selection_shape()
         AppTool.delete_tool_selection_shape(self, shapes_storage=self.exclusion_shapes)
@@ -674,6 +682,7 @@ class ExclusionAreas(QtCore.QObject):
         # delete shapes
         for idx in sorted(idxs, reverse=True):
             del self.exclusion_areas_storage[idx]
+        self.travel_routers.clear()
 
         # re-add what's left after deletion in first step
         if self.obj_type == 'excellon':
@@ -725,198 +734,44 @@ class ExclusionAreas(QtCore.QObject):
         :return:                A list of x,y tuples that describe the avoiding path
         :rtype:                 list
         """
+        return self.travel_router(tooldia).route(start_point, end_point)
 
-        ret_list = []
-
-        # Travel lines: rapids. Should not pass through Exclusion areas
-        travel_line = LineString([start_point, end_point])
-        origin_point = Point(start_point)
-
-        buffered_storage = []
-        # add a little something to the half diameter, to make sure that we really don't enter in the exclusion zones
-        buffered_distance = (tooldia / 2.0) + (0.1 if self.app.defaults['units'] == 'MM' else 0.00393701)
-
-        for area in self.exclusion_areas_storage:
-            new_area = deepcopy(area)
-            new_area['shape'] = area['shape'].buffer(buffered_distance, join_style=2)
-            buffered_storage.append(new_area)
-
-        # sort the Exclusion areas from the closest to the start_point to the farthest
-        tmp = []
-        for area in buffered_storage:
-            dist = Point(start_point).distance(area['shape'])
-            tmp.append((dist, area))
-        tmp.sort(key=lambda k: k[0])
-
-        sorted_area_storage = [k[1] for k in tmp]
-
-        # process the ordered exclusion areas list
-        for area in sorted_area_storage:
-            outline = area['shape'].exterior
-            if travel_line.intersects(outline):
-                intersection_pts = travel_line.intersection(outline)
-
-                if isinstance(intersection_pts, Point):
-                    # it's just a touch, continue
-                    continue
-
-                entry_pt = nearest_point(origin_point, intersection_pts)
-                exit_pt = farthest_point(origin_point, intersection_pts)
-
-                if area['strategy'] == 'around':
-                    full_vertex_points = [Point(x) for x in list(outline.coords)]
-
-                    # the last coordinate in outline, a LinearRing, is the closing one
-                    # therefore a duplicate of the first one; discard it
-                    vertex_points = full_vertex_points[:-1]
-
-                    # dist_from_entry = [(entry_pt.distance(vt), vertex_points.index(vt)) for vt in vertex_points]
-                    # closest_point_entry = nsmallest(1, dist_from_entry, key=lambda x: x[0])
-                    # start_idx = closest_point_entry[0][1]
-                    #
-                    # dist_from_exit = [(exit_pt.distance(vt), vertex_points.index(vt)) for vt in vertex_points]
-                    # closest_point_exit = nsmallest(1, dist_from_exit, key=lambda x: x[0])
-                    # end_idx = closest_point_exit[0][1]
-
-                    # pts_line_entry = None
-                    # pts_line_exit = None
-                    # for i in range(len(full_vertex_points)):
-                    #     try:
-                    #         line = LineString(
-                    #             [
-                    #                 (full_vertex_points[i].x, full_vertex_points[i].y),
-                    #                 (full_vertex_points[i + 1].x, full_vertex_points[i + 1].y)
-                    #             ]
-                    #         )
-                    #     except IndexError:
-                    #         continue
-                    #
-                    #     if entry_pt.within(line) or entry_pt.equals(Point(line.coords[0])) or \
-                    #             entry_pt.equals(Point(line.coords[1])):
-                    #         pts_line_entry = [Point(x) for x in line.coords]
-                    #
-                    #     if exit_pt.within(line) or exit_pt.equals(Point(line.coords[0])) or \
-                    #             exit_pt.equals(Point(line.coords[1])):
-                    #         pts_line_exit = [Point(x) for x in line.coords]
-                    #
-                    # closest_point_entry = nearest_point(entry_pt, pts_line_entry)
-                    # start_idx = vertex_points.index(closest_point_entry)
-                    #
-                    # closest_point_exit = nearest_point(exit_pt, pts_line_exit)
-                    # end_idx = vertex_points.index(closest_point_exit)
-
-                    # find all vertexes for which a line from start_point does not cross the Exclusion area polygon
-                    # the same for end_point
-                    # we don't need closest points for which the path leads to crosses of the Exclusion area
-
-                    close_start_points = []
-                    close_end_points = []
-                    for i in range(len(vertex_points)):
-                        try:
-                            start_line = LineString(
-                                [
-                                    start_point,
-                                    (vertex_points[i].x, vertex_points[i].y)
-                                ]
-                            )
-                            end_line = LineString(
-                                [
-                                    end_point,
-                                    (vertex_points[i].x, vertex_points[i].y)
-                                ]
-                            )
-                        except IndexError:
-                            continue
-
-                        if not start_line.crosses(area['shape']):
-                            close_start_points.append(vertex_points[i])
-                        if not end_line.crosses(area['shape']):
-                            close_end_points.append(vertex_points[i])
-
-                    closest_point_entry = nearest_point(entry_pt, close_start_points)
-                    closest_point_exit = nearest_point(exit_pt, close_end_points)
-
-                    start_idx = vertex_points.index(closest_point_entry)
-                    end_idx = vertex_points.index(closest_point_exit)
-
-                    # calculate possible paths: one clockwise the other counterclockwise on the exterior of the
-                    # exclusion area outline (Polygon.exterior)
-                    vp_len = len(vertex_points)
-                    if end_idx > start_idx:
-                        path_1 = vertex_points[start_idx:(end_idx + 1)]
-                        path_2 = [vertex_points[start_idx]]
-                        idx = start_idx
-                        for __ in range(vp_len):
-                            idx = idx - 1 if idx > 0 else (vp_len - 1)
-                            path_2.append(vertex_points[idx])
-                            if idx == end_idx:
-                                break
-                    else:
-                        path_1 = vertex_points[end_idx:(start_idx + 1)]
-                        path_2 = [vertex_points[end_idx]]
-                        idx = end_idx
-                        for __ in range(vp_len):
-                            idx = idx - 1 if idx > 0 else (vp_len - 1)
-                            path_2.append(vertex_points[idx])
-                            if idx == start_idx:
-                                break
-                        path_1.reverse()
-                        path_2.reverse()
-
-                    # choose the one with the lesser length
-                    length_path_1 = 0
-                    for i in range(len(path_1)):
-                        try:
-                            length_path_1 += path_1[i].distance(path_1[i + 1])
-                        except IndexError:
-                            pass
-
-                    length_path_2 = 0
-                    for i in range(len(path_2)):
-                        try:
-                            length_path_2 += path_2[i].distance(path_2[i + 1])
-                        except IndexError:
-                            pass
-
-                    path = path_1 if length_path_1 < length_path_2 else path_2
-
-                    # transform the list of Points into a list of Points coordinates
-                    path_coords = [[None, (p.x, p.y)] for p in path]
-                    ret_list += path_coords
-
-                else:
-                    path_coords = [[float(area['overz']), (entry_pt.x, entry_pt.y)], [None, (exit_pt.x, exit_pt.y)]]
-                    ret_list += path_coords
-
-                # create a new LineString to test again for possible other Exclusion zones
-                last_pt_in_path = path_coords[-1][1]
-                travel_line = LineString([last_pt_in_path, end_point])
-
-        ret_list.append([None, end_point])
-        return ret_list
-
-
-def farthest_point(origin, points_list):
-    """
-    Calculate the farthest Point in a list from another Point
-
-    :param origin:      Reference Point
-    :type origin:       Point
-    :param points_list: List of Points or a MultiPoint
-    :type points_list:  list
-    :return:            Farthest Point
-    :rtype:             Point
-    """
-    old_dist = 0
-    fartherst_pt = None
-
-    for pt in points_list:
-        dist = abs(origin.distance(pt))
-        if dist >= old_dist:
-            fartherst_pt = pt
-            old_dist = dist
+    def travel_router(self, tooldia):
+        """
+        The router of the travel lines for a tool. It is made once and used for all the travel lines of the tool; it
+        is made again if the exclusion areas or the units change.
 
-    return fartherst_pt
+        :param tooldia:         The tool diameter used and which generates the travel lines
+        :type tooldia:          float
+        :return:                The router
+        :rtype:                 TravelRouter
+        """
+        units = self.app.defaults['units']
+        key = (float(tooldia), units)
+        # the shapes themselves are kept and compared by identity: the id() of a deleted shape can be reused at once
+        # by a new one
+        signature = [(area['shape'], area['strategy'], area['overz']) for area in self.exclusion_areas_storage]
+
+        router = self.travel_routers.get(key)
+        if router is None or not self.same_areas(router[0], signature):
+            # add a little something to the half diameter, to make sure that we really don't enter in the exclusion
+            # zones
+            buffered_distance = (tooldia / 2.0) + (0.1 if units == 'MM' else 0.00393701)
+            router = (signature, TravelRouter(self.exclusion_areas_storage, buffered_distance))
+            self.travel_routers[key] = router
+        return router[1]
+
+    @staticmethod
+    def same_areas(signature, other):
+        """
+        :param signature:   list of (shape, strategy, overz) of the exclusion areas
+        :param other:       list of (shape, strategy, overz) of the exclusion areas
+        :return:            True if both are made of the same shapes, with the same strategy and over Z
+        """
+        if len(signature) != len(other):
+            return False
+        return all(shape is other_shape and rest == other_rest
+                   for (shape, *rest), (other_shape, *other_rest) in zip(signature, other))
 
 
 # def voronoi_diagram(geom, envelope, edges=False):
@@ -962,25 +817,3 @@ def farthest_point(origin, points_list):
 #                 print(traceback.format_exc())
 #
 #         return voronoi_polygons
-
-def nearest_point(origin, points_list):
-    """
-    Calculate the nearest Point in a list from another Point
-
-    :param origin:      Reference Point
-    :type origin:       Point
-    :param points_list: List of Points or a MultiPoint
-    :type points_list:  list
-    :return:            Nearest Point
-    :rtype:             Point
-    """
-    old_dist = np.Inf
-    nearest_pt = None
-
-    for pt in points_list:
-        dist = abs(origin.distance(pt))
-        if dist <= old_dist:
-            nearest_pt = pt
-            old_dist = dist
-
-    return nearest_pt
@@ -0,0 +1,383 @@
+# ##########################################################
+# FlatCAM: 2D Post-processing for Manufacturing            #
+# Date: 10/18/2026                                         #
+# MIT Licence                                              #
+# ##########################################################
+
+"""
+Design rules check (DRC) engine used by the Rules Check Tool.
+
+Instead of measuring the distance between every pair of features, the features of a layer are put in a spatial
+index and only the pairs whose bounding boxes are closer than the rule distance are measured:
+
+* with Shapely 2.0 a STRtree is queried with the whole array of features and the distances and the nearest points
+  of the candidate pairs are calculated in single (vectorized) calls
+* with older Shapely versions a RTree index (rtree is already used by camlib) is queried for each feature
+* the hole to hole clearance uses a KD-tree (scipy, optional) of the hole centers
+
+A violation is reported in the middle of the segment that joins the nearest points of the two features.
+
+For the process pool a rule can be split in tiles (make_tiles()): the bounding box of the features is divided in a
+grid and each tile gets, as WKB, only the features that touch the tile expanded by an overlap larger than the rule
+distance. A tile keeps only the violations located in its own grid cell so a violation found by two overlapping
+tiles is reported once.
+"""
+
+import logging
+
+import numpy as np
+
+from shapely.geometry import Polygon
+from shapely.ops import nearest_points
+from shapely import wkb
+
+from rtree import index as rtindex
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
+try:
+    # Shapely 2.0 STRtree (queried with arrays) and vectorized functions
+    from shapely import STRtree, distance as distances, shortest_line, get_coordinates, from_wkb, to_wkb
+    import shapely
+    # the 'dwithin' predicate requires GEOS 3.10
+    HAS_DWITHIN = shapely.geos_version >= (3, 10, 0)
+except ImportError:
+    STRtree = None
+    from_wkb = to_wkb = None
+    HAS_DWITHIN = False
+
+log = logging.getLogger('base')
+
+
+def flatten(geometry):
+    """
+    :param geometry:    a geometry, a multi-geometry or a list of them
+    :return:            list of the single (not multi) geometries, the empty ones removed
+    """
+    if geometry is None:
+        return []
+    if hasattr(geometry, 'geoms'):
+        geometry = geometry.geoms
+    elif not isinstance(geometry, (list, tuple)):
+        return [] if geometry.is_empty else [geometry]
+
+    geo_list = []
+    for geo in geometry:
+        geo_list += flatten(geo)
+    return geo_list
+
+
+def middle(x1, y1, x2, y2):
+    """
+    :return:    the point in the middle of two points (as calculated until now by the Rules Check Tool)
+    """
+    return np.minimum(x1, x2) + np.abs(x1 - x2) / 2, np.minimum(y1, y2) + np.abs(y1 - y2) / 2
+
+
+def candidate_pairs(geoms_a, geoms_b, size):
+    """
+    Finds the pairs of geometries whose bounding boxes are closer than size.
+
+    :param geoms_a:     list of geometries
+    :param geoms_b:     list of geometries or None to find the pairs of geoms_a (each pair once)
+    :param size:        the rule distance
+    :return:            two arrays with the index in geoms_a and in geoms_b of each pair, sorted
+    """
+    same = geoms_b is None
+    if same:
+        geoms_b = geoms_a
+
+    if not geoms_a or not geoms_b:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    if STRtree is not None:
+        arr_a = np.asarray(geoms_a, dtype=object)
+        tree = STRtree(np.asarray(geoms_b, dtype=object))
+        if HAS_DWITHIN:
+            idx_a, idx_b = tree.query(arr_a, predicate='dwithin', distance=size)
+        else:
+            bounds = shapely.bounds(arr_a) + np.array([-size, -size, size, size])
+            idx_a, idx_b = tree.query(shapely.box(*bounds.T))
+    else:
+        rt_idx = rtindex.Index(((k, geo.bounds, None) for k, geo in enumerate(geoms_b)))
+        idx_a = []
+        idx_b = []
+        for k, geo in enumerate(geoms_a):
+            minx, miny, maxx, maxy = geo.bounds
+            found = list(rt_idx.intersection((minx - size, miny - size, maxx + size, maxy + size)))
+            idx_a += [k] * len(found)
+            idx_b += found
+        idx_a = np.asarray(idx_a, dtype=np.int64)
+        idx_b = np.asarray(idx_b, dtype=np.int64)
+
+    if same:
+        keep = idx_a < idx_b
+        idx_a = idx_a[keep]
+        idx_b = idx_b[keep]
+
+    order = np.lexsort((idx_b, idx_a))
+    return idx_a[order], idx_b[order]
+
+
+def measure_pairs(geoms_a, geoms_b, idx_a, idx_b, size):
+    """
+    Measures the candidate pairs and keeps those closer than size.
+
+    :return:    list of (index in geoms_a, index in geoms_b, distance, (x, y) of the middle of the nearest points)
+    """
+    if len(idx_a) == 0:
+        return []
+
+    if STRtree is not None:
+        arr_a = np.asarray(geoms_a, dtype=object)[idx_a]
+        arr_b = np.asarray(geoms_b, dtype=object)[idx_b]
+        dist = distances(arr_a, arr_b)
+        close = dist < size
+        if not np.any(close):
+            return []
+
+        lines = shortest_line(arr_a[close], arr_b[close])
+        pts = get_coordinates(lines).reshape(-1, 2, 2)
+        loc_x, loc_y = middle(pts[:, 0, 0], pts[:, 0, 1], pts[:, 1, 0], pts[:, 1, 1])
+        return [(int(a), int(b), float(d), (float(x), float(y)))
+                for a, b, d, x, y in zip(idx_a[close], idx_b[close], dist[close], loc_x, loc_y)]
+
+    found = []
+    for a, b in zip(idx_a, idx_b):
+        geo, s_geo = geoms_a[a], geoms_b[b]
+        dist = geo.distance(s_geo)
+        if float(dist) < float(size):
+            loc_1, loc_2 = nearest_points(geo, s_geo)
+            x, y = middle(loc_1.x, loc_1.y, loc_2.x, loc_2.y)
+            found.append((int(a), int(b), float(dist), (float(x), float(y))))
+    return found
+
+
+def clearance_violations(geoms_a, geoms_b=None, size=0.0):
+    """
+    Finds the places where a geometry of geoms_a is closer than size to a geometry of geoms_b or, when geoms_b is
+    None, to another geometry of geoms_a.
+
+    :param geoms_a:     list of geometries
+    :param geoms_b:     list of geometries or None
+    :param size:        the rule distance
+    :return:            list of (distance, (x, y)) with the location of each violation
+    """
+    idx_a, idx_b = candidate_pairs(geoms_a, geoms_b, size)
+    log.debug("DesignRules.clearance_violations(). Measured pairs: %s" % str(len(idx_a)))
+
+    return [(dist, loc) for __, __, dist, loc in
+            measure_pairs(geoms_a, geoms_a if geoms_b is None else geoms_b, idx_a, idx_b, size)]
+
+
+def hole_candidate_pairs(holes, size):
+    """
+    Finds the pairs of holes that may be closer than size with a KD-tree of the hole centers: each hole is inside
+    the circle around the center of its bounding box that passes through the corners.
+
+    :param holes:   list of hole geometries (circles or slots)
+    :param size:    the rule distance
+    :return:        two arrays with the indexes of each pair (first < second), sorted
+    """
+    bounds = np.array([geo.bounds for geo in holes], dtype=np.float64).reshape(-1, 4)
+    centers = (bounds[:, :2] + bounds[:, 2:]) / 2
+    radii = np.hypot(bounds[:, 2] - bounds[:, 0], bounds[:, 3] - bounds[:, 1]) / 2
+
+    pairs = cKDTree(centers).query_pairs(r=2 * radii.max() + size, output_type='ndarray')
+    if len(pairs) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    idx_a, idx_b = pairs[:, 0], pairs[:, 1]
+    center_dist = np.hypot(*(centers[idx_a] - centers[idx_b]).T)
+    keep = center_dist < radii[idx_a] + radii[idx_b] + size
+
+    idx_a, idx_b = np.minimum(idx_a, idx_b)[keep], np.maximum(idx_a, idx_b)[keep]
+    order = np.lexsort((idx_b, idx_a))
+    return idx_a[order], idx_b[order]
+
+
+def hole_clearance_violations(holes, size):
+    """
+    Finds the places where two holes are closer than size.
+
+    :param holes:   list of hole geometries (circles or slots)
+    :param size:    the rule distance
+    :return:        list of (distance, (x, y)) with the location of each violation
+    """
+    holes = [geo for geo in holes if geo is not None and not geo.is_empty]
+    if cKDTree is None or not holes:
+        return clearance_violations(holes, None, size)
+
+    idx_a, idx_b = hole_candidate_pairs(holes, size)
+    log.debug("DesignRules.hole_clearance_violations(). Measured pairs: %s" % str(len(idx_a)))
+    return [(dist, loc) for __, __, dist, loc in measure_pairs(holes, holes, idx_a, idx_b, size)]
+
+
+def annular_ring_violations(pads, holes, size):
+    """
+    Finds the holes whose copper ring is smaller than size: the distance from the hole to the exterior of a pad is
+    under size. A hole that touches or crosses the exterior of a pad is reported at the hole location.
+
+    :param pads:    list of copper Polygons
+    :param holes:   list of hole geometries
+    :param size:    the minimum annular ring
+    :return:        list of (x, y) locations
+    """
+    exteriors = [pad.exterior for pad in pads if isinstance(pad, Polygon)]
+    holes = [geo for geo in holes if geo is not None and not geo.is_empty]
+
+    idx_a, idx_b = candidate_pairs(exteriors, holes, size)
+    log.debug("DesignRules.annular_ring_violations(). Measured pairs: %s" % str(len(idx_a)))
+
+    points = []
+    for __, b, dist, loc in measure_pairs(exteriors, holes, idx_a, idx_b, size):
+        if dist > 0:
+            points.append(loc)
+        else:
+            pt = holes[b].representative_point()
+            points.append((pt.x, pt.y))
+    return points
+
+
+def unique_points(violations):
+    """
+    :param violations:  list of (distance, (x, y))
+    :return:            list of the locations, each location once, in the order they are found
+    """
+    return list(dict.fromkeys(loc for __, loc in violations))
+
+
+# kinds of rules that can be checked in tiles
+CLEARANCE = 'clearance'
+HOLES = 'holes'
+ANNULAR_RING = 'annular_ring'
+
+
+def geometry_to_wkb(geoms):
+    if to_wkb is not None:
+        return list(to_wkb(np.asarray(geoms, dtype=object)))
+    return [geo.wkb for geo in geoms]
+
+
+def geometry_from_wkb(records):
+    if from_wkb is not None:
+        return list(from_wkb(np.asarray(records, dtype=object)))
+    return [wkb.loads(rec) for rec in records]
+
+
+def geometry_bounds(geoms):
+    """
+    :return:    array of shape (N, 4) with the bounds of each geometry
+    """
+    if STRtree is not None:
+        return shapely.bounds(np.asarray(geoms, dtype=object)).reshape(-1, 4)
+    return np.array([geo.bounds for geo in geoms], dtype=np.float64).reshape(-1, 4)
+
+
+def tile_grid(bounds, nr_tiles, min_size):
+    """
+    :param bounds:      (xmin, ymin, xmax, ymax) of all the features
+    :param nr_tiles:    the number of tiles wanted (about)
+    :param min_size:    minimum size of a tile
+    :return:            (xmin, ymin, tile width, tile height, number of columns, number of rows)
+    """
+    xmin, ymin, xmax, ymax = bounds
+    width = max(xmax - xmin, 1e-9)
+    height = max(ymax - ymin, 1e-9)
+
+    side = max(np.sqrt(width * height / max(nr_tiles, 1)), min_size)
+    nx = max(int(round(width / side)), 1)
+    ny = max(int(round(height / side)), 1)
+    return xmin, ymin, width / nx, height / ny, nx, ny
+
+
+def make_tiles(kind, geoms_a, geoms_b, size, nr_tiles):
+    """
+    Splits a rule in tiles.
+
+    :param kind:        CLEARANCE, HOLES or ANNULAR_RING
+    :param geoms_a:     the features (the pads for ANNULAR_RING)
+    :param geoms_b:     the features of the second layer (the holes for ANNULAR_RING) or None
+    :param size:        the rule distance
+    :param nr_tiles:    the number of tiles wanted (about); the tiles without features are dropped
+    :return:            list of tiles; a tile is a tuple: (grid, (column, row), WKB list of geoms_a, WKB list of
+                        geoms_b or None)
+    """
+    layers = [geoms_a] if geoms_b is None else [geoms_a, geoms_b]
+    layers = [[geo for geo in geoms if geo is not None and not geo.is_empty] for geoms in layers]
+    if not all(layers):
+        return []
+
+    all_bounds = [geometry_bounds(geoms) for geoms in layers]
+    stacked = np.vstack(all_bounds)
+    bounds = (stacked[:, 0].min(), stacked[:, 1].min(), stacked[:, 2].max(), stacked[:, 3].max())
+
+    overlap = float(size)
+    if kind == ANNULAR_RING:
+        # a hole that touches a pad exterior is reported inside the hole: the whole hole has to be in the tile
+        hole_bounds = all_bounds[1]
+        overlap += np.hypot(hole_bounds[:, 2] - hole_bounds[:, 0], hole_bounds[:, 3] - hole_bounds[:, 1]).max()
+
+    grid = tile_grid(bounds, nr_tiles, 2 * overlap)
+    x0, y0, tile_w, tile_h, nx, ny = grid
+
+    records = [geometry_to_wkb(geoms) for geoms in layers]
+    indexes = []
+    for layer_bounds in all_bounds:
+        # the tiles touched by each feature, from the expanded bounds
+        first_col = np.clip(np.floor((layer_bounds[:, 0] - overlap - x0) / tile_w), 0, nx - 1).astype(np.int64)
+        last_col = np.clip(np.floor((layer_bounds[:, 2] + overlap - x0) / tile_w), 0, nx - 1).astype(np.int64)
+        first_row = np.clip(np.floor((layer_bounds[:, 1] - overlap - y0) / tile_h), 0, ny - 1).astype(np.int64)
+        last_row = np.clip(np.floor((layer_bounds[:, 3] + overlap - y0) / tile_h), 0, ny - 1).astype(np.int64)
+
+        tile_features = {}
+        for k in range(len(layer_bounds)):
+            for col in range(first_col[k], last_col[k] + 1):
+                for row in range(first_row[k], last_row[k] + 1):
+                    tile_features.setdefault((col, row), []).append(k)
+        indexes.append(tile_features)
+
+    tiles = []
+    for row in range(ny):
+        for col in range(nx):
+            found = [tile_features.get((col, row), []) for tile_features in indexes]
+            if not all(found):
+                continue
+            tile_records = [[layer_records[k] for k in feat] for layer_records, feat in zip(records, found)]
+            tiles.append((grid, (col, row), tile_records[0], tile_records[1] if len(layers) > 1 else None))
+
+    log.debug("DesignRules.make_tiles(). %d tiles of %d x %d" % (len(tiles), nx, ny))
+    return tiles
+
+
+def check_tiles(tiles, kind, size):
+    """
+    Task run in the pool: checks a rule in tiles.
+
+    :param tiles:   list of tiles made by make_tiles()
+    :param kind:    CLEARANCE, HOLES or ANNULAR_RING
+    :param size:    the rule distance
+    :return:        list of the (x, y) locations of the violations located in the cell of their tile
+    """
+    points = []
+    for grid, cell, records_a, records_b in tiles:
+        geoms_a = geometry_from_wkb(records_a)
+        geoms_b = geometry_from_wkb(records_b) if records_b is not None else None
+
+        if kind == HOLES:
+            found = unique_points(hole_clearance_violations(geoms_a, size))
+        elif kind == ANNULAR_RING:
+            found = list(dict.fromkeys(annular_ring_violations(geoms_a, geoms_b, size)))
+        else:
+            found = unique_points(clearance_violations(geoms_a, geoms_b, size))
+
+        x0, y0, tile_w, tile_h, nx, ny = grid
+        for x, y in found:
+            col = min(max(int(np.floor((x - x0) / tile_w)), 0), nx - 1)
+            row = min(max(int(np.floor((y - y0) / tile_h)), 0), ny - 1)
+            if (col, row) == cell:
+                points.append((x, y))
+    return points
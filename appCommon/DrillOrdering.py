@@ -0,0 +1,354 @@
+# ##########################################################
+# FlatCAM: 2D Post-processing for Manufacturing            #
+# Date: 10/18/2026                                         #
+# MIT Licence                                              #
+# ##########################################################
+
+"""
+Drill ordering engine.
+
+Builds an open path through a set of drill points:
+
+1) an initial order, either made by a nearest neighbour walk (on a KD-tree with deletion of the visited points) or
+   by sorting the points along a Hilbert curve
+2) the initial order is improved with 2-opt and Or-opt moves restricted to the nearest neighbours of each point,
+   until no improving move is found or until the time limit is reached
+
+scipy is optional; when it is not available an RTree index (rtree is already used by camlib) replaces the KD-tree.
+"""
+
+import math
+import time
+import logging
+
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
+from rtree import index as rtindex
+
+log = logging.getLogger('base')
+
+
+def hilbert_keys(coords, order=16):
+    """
+    Calculate the distance along a Hilbert curve for each point. The points are scaled on a 2^order x 2^order grid.
+
+    :param coords:  numpy array of shape (N, 2)
+    :param order:   Hilbert curve order
+    :return:        numpy array of N keys (uint64)
+    """
+    coords = np.asarray(coords, dtype=np.float64)
+    side = (1 << order) - 1
+
+    mins = coords.min(axis=0)
+    span = (coords.max(axis=0) - mins).max()
+    if span == 0:
+        return np.zeros(len(coords), dtype=np.uint64)
+
+    grid = np.floor((coords - mins) / span * side).astype(np.int64)
+    x = grid[:, 0].copy()
+    y = grid[:, 1].copy()
+    keys = np.zeros(len(coords), dtype=np.int64)
+
+    s = 1 << (order - 1)
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        keys += s * s * ((3 * rx) ^ ry)
+
+        # rotate the quadrant
+        flip = ~ry
+        swap_and_mirror = flip & rx
+        x = np.where(swap_and_mirror, side - x, x)
+        y = np.where(swap_and_mirror, side - y, y)
+        x, y = np.where(flip, y, x), np.where(flip, x, y)
+        s >>= 1
+
+    return keys.astype(np.uint64)
+
+
+def hilbert_order(coords):
+    """
+    :param coords:  numpy array of shape (N, 2)
+    :return:        numpy array with the indexes of the points sorted along a Hilbert curve
+    """
+    return np.argsort(hilbert_keys(coords), kind='stable')
+
+
+def nearest_neighbour_order(coords, start=None):
+    """
+    Greedy walk that always goes to the nearest not yet visited point.
+
+    :param coords:  numpy array of shape (N, 2)
+    :param start:   (x, y) start position. If None the walk starts in the first point.
+    :return:        list with the indexes of the points in the visit order
+    """
+    coords = np.asarray(coords, dtype=np.float64)
+    nr_points = len(coords)
+    if nr_points == 0:
+        return []
+
+    current = coords[0] if start is None else np.asarray(start, dtype=np.float64)
+
+    if cKDTree is None:
+        return _nearest_neighbour_order_rtree(coords, current)
+
+    visited = np.zeros(nr_points, dtype=bool)
+    alive = np.arange(nr_points)
+    tree = cKDTree(coords)
+    dead_in_tree = 0
+
+    path = []
+    for __ in range(nr_points):
+        k = 8
+        while True:
+            k = min(k, tree.n)
+            __, found = tree.query(current, k=k)
+            found = alive[np.atleast_1d(found)]
+            free = found[~visited[found]]
+            if len(free) > 0:
+                nearest = free[0]
+                break
+            k *= 4
+
+        visited[nearest] = True
+        path.append(int(nearest))
+        current = coords[nearest]
+        dead_in_tree += 1
+
+        # the KD-tree has no deletion; rebuild it from the remaining points when it is mostly made of visited ones
+        if dead_in_tree > tree.n // 2 and tree.n - dead_in_tree > 16:
+            alive = np.flatnonzero(~visited)
+            tree = cKDTree(coords[alive])
+            dead_in_tree = 0
+
+    return path
+
+
+def _nearest_neighbour_order_rtree(coords, current):
+    rti = rtindex.Index()
+    for idx, (x, y) in enumerate(coords):
+        rti.insert(idx, (x, y, x, y))
+
+    path = []
+    for __ in range(len(coords)):
+        nearest = next(rti.nearest((current[0], current[1], current[0], current[1]), 1))
+        x, y = coords[nearest]
+        rti.delete(nearest, (x, y, x, y))
+        path.append(int(nearest))
+        current = coords[nearest]
+    return path
+
+
+def neighbour_lists(coords, nr_neighbours=8):
+    """
+    :param coords:          numpy array of shape (N, 2)
+    :param nr_neighbours:   how many neighbours to find for each point
+    :return:                list of lists, for each point the indexes of its nearest neighbours sorted by distance
+    """
+    nr_points = len(coords)
+    k = min(nr_neighbours + 1, nr_points)
+
+    if cKDTree is not None:
+        __, found = cKDTree(coords).query(coords, k=k)
+        found = np.atleast_2d(found)
+        return [[int(n) for n in row if n != idx] for idx, row in enumerate(found)]
+
+    rti = rtindex.Index()
+    for idx, (x, y) in enumerate(coords):
+        rti.insert(idx, (x, y, x, y))
+
+    neighbours = []
+    for idx, (x, y) in enumerate(coords):
+        found = list(rti.nearest((x, y, x, y), k))
+        dists = [math.hypot(coords[n][0] - x, coords[n][1] - y) for n in found]
+        neighbours.append([n for __, n in sorted(zip(dists, found)) if n != idx][:nr_neighbours])
+    return neighbours
+
+
+def improve_order(coords, path, time_limit=3.0, nr_neighbours=8):
+    """
+    Improve an open path with 2-opt and Or-opt moves. Only moves that connect a point with one of its nearest
+    neighbours are tried. The first point of the path is kept in place.
+
+    :param coords:          numpy array of shape (N, 2)
+    :param path:            list of point indexes (the initial order)
+    :param time_limit:      maximum time in seconds spent on improving
+    :param nr_neighbours:   size of the neighbour lists
+    :return:                list of point indexes (the improved order)
+    """
+    nr_points = len(path)
+    if nr_points < 4:
+        return list(path)
+
+    stop_time = time.time() + float(time_limit)
+
+    xs = coords[:, 0].tolist()
+    ys = coords[:, 1].tolist()
+    neighbours = neighbour_lists(coords, nr_neighbours)
+
+    tour = list(path)
+    pos = [0] * nr_points
+    for i, node in enumerate(tour):
+        pos[node] = i
+
+    def dist(a, b):
+        return math.hypot(xs[a] - xs[b], ys[a] - ys[b])
+
+    def reverse(i, j):
+        # reverse tour[i:j+1]
+        tour[i:j + 1] = tour[i:j + 1][::-1]
+        for k in range(i, j + 1):
+            pos[tour[k]] = k
+
+    eps = 1e-10
+    improved = True
+    checks = 0
+    while improved:
+        improved = False
+
+        # ############################################################################################################
+        # 2-opt
+        # ############################################################################################################
+        for i in range(nr_points - 1):
+            a = tour[i]
+            b = tour[i + 1]
+            d_ab = dist(a, b)
+
+            for c in neighbours[a]:
+                d_ac = dist(a, c)
+                if d_ac >= d_ab:
+                    break
+
+                j = pos[c]
+                if j > i + 1:
+                    # a-b ... c-d  =>  a-c ... b-d
+                    if j + 1 < nr_points:
+                        d = tour[j + 1]
+                        delta = d_ac + dist(b, d) - d_ab - dist(c, d)
+                    else:
+                        delta = d_ac - d_ab
+                    if delta < -eps:
+                        reverse(i + 1, j)
+                        improved = True
+                        break
+                elif j < i and j + 1 < i:
+                    # c-e ... a-b  =>  c-a ... e-b
+                    e = tour[j + 1]
+                    delta = d_ac + dist(e, b) - d_ab - dist(c, e)
+                    if delta < -eps:
+                        reverse(j + 1, i)
+                        improved = True
+                        break
+
+            checks += 1
+            if checks % 256 == 0 and time.time() > stop_time:
+                return tour
+
+        # ############################################################################################################
+        # Or-opt: move a segment of 1 to 3 points between two other points
+        # ############################################################################################################
+        for seg_len in (1, 2, 3):
+            i = 1
+            while i + seg_len <= nr_points:
+                s_first = tour[i]
+                s_last = tour[i + seg_len - 1]
+                p = tour[i - 1]
+                nx = tour[i + seg_len] if i + seg_len < nr_points else None
+
+                if nx is None:
+                    removal_gain = dist(p, s_first)
+                else:
+                    removal_gain = dist(p, s_first) + dist(s_last, nx) - dist(p, nx)
+
+                best = None
+                for end_node in (s_first, s_last):
+                    for c in neighbours[end_node]:
+                        j = pos[c]
+                        if i - 1 <= j < i + seg_len:
+                            continue
+                        cn = tour[j + 1] if j + 1 < nr_points else None
+                        if cn == s_first:
+                            continue
+
+                        if cn is None:
+                            cost_keep = dist(c, s_first)
+                            cost_rev = dist(c, s_last)
+                            old = 0.0
+                        else:
+                            cost_keep = dist(c, s_first) + dist(s_last, cn)
+                            cost_rev = dist(c, s_last) + dist(s_first, cn)
+                            old = dist(c, cn)
+
+                        gain = removal_gain - (min(cost_keep, cost_rev) - old)
+                        if gain > eps and (best is None or gain > best[0]):
+                            best = (gain, j, cost_rev < cost_keep)
+
+                if best is not None:
+                    __, j, rev = best
+                    segment = tour[i:i + seg_len]
+                    if rev:
+                        segment.reverse()
+                    rest = tour[:i] + tour[i + seg_len:]
+                    insert_at = j + 1 if j < i else j + 1 - seg_len
+                    tour = rest[:insert_at] + segment + rest[insert_at:]
+                    for k in range(min(i, insert_at), nr_points):
+                        pos[tour[k]] = k
+                    improved = True
+                else:
+                    i += 1
+
+                checks += 1
+                if checks % 256 == 0 and time.time() > stop_time:
+                    return tour
+
+    return tour
+
+
+def order_drills(coords, start=None, time_limit=3.0, initial='nn'):
+    """
+    Find a short open path through the drill points.
+
+    :param coords:      list of (x, y) tuples or numpy array of shape (N, 2)
+    :param start:       (x, y) position from where the drilling starts. If None the path starts in the first point.
+    :param time_limit:  maximum time in seconds used for the 2-opt/Or-opt improvement. If 0 no improvement is done.
+    :param initial:     'nn' for a nearest neighbour initial order or 'hilbert' for a Hilbert curve initial order
+    :return:            list with the indexes of the points in the drilling order
+    """
+    coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+    if len(coords) == 0:
+        return []
+
+    if initial == 'hilbert':
+        path = hilbert_order(coords).tolist()
+        if start is not None:
+            # begin the walk from the point closest to the start position; the curve is walked in both directions
+            first = int(np.argmin(np.hypot(coords[:, 0] - start[0], coords[:, 1] - start[1])))
+            k = path.index(first)
+            path = path[k:] + path[:k][::-1]
+    else:
+        path = nearest_neighbour_order(coords, start=start)
+
+    if time_limit and float(time_limit) > 0:
+        path = improve_order(coords, path, time_limit=time_limit)
+
+    return path
+
+
+def path_length(coords, path, start=None):
+    """
+    :param coords:  numpy array of shape (N, 2)
+    :param path:    list of point indexes
+    :param start:   (x, y) start position or None
+    :return:        the length of the travel along the path
+    """
+    if len(path) == 0:
+        return 0.0
+    pts = np.asarray(coords, dtype=np.float64)[np.asarray(path)]
+    if start is not None:
+        pts = np.vstack((np.asarray(start, dtype=np.float64).reshape(1, 2), pts))
+    return float(np.hypot(*np.diff(pts, axis=0).T).sum())
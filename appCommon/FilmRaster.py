@@ -0,0 +1,217 @@
+# ##########################################################
+# FlatCAM: 2D Post-processing for Manufacturing            #
+# Date: 10/18/2026                                         #
+# MIT Licence                                              #
+# ##########################################################
+
+"""
+Raster output (PNG, TIFF) of the Film Tool.
+
+The geometry is filled directly in a bitmap (rasterio.features.rasterize()) instead of being written as SVG, parsed
+back and rendered by ReportLab:
+
+* the bitmap is made in horizontal strips; a strip is filled only with the shapes that cross it and is written
+  before the next one is made, so the memory used depends on the width of the film and not on its area
+* the PNG file is written as it's made, a zlib stream split in an IDAT chunk for each strip; the TIFF file is
+  written in strips by rasterio (GDAL)
+* the resolution (DPI) is stored in the file, so the film is printed at scale
+
+The shapes are drawn like in the SVG export: the polygons are filled and their outlines and the lines have a width
+of 2 * stroke; the points are circles with a radius of 3 * stroke.
+"""
+
+import logging
+import struct
+import warnings
+import zlib
+
+import numpy as np
+
+from shapely.geometry import box
+
+import rasterio
+from rasterio.errors import NotGeoreferencedWarning
+from rasterio.features import rasterize
+from rasterio.transform import Affine
+from rasterio.windows import Window
+
+log = logging.getLogger('base')
+
+
+def flatten_shapes(geometry):
+    """
+    :param geometry:    Shapely geometry or a list of them
+    :return:            list of the non empty simple geometries (Polygons, LineStrings, Points ...)
+    """
+    if geometry is None:
+        return []
+    if hasattr(geometry, 'geoms'):
+        geometry = geometry.geoms
+    elif not isinstance(geometry, (list, tuple)):
+        geometry = [geometry]
+
+    shapes = []
+    for geo in geometry:
+        if hasattr(geo, 'geoms') or isinstance(geo, (list, tuple)):
+            shapes += flatten_shapes(geo)
+        elif geo is not None and not geo.is_empty:
+            shapes.append(geo)
+    return shapes
+
+
+def film_shapes(geometry, stroke, resolution=16):
+    """
+    :param geometry:    Shapely geometry or a list of them
+    :param stroke:      half of the width of the lines and outlines
+    :param resolution:  number of segments used for a quarter of circle
+    :return:            list of the areas filled for the geometry
+    """
+    shapes = []
+    for geo in flatten_shapes(geometry):
+        if geo.geom_type == 'Point':
+            if stroke > 0:
+                shapes.append(geo.buffer(3 * stroke, resolution))
+        elif geo.geom_type == 'Polygon':
+            shapes.append(geo.buffer(stroke, resolution) if stroke > 0 else geo)
+        elif stroke > 0:
+            shapes.append(geo.buffer(stroke, resolution))
+    return [geo for geo in shapes if not geo.is_empty]
+
+
+class PNGStripWriter:
+    """
+    Writes a PNG image a strip of rows at a time.
+    """
+
+    def __init__(self, filename, width, height, channels, dpi):
+        """
+        :param filename:    path of the PNG file
+        :param width:       width of the image in pixels
+        :param height:      height of the image in pixels
+        :param channels:    1 (grayscale) or 3 (RGB)
+        :param dpi:         resolution, in dots per inch
+        """
+        self.width = width
+        self.height = height
+        self.channels = channels
+        self.compressor = zlib.compressobj(6)
+
+        self.fp = open(filename, 'wb')
+        self.fp.write(b'\x89PNG\r\n\x1a\n')
+        color_type = 0 if channels == 1 else 2
+        self.chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, color_type, 0, 0, 0))
+        pixels_per_meter = int(round(dpi / 0.0254))
+        self.chunk(b'pHYs', struct.pack('>IIB', pixels_per_meter, pixels_per_meter, 1))
+
+    def chunk(self, tag, data):
+        self.fp.write(struct.pack('>I', len(data)))
+        self.fp.write(tag)
+        self.fp.write(data)
+        self.fp.write(struct.pack('>I', zlib.crc32(data, zlib.crc32(tag)) & 0xffffffff))
+
+    def write(self, rows):
+        """
+        :param rows:    uint8 array of (rows, width) or (rows, width, channels) pixels
+        :return:        None
+        """
+        rows = rows.reshape(len(rows), self.width * self.channels)
+        # each row starts with its filter type: 0 (none)
+        data = np.concatenate((np.zeros((len(rows), 1), dtype=np.uint8), rows), axis=1)
+        compressed = self.compressor.compress(data.tobytes())
+        if compressed:
+            self.chunk(b'IDAT', compressed)
+
+    def close(self):
+        self.chunk(b'IDAT', self.compressor.flush())
+        self.chunk(b'IEND', b'')
+        self.fp.close()
+
+
+class TIFFStripWriter:
+    """
+    Writes a TIFF image a strip of rows at a time, with rasterio.
+    """
+
+    def __init__(self, filename, width, height, channels, dpi):
+        self.height = height
+        self.channels = channels
+        self.row = 0
+
+        with warnings.catch_warnings():
+            # the film has no geographic reference
+            warnings.simplefilter('ignore', NotGeoreferencedWarning)
+            self.dst = rasterio.open(filename, 'w', driver='GTiff', width=width, height=height, count=channels,
+                                     dtype='uint8', compress='deflate', photometric='minisblack' if channels == 1
+                                     else 'rgb')
+        self.dst.update_tags(TIFFTAG_XRESOLUTION=str(dpi), TIFFTAG_YRESOLUTION=str(dpi), TIFFTAG_RESOLUTIONUNIT='2')
+
+    def write(self, rows):
+        nr_rows = len(rows)
+        bands = rows[None, :, :] if rows.ndim == 2 else np.moveaxis(rows, 2, 0)
+        self.dst.write(bands, window=Window(0, self.row, bands.shape[2], nr_rows))
+        self.row += nr_rows
+
+    def close(self):
+        self.dst.close()
+
+
+def write_film(filename, geometry, bounds, dpi, units='MM', stroke=0.0, foreground=(0, 0, 0),
+               background=(255, 255, 255), ftype='png', strip_height=512, check_abort=None, progress=None):
+    """
+    Fills the geometry in a bitmap and writes it in a PNG or TIFF file.
+
+    :param filename:        path of the file
+    :param geometry:        Shapely geometry or a list of them
+    :param bounds:          (xmin, ymin, xmax, ymax) of the area of the film
+    :param dpi:             resolution, in dots per inch
+    :param units:           units of the geometry: 'MM' or 'IN'
+    :param stroke:          half of the width of the lines and outlines, see film_shapes()
+    :param foreground:      (R, G, B) color of the geometry
+    :param background:      (R, G, B) color of the rest of the film
+    :param ftype:           'png' or 'tif'
+    :param strip_height:    number of rows of pixels made at a time
+    :param check_abort:     function called between the strips; it raises an exception to abort
+    :param progress:        function called with the percentage done after each strip
+    :return:                (width, height) of the image in pixels
+    """
+    xmin, ymin, xmax, ymax = bounds
+    pixel = (25.4 if units.upper() == 'MM' else 1.0) / float(dpi)
+    # the rounding errors don't add a pixel
+    width = max(int(np.ceil((xmax - xmin) / pixel - 1e-6)), 1)
+    height = max(int(np.ceil((ymax - ymin) / pixel - 1e-6)), 1)
+
+    shapes = [geo for geo in film_shapes(geometry, stroke) if geo.intersects(box(xmin, ymin, xmax, ymax))]
+    shape_bounds = np.array([geo.bounds for geo in shapes], dtype=np.float64).reshape(-1, 4)
+
+    gray = foreground[0] == foreground[1] == foreground[2] and background[0] == background[1] == background[2]
+    channels = 1 if gray else 3
+    colors = np.array([background, foreground], dtype=np.uint8)[:, :channels]
+
+    writer_class = TIFFStripWriter if ftype == 'tif' else PNGStripWriter
+    writer = writer_class(filename, width, height, channels, dpi)
+    try:
+        for row in range(0, height, strip_height):
+            if check_abort is not None:
+                check_abort()
+
+            nr_rows = min(strip_height, height - row)
+            top = ymax - row * pixel
+            bottom = top - nr_rows * pixel
+            selected = np.flatnonzero((shape_bounds[:, 1] <= top) & (shape_bounds[:, 3] >= bottom))
+
+            if len(selected):
+                mask = rasterize(((shapes[k], 1) for k in selected.tolist()), out_shape=(nr_rows, width),
+                                 transform=Affine(pixel, 0.0, xmin, 0.0, -pixel, top), fill=0, dtype='uint8')
+            else:
+                mask = np.zeros((nr_rows, width), dtype=np.uint8)
+
+            pixels = colors[mask]
+            writer.write(pixels[:, :, 0] if channels == 1 else pixels)
+
+            if progress is not None:
+                progress(int(100 * (row + nr_rows) / height))
+    finally:
+        writer.close()
+
+    log.debug("FilmRaster.write_film() --> %d x %d pixels, %d shapes" % (width, height, len(shapes)))
+    return width, height
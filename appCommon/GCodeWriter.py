@@ -0,0 +1,279 @@
+# ##########################################################
+# FlatCAM: 2D Post-processing for Manufacturing            #
+# Date: 10/18/2026                                         #
+# MIT Licence                                              #
+# ##########################################################
+
+"""
+G-code writer helpers.
+
+* ``PreprocessorTemplates`` turns a preprocessor method that emits a move to an (x, y) position (rapid_code,
+  linear_code, lift_code, down_code, up_to_zero_code) into a %-format template. The preprocessor method is run only
+  a few times, when the template is compiled, and each G-code line is then made by a single string formatting instead
+  of a call into the preprocessor with a copy of all the CNCjob attributes.
+* ``GCodeBuffer`` collects the G-code text in a list of chunks and joins it once; it can also write the chunks to
+  an open file as they are made.
+
+A template is compiled from the output of the preprocessor for a few probe positions. When the output can't be
+expressed as a template (the coordinates are not formatted as fixed point numbers or the output depends on the
+coordinates in other ways) the preprocessor method is called for each line, as before.
+"""
+
+import re
+import logging
+import traceback
+
+log = logging.getLogger('base')
+
+# the first probe is used to find the coordinates in the preprocessor output and the others to verify the template
+PROBE_VALUES = [
+    (71717.171717171717, 82828.282828282828),
+    (-3.141592653589, 0.000046789012),
+    (123.456789012345, -98765.4321098765),
+    (0.0, -0.5)
+]
+
+NUMBER_RE = re.compile(r'-?\d+(?:\.\d*)?')
+
+
+class RecordingAttrDict(dict):
+    """
+    Same as camlib.AttrDict (the values are available as keys and as attributes) but it records the keys that are
+    read, so a compiled template can be tied to the values used to make it.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        object.__setattr__(self, 'accessed', set())
+
+    def __getitem__(self, key):
+        self.accessed.add(key)
+        return dict.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        self.accessed.add(key)
+        return dict.get(self, key, default)
+
+    def __contains__(self, key):
+        self.accessed.add(key)
+        return dict.__contains__(self, key)
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+
+def compile_template(fun, attributes, slots=('x', 'y')):
+    """
+    Compile a preprocessor method into a %-format template.
+
+    :param fun:         preprocessor method; takes a dictionary with the CNCjob attributes and returns a string
+    :param attributes:  dictionary with the CNCjob attributes (including the kwargs of the call)
+    :param slots:       the attributes that change for each line
+    :return:            tuple (template, order of the slots in the template, names of the attributes read by the
+                        preprocessor) or None if the preprocessor output can't be expressed as a template
+    """
+    if len(slots) > len(PROBE_VALUES[0]):
+        return None
+
+    probe = RecordingAttrDict(attributes)
+    probe.update(zip(slots, PROBE_VALUES[0]))
+    try:
+        out = fun(probe)
+    except Exception:
+        return None
+    if not isinstance(out, str):
+        return None
+
+    template_parts = []
+    order = []
+    last = 0
+    for match in NUMBER_RE.finditer(out):
+        token = match.group(0)
+        decimals = len(token) - token.index('.') - 1 if '.' in token else 0
+        value = float(token)
+
+        for slot, probe_value in zip(slots, PROBE_VALUES[0]):
+            if abs(value - probe_value) <= 0.5 * 10 ** -decimals + 1e-9:
+                template_parts.append(out[last:match.start()].replace('%', '%%'))
+                template_parts.append('%%.%df' % decimals)
+                order.append(slot)
+                last = match.end()
+                break
+    template_parts.append(out[last:].replace('%', '%%'))
+    template = ''.join(template_parts)
+
+    # the template has to give the same output as the preprocessor for the other probe positions
+    for values in PROBE_VALUES[1:]:
+        check = RecordingAttrDict(attributes)
+        check.update(zip(slots, values))
+        by_slot = dict(zip(slots, values))
+        try:
+            if fun(check) != template % tuple(by_slot[s] for s in order):
+                return None
+        except Exception:
+            return None
+
+    return template, tuple(order), frozenset(probe.accessed.difference(slots))
+
+
+def freeze(value):
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+class PreprocessorTemplates:
+    """
+    Cache of the templates compiled from the preprocessor methods of a CNCjob.
+
+    A template is reused as long as the attributes read by the preprocessor method when the template was compiled
+    keep their values; otherwise a new template is compiled (e.g. for each depth of a multi-depth cut).
+    """
+
+    def __init__(self, app_log=None):
+        self.log = app_log if app_log is not None else log
+
+        # (method, slots) -> (names of the attributes read by the method, {values of those attributes: renderer})
+        self.cache = {}
+
+    def __getstate__(self):
+        # the renderers are closures, they are made again after unpickling
+        return {'log': None, 'cache': {}}
+
+    def __setstate__(self, state):
+        self.log = log
+        self.cache = {}
+
+    def __deepcopy__(self, memo):
+        return PreprocessorTemplates(app_log=self.log)
+
+    @staticmethod
+    def method_key(fun):
+        return getattr(fun, '__func__', fun), id(getattr(fun, '__self__', None))
+
+    def renderer(self, fun, postdata, kwargs, slots=('x', 'y')):
+        """
+        :param fun:         preprocessor method
+        :param postdata:    the CNCjob attributes
+        :param kwargs:      attributes that replace the CNCjob attributes for this call
+        :param slots:       the attributes that are given to the renderer
+        :return:            callable that takes the slots values (positional, in the slots order) and returns the
+                            G-code line, including the line ending
+        """
+        key = (self.method_key(fun), slots)
+        entry = self.cache.get(key)
+
+        if entry is False:
+            return self.fallback(fun, postdata, kwargs, slots)
+
+        if entry is not None:
+            names, compiled = entry
+            render = compiled.get(self.values_key(names, postdata, kwargs))
+            if render is not None:
+                return render
+
+        attributes = dict(postdata)
+        attributes.update(kwargs)
+        result = compile_template(fun, attributes, slots)
+
+        if result is None:
+            self.log.debug("PreprocessorTemplates.renderer() -> %s can't be compiled. Using the preprocessor." %
+                           str(getattr(fun, '__name__', fun)))
+            self.cache[key] = False
+            return self.fallback(fun, postdata, kwargs, slots)
+
+        template, order, names = result
+        if entry is None or not names.issubset(entry[0]):
+            # keep the attributes read for the previous compilations and add the new ones
+            names = names if entry is None else entry[0] | names
+            entry = (names, {})
+            self.cache[key] = entry
+
+        render = self.make_renderer(template + '\n', order, slots)
+        entry[1][self.values_key(entry[0], postdata, kwargs)] = render
+        return render
+
+    @staticmethod
+    def values_key(names, postdata, kwargs):
+        return tuple(freeze(kwargs[n] if n in kwargs else postdata.get(n)) for n in sorted(names))
+
+    @staticmethod
+    def make_renderer(template, order, slots):
+        if order == slots:
+            return lambda *values: template % values
+
+        positions = tuple(slots.index(s) for s in order)
+        return lambda *values: template % tuple(values[i] for i in positions)
+
+    def fallback(self, fun, postdata, kwargs, slots):
+        app_log = self.log
+        attributes = dict(postdata)
+        attributes.update(kwargs)
+
+        def render(*values):
+            params = RecordingAttrDict(attributes)
+            params.update(zip(slots, values))
+            try:
+                return fun(params) + '\n'
+            except Exception:
+                app_log.error('Exception occurred within a preprocessor: ' + traceback.format_exc())
+                return '\n'
+        return render
+
+
+class GCodeBuffer:
+    """
+    List of G-code chunks. When a stream (an open text file) is given, the chunks are written to it every time
+    more than chunk_size chunks or more than flush_size characters are collected and when flush() is called; a large
+    chunk (the G-code of a tool) is written as it is, without being joined with the others.
+    """
+
+    def __init__(self, stream=None, chunk_size=65536, flush_size=1048576):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.flush_size = flush_size
+        self.chunks = []
+        self.size = 0
+
+    def write(self, text):
+        self.chunks.append(text)
+        self.size += len(text)
+        if self.stream is not None and (len(self.chunks) >= self.chunk_size or self.size >= self.flush_size):
+            self.flush()
+
+    def extend(self, texts):
+        for text in texts:
+            self.write(text)
+
+    def flush(self):
+        if self.stream is not None and self.chunks:
+            self.stream.write(''.join(self.chunks))
+            self.chunks = []
+            self.size = 0
+
+    def getvalue(self):
+        return ''.join(self.chunks)
+
+    def __len__(self):
+        return len(self.chunks)
+
+
+def write_gcode(filename, parts, newline=None, chunk_size=65536):
+    """
+    Write G-code to a file without joining the parts in a single string first.
+
+    :param filename:    path to the file
+    :param parts:       iterable of strings: the lines or the sections of the G-code
+    :param newline:     the newline argument of open(); '\\r\\n' forces Windows line endings
+    :param chunk_size:  how many parts are joined for a file write
+    :return:            None
+    """
+    with open(filename, 'w', newline=newline) as f:
+        buffer = GCodeBuffer(stream=f, chunk_size=chunk_size)
+        buffer.extend(parts)
+        buffer.flush()
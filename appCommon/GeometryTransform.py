@@ -0,0 +1,221 @@
+# ##########################################################
+# FlatCAM: 2D Post-processing for Manufacturing            #
+# Date: 10/18/2026                                         #
+# MIT Licence                                              #
+# ##########################################################
+
+"""
+Affine transformations (scale, offset, mirror, rotate, skew) of the geometry of the objects.
+
+Instead of walking the nested lists and the apertures and calling shapely.affinity once for each geometry:
+
+* the transformation is a 3x3 matrix (the functions below make them like shapely.affinity does)
+* the geometries of all the targets of an object (e.g. solid_geometry, follow_geometry and the geometry of the
+  apertures of a Gerber) are gathered in a single array and transformed at once (shapely.transform() with Shapely
+  2.0, one affine_transform() per geometry before); the results are stored back in the same nested lists
+* consecutive transformations of the same targets are composed (compose()) so the geometry is transformed once,
+  see Geometry.deferred_transforms()
+"""
+
+import logging
+
+import numpy as np
+
+from shapely import affinity
+from shapely.geometry.base import BaseGeometry
+
+try:
+    from shapely import transform as transform_coords, has_z
+except ImportError:
+    transform_coords = None
+
+log = logging.getLogger('base')
+
+
+def translate_matrix(dx, dy):
+    return np.array([[1.0, 0.0, dx], [0.0, 1.0, dy], [0.0, 0.0, 1.0]])
+
+
+def scale_matrix(xfactor, yfactor, origin=(0, 0)):
+    x0, y0 = origin
+    return np.array([[xfactor, 0.0, x0 - x0 * xfactor], [0.0, yfactor, y0 - y0 * yfactor], [0.0, 0.0, 1.0]])
+
+
+def mirror_matrix(axis, point):
+    """
+    :param axis:    "X" or "Y": the axis to mirror around
+    :param point:   (x, y) point of the mirror axis
+    :return:        3x3 matrix
+    """
+    xscale, yscale = {"X": (1.0, -1.0), "Y": (-1.0, 1.0)}[axis]
+    return scale_matrix(xscale, yscale, origin=point)
+
+
+def rotate_matrix(angle, origin=(0, 0)):
+    """
+    :param angle:   angle in degrees, counter-clockwise
+    :param origin:  (x, y) center of the rotation
+    :return:        3x3 matrix
+    """
+    x0, y0 = origin
+    angle = np.radians(angle)
+    cos_a = np.cos(angle)
+    sin_a = np.sin(angle)
+    # as shapely.affinity.rotate(), the values next to zero are zero
+    cos_a = 0.0 if abs(cos_a) < 2.5e-16 else cos_a
+    sin_a = 0.0 if abs(sin_a) < 2.5e-16 else sin_a
+    return np.array([[cos_a, -sin_a, x0 - x0 * cos_a + y0 * sin_a],
+                     [sin_a, cos_a, y0 - x0 * sin_a - y0 * cos_a],
+                     [0.0, 0.0, 1.0]])
+
+
+def skew_matrix(angle_x, angle_y, origin=(0, 0)):
+    """
+    :param angle_x: shear angle for the X axis, in degrees
+    :param angle_y: shear angle for the Y axis, in degrees
+    :param origin:  (x, y) origin of the skew
+    :return:        3x3 matrix
+    """
+    x0, y0 = origin
+    tan_x = np.tan(np.radians(angle_x))
+    tan_y = np.tan(np.radians(angle_y))
+    tan_x = 0.0 if abs(tan_x) < 2.5e-16 else tan_x
+    tan_y = 0.0 if abs(tan_y) < 2.5e-16 else tan_y
+    return np.array([[1.0, tan_x, -y0 * tan_x], [tan_y, 1.0, -x0 * tan_y], [0.0, 0.0, 1.0]])
+
+
+def affine_params(matrix):
+    """
+    :param matrix:  3x3 matrix
+    :return:        [a, b, d, e, xoff, yoff] as for shapely.affinity.affine_transform()
+    """
+    return [float(matrix[0, 0]), float(matrix[0, 1]), float(matrix[1, 0]), float(matrix[1, 1]),
+            float(matrix[0, 2]), float(matrix[1, 2])]
+
+
+def transform_geometries(geometries, matrix):
+    """
+    :param geometries:  list of Shapely geometries
+    :param matrix:      3x3 matrix
+    :return:            list with the transformed geometries; the Z coordinates are not changed
+    """
+    if not geometries:
+        return []
+
+    a, b, d, e, xoff, yoff = affine_params(matrix)
+    if transform_coords is None:
+        return [affinity.affine_transform(geo, [a, b, 0.0, d, e, 0.0, 0.0, 0.0, 1.0, xoff, yoff, 0.0])
+                for geo in geometries]
+
+    def affine_coords(coords):
+        x = coords[:, 0]
+        y = coords[:, 1]
+        result = coords.copy()
+        result[:, 0] = a * x + b * y + xoff
+        result[:, 1] = d * x + e * y + yoff
+        return result
+
+    arr = np.empty(len(geometries), dtype=object)
+    arr[:] = geometries
+    with_z = has_z(arr)
+    if np.any(with_z):
+        arr[with_z] = transform_coords(arr[with_z], affine_coords, include_z=True)
+        arr[~with_z] = transform_coords(arr[~with_z], affine_coords)
+    else:
+        arr = transform_coords(arr, affine_coords)
+    return list(arr)
+
+
+def _get(container, key):
+    if isinstance(container, dict):
+        return container.get(key)
+    return getattr(container, key, None)
+
+
+def _set(container, key, value):
+    if isinstance(container, dict):
+        container[key] = value
+    else:
+        setattr(container, key, value)
+
+
+def gather(value, geometries):
+    """
+    :param value:       a geometry or a (nested) list of geometries; anything else is kept as it is
+    :param geometries:  list where the geometries found are added
+    :return:            None
+    """
+    if type(value) is list:
+        for item in value:
+            gather(item, geometries)
+    elif isinstance(value, BaseGeometry):
+        geometries.append(value)
+
+
+def rebuild(value, transformed):
+    """
+    :param value:       the value given to gather()
+    :param transformed: iterator over the transformed geometries, in the order gather() found them
+    :return:            a copy of the value (new lists) with the transformed geometries
+    """
+    if type(value) is list:
+        return [rebuild(item, transformed) for item in value]
+    if isinstance(value, BaseGeometry):
+        return next(transformed)
+    return value
+
+
+def transform_targets(targets, matrix, progress=None, nr_steps=20):
+    """
+    Transforms the geometry of the targets at once and stores it back in the targets.
+
+    The lists of the geometry are new lists (they can be shared with other objects, e.g. after a copy).
+
+    :param targets:     list of (container, key): a dict and a key or an object and the name of an attribute; the
+                        value is a geometry or a (nested) list of geometries
+    :param matrix:      3x3 matrix
+    :param progress:    function called with the percentage done
+    :param nr_steps:    number of parts in which the geometry is transformed when there is a progress function
+    :return:            the number of transformed geometries
+    """
+    values = [_get(container, key) for container, key in targets]
+    geometries = []
+    for value in values:
+        gather(value, geometries)
+    if not geometries:
+        return 0
+
+    step = len(geometries) if progress is None else max(-(-len(geometries) // nr_steps), 10000)
+    transformed = []
+    for start in range(0, len(geometries), step):
+        stop = min(start + step, len(geometries))
+        transformed += transform_geometries(geometries[start:stop], matrix)
+        if progress is not None:
+            progress(int(100 * stop / len(geometries)))
+
+    transformed = iter(transformed)
+    for (container, key), value in zip(targets, values):
+        if type(value) is list or isinstance(value, BaseGeometry):
+            _set(container, key, rebuild(value, transformed))
+    return len(geometries)
+
+
+def targets_key(targets):
+    return tuple((id(container), key) for container, key in targets)
+
+
+def compose(pending):
+    """
+    Composes the consecutive transformations of the same targets.
+
+    :param pending: list of (3x3 matrix, targets) in the order they were asked
+    :return:        list of (3x3 matrix, targets) to be applied in this order
+    """
+    composed = []
+    for matrix, targets in pending:
+        if composed and targets_key(composed[-1][1]) == targets_key(targets):
+            # the last transformation is applied after the previous ones
+            composed[-1] = (np.dot(matrix, composed[-1][0]), composed[-1][1])
+        else:
+            composed.append((np.asarray(matrix, dtype=np.float64), targets))
+    return composed
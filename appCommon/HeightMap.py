@@ -0,0 +1,297 @@
+# ##########################################################
+# FlatCAM: 2D Post-processing for Manufacturing            #
+# Date: 10/18/2026                                         #
+# MIT Licence                                              #
+# ##########################################################
+
+"""
+Height map of the probed points, for the autolevelling of the CNC jobs with bilinear interpolation.
+
+Instead of matching each node of the grid with each probed point and interpolating one point per call:
+
+* the probed points are placed in the grid with NumPy: the nearest column and row of each point are found with
+  searchsorted() and the points that fall on the same node are resolved with lexsort()
+* the heights of a whole (N, 2) array of coordinates are interpolated in one call (HeightMap.interpolate())
+* the G-code is levelled in bulk (HeightMap.level_gcode()): the moves are read in a single pass, the feed moves
+  longer than a given length are split, the heights of all the points are interpolated at once and the G-code is
+  written again with the new Z
+"""
+
+import re
+import logging
+
+import numpy as np
+
+log = logging.getLogger('base')
+
+# a word of G-code: the letter and the number
+WORD_RE = re.compile(r'([A-Z])[ \t]*([-+]?(?:\d+\.?\d*|\.\d+))', re.IGNORECASE)
+COMMENT_RE = re.compile(r'\([^)]*\)|;.*')
+XYZ_RE = re.compile(r'[ \t]*[XYZ][ \t]*[-+]?(?:\d+\.?\d*|\.\d+)', re.IGNORECASE)
+G_RE = re.compile(r'G[ \t]*0*[0-3](?![0-9.])', re.IGNORECASE)
+# G codes of the non-modal group whose X, Y, Z words are not a move in the work coordinates: dwell, offsets (G10),
+# return to home (G28, G30), probing (G38.x), machine coordinates (G53) and coordinate system offset (G92)
+NON_MODAL_CODES = (4, 10, 28, 30, 38, 53, 92)
+
+
+def strip_axes(line):
+    """
+    :param line:    a line of G-code
+    :return:        the line without its X, Y and Z words; the comments are not changed
+    """
+    parts = []
+    pos = 0
+    for comment in COMMENT_RE.finditer(line):
+        parts += [XYZ_RE.sub('', line[pos:comment.start()]), comment.group()]
+        pos = comment.end()
+    parts.append(XYZ_RE.sub('', line[pos:]))
+    return ''.join(parts)
+
+
+def search_code(regex, line):
+    """
+    :param regex:   compiled regular expression
+    :param line:    a line of G-code
+    :return:        the first match of the regex outside the comments of the line or None
+    """
+    pos = 0
+    for comment in COMMENT_RE.finditer(line):
+        match = regex.search(line, pos, comment.start())
+        if match is not None:
+            return match
+        pos = comment.end()
+    return regex.search(line, pos)
+
+
+def grid_axis(values):
+    """
+    The ideal grid of one axis of the probed points.
+
+    :param values:  the coordinates of the probed points on the axis
+    :return:        (minimum, maximum, spacing, count)
+    """
+    values = np.sort(np.asarray(values, dtype=np.float64))
+    v_min = float(values[0])
+    v_max = float(values[-1])
+    # the largest gap between two values is the step of the grid; the step is then the one of the evenly-spaced grid
+    spacing = float(np.diff(values).max()) if len(values) > 1 else 0.0
+    count = int(round((v_max - v_min) / spacing + 1)) if spacing > 0 else 1
+    if count > 1:
+        spacing = (v_max - v_min) / (count - 1)
+    return v_min, v_max, spacing, count
+
+
+class HeightMap:
+    """
+    The heights of the probed points on an evenly-spaced (ideal) grid.
+    """
+
+    def __init__(self, points):
+        """
+        :param points:  (N, 3) array of the probed (x, y, z) points; they are on a grid, with some floating point
+                        errors
+        """
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        if len(self.points) == 0:
+            raise ValueError("No probed points.")
+
+        self.x_min, self.x_max, self.x_spacing, self.x_count = grid_axis(self.points[:, 0])
+        self.y_min, self.y_max, self.y_spacing, self.y_count = grid_axis(self.points[:, 1])
+        self.xs = np.linspace(self.x_min, self.x_max, self.x_count)
+        self.ys = np.linspace(self.y_min, self.y_max, self.y_count)
+
+        # the nearest column and row of each probed point: the index of the first node after the middle point
+        col = np.searchsorted((self.xs[1:] + self.xs[:-1]) / 2.0, self.points[:, 0])
+        row = np.searchsorted((self.ys[1:] + self.ys[:-1]) / 2.0, self.points[:, 1])
+        node = row * self.x_count + col
+
+        # when more points fall on a node, the one nearest to the node is used (the last one for equal distances)
+        dist = np.hypot(self.points[:, 0] - self.xs[col], self.points[:, 1] - self.ys[row])
+        order = np.lexsort((np.arange(len(node)), -dist, node))
+        last = np.concatenate((node[order][1:] != node[order][:-1], [True]))
+
+        # index of the probed point of each node
+        self.node_point = np.full(self.x_count * self.y_count, -1, dtype=np.int64)
+        self.node_point[node[order][last]] = order[last]
+
+        # a node without a probed point takes the height of the nearest probed point
+        missing = np.flatnonzero(self.node_point < 0)
+        if len(missing):
+            log.debug("HeightMap --> %d nodes of the grid without a probed point" % len(missing))
+        for start in range(0, len(missing), 1000):
+            nodes = missing[start:start + 1000]
+            nx = self.xs[nodes % self.x_count]
+            ny = self.ys[nodes // self.x_count]
+            sq_dist = (nx[:, None] - self.points[None, :, 0]) ** 2 + (ny[:, None] - self.points[None, :, 1]) ** 2
+            self.node_point[nodes] = np.argmin(sq_dist, axis=1)
+
+        # heights of the nodes, (rows, columns)
+        self.z = self.points[self.node_point, 2].reshape(self.y_count, self.x_count)
+
+    @property
+    def probed_grid(self):
+        """
+        :return:    (columns, rows, 3) array with the probed point used for each node of the grid
+        """
+        return self.points[self.node_point].reshape(self.y_count, self.x_count, 3).transpose(1, 0, 2)
+
+    @staticmethod
+    def cell(values, v_min, spacing, count):
+        """
+        :return:    (index of the first node of the cell, position in the cell from 0 to 1) for each value; the values
+                    outside the grid are moved on its border
+        """
+        if count < 2:
+            return np.zeros(len(values), dtype=np.int64), np.zeros(len(values))
+
+        pos = np.clip((values - v_min) / spacing, 0, count - 1)
+        idx = np.minimum(np.floor(pos).astype(np.int64), count - 2)
+        return idx, pos - idx
+
+    def interpolate(self, points):
+        """
+        Bilinear interpolation of the heights. If one coordinate is outside the grid, the height is interpolated
+        on the border of the grid; if both are outside, it is the height of the nearest corner.
+
+        :param points:  (N, 2) array of (x, y) coordinates
+        :return:        array with the N heights
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        ix, tx = self.cell(points[:, 0], self.x_min, self.x_spacing, self.x_count)
+        iy, ty = self.cell(points[:, 1], self.y_min, self.y_spacing, self.y_count)
+        ix1 = np.minimum(ix + 1, self.x_count - 1)
+        iy1 = np.minimum(iy + 1, self.y_count - 1)
+
+        z = self.z
+        bottom = z[iy, ix] * (1 - tx) + z[iy, ix1] * tx
+        top = z[iy1, ix] * (1 - tx) + z[iy1, ix1] * tx
+        return bottom * (1 - ty) + top * ty
+
+    def level_gcode(self, gcode, max_segment=None, decimals=4):
+        """
+        Z compensation of G-code: the height of the surface is added to the Z of each move. The feed moves (G1)
+        longer than max_segment are split so they follow the surface.
+
+        Only absolute coordinates (G90) are supported. The arcs (G2, G3) are not split; their end is levelled. The
+        lines with a G code of the non-modal group (G4, G10, G28, G30, G38.x, G53, G92) are not changed.
+
+        :param gcode:       G-code text
+        :param max_segment: the maximum length of a levelled feed move; None to not split the moves
+        :param decimals:    number of decimals of the coordinates written
+        :return:            the levelled G-code text
+        """
+        lines = gcode.splitlines()
+
+        # ## pass 1: the moves
+        move_lines = []
+        starts = []
+        ends = []
+        feeds = []
+        # the words X and Y written on each move line
+        written = []
+        motion = None
+        x = y = z = None
+        for idx, line in enumerate(lines):
+            words = WORD_RE.findall(COMMENT_RE.sub('', line))
+            if not words:
+                continue
+
+            found = {}
+            non_modal = None
+            for letter, value in words:
+                letter = letter.upper()
+                if letter == 'G':
+                    g_code = float(value)
+                    if g_code in (0, 1, 2, 3):
+                        motion = int(g_code)
+                    elif g_code == 91:
+                        raise ValueError("Only absolute coordinates (G90) can be levelled.")
+                    elif int(g_code) in NON_MODAL_CODES:
+                        non_modal = g_code
+                elif letter in 'XYZ':
+                    found[letter] = float(value)
+
+            # these lines are not levelled
+            if non_modal is not None:
+                if non_modal == 92:
+                    # the current position gets the given coordinates
+                    x, y, z = found.get('X', x), found.get('Y', y), found.get('Z', z)
+                elif int(non_modal) in (38, 53) or (int(non_modal) in (28, 30) and found):
+                    # the axes moved to the probed point, in machine coordinates or to the home position are not
+                    # known until the next moves
+                    x = None if 'X' in found else x
+                    y = None if 'Y' in found else y
+                    z = None if 'Z' in found else z
+                elif non_modal != 4:
+                    # the work coordinates changed or all the axes went home
+                    x = y = z = None
+                continue
+            if not found or motion is None:
+                continue
+
+            new_x = found.get('X', x)
+            new_y = found.get('Y', y)
+            new_z = found.get('Z', z)
+            if new_z is not None:
+                move_lines.append(idx)
+                written.append(('X' in found, 'Y' in found))
+                # the position is not known before the first move on both axes: the move is not split
+                known = x is not None and y is not None and new_x is not None and new_y is not None
+                starts.append((x, y) if known else (np.nan, np.nan))
+                ends.append((new_x if new_x is not None else np.nan, new_y if new_y is not None else np.nan, new_z))
+                feeds.append(motion == 1 and known)
+            x, y, z = new_x, new_y, new_z
+
+        if not move_lines:
+            return gcode
+
+        # ## the points of the levelled moves
+        starts = np.array(starts, dtype=np.float64)
+        ends = np.array(ends, dtype=np.float64)
+        feeds = np.array(feeds, dtype=bool)
+
+        nr_segments = np.ones(len(move_lines), dtype=np.int64)
+        if max_segment:
+            lengths = np.hypot(*(ends[:, :2] - starts).T)
+            split = feeds & (np.nan_to_num(lengths) > max_segment)
+            nr_segments[split] = np.ceil(lengths[split] / max_segment).astype(np.int64)
+
+        move = np.repeat(np.arange(len(move_lines)), nr_segments)
+        first = np.cumsum(nr_segments) - nr_segments
+        # position of each point on its move, from 1 / nr_segments to 1
+        t = ((np.arange(len(move)) - first[move] + 1) / nr_segments[move])[:, None]
+        xy = np.where(nr_segments[move, None] > 1, starts[move] + (ends[move, :2] - starts[move]) * t, ends[move, :2])
+        # a Z change during a split move is spread on the segments; each point is levelled
+        prev_z = np.concatenate(([ends[0, 2]], ends[:-1, 2]))
+        z_values = np.where(nr_segments[move] > 1, prev_z[move] + (ends[move, 2] - prev_z[move]) * t[:, 0],
+                            ends[move, 2])
+        # the moves made before the position is known are not levelled
+        known = ~np.isnan(xy).any(axis=1)
+        z_values[known] += self.interpolate(xy[known])
+
+        # ## pass 2: the G-code written again
+        num = '{:.%df}' % decimals
+        xy_text = [(num.format(px), num.format(py)) for px, py in xy.tolist()]
+        z_text = [num.format(pz) for pz in z_values.tolist()]
+
+        new_lines = list(lines)
+        for k, idx in enumerate(move_lines):
+            start = first[k]
+            stop = start + nr_segments[k]
+            segments = ['X%s Y%s Z%s' % (xy_text[j][0], xy_text[j][1], z_text[j]) for j in range(start, stop)]
+            if nr_segments[k] == 1:
+                # only the coordinates that were on the line are written
+                has_x, has_y = written[k]
+                segments = [' '.join((['X' + xy_text[start][0]] if has_x else []) +
+                                     (['Y' + xy_text[start][1]] if has_y else []) + ['Z' + z_text[start]])]
+
+            # the other words of the line (G, F ...) and the comments stay on the first segment
+            body = strip_axes(lines[idx])
+            g_word = search_code(G_RE, body)
+            if g_word is not None:
+                body = body[:g_word.end()] + ' ' + segments[0] + body[g_word.end():]
+            else:
+                body = segments[0] + (' ' + body.strip() if body.strip() else '')
+            new_lines[idx] = '\n'.join([body] + segments[1:])
+
+        return '\n'.join(new_lines) + ('\n' if gcode.endswith('\n') else '')
@@ -0,0 +1,162 @@
+# ##########################################################
+# FlatCAM: 2D Post-processing for Manufacturing            #
+# Date: 10/18/2026                                         #
+# MIT Licence                                              #
+# ##########################################################
+
+"""
+Parallel polygon clearing.
+
+The area cleared by a tool (NCC) is made of independent polygons; each one is cleared with the methods of
+camlib.Geometry (clear_polygon(), clear_polygon2(), clear_polygon3()) in the processes of the app pool:
+
+    results = clear_polygons(app.scheduler, polygons, tooldia, method, steps_per_circle, overlap=..)
+
+* the polygons are sent in chunks, the largest ones first, so a large polygon doesn't end the job alone
+* the results are returned in the order of the polygons, whatever the order the tasks end in
+* a polygon is not split in tiles: the offset paths of the clearing methods depend on the whole polygon
+
+The processes don't plot (no progressive plotting) and don't process the GUI events; the abort of the user is
+checked by the scheduler between the tasks.
+"""
+
+import logging
+
+from shapely.geometry import Polygon
+
+from camlib import Geometry
+
+log = logging.getLogger('base')
+
+# clearing methods, same values as in the NCC Tool
+STANDARD = 0
+SEED = 1
+LINES = 2
+COMBO = 3
+
+
+class _PoolApp:
+    """
+    Replaces the App for the Geometry used in a process of the pool. The abort is checked by the scheduler.
+    """
+    abort_flag = False
+
+
+class ClearGeometry(Geometry):
+    """
+    Geometry without the App and the GUI, used only for its polygon clearing methods.
+    """
+
+    app = _PoolApp()
+    gui_events = False
+
+    def __init__(self):
+        # no units, no temporary shapes: Geometry.__init__() needs the App
+        self.temp_shapes = None
+
+
+def flatten_polygons(geometry):
+    """
+    :param geometry:    Polygon, MultiPolygon, GeometryCollection or a list of them
+    :return:            list of the valid, non empty Polygons
+    """
+    if geometry is None:
+        return []
+    if isinstance(geometry, Polygon):
+        return [geometry] if geometry.is_valid and not geometry.is_empty else []
+    if hasattr(geometry, 'geoms'):
+        geometry = geometry.geoms
+
+    polygons = []
+    try:
+        for geo in geometry:
+            polygons += flatten_polygons(geo)
+    except TypeError:
+        log.warning("Expected geo is a Polygon. Instead got a %s" % str(type(geometry)))
+    return polygons
+
+
+def clear_polygon(geo, polygon, tooldia, method, steps_per_circle, overlap, connect, contour):
+    """
+    Clears a polygon with a method; the Combo method tries Lines, Seed and Standard until one makes paths.
+
+    :param geo:                 Geometry whose clearing methods are used
+    :param polygon:             Polygon to clear
+    :param tooldia:             tool diameter
+    :param method:              STANDARD, SEED, LINES or COMBO
+    :param steps_per_circle:    number of linear segments used to approximate a circle
+    :param overlap:             overlap of the tool passes (fraction)
+    :param connect:             connect the paths to reduce the lifts
+    :param contour:             add a path around the edges
+    :return:                    list of paths or None if the polygon can't be cleared
+    """
+    methods = {
+        STANDARD: [geo.clear_polygon],
+        SEED: [geo.clear_polygon2],
+        LINES: [geo.clear_polygon3],
+        COMBO: [geo.clear_polygon3, geo.clear_polygon2, geo.clear_polygon]
+    }
+
+    for clear_method in methods.get(method, []):
+        try:
+            cp = clear_method(polygon, tooldia, steps_per_circle=steps_per_circle, overlap=overlap, contour=contour,
+                              connect=connect, prog_plot=False)
+        except Exception as e:
+            log.debug("ParallelClear.clear_polygon() --> %s" % str(e))
+            continue
+
+        if cp and cp.objects:
+            return list(cp.get_objects())
+    return None
+
+
+def clear_chunk(chunk, tooldia, method, steps_per_circle, overlap, connect, contour, check_dia):
+    """
+    Task run in the pool: clears a chunk of polygons.
+
+    :param chunk:               list of Polygons
+    :param check_dia:           if not None a polygon where a tool with this diameter doesn't fit is skipped
+                                (rest machining); see clear_polygon() for the other parameters
+    :return:                    list with the paths of each polygon; [] for a skipped polygon, None for a polygon
+                                that can't be cleared
+    """
+    geo = ClearGeometry()
+
+    results = []
+    for polygon in chunk:
+        if check_dia is not None:
+            check_buff = polygon.buffer(-check_dia / 2, int(steps_per_circle))
+            if not check_buff or check_buff.is_empty:
+                results.append([])
+                continue
+        results.append(clear_polygon(geo, polygon, tooldia, method, steps_per_circle, overlap, connect, contour))
+    return results
+
+
+def clear_polygons(scheduler, polygons, tooldia, method, steps_per_circle, overlap=0.15, connect=True, contour=True,
+                   check_dia=None, chunk_size=None):
+    """
+    Clears polygons in the processes of the pool (in the calling process when the scheduler has no pool).
+
+    :param scheduler:           appPool.JobScheduler
+    :param polygons:            list of Polygons
+    :param chunk_size:          number of polygons in a task; None for a size based on the number of processes
+    :return:                    list with the result of clear_chunk() for each polygon, in the order of polygons
+    """
+    if not polygons:
+        return []
+
+    # the largest polygons are sent first
+    order = sorted(range(len(polygons)), key=lambda k: polygons[k].area, reverse=True)
+    if chunk_size is None:
+        # smaller chunks than usual: the time to clear a polygon varies a lot
+        chunk_size = max(scheduler.chunk_size(len(polygons)) // 2, 1)
+
+    results = scheduler.map(clear_chunk, [polygons[k] for k in order],
+                            args=(tooldia, method, steps_per_circle, overlap, connect, contour, check_dia),
+                            chunk_size=chunk_size)
+
+    ordered = [None] * len(polygons)
+    for k, res in zip(order, results):
+        ordered[k] = res
+    return ordered
@@ -0,0 +1,297 @@
+# ##########################################################
+# FlatCAM: 2D Post-processing for Manufacturing            #
+# Date: 10/18/2026                                         #
+# MIT Licence                                              #
+# ##########################################################
+
+"""
+Path chaining.
+
+Joins the paths made by the clearing algorithms (NCC, Paint) to reduce the tool lifts:
+
+* ``paint_chain()`` joins a path with the path that has the nearest endpoint when the straight walk between them,
+  buffered with the tool radius, is inside the boundary of the cleared area
+* ``touch_chain()`` joins the paths that share an endpoint
+
+The endpoints of the paths are kept in a NumPy array and searched with ``EndpointIndex``; a removed path is only
+marked as removed and the spatial index is rebuilt (in a single bulk operation) from the remaining endpoints when
+it is mostly made of removed paths. The coordinates of a chain are collected as a list of NumPy arrays and
+concatenated once, when the chain is finished.
+
+scipy is optional; when it is not available an RTree index (rtree is already used by camlib) replaces the KD-tree.
+"""
+
+import logging
+from collections import deque
+
+import numpy as np
+
+from shapely.geometry import LineString, LinearRing
+from shapely.prepared import prep
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
+from rtree import index as rtindex
+
+try:
+    # Shapely 2.0 can extract the coordinates of a whole array of geometries in one call
+    from shapely import get_coordinates
+except ImportError:
+    get_coordinates = None
+
+log = logging.getLogger('base')
+
+
+def paths_coordinates(paths):
+    """
+    :param paths:   list of LineString / LinearRing
+    :return:        list of numpy arrays of shape (N, 2), one for each path
+    """
+    if not paths:
+        return []
+
+    if get_coordinates is not None:
+        coords, owners = get_coordinates(np.asarray(paths, dtype=object), return_index=True)
+        counts = np.bincount(owners, minlength=len(paths))
+        return np.split(coords, np.cumsum(counts)[:-1])
+
+    return [np.asarray(p.coords, dtype=np.float64)[:, :2] for p in paths]
+
+
+class EndpointIndex:
+    """
+    Nearest point queries over the two endpoints of a set of paths, with removal of whole paths.
+
+    The endpoints of the path ``i`` are the rows ``2 * i`` (first point) and ``2 * i + 1`` (last point).
+    """
+
+    # the index is rebuilt when more than half of it is made of removed endpoints but not for less than this
+    # number of endpoints; below it the queries are cheap anyway
+    min_rebuild = 64
+
+    def __init__(self, endpoints):
+        """
+        :param endpoints:   numpy array of shape (2 * N, 2)
+        """
+        self.points = np.asarray(endpoints, dtype=np.float64).reshape(-1, 2)
+        self.removed = np.zeros(len(self.points) // 2, dtype=bool)
+        self.nr_alive = len(self.removed)
+
+        self.rows = None
+        self.tree = None
+        self.size = 0
+        self.dead = 0
+        self.build()
+
+    def build(self):
+        self.rows = np.flatnonzero(np.repeat(~self.removed, 2))
+        self.size = len(self.rows)
+        self.dead = 0
+
+        if self.size == 0:
+            self.tree = None
+        elif cKDTree is not None:
+            self.tree = cKDTree(self.points[self.rows])
+        else:
+            # bulk loading is much faster than inserting the points one by one
+            pts = self.points[self.rows]
+            self.tree = rtindex.Index(((i, (x, y, x, y), None) for i, (x, y) in enumerate(pts.tolist())))
+
+    def query(self, pt, k):
+        if cKDTree is not None:
+            __, found = self.tree.query(pt, k=k)
+            return self.rows[np.atleast_1d(found)]
+        return self.rows[list(self.tree.nearest((pt[0], pt[1], pt[0], pt[1]), k))]
+
+    def nearest(self, pt):
+        """
+        :param pt:  (x, y) query point
+        :return:    the row of the nearest endpoint of a path that was not removed or None if all were removed
+        """
+        if self.nr_alive == 0:
+            return None
+
+        k = 8
+        while True:
+            k = min(k, self.size)
+            found = self.query(pt, k)
+            free = found[~self.removed[found // 2]]
+            if len(free) > 0:
+                return int(free[0])
+            k *= 4
+
+    def remove(self, path_idx):
+        """
+        Remove the two endpoints of a path. The spatial index is updated in batches.
+
+        :param path_idx:    index of the path
+        :return:            None
+        """
+        if self.removed[path_idx]:
+            return
+
+        self.removed[path_idx] = True
+        self.nr_alive -= 1
+        self.dead += 2
+
+        if self.dead > self.size // 2 and self.size > self.min_rebuild:
+            self.build()
+
+
+class ChainBuffer:
+    """
+    Coordinates of a path that grows at both ends. Each piece is kept as it is and all are joined by ``coords()``.
+    """
+
+    def __init__(self, coords):
+        self.pieces = deque([coords])
+        self.first = coords[0]
+        self.last = coords[-1]
+
+    def append(self, coords):
+        if len(coords) > 0:
+            self.pieces.append(coords)
+            self.last = coords[-1]
+
+    def prepend(self, coords):
+        if len(coords) > 0:
+            self.pieces.appendleft(coords)
+            self.first = coords[0]
+
+    def coords(self):
+        if len(self.pieces) == 1:
+            return self.pieces[0]
+        return np.concatenate(self.pieces)
+
+
+def paint_chain(paths, boundary, tooldia, steps_per_circle, max_walk, origin=(0, 0)):
+    """
+    Join the paths when the walk between the end of a path and the nearest endpoint of the next path is shorter
+    than max_walk and when the walk, buffered with the tool radius, is inside the boundary.
+
+    :param paths:               list of LineString / LinearRing
+    :param boundary:            Polygon; the area that can be walked without lifting the tool
+    :param tooldia:             tool diameter
+    :param steps_per_circle:    how many linear segments to use to approximate a circle
+    :param max_walk:            maximum length of a walk without lifting the tool
+    :param origin:              (x, y) the chaining starts with the path nearest to this point
+    :return:                    list of LineString
+    """
+    coords_list = [c for c in paths_coordinates(paths) if len(c) > 0]
+    if not coords_list:
+        return []
+
+    endpoints = np.empty((2 * len(coords_list), 2))
+    endpoints[0::2] = [c[0] for c in coords_list]
+    endpoints[1::2] = [c[-1] for c in coords_list]
+
+    index = EndpointIndex(endpoints)
+    prepared_boundary = prep(boundary)
+    radius = tooldia / 2
+    steps_per_circle = int(steps_per_circle)
+
+    chains = []
+    row = index.nearest(origin)
+    index.remove(row // 2)
+    chain = ChainBuffer(coords_list[row // 2])
+
+    while True:
+        row = index.nearest(chain.last)
+        if row is None:
+            break
+
+        path_idx = row // 2
+        index.remove(path_idx)
+        candidate = coords_list[path_idx]
+
+        # If the last point is the nearest then reverse the path, but prefer the first point if last == first
+        if row % 2 == 1 and not (candidate[0] == candidate[-1]).all():
+            candidate = candidate[::-1]
+
+        # Straight line from the end of the chain to the candidate. Is the toolpath inside the geometry?
+        walk_path = LineString([chain.last, candidate[0]])
+        if walk_path.length < max_walk and \
+                prepared_boundary.contains(walk_path.buffer(radius, steps_per_circle)):
+            chain.append(candidate)
+        else:
+            # Have to lift tool. End path.
+            chains.append(LineString(chain.coords()))
+            chain = ChainBuffer(candidate)
+
+    chains.append(LineString(chain.coords()))
+    return chains
+
+
+def touch_chain(paths, origin=(0, 0)):
+    """
+    Join the LineString paths that share an endpoint. LinearRings are not joined.
+
+    :param paths:   list of LineString / LinearRing
+    :param origin:  (x, y) the chaining starts with the path nearest to this point
+    :return:        list of LineString / LinearRing
+    """
+    paths = [p for p in paths if p is not None and not p.is_empty]
+    if not paths:
+        return []
+
+    coords_list = paths_coordinates(paths)
+    is_ring = [isinstance(p, LinearRing) for p in paths]
+
+    endpoints = np.empty((2 * len(coords_list), 2))
+    endpoints[0::2] = [c[0] for c in coords_list]
+    endpoints[1::2] = [c[-1] for c in coords_list]
+
+    # exact endpoint matches
+    touching = {}
+    for row, pt in enumerate(endpoints.tolist()):
+        if not is_ring[row // 2]:
+            touching.setdefault(tuple(pt), []).append(row)
+
+    index = EndpointIndex(endpoints)
+
+    def pop_touching(pt):
+        for row in touching.get((pt[0], pt[1]), ()):
+            if not index.removed[row // 2]:
+                index.remove(row // 2)
+                return row
+        return None
+
+    result = []
+    current = origin
+    while True:
+        row = index.nearest(current)
+        if row is None:
+            break
+
+        path_idx = row // 2
+        index.remove(path_idx)
+
+        if is_ring[path_idx]:
+            result.append(paths[path_idx])
+            current = endpoints[row]
+            continue
+
+        chain = ChainBuffer(coords_list[path_idx])
+
+        # grow the end of the chain and then its start; the shared point is not repeated
+        while True:
+            row = pop_touching(chain.last)
+            if row is None:
+                break
+            coords = coords_list[row // 2]
+            chain.append(coords[1:] if row % 2 == 0 else coords[-2::-1])
+
+        while True:
+            row = pop_touching(chain.first)
+            if row is None:
+                break
+            coords = coords_list[row // 2]
+            chain.prepend(coords[:-1] if row % 2 == 1 else coords[:0:-1])
+
+        result.append(LineString(chain.coords()))
+        current = chain.last
+
+    return result
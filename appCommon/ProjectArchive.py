@@ -0,0 +1,212 @@
+# ##########################################################
+# FlatCAM: 2D Post-processing for Manufacturing            #
+# Date: 10/18/2026                                         #
+# MIT Licence                                              #
+# ##########################################################
+
+"""
+Binary FlatCAM project container (FlatPrj version 2).
+
+The project is a ZIP archive that holds:
+
+* ``manifest.json``: the project options, the app version and, for each object, its kind, its options and the
+  names of the archive members that hold the object data
+* ``objects/<nr>/object.json``: the object attributes (``to_dict()``) where each Shapely geometry is replaced by a
+  reference into the geometry blob of the object
+* ``objects/<nr>/geometry.wkb``: all the geometry of the object as a WKB blob
+
+The whole project is read and decoded when it is opened, as a JSON project is: the gain is in the storage format
+(smaller files, the geometry decoded from WKB in bulk instead of parsed from WKT), not in deferred loading.
+"""
+
+import zipfile
+import struct
+import logging
+
+import simplejson as json
+
+from shapely.geometry.base import BaseGeometry
+from shapely import wkb
+
+from camlib import to_dict, dict2obj
+
+try:
+    # Shapely 2.0 can decode a whole array of WKB records in one call
+    from shapely import from_wkb
+except ImportError:
+    from_wkb = None
+
+log = logging.getLogger('base')
+
+PROJECT_ARCHIVE_VERSION = 2
+MANIFEST_NAME = 'manifest.json'
+BLOB_MAGIC = b'FCWKB1'
+
+
+def is_project_archive(filename):
+    """
+    Check if a file is a FlatPrj version 2 container.
+
+    :param filename:    path to the project file
+    :return:            True if the file is a ZIP archive with a project manifest
+    """
+    try:
+        if not zipfile.is_zipfile(filename):
+            return False
+        with zipfile.ZipFile(filename, 'r') as archive:
+            return MANIFEST_NAME in archive.namelist()
+    except (IOError, OSError):
+        return False
+
+
+def pack_geometry_blob(records):
+    """
+    Pack a list of WKB records in a single blob.
+
+    Layout: magic, number of records (uint32), offsets of the records (uint64 * (count + 1)), records data.
+
+    :param records:     list of bytes
+    :return:            bytes
+    """
+    offsets = [0]
+    for rec in records:
+        offsets.append(offsets[-1] + len(rec))
+
+    header = BLOB_MAGIC + struct.pack('<I', len(records)) + struct.pack('<%dQ' % len(offsets), *offsets)
+    return header + b''.join(records)
+
+
+def unpack_geometry_blob(blob):
+    """
+    Split a blob made by ``pack_geometry_blob()`` into the WKB records.
+
+    :param blob:    bytes
+    :return:        list of bytes
+    """
+    if blob[:len(BLOB_MAGIC)] != BLOB_MAGIC:
+        raise ValueError("Not a FlatCAM geometry blob.")
+
+    start = len(BLOB_MAGIC)
+    count = struct.unpack_from('<I', blob, start)[0]
+    start += 4
+    offsets = struct.unpack_from('<%dQ' % (count + 1), blob, start)
+    start += 8 * (count + 1)
+
+    data = memoryview(blob)[start:]
+    return [bytes(data[offsets[i]:offsets[i + 1]]) for i in range(count)]
+
+
+class GeometryBlobWriter:
+    """
+    JSON ``default`` hook that moves the Shapely geometry out of the JSON document into a list of WKB records.
+    """
+
+    def __init__(self):
+        self.records = []
+
+    def default(self, obj):
+        if isinstance(obj, BaseGeometry):
+            try:
+                rec = wkb.dumps(obj)
+            except Exception:
+                # some (empty) geometries can't be expressed as WKB by older GEOS; keep them as WKT
+                return to_dict(obj)
+
+            self.records.append(rec)
+            return {
+                "__class__": "ShplRef",
+                "__inst__": len(self.records) - 1
+            }
+        return to_dict(obj)
+
+    def blob(self):
+        return pack_geometry_blob(self.records)
+
+
+class GeometryBlobReader:
+    """
+    JSON ``object_hook`` that replaces the geometry references with the geometry decoded from the WKB blob.
+    """
+
+    def __init__(self, blob):
+        self.records = unpack_geometry_blob(blob) if blob else []
+
+        if from_wkb is not None and self.records:
+            self.geometry = list(from_wkb(self.records))
+        else:
+            self.geometry = [None] * len(self.records)
+
+    def object_hook(self, d):
+        if d.get('__class__') == "ShplRef" and '__inst__' in d:
+            idx = d['__inst__']
+            if self.geometry[idx] is None:
+                self.geometry[idx] = wkb.loads(self.records[idx])
+            return self.geometry[idx]
+        return dict2obj(d)
+
+
+def save_project_archive(filename, project, compression_level=None):
+    """
+    Save a project in the FlatPrj version 2 container.
+
+    :param filename:            path to the project file
+    :param project:             dictionary with the keys: "objs" (list of objects dictionaries as returned by the
+                                objects to_dict() method), "options" and "version"
+    :param compression_level:   the ZIP deflate compression level (0...9). None for the default level.
+    :return:                    None
+    """
+    manifest = {
+        "format": PROJECT_ARCHIVE_VERSION,
+        "version": project['version'],
+        "options": project['options'],
+        "objs": []
+    }
+
+    with zipfile.ZipFile(filename, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=compression_level) \
+            as archive:
+        for nr, obj_dict in enumerate(project['objs']):
+            writer = GeometryBlobWriter()
+            obj_json = json.dumps(obj_dict, default=writer.default)
+
+            data_member = 'objects/%d/object.json' % nr
+            geometry_member = 'objects/%d/geometry.wkb' % nr
+
+            archive.writestr(data_member, obj_json)
+            archive.writestr(geometry_member, writer.blob())
+
+            manifest['objs'].append({
+                "kind": obj_dict['kind'],
+                "options": obj_dict['options'],
+                "data": data_member,
+                "geometry": geometry_member
+            })
+
+        archive.writestr(MANIFEST_NAME, json.dumps(manifest, default=to_dict, indent=2, sort_keys=True))
+
+
+def load_project_archive(filename):
+    """
+    Open a project saved in the FlatPrj version 2 container.
+
+    The archive is opened once and the data (attributes and geometry) of all the objects is read and decoded.
+
+    :param filename:    path to the project file
+    :return:            dictionary with the same layout as the one of a JSON project: "objs", "options", "version"
+    """
+    with zipfile.ZipFile(filename, 'r') as archive:
+        manifest = json.loads(archive.read(MANIFEST_NAME).decode('utf-8'), object_hook=dict2obj)
+
+        if manifest.get('format', 0) > PROJECT_ARCHIVE_VERSION:
+            log.warning("The project was saved in a newer format (%s). Trying to load it anyway." %
+                        str(manifest['format']))
+
+        objs = []
+        for entry in manifest['objs']:
+            reader = GeometryBlobReader(archive.read(entry['geometry']))
+            objs.append(json.loads(archive.read(entry['data']).decode('utf-8'), object_hook=reader.object_hook))
+
+    return {
+        "objs": objs,
+        "options": manifest['options'],
+        "version": manifest['version']
+    }
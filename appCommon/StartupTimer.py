@@ -0,0 +1,54 @@
+# ##########################################################
+# FlatCAM: 2D Post-processing for Manufacturing            #
+# Date: 10/18/2026                                         #
+# MIT Licence                                              #
+# ##########################################################
+
+"""
+Timing of the phases of the start-up of the App, reported in the log when the App is started, so the slow phases and
+the regressions can be found.
+"""
+
+import time
+
+
+class StartupTimer:
+    """
+    Each call of phase() ends a phase, started where the previous one ended.
+    """
+
+    def __init__(self, start=None):
+        """
+        :param start:   time.perf_counter() value of the start; default is now
+        """
+        self.start = time.perf_counter() if start is None else start
+        self.last = self.start
+        self.phases = []
+
+    def phase(self, name):
+        """
+        Ends a phase.
+
+        :param name:    name of the phase
+        :return:        the duration of the phase, in seconds
+        """
+        now = time.perf_counter()
+        duration = now - self.last
+        self.phases.append((name, duration))
+        self.last = now
+        return duration
+
+    @property
+    def total(self):
+        return self.last - self.start
+
+    def report(self):
+        """
+        :return:    text of the report: one line for each phase, then the total
+        """
+        width = max([len(name) for name, __ in self.phases] + [len("Total")])
+        lines = ["Start-up timing:"]
+        for name, duration in self.phases:
+            lines.append("    %s %8.1f ms" % (name.ljust(width), duration * 1000.0))
+        lines.append("    %s %8.1f ms" % ("Total".ljust(width), self.total * 1000.0))
+        return '\n'.join(lines)
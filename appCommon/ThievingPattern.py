@@ -0,0 +1,137 @@
+# ##########################################################
+# FlatCAM: 2D Post-processing for Manufacturing            #
+# Date: 10/18/2026                                         #
+# MIT Licence                                              #
+# ##########################################################
+
+"""
+Dots and squares grids of the Copper Thieving Tool.
+
+Instead of making a shape at every node of the grid and testing each shape against each area to fill:
+
+* the centers of the grid are computed with NumPy (grid_centers())
+* the centers inside an area are found in bulk: a spatial index of the centers queried with the (prepared) areas,
+  a STRtree with Shapely 2.0, RTree before
+* a shape is made, by moving a template made once, only at the centers inside an area and kept if it's within the
+  area (fill_pattern())
+"""
+
+import logging
+
+import numpy as np
+
+from shapely.geometry import Point
+from shapely.prepared import prep
+from rtree import index as rtindex
+
+from appParsers.FlashInstances import translate_copies
+
+try:
+    from shapely import STRtree, points as points_array, contains, prepare
+except ImportError:
+    STRtree = None
+
+log = logging.getLogger('base')
+
+
+def grid_steps(start, stop, step):
+    """
+    :return:    array of the values start, start + step, start + 2 * step ... not larger than stop (added one by one,
+                as a loop would, so the last value is the same)
+    """
+    if step <= 0 or start > stop:
+        return np.zeros(0)
+
+    nr = int(np.floor((stop - start) / step)) + 2
+    values = np.cumsum(np.concatenate(([start], np.full(nr - 1, step))))
+    return values[values <= stop]
+
+
+def grid_centers(bounds, size, spacing):
+    """
+    Centers of a grid of shapes that fills a rectangle; the grid is centered in the rectangle.
+
+    :param bounds:      (xmin, ymin, xmax, ymax) of the rectangle
+    :param size:        size of a shape (diameter of a dot, side of a square)
+    :param spacing:     distance between two shapes
+    :return:            array of (x, y) centers, column by column
+    """
+    x0, y0, x1, y1 = bounds
+    half = size / 2.0
+
+    xs = grid_steps(x0 + half, x1 - half, size + spacing)
+    ys = grid_steps(y0 + half, y1 - half, size + spacing)
+    if len(xs) == 0 or len(ys) == 0:
+        return np.zeros((0, 2))
+
+    # move the grid in the middle of the rectangle
+    xs = xs + ((x0 + x1) / 2.0 - (xs[0] + xs[-1]) / 2.0)
+    ys = ys + ((y0 + y1) / 2.0 - (ys[0] + ys[-1]) / 2.0)
+
+    return np.column_stack((np.repeat(xs, len(ys)), np.tile(ys, len(xs))))
+
+
+def flatten_areas(areas):
+    """
+    :param areas:   Polygon, MultiPolygon or a list of them
+    :return:        list of the non empty Polygons
+    """
+    if areas is None:
+        return []
+    if hasattr(areas, 'geoms'):
+        areas = areas.geoms
+    elif not isinstance(areas, (list, tuple)):
+        areas = [areas]
+
+    polygons = []
+    for geo in areas:
+        if hasattr(geo, 'geoms'):
+            polygons += flatten_areas(geo)
+        elif geo is not None and not geo.is_empty:
+            polygons.append(geo)
+    return polygons
+
+
+def fill_pattern(areas, template, centers):
+    """
+    Fills areas with copies of a shape.
+
+    :param areas:       Polygon, MultiPolygon or a list of them
+    :param template:    the shape centered in (0, 0)
+    :param centers:     array of (x, y) centers of the grid
+    :return:            list of the copies of the shape, at the centers, that are within an area; in the order of
+                        the centers
+    """
+    areas = flatten_areas(areas)
+    centers = np.asarray(centers, dtype=np.float64).reshape(-1, 2)
+    if not areas or len(centers) == 0:
+        return []
+
+    if STRtree is not None:
+        areas = np.asarray(areas, dtype=object)
+        prepare(areas)
+        # pairs (area, center) with the center inside the area
+        area_idx, center_idx = STRtree(points_array(centers)).query(areas, predicate='contains')
+        order = np.argsort(center_idx, kind='stable')
+        area_idx, center_idx = area_idx[order], center_idx[order]
+
+        shapes = np.asarray(translate_copies(template, centers[center_idx]), dtype=object)
+        # the prepared area is the first argument
+        keep = contains(areas[area_idx], shapes) if len(shapes) else np.zeros(0, dtype=bool)
+
+        # a shape is kept once, even if the areas touch
+        found = {}
+        for k, geo in zip(center_idx[keep].tolist(), shapes[keep]):
+            found.setdefault(k, geo)
+        return [found[k] for k in sorted(found)]
+
+    rt_idx = rtindex.Index(((k, (x, y, x, y), None) for k, (x, y) in enumerate(centers.tolist())))
+    found = {}
+    for area in areas:
+        prepared = prep(area)
+        candidates = sorted(k for k in rt_idx.intersection(area.bounds) if k not in found)
+        inside = [k for k in candidates if prepared.contains(Point(centers[k]))]
+        for k, geo in zip(inside, translate_copies(template, centers[inside])):
+            if prepared.contains(geo):
+                found[k] = geo
+    return [found[k] for k in sorted(found)]
@@ -0,0 +1,250 @@
+# ##########################################################
+# FlatCAM: 2D Post-processing for Manufacturing            #
+# Date: 10/18/2026                                         #
+# MIT Licence                                              #
+# ##########################################################
+
+"""
+Routing of the travel moves (rapids) of the CNC jobs around the Exclusion Areas.
+
+Instead of buffering all the areas again and walking their outlines for each travel move:
+
+* the areas are buffered once for a tool diameter and kept in a spatial index (TravelRouter); the router is made
+  again only when the areas, the tool diameter or the units change (ExclusionAreas.travel_router())
+* a travel move that doesn't cross an area (most of them) is found with a single query of the index
+* the 'around' areas are avoided on the shortest path over a visibility graph of the vertices of their outlines; the
+  shortest paths between all the vertices are computed once (Floyd-Warshall, NumPy), so a travel only has to find
+  the vertices seen from its start and from its end
+* the 'over' areas are crossed at their Z: the tool is raised where the path enters the area and lowered where it
+  exits
+"""
+
+import logging
+
+import numpy as np
+
+from shapely.geometry import Polygon, Point, LineString
+from rtree import index as rtindex
+
+try:
+    from shapely import STRtree, prepare, linestrings
+except ImportError:
+    STRtree = None
+
+log = logging.getLogger('base')
+
+# DE-9IM pattern: the interiors of the geometries intersect
+INTERIORS_INTERSECT = 'T********'
+
+
+class TravelRouter:
+    """
+    The Exclusion Areas buffered for a tool and the shortest paths between the vertices of the 'around' areas.
+    """
+
+    def __init__(self, areas, distance):
+        """
+        :param areas:       list of the Exclusion Areas dictionaries: {'shape': Polygon, 'strategy': 'over' or
+                            'around', 'overz': float, ...}
+        :param distance:    the areas are buffered by this distance (the tool radius and a margin)
+        """
+        self.around = []
+        self.over = []
+        self.over_z = []
+        for area in areas:
+            shape = area['shape'].buffer(distance, join_style=2)
+            for poly in (shape.geoms if hasattr(shape, 'geoms') else [shape]):
+                if poly.is_empty:
+                    continue
+                # the travel goes around the outline, the holes are not used
+                poly = Polygon(poly.exterior)
+                if area['strategy'] == 'around':
+                    self.around.append(poly)
+                else:
+                    self.over.append(poly)
+                    self.over_z.append(float(area['overz']))
+
+        # the bounds of all the areas, to find quickly the travels that don't get near an area
+        self.bounds = np.array([poly.bounds for poly in self.around + self.over], dtype=np.float64).reshape(-1, 4)
+
+        if STRtree is not None:
+            self.around_arr = np.asarray(self.around, dtype=object).reshape(-1)
+            self.over_arr = np.asarray(self.over, dtype=object).reshape(-1)
+            prepare(self.around_arr)
+            prepare(self.over_arr)
+            self.around_tree = STRtree(self.around_arr)
+            self.over_tree = STRtree(self.over_arr)
+        else:
+            self.around_tree = rtindex.Index(((k, poly.bounds, None) for k, poly in enumerate(self.around)))
+            self.over_tree = rtindex.Index(((k, poly.bounds, None) for k, poly in enumerate(self.over)))
+
+        self.make_graph()
+
+    # ## Visibility
+    def blocked(self, starts, ends):
+        """
+        :param starts:  (N, 2) array with the start of the segments
+        :param ends:    (N, 2) array with the end of the segments
+        :return:        boolean array, True for the segments that pass through an 'around' area
+        """
+        starts = np.asarray(starts, dtype=np.float64).reshape(-1, 2)
+        ends = np.asarray(ends, dtype=np.float64).reshape(-1, 2)
+        result = np.zeros(len(starts), dtype=bool)
+        if not self.around or len(starts) == 0:
+            return result
+
+        if STRtree is not None:
+            # the interiors of a line and a polygon intersect if the line crosses the polygon or is within it; the
+            # queries use the prepared areas
+            segments = linestrings(np.stack((starts, ends), axis=1))
+            for predicate in ('crosses', 'within'):
+                seg_idx = self.around_tree.query(segments, predicate=predicate)[0]
+                result[seg_idx] = True
+            return result
+
+        for k, (start, end) in enumerate(zip(starts.tolist(), ends.tolist())):
+            segment = LineString([start, end])
+            for idx in self.around_tree.intersection(segment.bounds):
+                if segment.relate_pattern(self.around[idx], INTERIORS_INTERSECT):
+                    result[k] = True
+                    break
+        return result
+
+    def inside(self, point):
+        """
+        :param point:   (x, y)
+        :return:        True if the point is inside (not on the outline of) an 'around' area
+        """
+        pt = Point(point)
+        if STRtree is not None:
+            return len(self.around_tree.query(pt, predicate='within')) > 0
+        return any(pt.within(self.around[idx]) for idx in self.around_tree.intersection(pt.bounds))
+
+    def make_graph(self):
+        """
+        Makes the visibility graph of the vertices of the 'around' areas and the shortest paths between them.
+
+        :return:    None
+        """
+        vertices = [np.asarray(poly.exterior.coords, dtype=np.float64)[:-1, :2] for poly in self.around]
+        vertices = np.concatenate(vertices) if vertices else np.zeros((0, 2))
+        # the vertices inside another area can't be used
+        if len(vertices):
+            vertices = vertices[[not self.inside(vt) for vt in vertices.tolist()]]
+        self.vertices = vertices
+
+        nr = len(vertices)
+        dist = np.full((nr, nr), np.inf)
+        if nr > 1:
+            first, second = np.triu_indices(nr, k=1)
+            visible = ~self.blocked(vertices[first], vertices[second])
+            lengths = np.hypot(*(vertices[second] - vertices[first]).T)
+            dist[first[visible], second[visible]] = lengths[visible]
+            dist[second[visible], first[visible]] = lengths[visible]
+        np.fill_diagonal(dist, 0.0)
+
+        # next_hop[i, j] is the vertex after i on the shortest path from i to j
+        next_hop = np.where(np.isfinite(dist), np.arange(nr)[None, :], -1)
+        for k in range(nr):
+            via = dist[:, k, None] + dist[None, k, :]
+            shorter = via < dist
+            dist = np.where(shorter, via, dist)
+            next_hop = np.where(shorter, next_hop[:, k, None], next_hop)
+
+        self.dist = dist
+        self.next_hop = next_hop
+
+    def shortest_path(self, start_point, end_point):
+        """
+        :param start_point: (x, y) start of the travel
+        :param end_point:   (x, y) end of the travel
+        :return:            list of the (x, y) vertices where the travel changes direction, between the start and the
+                            end; empty for a straight travel
+        """
+        if not self.blocked([start_point], [end_point])[0]:
+            return []
+
+        # the tool is already in an area (or goes in one): it's not avoided
+        if self.inside(start_point) or self.inside(end_point) or len(self.vertices) == 0:
+            return []
+
+        nr = len(self.vertices)
+        start = np.asarray(start_point, dtype=np.float64)
+        end = np.asarray(end_point, dtype=np.float64)
+        from_start = np.hypot(*(self.vertices - start).T)
+        to_end = np.hypot(*(self.vertices - end).T)
+        hidden = self.blocked(np.concatenate((np.tile(start, (nr, 1)), np.tile(end, (nr, 1)))),
+                              np.concatenate((self.vertices, self.vertices)))
+        from_start[hidden[:nr]] = np.inf
+        to_end[hidden[nr:]] = np.inf
+
+        cost = from_start[:, None] + self.dist + to_end[None, :]
+        first, last = np.unravel_index(np.argmin(cost), cost.shape)
+        if not np.isfinite(cost[first, last]):
+            log.debug("TravelRouter.shortest_path() --> no path around the exclusion areas from %s to %s" %
+                      (str(start_point), str(end_point)))
+            return []
+
+        path = [first]
+        while path[-1] != last:
+            path.append(self.next_hop[path[-1], last])
+        return [tuple(self.vertices[k].tolist()) for k in path]
+
+    # ## 'over' areas
+    def over_crossings(self, start_point, end_point):
+        """
+        :param start_point: (x, y) start of a straight travel
+        :param end_point:   (x, y) end of a straight travel
+        :return:            list of (Z, entry point, exit point) for the 'over' areas crossed, from the start
+        """
+        if not self.over:
+            return []
+
+        line = LineString([start_point, end_point])
+        if STRtree is not None:
+            candidates = self.over_tree.query(line, predicate='intersects').tolist()
+        else:
+            candidates = list(self.over_tree.intersection(line.bounds))
+
+        origin = np.asarray(start_point, dtype=np.float64)
+        crossings = []
+        for idx in candidates:
+            found = line.intersection(self.over[idx].exterior)
+            coords = [xy[:2] for geo in (found.geoms if hasattr(found, 'geoms') else [found])
+                      for xy in getattr(geo, 'coords', [])]
+            if len(coords) < 2:
+                # just a touch
+                continue
+
+            dist = np.hypot(*(np.asarray(coords, dtype=np.float64) - origin).T)
+            entry_pt = tuple(coords[int(np.argmin(dist))])
+            exit_pt = tuple(coords[int(np.argmax(dist))])
+            crossings.append((float(dist.min()), self.over_z[idx], entry_pt, exit_pt))
+
+        crossings.sort(key=lambda c: c[0])
+        return [c[1:] for c in crossings]
+
+    def route(self, start_point, end_point):
+        """
+        :param start_point: (x, y) start of the travel
+        :param end_point:   (x, y) end of the travel
+        :return:            list of [Z, (x, y)]: Z is the Z to which the tool is raised at (x, y) or None to keep
+                            (or go back to) the travel Z; the last element is the end point
+        """
+        x0, x1 = sorted((start_point[0], end_point[0]))
+        y0, y1 = sorted((start_point[1], end_point[1]))
+        b = self.bounds
+        if not np.any((b[:, 0] <= x1) & (b[:, 2] >= x0) & (b[:, 1] <= y1) & (b[:, 3] >= y0)):
+            return [[None, end_point]]
+
+        points = [tuple(start_point)] + self.shortest_path(start_point, end_point)
+        ret_list = []
+        for k, point in enumerate(points):
+            if k > 0:
+                ret_list.append([None, point])
+            next_pt = points[k + 1] if k + 1 < len(points) else tuple(end_point)
+            for overz, entry_pt, exit_pt in self.over_crossings(point, next_pt):
+                ret_list += [[overz, entry_pt], [None, exit_pt]]
+
+        ret_list.append([None, end_point])
+        return ret_list
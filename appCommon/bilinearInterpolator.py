@@ -2,6 +2,8 @@
 import math
 import numpy as np
 
+from appCommon.HeightMap import HeightMap
+
 
 class bilinearInterpolator:
     """
@@ -21,31 +23,24 @@ class bilinearInterpolator:
         self.pointsFile = pointsFile
         self.points = np.loadtxt(self.pointsFile, delimiter=',')
 
-        self.xMin, self.xMax, self.xSpacing, self.xCount = self._axisParams(0)
-        self.yMin, self.yMax, self.ySpacing, self.yCount = self._axisParams(1)
-
-        # generate ideal grid to match actually probed points -- this is due to floating-point error issues
-        idealGrid = ([
-            [(x, y) for x in np.linspace(self.xMin, self.xMax, self.xCount, True)]
-            for y in np.linspace(self.yMin, self.yMax, self.yCount, True)
-            ])
-
-        self._probedGrid = [[0] * self.yCount for i in range(0, self.xCount)]
-
-        # align ideal grid indices with probed data points
-        for rowIndex, row in enumerate(idealGrid):
-            for colIndex, idealPoint in enumerate(row):
-                minSqDist = math.inf
-                for probed in self.points:
-                    # find closest point in ideal grid that corresponds to actual tested point
-                    # put z value in correct index
-                    sqDist = pow(probed[0] - idealPoint[0], 2) + pow(probed[1] - idealPoint[1], 2)
-                    if sqDist <= minSqDist:
-                        minSqDist = sqDist
-                        indexX = rowIndex
-                        indexY = colIndex
-                        closestProbed = probed
-                self.probedGrid[indexY][indexX] = closestProbed
+        # the ideal grid and the probed point matched with each of its nodes are found by the vectorized height map
+        self.heightMap = HeightMap(self.points)
+
+        hmap = self.heightMap
+        self.xMin, self.xMax, self.xSpacing, self.xCount = hmap.x_min, hmap.x_max, hmap.x_spacing, hmap.x_count
+        self.yMin, self.yMax, self.ySpacing, self.yCount = hmap.y_min, hmap.y_max, hmap.y_spacing, hmap.y_count
+
+        # probedGrid[x index][y index] is the probed (x, y, z) point of the node of the grid
+        self._probedGrid = self.heightMap.probed_grid.tolist()
+
+    def interpolate(self, points):
+        """
+        Bilinear interpolation of the z-values of many points at once.
+
+        :param points:  (N, 2) array of (x, y) coordinates
+        :return:        array with the N z-values
+        """
+        return self.heightMap.interpolate(points)
 
     def Interpolate(self, point):
         """
@@ -106,21 +101,3 @@ class bilinearInterpolator:
         p = specialDiv(point[1]-y1, y2-y1)*r2 + specialDiv(y2-point[1], y2-y1)*r1
             
         return p
-
-    # Returns the min, max, spacing and size of one axis of the 2D grid
-    def _axisParams(self, sortAxis):
-        # sort the set and eliminate the previous, unsorted set
-        srtSet = sorted(self.points, key=lambda x: x[sortAxis])
-
-        dists = []
-        for item0, item1 in zip(srtSet[:(len(srtSet)-2)], srtSet[1:]):
-            dists.append(float(item1[sortAxis]) - float(item0[sortAxis]))
-        axisSpacing = max(dists)
-
-        # add an extra one for axisCount to account for the starting point
-        axisMin = float(min(srtSet, key=lambda x: x[sortAxis])[sortAxis])
-        axisMax = float(max(srtSet, key=lambda x: x[sortAxis])[sortAxis])
-        axisRange = axisMax - axisMin
-        axisCount = round((axisRange/axisSpacing) + 1)
-
-        return axisMin, axisMax, axisSpacing, axisCount
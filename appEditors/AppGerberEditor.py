@@ -17,7 +17,7 @@ from vispy.geometry import Rect
 from copy import copy, deepcopy
 import logging
 
-from camlib import distance, arc, three_point_circle
+from camlib import distance, arc, three_point_circle, grace
 from appGUI.GUIElements import FCEntry, FCComboBox, FCTable, FCDoubleSpinner, FCSpinner, RadioSet, EvalEntry2, \
     FCInputDoubleSpinner, FCButton, OptionalInputSection, FCCheckBox, NumericalEvalTupleEntry, FCComboBox2, FCLabel
 from appTool import AppTool
@@ -2629,7 +2629,6 @@ class SelectEditorGrb(QtCore.QObject, DrawTool):
 
     def selection_worker(self, point):
         def job_thread(editor_obj):
-            self.results = []
             with editor_obj.app.proc_container.new('%s' % _("Working ...")):
 
                 def divide_chunks(lst, n):
@@ -2640,18 +2639,17 @@ class SelectEditorGrb(QtCore.QObject, DrawTool):
                 # divide in chunks of 77 elements
                 n_chunks = 77
 
-                for ap_key, storage_val in editor_obj.storage_dict.items():
-                    # divide in chunks of 77 elements
-                    geo_list = list(divide_chunks(storage_val['geometry'], n_chunks))
-                    for chunk, list30 in enumerate(geo_list):
-                        self.results.append(
-                            editor_obj.pool.apply_async(
-                                self.check_intersection, args=(ap_key, chunk, list30, point))
-                        )
-
-                output = []
-                for p in self.results:
-                    output.append(p.get())
+                try:
+                    with editor_obj.app.scheduler.group() as group:
+                        for ap_key, storage_val in editor_obj.storage_dict.items():
+                            # divide in chunks of 77 elements
+                            geo_list = list(divide_chunks(storage_val['geometry'], n_chunks))
+                            for chunk, list30 in enumerate(geo_list):
+                                group.submit(self.check_intersection, ap_key, chunk, list30, point)
+
+                        output = group.results()
+                except grace:
+                    return
 
                 for ret_val in output:
                     if ret_val:
@@ -4009,20 +4007,20 @@ class AppGerberEditor(QtCore.QObject):
 
                     log.warning("Polygon difference done for %d apertures." % len(app_obj.gerber_obj.apertures))
 
-                    try:
-                        # Loading the Geometry into Editor Storage
-                        for ap_code, ap_dict in app_obj.gerber_obj.apertures.items():
-                            app_obj.results.append(
-                                app_obj.pool.apply_async(app_obj.add_apertures, args=(ap_code, ap_dict))
-                            )
-                    except Exception as ee:
-                        log.debug(
-                            "AppGerberEditor.edit_fcgerber.worker_job() Adding processes to pool --> %s" % str(ee))
-                        traceback.print_exc()
-
-                    output = []
-                    for p in app_obj.results:
-                        output.append(p.get())
+                    with app_obj.app.scheduler.group() as group:
+                        try:
+                            # Loading the Geometry into Editor Storage
+                            for ap_code, ap_dict in app_obj.gerber_obj.apertures.items():
+                                group.submit(app_obj.add_apertures, ap_code, ap_dict)
+                        except Exception as ee:
+                            log.debug(
+                                "AppGerberEditor.edit_fcgerber.worker_job() Adding processes to pool --> %s" % str(ee))
+                            traceback.print_exc()
+
+                        try:
+                            output = group.results()
+                        except grace:
+                            return
 
                     for elem in output:
                         app_obj.storage_dict[elem[0]] = deepcopy(elem[1])
@@ -8,9 +8,6 @@
 from appGUI.GUIElements import FCFileSaveDialog, FCEntry, FCTextAreaExtended, FCTextAreaLineNumber, FCButton
 from PyQt5 import QtPrintSupport, QtWidgets, QtCore, QtGui
 
-from reportlab.platypus import SimpleDocTemplate, Paragraph
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib.units import inch, mm
 
 # from io import StringIO
 
@@ -262,6 +259,11 @@ class AppTextEditor(QtWidgets.QWidget):
             try:
                 my_gcode = self.code_editor.toPlainText()
                 if filename.rpartition('.')[2].lower() == 'pdf':
+                    # reportlab is slow to import: it is imported only when a PDF is saved
+                    from reportlab.platypus import SimpleDocTemplate, Paragraph
+                    from reportlab.lib.styles import getSampleStyleSheet
+                    from reportlab.lib.units import inch, mm
+
                     page_size = (
                         self.app.plotcanvas.pagesize_dict[self.app.defaults['global_workspaceT']][0] * mm,
                         self.app.plotcanvas.pagesize_dict[self.app.defaults['global_workspaceT']][1] * mm
@@ -7,9 +7,11 @@
 
 from PyQt5 import QtCore
 
+import os
 import logging
 from appGUI.VisPyCanvas import VisPyCanvas, Color
 from appGUI.VisPyVisuals import ShapeGroup, ShapeCollection, TextCollection, TextGroup, Cursor
+from appGUI.VisPyTessellationCache import tessellation_cache
 from vispy.scene.visuals import InfiniteLine, Line, Rectangle, Text
 
 import gettext
@@ -381,7 +383,12 @@ class PlotCanvas(QtCore.QObject, VisPyCanvas):
         # sc = ShapeCollection(parent=self.view.scene, pool=self.app.pool, **kwargs)
         # self.shape_collections.append(sc)
         # return sc
-        return ShapeCollection(parent=self.view.scene, pool=self.fcapp.pool, **kwargs)
+        cache_size = self.fcapp.defaults["global_tess_cache_size"]
+        disk_dir = os.path.join(self.fcapp.data_path, 'tessellation_cache') \
+            if self.fcapp.defaults["global_tess_cache_disk"] else None
+        tessellation_cache.configure(max_bytes=int(cache_size * 1024 * 1024), disk_dir=disk_dir)
+
+        return ShapeCollection(parent=self.view.scene, pool=self.fcapp.pool, cache=tessellation_cache, **kwargs)
 
     def new_cursor(self, big=None):
         """
@@ -0,0 +1,305 @@
+# ##########################################################
+# FlatCAM: 2D Post-processing for Manufacturing            #
+# Date: 10/18/2026                                         #
+# MIT Licence                                              #
+# ##########################################################
+
+"""
+Tessellation cache for the shape collections.
+
+The buffers made by _update_shape_buffers() for a shape (the triangles of the polygon faces and the line segments)
+depend only on the geometry, on the simplification tolerance, on which of them are drawn (face, edge) and on the
+triangulation engine of the collection. They are kept here, keyed by a hash of the geometry WKB and by those
+parameters, so a replot, a color change or the same geometry opened again doesn't triangulate the shape again.
+The colors are not part of the cached buffers.
+
+Two tiers:
+
+* memory: a LRU dictionary limited by the size of the buffers
+* disk (optional): the buffers of the shapes with many vertices (expensive to triangulate) are also saved as .npy
+  files in a folder and found there after the app is restarted. Small shapes are not saved; it is faster to
+  triangulate them again than to read a file for each of them. The oldest files are deleted when the folder grows
+  over its size limit.
+"""
+
+import os
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+try:
+    # Shapely 2.0
+    from shapely import to_wkb
+except ImportError:
+    to_wkb = None
+
+log = logging.getLogger('base')
+
+
+class TessellationCache:
+
+    # version of the format of the files in the disk cache
+    disk_version = 2
+
+    def __init__(self, max_bytes=256 * 1024 * 1024, disk_dir=None, disk_min_points=256,
+                 disk_max_bytes=1024 * 1024 * 1024):
+        """
+        :param max_bytes:           size limit for the buffers kept in memory
+        :param disk_dir:            folder used for the disk cache; None to disable it
+        :param disk_min_points:     only the buffers with at least this many points are saved on disk
+        :param disk_max_bytes:      size limit for the disk cache; the oldest files are deleted over it
+        """
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.nbytes = 0
+
+        self.max_bytes = max_bytes
+        self.disk_dir = None
+        self.disk_min_points = disk_min_points
+        self.disk_max_bytes = disk_max_bytes
+        # size of the disk cache as known after the last prune plus the files saved since then
+        self.disk_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+
+        self.set_disk_dir(disk_dir)
+
+    def configure(self, max_bytes=None, disk_dir=None):
+        """
+        :param max_bytes:   size limit for the buffers kept in memory; 0 disables the cache
+        :param disk_dir:    folder used for the disk cache; None to disable it
+        :return:            None
+        """
+        if max_bytes is not None and max_bytes != self.max_bytes:
+            with self.lock:
+                self.max_bytes = max_bytes
+                self.evict()
+        if disk_dir != self.disk_dir:
+            self.set_disk_dir(disk_dir)
+
+    def set_disk_dir(self, disk_dir):
+        if disk_dir is not None:
+            try:
+                os.makedirs(disk_dir, exist_ok=True)
+            except OSError as e:
+                log.debug("TessellationCache.set_disk_dir() --> %s" % str(e))
+                disk_dir = None
+        self.disk_dir = disk_dir
+        if disk_dir is not None:
+            self.prune_disk()
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    @staticmethod
+    def key(geometry, tolerance, face, edge, triangulation='vispy'):
+        """
+        :param geometry:        Shapely geometry
+        :param tolerance:       simplification tolerance
+        :param face:            True if the polygon faces are drawn (triangulated)
+        :param edge:            True if the polygon edges are drawn
+        :param triangulation:   the triangulation engine of the shape collection ('glu' or 'vispy')
+        :return:                the key of the buffers or None if the geometry can't be hashed
+        """
+        if geometry is None:
+            return None
+        try:
+            digest = hashlib.blake2b(geometry.wkb, digest_size=16)
+        except Exception:
+            return None
+        digest.update(('%s|%r|%d|%d|%s' % (type(geometry).__name__, tolerance, bool(face), bool(edge),
+                                           triangulation)).encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def batch_key(geometries, tolerance, face, edge, triangulation='vispy'):
+        """
+        :param geometries:      list of Shapely geometries added together to a shape collection
+        :param tolerance:       simplification tolerance
+        :param face:            True if the polygon faces are drawn (triangulated)
+        :param edge:            True if the polygon edges are drawn
+        :param triangulation:   the triangulation engine of the shape collection ('glu' or 'vispy')
+        :return:                the key of the buffers of the whole list or None if the geometries can't be hashed
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        try:
+            if to_wkb is not None:
+                wkbs = to_wkb(np.array(geometries, dtype=object))
+            else:
+                wkbs = [geo.wkb for geo in geometries]
+            for wkb in wkbs:
+                digest.update(wkb)
+        except Exception:
+            return None
+        digest.update(('batch|%d|%r|%d|%d|%s' % (len(geometries), tolerance, bool(face), bool(edge),
+                                                 triangulation)).encode())
+        return digest.hexdigest()
+
+    def get(self, key):
+        """
+        :param key:     the key made by key()
+        :return:        tuple of numpy arrays (line_pts, mesh_vertices, mesh_tris, ...) or None
+        """
+        if key is None or not self.enabled:
+            return None
+
+        with self.lock:
+            buffers = self.entries.get(key)
+            if buffers is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return buffers
+
+        buffers = self.load(key)
+        if buffers is not None:
+            self.hits += 1
+            self.put(key, buffers, save=False)
+        else:
+            self.misses += 1
+        return buffers
+
+    def put(self, key, buffers, save=True):
+        """
+        :param key:     the key made by key()
+        :param buffers: tuple (line_pts, mesh_vertices, mesh_tris, ...); lists or numpy arrays. The first two are
+                        lists of points, the others lists of integers (e.g. the vertex counts of a batch of shapes)
+        :param save:    if True the buffers of a large shape are also saved on disk
+        :return:        None
+        """
+        if key is None or not self.enabled:
+            return
+
+        try:
+            buffers = tuple(self.as_points(b) for b in buffers[:2]) + \
+                tuple(np.asarray(b, dtype=np.int64).reshape(-1) for b in buffers[2:])
+        except ValueError:
+            # e.g. 3D coordinates; not cached
+            return
+        size = sum(b.nbytes for b in buffers)
+
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.nbytes -= sum(b.nbytes for b in old)
+            self.entries[key] = buffers
+            self.nbytes += size
+            self.evict()
+
+        if save and self.disk_dir is not None and len(buffers[0]) + len(buffers[1]) >= self.disk_min_points:
+            self.save(key, buffers)
+
+    @staticmethod
+    def as_points(values):
+        points = np.asarray(values, dtype=np.float64)
+        if len(points) == 0:
+            return points.reshape(0, 2)
+        if points.ndim != 2 or points.shape[1] != 2:
+            raise ValueError("Not a list of 2D points")
+        return points
+
+    def evict(self):
+        while self.entries and self.nbytes > self.max_bytes:
+            __, old = self.entries.popitem(last=False)
+            self.nbytes -= sum(b.nbytes for b in old)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.nbytes = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    # ## Disk tier
+    def file_path(self, key):
+        return os.path.join(self.disk_dir, '%s.v%d.npy' % (key, self.disk_version))
+
+    def save(self, key, buffers):
+        # a single array: the number of buffers, the length of each buffer and then their values
+        header = np.array([len(buffers)] + [len(b) for b in buffers], dtype=np.float64)
+        flat = np.concatenate([header] + [b.ravel().astype(np.float64) for b in buffers])
+
+        path = self.file_path(key)
+        tmp_path = path + '.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                np.save(f, flat)
+            os.replace(tmp_path, path)
+            size = os.path.getsize(path)
+        except OSError as e:
+            log.debug("TessellationCache.save() --> %s" % str(e))
+            return
+
+        # the files are pruned only when the limit is crossed, down to a lower size so the next few saves don't
+        # list the folder again
+        with self.lock:
+            self.disk_bytes += size
+            crossed = self.disk_bytes > self.disk_max_bytes
+        if crossed:
+            self.prune_disk(max_bytes=self.disk_max_bytes * 3 // 4)
+
+    def load(self, key):
+        if self.disk_dir is None:
+            return None
+
+        path = self.file_path(key)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            flat = np.load(path)
+            nr_buffers = int(flat[0])
+            lengths = [int(v) for v in flat[1:nr_buffers + 1]]
+            start = nr_buffers + 1
+            buffers = []
+            for idx, length in enumerate(lengths):
+                if idx < 2:
+                    buffers.append(flat[start:start + 2 * length].reshape(-1, 2))
+                    start += 2 * length
+                else:
+                    buffers.append(flat[start:start + length].astype(np.int64))
+                    start += length
+        except Exception as e:
+            log.debug("TessellationCache.load() --> %s" % str(e))
+            return None
+
+        return tuple(buffers)
+
+    def prune_disk(self, max_bytes=None):
+        """
+        Delete the oldest files of the disk cache until it is smaller than max_bytes.
+
+        :param max_bytes:   size to prune the disk cache to; disk_max_bytes if None
+        :return:            None
+        """
+        if max_bytes is None:
+            max_bytes = self.disk_max_bytes
+
+        try:
+            files = [os.path.join(self.disk_dir, f) for f in os.listdir(self.disk_dir) if f.endswith('.npy')]
+            stats = [(os.path.getmtime(f), os.path.getsize(f), f) for f in files]
+        except OSError as e:
+            log.debug("TessellationCache.prune_disk() --> %s" % str(e))
+            return
+
+        total = sum(s[1] for s in stats)
+        for __, size, f in sorted(stats):
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(f)
+                total -= size
+            except OSError:
+                pass
+
+        with self.lock:
+            self.disk_bytes = total
+
+
+# the cache shared by the shape collections of the FlatCAM objects
+tessellation_cache = TessellationCache()
@@ -10,7 +10,7 @@ from vispy.visuals import CompoundVisual, LineVisual, MeshVisual, TextVisual, Ma
 from vispy.scene.visuals import VisualNode, generate_docstring, visuals
 from vispy.gloo import set_state
 from vispy.color import Color
-from shapely.geometry import Polygon, LineString, LinearRing
+from shapely.geometry import Polygon, LineString, LinearRing, MultiLineString
 import threading
 import numpy as np
 from appGUI.VisPyTesselators import GLUTess
@@ -36,13 +36,35 @@ def _update_shape_buffers(data, triangulation='glu'):
     :param triangulation: str
         Triangulation engine
     """
+    buffers = _shape_buffers(data['geometry'], data['tolerance'], face=data['face_color'] is not None,
+                             edge=data['color'] is not None, triangulation=triangulation)
+    _set_shape_buffers(data, buffers)
+
+    # Clear shapely geometry
+    del data['geometry']
+
+    return data
+
+
+def _shape_buffers(geo, tolerance, face=True, edge=True, triangulation='glu'):
+    """
+    Translates Shapely geometry to line segments and mesh triangles
+    :param geo: shapely.geometry
+        Shape to translate
+    :param tolerance: float
+        Geometry simplifying tolerance
+    :param face: bool
+        Set True to triangulate the polygon faces
+    :param edge: bool
+        Set True to make the polygon edges
+    :param triangulation: str
+        Triangulation engine
+    :return: tuple
+        (line points, mesh vertices, mesh triangles vertex indices)
+    """
     mesh_vertices = []                                              # Vertices for mesh
     mesh_tris = []                                                  # Faces for mesh
-    mesh_colors = []                                                # Face colors
     line_pts = []                                                   # Vertices for line
-    line_colors = []                                                # Line color
-
-    geo, color, face_color, tolerance = data['geometry'], data['color'], data['face_color'], data['tolerance']
 
     if geo is not None and not geo.is_empty:
         simplified_geo = geo.simplify(tolerance) if tolerance else geo      # Simplified shape
@@ -58,9 +80,13 @@ def _update_shape_buffers(data, triangulation='glu'):
             # Prepare lines
             pts = _linearring_to_segments(list(simplified_geo.coords))
 
+        elif type(geo) == MultiLineString:
+            # Prepare lines; many lines of the same color are added as a single shape (e.g. the parsed G-code)
+            pts = _multilinestring_to_segments(simplified_geo)
+
         elif type(geo) == Polygon:
             # Prepare polygon faces
-            if face_color is not None:
+            if face:
                 if triangulation == 'glu':
                     gt = GLUTess()
                     tri_tris, tri_pts = gt.triangulate(simplified_geo)
@@ -68,7 +94,7 @@ def _update_shape_buffers(data, triangulation='glu'):
                     print("Triangulation type '%s' isn't implemented. Drawing only edges." % triangulation)
 
             # Prepare polygon edges
-            if color is not None:
+            if edge:
                 pts = _linearring_to_segments(list(simplified_geo.exterior.coords))
                 for ints in simplified_geo.interiors:
                     pts += _linearring_to_segments(list(ints.coords))
@@ -77,16 +103,36 @@ def _update_shape_buffers(data, triangulation='glu'):
         if len(tri_pts) > 0 and len(tri_tris) > 0:
             mesh_tris += tri_tris
             mesh_vertices += tri_pts
-            face_color_rgba = Color(face_color).rgba
-            # mesh_colors += [face_color_rgba] * (len(tri_tris) // 3)
-            mesh_colors += [face_color_rgba for __ in range(len(tri_tris) // 3)]
 
         # Appending data for line
         if len(pts) > 0:
             line_pts += pts
-            colo_rgba = Color(color).rgba
-            # line_colors += [colo_rgba] * len(pts)
-            line_colors += [colo_rgba for __ in range(len(pts))]
+
+    return line_pts, mesh_vertices, mesh_tris
+
+
+def _set_shape_buffers(data, buffers):
+    """
+    Stores the shape buffers and their colors in the shape data
+    :param data: dict
+        Shape data
+    :param buffers: tuple
+        (line points, mesh vertices, mesh triangles vertex indices) as made by _shape_buffers()
+    """
+    line_pts, mesh_vertices, mesh_tris = buffers
+
+    mesh_colors = []                                                # Face colors
+    line_colors = []                                                # Line color
+
+    if len(mesh_tris) > 0:
+        face_color_rgba = Color(data['face_color']).rgba
+        # mesh_colors += [face_color_rgba] * (len(tri_tris) // 3)
+        mesh_colors = [face_color_rgba for __ in range(len(mesh_tris) // 3)]
+
+    if len(line_pts) > 0:
+        colo_rgba = Color(data['color']).rgba
+        # line_colors += [colo_rgba] * len(pts)
+        line_colors = [colo_rgba for __ in range(len(line_pts))]
 
     # Store buffers
     data['line_pts'] = line_pts
@@ -95,10 +141,130 @@ def _update_shape_buffers(data, triangulation='glu'):
     data['mesh_tris'] = mesh_tris
     data['mesh_colors'] = mesh_colors
 
-    # Clear shapely geometry
-    del data['geometry']
 
-    return data
+def _shape_buffers_batch(args):
+    """
+    Translates a list of Shapely geometries to contiguous buffers; runs in the process pool
+    :param args: tuple
+        (list of geometries, tolerance, face, edge)
+    :return: tuple
+        (line points, mesh vertices, mesh triangles vertex indices, line points count of each shape,
+        mesh triangles vertex indices count of each shape) as numpy arrays
+    """
+    geometries, tolerance, face, edge = args
+
+    line_pts = []
+    mesh_vertices = []
+    mesh_tris = []
+    counts = np.zeros((len(geometries), 3), dtype=np.int64)     # line points, mesh vertices, mesh indices
+
+    for idx, geo in enumerate(geometries):
+        pts, tri_pts, tri_tris = _shape_buffers(geo, tolerance, face=face, edge=edge)
+        if geo is not None and geo.has_z:
+            pts = [pt[:2] for pt in pts]
+        line_pts += pts
+        mesh_vertices += tri_pts
+        mesh_tris += tri_tris
+        counts[idx] = len(pts), len(tri_pts), len(tri_tris)
+
+    # the triangles of each shape index its own vertices
+    vertex_offsets = np.cumsum(counts[:, 1]) - counts[:, 1]
+    tris = np.asarray(mesh_tris, dtype=np.int64) + np.repeat(vertex_offsets, counts[:, 2])
+
+    return (
+        np.asarray(line_pts, dtype=np.float64).reshape(-1, 2),
+        np.asarray(mesh_vertices, dtype=np.float64).reshape(-1, 2),
+        tris,
+        counts[:, 0].copy(),
+        counts[:, 2].copy()
+    )
+
+
+def _join_shape_buffers(parts):
+    """
+    Joins the buffers made by _shape_buffers_batch() for consecutive lists of geometries
+    :param parts: list
+        Buffers as made by _shape_buffers_batch()
+    :return: tuple
+        Buffers of all the geometries, as made by _shape_buffers_batch()
+    """
+    if len(parts) == 1:
+        return parts[0]
+
+    nr_vertices = np.array([len(p[1]) for p in parts], dtype=np.int64)
+    nr_tris = np.array([len(p[2]) for p in parts], dtype=np.int64)
+    vertex_offsets = np.cumsum(nr_vertices) - nr_vertices
+
+    return (
+        np.concatenate([p[0] for p in parts]).reshape(-1, 2),
+        np.concatenate([p[1] for p in parts]).reshape(-1, 2),
+        np.concatenate([p[2] for p in parts]).astype(np.int64) + np.repeat(vertex_offsets, nr_tris),
+        np.concatenate([p[3] for p in parts]).astype(np.int64),
+        np.concatenate([p[4] for p in parts]).astype(np.int64)
+    )
+
+
+def _set_batch_buffers(data, buffers):
+    """
+    Stores the buffers of a list of shapes and their colors in the shape data
+    :param data: dict
+        Shape data; 'color' and 'face_color' are a color or a list with a color for each shape
+    :param buffers: tuple
+        Buffers as made by _shape_buffers_batch()
+    """
+    line_pts, mesh_vertices, mesh_tris, line_counts, tri_counts = buffers
+
+    def colors(color, counts):
+        if isinstance(color, list):
+            rgba = np.array([Color(c).rgba for c in color], dtype=np.float64).reshape(-1, 4)
+            return np.repeat(rgba, counts, axis=0)
+        return np.tile(np.asarray(Color(color).rgba, dtype=np.float64), (int(np.sum(counts)), 1))
+
+    data['line_pts'] = line_pts
+    data['line_colors'] = colors(data['color'], line_counts) if len(line_pts) > 0 else np.empty((0, 4))
+    data['mesh_vertices'] = mesh_vertices
+    data['mesh_tris'] = mesh_tris
+    data['mesh_colors'] = colors(data['face_color'], tri_counts // 3) if len(mesh_tris) > 0 else np.empty((0, 4))
+
+
+def _instance_buffers(geo, offsets, tolerance, face=True, edge=True):
+    """
+    Translates a Shapely geometry to buffers once and moves them at each offset (instanced shapes)
+    :param geo: shapely.geometry
+        Shape to translate (a Polygon or a MultiPolygon)
+    :param offsets: numpy.array
+        (x, y) offset of each instance
+    :param tolerance: float
+        Geometry simplifying tolerance
+    :param face: bool
+        Set True to triangulate the polygon faces
+    :param edge: bool
+        Set True to make the polygon edges
+    :return: tuple
+        Buffers of all the instances, as made by _shape_buffers_batch()
+    """
+    line_pts = []
+    mesh_vertices = []
+    mesh_tris = []
+    for part in getattr(geo, 'geoms', [geo]):
+        pts, tri_pts, tri_tris = _shape_buffers(part, tolerance, face=face, edge=edge)
+        line_pts += pts
+        mesh_tris += [x + len(mesh_vertices) for x in tri_tris]
+        mesh_vertices += tri_pts
+
+    offsets = np.asarray(offsets, dtype=np.float64).reshape(-1, 2)
+    line_pts = np.asarray(line_pts, dtype=np.float64).reshape(-1, 2)
+    mesh_vertices = np.asarray(mesh_vertices, dtype=np.float64).reshape(-1, 2)
+    mesh_tris = np.asarray(mesh_tris, dtype=np.int64)
+    nr = len(offsets)
+
+    return (
+        (line_pts[None, :, :] + offsets[:, None, :]).reshape(-1, 2),
+        (mesh_vertices[None, :, :] + offsets[:, None, :]).reshape(-1, 2),
+        (mesh_tris[None, :] + (np.arange(nr, dtype=np.int64) * len(mesh_vertices))[:, None]).reshape(-1),
+        np.full(nr, len(line_pts), dtype=np.int64),
+        np.full(nr, len(mesh_tris), dtype=np.int64)
+    )
 
 
 def _linearring_to_segments(arr):
@@ -127,6 +293,23 @@ def _linestring_to_segments(arr):
     return [arr[i // 2] for i in range(0, len(arr) * 2)][1:-1]
 
 
+def _multilinestring_to_segments(geo):
+    """
+    Translates all the lines of a MultiLineString to line segments
+    :param geo: MultiLineString
+    :return: numpy.array
+        Line segments
+    """
+    segments = []
+    for line in geo.geoms:
+        coords = np.asarray(line.coords)[:, :2]
+        if len(coords) > 1:
+            segments.append(np.repeat(coords, 2, axis=0)[1:-1])
+    if not segments:
+        return []
+    return np.concatenate(segments).tolist()
+
+
 class ShapeGroup(object):
     def __init__(self, collection):
         """
@@ -149,6 +332,26 @@ class ShapeGroup(object):
         self._indexes.append(key)
         return key
 
+    def add_batch(self, **kwargs):
+        """
+        Adds a list of shapes to collection and store index in group
+        :param kwargs: keyword arguments
+            Arguments for ShapeCollection.add_batch function
+        """
+        key = self._collection.add_batch(**kwargs)
+        self._indexes.append(key)
+        return key
+
+    def add_instances(self, **kwargs):
+        """
+        Adds copies of a shape to collection and store index in group
+        :param kwargs: keyword arguments
+            Arguments for ShapeCollection.add_instances function
+        """
+        key = self._collection.add_instances(**kwargs)
+        self._indexes.append(key)
+        return key
+
     def remove(self, idx, update=False):
         self._indexes.remove(idx)
         self._collection.remove(idx, False)
@@ -212,7 +415,7 @@ class ShapeGroup(object):
 
 class ShapeCollectionVisual(CompoundVisual):
 
-    def __init__(self, linewidth=1, triangulation='vispy', layers=3, pool=None, **kwargs):
+    def __init__(self, linewidth=1, triangulation='vispy', layers=3, pool=None, cache=None, **kwargs):
         """
         Represents collection of shapes to draw on VisPy scene
         :param linewidth: float
@@ -224,11 +427,16 @@ class ShapeCollectionVisual(CompoundVisual):
         :param layers: int
             Layers count
             Each layer adds 2 visuals on VisPy scene. Be careful: more layers cause less fps
+        :param cache: TessellationCache
+            Cache for the shape buffers; None to translate every shape
         :param kwargs:
         """
         self.data = {}
         self.last_key = -1
 
+        # Shape buffers cache
+        self.cache = cache
+
         # Thread locks
         self.key_lock = threading.Lock()
         self.results_lock = threading.Lock()
@@ -238,6 +446,9 @@ class ShapeCollectionVisual(CompoundVisual):
         self.pool = pool
         self.results = {}
 
+        # Minimum number of shapes sent in a pool task by add_batch()
+        self.batch_chunk_size = 256
+
         self._meshes = [MeshVisual() for _ in range(0, layers)]
         # self._lines = [LineVisual(antialias=True) for _ in range(0, layers)]
         self._lines = [FlatCAMLineVisual(antialias=True) for _ in range(0, layers)]
@@ -298,17 +509,187 @@ class ShapeCollectionVisual(CompoundVisual):
         if linewidth:
             self._line_width = linewidth
 
+        # Use the buffers of the same shape if they are in cache
+        if self.cache is not None and self.cache.enabled:
+            cache_key = self.cache.key(shape, tolerance, face=face_color is not None, edge=color is not None,
+                                       triangulation=self._triangulation)
+            buffers = self.cache.get(cache_key)
+            if buffers is not None:
+                del self.data[key]['geometry']
+                _set_shape_buffers(self.data[key], [b.tolist() for b in buffers])
+                if update:
+                    self.redraw()
+                return key
+            self.data[key]['cache_key'] = cache_key
+
         # Add data to process pool if pool exists
         try:
             self.results[key] = self.pool.map_async(_update_shape_buffers, [self.data[key]])
         except Exception:
             self.data[key] = _update_shape_buffers(self.data[key])
+            self.cache_buffers(self.data[key])
 
         if update:
             self.redraw()   # redraw() waits for pool process end
 
         return key
 
+    def add_batch(self, shapes, color=None, face_color=None, alpha=None, visible=True,
+                  update=False, layer=1, tolerance=0.01, linewidth=None):
+        """
+        Adds a list of shapes to collection as a single entry (e.g. all the geometry of an object).
+        The list is split in a few large chunks translated in the process pool and the buffers are kept as
+        contiguous arrays instead of a task and a set of lists for each shape.
+        :param shapes: list
+            Shapely geometry objects
+        :param color: str, tuple, list
+            Line/edge color or a list with a color for each shape
+        :param face_color: str, tuple, list
+            Polygon face color or a list with a color for each shape
+        :param alpha: str
+            Polygon transparency
+        :param visible: bool
+            Shapes visibility
+        :param update: bool
+            Set True to redraw collection
+        :param layer: int
+            Layer number. 0 - lowest.
+        :param tolerance: float
+            Geometry simplifying tolerance
+        :param linewidth: int
+            Width of the line
+        :return: int
+            Index of the shapes
+        """
+        # Get new key
+        self.key_lock.acquire(True)
+        self.last_key += 1
+        key = self.last_key
+        self.key_lock.release()
+
+        # Skip the empty shapes and their colors
+        keep = [k for k, geo in enumerate(shapes) if geo is not None and not geo.is_empty]
+        geometries = [shapes[k] for k in keep]
+        if isinstance(color, list):
+            color = [color[k] for k in keep]
+        if isinstance(face_color, list):
+            face_color = [face_color[k] for k in keep]
+
+        self.data[key] = {'color': color, 'alpha': alpha, 'face_color': face_color,
+                          'visible': visible, 'layer': layer, 'tolerance': tolerance}
+
+        if linewidth:
+            self._line_width = linewidth
+
+        face = face_color is not None
+        edge = color is not None
+
+        # Use the buffers of the same list of shapes if they are in cache
+        if self.cache is not None and self.cache.enabled:
+            cache_key = self.cache.batch_key(geometries, tolerance, face=face, edge=edge,
+                                             triangulation=self._triangulation)
+            buffers = self.cache.get(cache_key)
+            if buffers is not None:
+                _set_batch_buffers(self.data[key], buffers)
+                if update:
+                    self.redraw()
+                return key
+            self.data[key]['cache_key'] = cache_key
+
+        # Split the shapes in a few chunks for each process
+        try:
+            nr_chunks = self.pool._processes * 2
+        except AttributeError:
+            nr_chunks = 1
+        chunk_size = max(self.batch_chunk_size, -(-len(geometries) // nr_chunks))
+        chunks = [(geometries[k:k + chunk_size], tolerance, face, edge)
+                  for k in range(0, len(geometries), chunk_size)] or [([], tolerance, face, edge)]
+
+        self.data[key]['batch'] = True
+
+        # Add data to process pool if pool exists
+        try:
+            self.results[key] = self.pool.map_async(_shape_buffers_batch, chunks)
+        except Exception:
+            self.set_batch_buffers(self.data[key], [_shape_buffers_batch(c) for c in chunks])
+
+        if update:
+            self.redraw()   # redraw() waits for pool process end
+
+        return key
+
+    def add_instances(self, shape, offsets, color=None, face_color=None, alpha=None, visible=True,
+                      update=False, layer=1, tolerance=0.01, linewidth=None):
+        """
+        Adds copies of a shape, each moved by an offset, to collection as a single entry (e.g. the flashes of a
+        Gerber aperture). The shape is translated to buffers only once; the buffers are moved at each offset.
+        :param shape: shapely.geometry
+            Shapely geometry object, a Polygon or a MultiPolygon
+        :param offsets: numpy.array
+            (x, y) offset of each copy
+        :param color: str, tuple
+            Line/edge color
+        :param face_color: str, tuple
+            Polygon face color
+        :param alpha: str
+            Polygon transparency
+        :param visible: bool
+            Shapes visibility
+        :param update: bool
+            Set True to redraw collection
+        :param layer: int
+            Layer number. 0 - lowest.
+        :param tolerance: float
+            Geometry simplifying tolerance
+        :param linewidth: int
+            Width of the line
+        :return: int
+            Index of the shapes
+        """
+        # Get new key
+        self.key_lock.acquire(True)
+        self.last_key += 1
+        key = self.last_key
+        self.key_lock.release()
+
+        self.data[key] = {'color': color, 'alpha': alpha, 'face_color': face_color,
+                          'visible': visible, 'layer': layer, 'tolerance': tolerance}
+
+        if linewidth:
+            self._line_width = linewidth
+
+        buffers = _instance_buffers(shape, offsets, tolerance, face=face_color is not None, edge=color is not None)
+        _set_batch_buffers(self.data[key], buffers)
+
+        if update:
+            self.redraw()
+
+        return key
+
+    def set_batch_buffers(self, data, parts):
+        """
+        Stores the translated buffers of a list of shapes and puts them in cache
+        :param data: dict
+            Shape data
+        :param parts: list
+            Buffers made for each chunk of shapes by _shape_buffers_batch()
+        """
+        buffers = _join_shape_buffers(parts)
+        cache_key = data.pop('cache_key', None)
+        if self.cache is not None and cache_key is not None:
+            self.cache.put(cache_key, buffers)
+        _set_batch_buffers(data, buffers)
+
+    def cache_buffers(self, data):
+        """
+        Stores the buffers of a translated shape in cache
+        :param data: dict
+            Shape data
+        """
+        cache_key = data.pop('cache_key', None)
+        if self.cache is not None and cache_key is not None:
+            self.cache.put(cache_key, (data['line_pts'], data['mesh_vertices'], data['mesh_tris']))
+
     def remove(self, key, update=False):
         """
         Removes shape from collection
@@ -383,7 +764,7 @@ class ShapeCollectionVisual(CompoundVisual):
         # Merge shapes buffers
 
         if indexes is None:
-            for k, data in list(self.data.items()):
+            for k, data in self.merge_order():
                 if data['visible'] and 'line_pts' in data:
                     if new_mesh_color and new_mesh_color != '':
                         dim_mesh_tris = (len(data['mesh_tris']) // 3)
@@ -405,12 +786,12 @@ class ShapeCollectionVisual(CompoundVisual):
                                 line_colors[data['layer']] += [line_color_rgba] * dim_line_pts
                                 self.data[k]['color'] = new_line_color
 
-                                data['line_colors'] = [mesh_color_rgba for __ in range(len(data['line_colors']))]
+                                data['line_colors'] = [line_color_rgba for __ in range(len(data['line_colors']))]
                             except Exception as e:
                                 print("VisPyVisuals.ShapeCollectionVisual.update_color(). "
                                       "Create line colors --> Data error. %s" % str(e))
         else:
-            for k, data in list(self.data.items()):
+            for k, data in self.merge_order():
                 if data['visible'] and 'line_pts' in data:
                     dim_mesh_tris = (len(data['mesh_tris']) // 3)
                     dim_line_pts = (len(data['line_pts']))
@@ -433,22 +814,23 @@ class ShapeCollectionVisual(CompoundVisual):
                                     line_colors[data['layer']] += [line_color_rgba] * dim_line_pts
                                     self.data[k]['color'] = new_line_color
 
-                                    data['line_colors'] = [mesh_color_rgba for __ in range(len(data['line_colors']))]
+                                    data['line_colors'] = [line_color_rgba for __ in range(len(data['line_colors']))]
                                 except Exception as e:
                                     print("VisPyVisuals.ShapeCollectionVisual.update_color(). "
                                           "Create line colors --> Data error. %s" % str(e))
                     else:
+                        # the colors they have; a list of shapes (add_batch()) can have a color for each shape
                         if dim_mesh_tris != 0:
                             try:
-                                mesh_colors[data['layer']] += [Color(data['face_color']).rgba] * dim_mesh_tris
+                                mesh_colors[data['layer']] += list(data['mesh_colors'])
                             except Exception as e:
                                 print("VisPyVisuals.ShapeCollectionVisual.update_color(). "
                                       "Create mesh colors --> Data error. %s" % str(e))
 
                         if dim_line_pts != 0:
                             try:
-                                line_pts[data['layer']] += data['line_pts']
-                                line_colors[data['layer']] += [Color(data['color']).rgba] * dim_line_pts
+                                line_pts[data['layer']] += list(data['line_pts'])
+                                line_colors[data['layer']] += list(data['line_colors'])
                             except Exception as e:
                                 print("VisPyVisuals.ShapeCollectionVisual.update_color(). "
                                       "Create line colors --> Data error. %s" % str(e))
@@ -480,6 +862,15 @@ class ShapeCollectionVisual(CompoundVisual):
 
         self.update_lock.release()
 
+    def merge_order(self):
+        """
+        The shapes in the order their buffers are merged by __update(): the shapes added one by one, then the lists
+        of shapes added by add_batch() and add_instances()
+        :return: list
+            (key, data) of the shapes
+        """
+        return sorted(self.data.items(), key=lambda item: isinstance(item[1].get('line_pts'), np.ndarray))
+
     def __update(self):
         """
         Merges internal buffers, sets data to visuals, redraws collection on scene
@@ -489,6 +880,7 @@ class ShapeCollectionVisual(CompoundVisual):
         mesh_colors = [[] for _ in range(0, len(self._meshes))]         # Face colors
         line_pts = [[] for _ in range(0, len(self._lines))]             # Vertices for line
         line_colors = [[] for _ in range(0, len(self._lines))]          # Line color
+        batches = [[] for _ in range(0, len(self._meshes))]             # Shapes added by add_batch()
 
         # Lock sub-visuals updates
         self.update_lock.acquire(True)
@@ -496,6 +888,10 @@ class ShapeCollectionVisual(CompoundVisual):
         # Merge shapes buffers
         for data in list(self.data.values()):
             if data['visible'] and 'line_pts' in data:
+                if isinstance(data['line_pts'], np.ndarray):
+                    # arrays; joined in a single step below
+                    batches[data['layer']].append(data)
+                    continue
                 try:
                     line_pts[data['layer']] += data['line_pts']
                     line_colors[data['layer']] += data['line_colors']
@@ -506,6 +902,29 @@ class ShapeCollectionVisual(CompoundVisual):
                 except Exception as e:
                     print("VisPyVisuals.ShapeCollectionVisual._update() --> Data error. %s" % str(e))
 
+        # Join the buffers of the shapes added one by one with the arrays of the lists of shapes
+        for i in range(len(self._meshes)):
+            if not batches[i]:
+                continue
+            parts = [{'line_pts': line_pts[i], 'line_colors': line_colors[i], 'mesh_vertices': mesh_vertices[i],
+                      'mesh_tris': mesh_tris[i], 'mesh_colors': mesh_colors[i]}] + batches[i]
+            try:
+                vertices = [np.asarray(d['mesh_vertices'], dtype=np.float64).reshape(-1, 2) for d in parts]
+                tris = [np.asarray(d['mesh_tris'], dtype=np.int64) for d in parts]
+                nr_vertices = np.array([len(v) for v in vertices], dtype=np.int64)
+                vertex_offsets = np.cumsum(nr_vertices) - nr_vertices
+
+                line_pts[i] = np.concatenate([np.asarray(d['line_pts'], dtype=np.float64).reshape(-1, 2)
+                                              for d in parts])
+                line_colors[i] = np.concatenate([np.asarray(d['line_colors'], dtype=np.float64).reshape(-1, 4)
+                                                 for d in parts])
+                mesh_vertices[i] = np.concatenate(vertices)
+                mesh_tris[i] = np.concatenate(tris) + np.repeat(vertex_offsets, [len(t) for t in tris])
+                mesh_colors[i] = np.concatenate([np.asarray(d['mesh_colors'], dtype=np.float64).reshape(-1, 4)
+                                                 for d in parts])
+            except Exception as e:
+                print("VisPyVisuals.ShapeCollectionVisual._update() --> Data error. %s" % str(e))
+
         # Updating meshes
         for i, mesh in enumerate(self._meshes):
             if len(mesh_vertices[i]) > 0:
@@ -552,7 +971,11 @@ class ShapeCollectionVisual(CompoundVisual):
                 try:
                     self.results[i].wait()                                  # Wait for process results
                     if i in self.data:
-                        self.data[i] = self.results[i].get()[0]             # Store translated data
+                        if self.data[i].get('batch'):
+                            self.set_batch_buffers(self.data[i], self.results[i].get())
+                        else:
+                            self.data[i] = self.results[i].get()[0]         # Store translated data
+                            self.cache_buffers(self.data[i])
                         del self.results[i]
                 except Exception as e:
                     print("VisPyVisuals.ShapeCollectionVisual.redraw() --> Data error = %s. Indexes = %s" %
@@ -67,6 +67,7 @@ class PreferencesUIManager:
 
             "global_compression_level": self.ui.general_defaults_form.general_app_group.compress_spinner,
             "global_save_compressed": self.ui.general_defaults_form.general_app_group.save_type_cb,
+            "global_save_binary": self.ui.general_defaults_form.general_app_group.save_binary_cb,
             "global_autosave": self.ui.general_defaults_form.general_app_group.autosave_cb,
             "global_autosave_timeout": self.ui.general_defaults_form.general_app_group.autosave_entry,
 
@@ -75,6 +76,9 @@ class PreferencesUIManager:
             "global_tpdf_lmargin": self.ui.general_defaults_form.general_app_group.lmargin_entry,
             "global_tpdf_rmargin": self.ui.general_defaults_form.general_app_group.rmargin_entry,
 
+            "global_tess_cache_size": self.ui.general_defaults_form.general_app_group.tess_cache_size_entry,
+            "global_tess_cache_disk": self.ui.general_defaults_form.general_app_group.tess_cache_disk_cb,
+
             # General GUI Preferences
             "global_theme": self.ui.general_defaults_form.general_gui_group.theme_radio,
             "global_gray_icons": self.ui.general_defaults_form.general_gui_group.gray_icons_cb,
@@ -145,6 +149,7 @@ class PreferencesUIManager:
             "gerber_delayed_buffering": self.ui.gerber_defaults_form.gerber_adv_opt_group.delayed_buffer_cb,
             "gerber_simplification": self.ui.gerber_defaults_form.gerber_adv_opt_group.simplify_cb,
             "gerber_simp_tolerance": self.ui.gerber_defaults_form.gerber_adv_opt_group.simplification_tol_spinner,
+            "gerber_flash_instancing": self.ui.gerber_defaults_form.gerber_adv_opt_group.flash_instancing_cb,
 
             # Gerber Export
             "gerber_exp_units": self.ui.gerber_defaults_form.gerber_exp_group.gerber_units_radio,
@@ -188,6 +193,7 @@ class PreferencesUIManager:
             "excellon_update": self.ui.excellon_defaults_form.excellon_gen_group.update_excellon_cb,
             "excellon_optimization_type": self.ui.excellon_defaults_form.excellon_gen_group.excellon_optimization_radio,
             "excellon_search_time": self.ui.excellon_defaults_form.excellon_gen_group.optimization_time_entry,
+            "excellon_kdtree_initial": self.ui.excellon_defaults_form.excellon_gen_group.kdtree_initial_radio,
             "excellon_plot_fill": self.ui.excellon_defaults_form.excellon_gen_group.fill_color_entry,
             "excellon_plot_line": self.ui.excellon_defaults_form.excellon_gen_group.line_color_entry,
 
@@ -559,6 +565,7 @@ class PreferencesUIManager:
 
             # Optimal Tool
             "tools_opt_precision": self.ui.tools2_defaults_form.tools2_optimal_group.precision_sp,
+            "tools_opt_distances": self.ui.tools2_defaults_form.tools2_optimal_group.distances_sp,
 
             # Check Rules Tool
             "tools_cr_trace_size": self.ui.tools2_defaults_form.tools2_checkrules_group.trace_size_cb,
@@ -581,6 +588,7 @@ class PreferencesUIManager:
             "tools_cr_h2h_val": self.ui.tools2_defaults_form.tools2_checkrules_group.clearance_d2d_entry,
             "tools_cr_dh": self.ui.tools2_defaults_form.tools2_checkrules_group.drill_size_cb,
             "tools_cr_dh_val": self.ui.tools2_defaults_form.tools2_checkrules_group.drill_size_entry,
+            "tools_cr_tiled": self.ui.tools2_defaults_form.tools2_checkrules_group.tiled_cb,
 
             # QRCode Tool
             "tools_qrcode_version": self.ui.tools2_defaults_form.tools2_qrcode_group.version_entry,
@@ -218,13 +218,18 @@ class ExcellonGenPrefGroupUI(OptionsGroupUI):
               "If <<Basic>> is checked then Google OR-Tools Basic algorithm is used.\n"
               "If <<TSA>> is checked then Travelling Salesman algorithm is used for\n"
               "drill path optimization.\n"
+              "If <<KD-Tree>> is checked then a fast nearest neighbour algorithm is used,\n"
+              "followed by a path improvement limited by the Duration parameter\n"
+              "(the initial order is set by the Initial Order parameter).\n"
+              "It is recommended for jobs with a very large number of drills.\n"
               "\n"
               "Some options are disabled when the application works in 32bit mode.")
         )
 
         self.excellon_optimization_radio = RadioSet([{'label': _('MetaHeuristic'), 'value': 'M'},
                                                      {'label': _('Basic'), 'value': 'B'},
-                                                     {'label': _('TSA'), 'value': 'T'}],
+                                                     {'label': _('TSA'), 'value': 'T'},
+                                                     {'label': _('KD-Tree'), 'value': 'K'}],
                                                     orientation='vertical', stretch=False)
 
         grid2.addWidget(self.excellon_optimization_label, 9, 0)
@@ -233,7 +238,7 @@ class ExcellonGenPrefGroupUI(OptionsGroupUI):
         self.optimization_time_label = QtWidgets.QLabel('%s:' % _('Duration'))
         self.optimization_time_label.setAlignment(QtCore.Qt.AlignLeft)
         self.optimization_time_label.setToolTip(
-            _("When OR-Tools Metaheuristic (MH) is enabled there is a\n"
+            _("When OR-Tools Metaheuristic (MH) or KD-Tree is enabled there is a\n"
               "maximum threshold for how much time is spent doing the\n"
               "path optimization. This max duration is set here.\n"
               "In seconds.")
@@ -246,26 +251,39 @@ class ExcellonGenPrefGroupUI(OptionsGroupUI):
         grid2.addWidget(self.optimization_time_label, 10, 0)
         grid2.addWidget(self.optimization_time_entry, 10, 1)
 
+        self.kdtree_initial_label = QtWidgets.QLabel('%s:' % _('Initial Order'))
+        self.kdtree_initial_label.setToolTip(
+            _("The order of the drills improved by the KD-Tree algorithm.\n"
+              "- Nearest -> a nearest neighbour walk\n"
+              "- Hilbert -> the order of the drills on a Hilbert curve; it is faster\n"
+              "for jobs with a very large number of drills")
+        )
+        self.kdtree_initial_radio = RadioSet([{'label': _('Nearest'), 'value': 'nn'},
+                                              {'label': _('Hilbert'), 'value': 'hilbert'}])
+
+        grid2.addWidget(self.kdtree_initial_label, 11, 0)
+        grid2.addWidget(self.kdtree_initial_radio, 11, 1)
+
         separator_line = QtWidgets.QFrame()
         separator_line.setFrameShape(QtWidgets.QFrame.HLine)
         separator_line.setFrameShadow(QtWidgets.QFrame.Sunken)
-        grid2.addWidget(separator_line, 11, 0, 1, 2)
+        grid2.addWidget(separator_line, 12, 0, 1, 2)
 
         # Fuse Tools
         self.join_geo_label = QtWidgets.QLabel('<b>%s</b>:' % _('Join Option'))
-        grid2.addWidget(self.join_geo_label, 12, 0, 1, 2)
+        grid2.addWidget(self.join_geo_label, 13, 0, 1, 2)
 
         self.fuse_tools_cb = FCCheckBox(_("Fuse Tools"))
         self.fuse_tools_cb.setToolTip(
             _("When checked, the tools will be merged\n"
               "but only if they share some of their attributes.")
         )
-        grid2.addWidget(self.fuse_tools_cb, 13, 0, 1, 2)
+        grid2.addWidget(self.fuse_tools_cb, 14, 0, 1, 2)
 
         separator_line = QtWidgets.QFrame()
         separator_line.setFrameShape(QtWidgets.QFrame.HLine)
         separator_line.setFrameShadow(QtWidgets.QFrame.Sunken)
-        grid2.addWidget(separator_line, 14, 0, 1, 2)
+        grid2.addWidget(separator_line, 15, 0, 1, 2)
 
         # Excellon Object Color
         self.gerber_color_label = QtWidgets.QLabel('<b>%s</b>' % _('Object Color'))
@@ -333,13 +351,17 @@ class ExcellonGenPrefGroupUI(OptionsGroupUI):
         self.excellon_optimization_radio.activated_custom.connect(self.optimization_selection)
 
     def optimization_selection(self):
-        if self.excellon_optimization_radio.get_value() == 'M':
+        if self.excellon_optimization_radio.get_value() in ['M', 'K']:
             self.optimization_time_label.setDisabled(False)
             self.optimization_time_entry.setDisabled(False)
         else:
             self.optimization_time_label.setDisabled(True)
             self.optimization_time_entry.setDisabled(True)
 
+        kdtree = self.excellon_optimization_radio.get_value() == 'K'
+        self.kdtree_initial_label.setDisabled(not kdtree)
+        self.kdtree_initial_radio.setDisabled(not kdtree)
+
     # Setting plot colors handlers
     def on_fill_color_entry(self):
         self.app.defaults['excellon_plot_fill'] = self.fill_color_entry.get_value()[:7] + \
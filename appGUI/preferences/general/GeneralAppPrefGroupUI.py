@@ -276,6 +276,17 @@ class GeneralAppPrefGroupUI(OptionsGroupUI):
 
         self.proj_ois = OptionalInputSection(self.save_type_cb, [self.compress_label, self.compress_spinner], True)
 
+        # Save binary project CB
+        self.save_binary_cb = FCCheckBox(_('Save Binary Project'))
+        self.save_binary_cb.setToolTip(
+            _("Whether to save the project in the binary format.\n"
+              "When checked the project is saved as an archive with the\n"
+              "geometry stored in binary form (WKB) which is faster to save and to load.\n"
+              "Projects saved in this format can't be opened by older app versions.")
+        )
+
+        grid0.addWidget(self.save_binary_cb, 31, 0, 1, 2)
+
         # Auto save CB
         self.autosave_cb = FCCheckBox(_('Enable Auto Save'))
         self.autosave_cb.setToolTip(
@@ -284,7 +295,7 @@ class GeneralAppPrefGroupUI(OptionsGroupUI):
               "at the set interval.")
         )
 
-        grid0.addWidget(self.autosave_cb, 31, 0, 1, 2)
+        grid0.addWidget(self.autosave_cb, 32, 0, 1, 2)
 
         # Auto Save Timeout Interval
         self.autosave_entry = FCSpinner()
@@ -297,21 +308,21 @@ class GeneralAppPrefGroupUI(OptionsGroupUI):
               "While active, some operations may block this feature.")
         )
 
-        grid0.addWidget(self.autosave_label, 32, 0)
-        grid0.addWidget(self.autosave_entry, 32, 1)
+        grid0.addWidget(self.autosave_label, 33, 0)
+        grid0.addWidget(self.autosave_entry, 33, 1)
 
         # self.as_ois = OptionalInputSection(self.autosave_cb, [self.autosave_label, self.autosave_entry], True)
 
         separator_line = QtWidgets.QFrame()
         separator_line.setFrameShape(QtWidgets.QFrame.HLine)
         separator_line.setFrameShadow(QtWidgets.QFrame.Sunken)
-        grid0.addWidget(separator_line, 33, 0, 1, 2)
+        grid0.addWidget(separator_line, 34, 0, 1, 2)
 
         self.pdf_param_label = QtWidgets.QLabel('<B>%s:</b>' % _("Text to PDF parameters"))
         self.pdf_param_label.setToolTip(
             _("Used when saving text in Code Editor or in FlatCAM Document objects.")
         )
-        grid0.addWidget(self.pdf_param_label, 34, 0, 1, 2)
+        grid0.addWidget(self.pdf_param_label, 35, 0, 1, 2)
 
         # Top Margin value
         self.tmargin_entry = FCDoubleSpinner()
@@ -323,8 +334,8 @@ class GeneralAppPrefGroupUI(OptionsGroupUI):
             _("Distance between text body and the top of the PDF file.")
         )
 
-        grid0.addWidget(self.tmargin_label, 35, 0)
-        grid0.addWidget(self.tmargin_entry, 35, 1)
+        grid0.addWidget(self.tmargin_label, 36, 0)
+        grid0.addWidget(self.tmargin_entry, 36, 1)
 
         # Bottom Margin value
         self.bmargin_entry = FCDoubleSpinner()
@@ -336,8 +347,8 @@ class GeneralAppPrefGroupUI(OptionsGroupUI):
             _("Distance between text body and the bottom of the PDF file.")
         )
 
-        grid0.addWidget(self.bmargin_label, 36, 0)
-        grid0.addWidget(self.bmargin_entry, 36, 1)
+        grid0.addWidget(self.bmargin_label, 37, 0)
+        grid0.addWidget(self.bmargin_entry, 37, 1)
 
         # Left Margin value
         self.lmargin_entry = FCDoubleSpinner()
@@ -349,8 +360,8 @@ class GeneralAppPrefGroupUI(OptionsGroupUI):
             _("Distance between text body and the left of the PDF file.")
         )
 
-        grid0.addWidget(self.lmargin_label, 37, 0)
-        grid0.addWidget(self.lmargin_entry, 37, 1)
+        grid0.addWidget(self.lmargin_label, 38, 0)
+        grid0.addWidget(self.lmargin_entry, 38, 1)
 
         # Right Margin value
         self.rmargin_entry = FCDoubleSpinner()
@@ -362,8 +373,43 @@ class GeneralAppPrefGroupUI(OptionsGroupUI):
             _("Distance between text body and the right of the PDF file.")
         )
 
-        grid0.addWidget(self.rmargin_label, 38, 0)
-        grid0.addWidget(self.rmargin_entry, 38, 1)
+        grid0.addWidget(self.rmargin_label, 39, 0)
+        grid0.addWidget(self.rmargin_entry, 39, 1)
+
+        separator_line = QtWidgets.QFrame()
+        separator_line.setFrameShape(QtWidgets.QFrame.HLine)
+        separator_line.setFrameShadow(QtWidgets.QFrame.Sunken)
+        grid0.addWidget(separator_line, 40, 0, 1, 2)
+
+        self.tess_cache_label = QtWidgets.QLabel('<B>%s:</b>' % _("Plot Cache"))
+        self.tess_cache_label.setToolTip(
+            _("The triangulated shapes are kept in a cache so they are not\n"
+              "triangulated again when they are plotted again.")
+        )
+        grid0.addWidget(self.tess_cache_label, 41, 0, 1, 2)
+
+        # Tessellation cache size
+        self.tess_cache_size_entry = FCSpinner()
+        self.tess_cache_size_entry.set_range(0, 65535)
+
+        self.tess_cache_size_label = QtWidgets.QLabel('%s:' % _("Memory (MB)"))
+        self.tess_cache_size_label.setToolTip(
+            _("The memory used by the plot cache.\n"
+              "Zero disables the cache.")
+        )
+
+        grid0.addWidget(self.tess_cache_size_label, 42, 0)
+        grid0.addWidget(self.tess_cache_size_entry, 42, 1)
+
+        # Tessellation disk cache CB
+        self.tess_cache_disk_cb = FCCheckBox(_('Disk Cache'))
+        self.tess_cache_disk_cb.setToolTip(
+            _("When checked, the large triangulated shapes are also saved\n"
+              "in the preferences folder and they are reused after the app\n"
+              "is restarted, e.g. when the same project is opened again.")
+        )
+
+        grid0.addWidget(self.tess_cache_disk_cb, 43, 0, 1, 2)
 
         self.layout.addStretch()
 
@@ -108,6 +108,14 @@ class GerberAdvOptPrefGroupUI(OptionsGroupUI):
             ],
             logic=True)
 
+        # Flash Instancing
+        self.flash_instancing_cb = FCCheckBox(label=_('Flash Instancing'))
+        self.flash_instancing_cb.setToolTip(
+            _("When checked the flash geometry of an aperture is made only once\n"
+              "and moved at each flash. Faster for files with many pads.")
+        )
+        grid0.addWidget(self.flash_instancing_cb, 13, 0, 1, 2)
+
         self.layout.addStretch()
 
         # signals
@@ -53,4 +53,17 @@ class Tools2OptimalPrefGroupUI(OptionsGroupUI):
         grid0.addWidget(self.precision_lbl, 0, 0)
         grid0.addWidget(self.precision_sp, 0, 1)
 
+        self.distances_sp = FCSpinner()
+        self.distances_sp.set_range(1, 1000)
+        self.distances_sp.set_step(1)
+
+        self.distances_lbl = QtWidgets.QLabel('%s:' % _("Distances"))
+        self.distances_lbl.setToolTip(
+            _("Number of the smallest distances that are searched.\n"
+              "The minimum distance is the first one.")
+        )
+
+        grid0.addWidget(self.distances_lbl, 1, 0)
+        grid0.addWidget(self.distances_sp, 1, 1)
+
         self.layout.addStretch()
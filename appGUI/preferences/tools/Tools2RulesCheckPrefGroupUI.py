@@ -239,4 +239,15 @@ class Tools2RulesCheckPrefGroupUI(OptionsGroupUI):
         )
         self.form_layout_1.addRow(self.drill_size_lbl, self.drill_size_entry)
 
+        self.form_layout_1.addRow(QtWidgets.QLabel(""))
+
+        # Tiled check
+        self.tiled_cb = FCCheckBox(_("Tiled"))
+        self.tiled_cb.setToolTip(
+            _("If checked, the clearance and annular ring rules are checked\n"
+              "in tiles of the board, in parallel.\n"
+              "Only the geometry of a tile is sent to the process that checks it.")
+        )
+        self.form_layout_1.addRow(self.tiled_cb)
+
         self.layout.addStretch()
@@ -210,6 +210,7 @@ class ToolsFilmPrefGroupUI(OptionsGroupUI):
 
         self.file_type_radio = RadioSet([{'label': _('SVG'), 'value': 'svg'},
                                          {'label': _('PNG'), 'value': 'png'},
+                                         {'label': _('TIFF'), 'value': 'tif'},
                                          {'label': _('PDF'), 'value': 'pdf'}
                                          ], stretch=False)
 
@@ -218,6 +219,7 @@ class ToolsFilmPrefGroupUI(OptionsGroupUI):
             _("The file type of the saved film. Can be:\n"
               "- 'SVG' -> open-source vectorial format\n"
               "- 'PNG' -> raster image\n"
+              "- 'TIFF' -> raster image\n"
               "- 'PDF' -> portable document format")
         )
         grid0.addWidget(self.file_type_label, 15, 0)
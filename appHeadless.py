@@ -0,0 +1,733 @@
+# ##########################################################
+# FlatCAM: 2D Post-processing for Manufacturing            #
+# Date: 10/18/2026                                         #
+# MIT Licence                                              #
+# ##########################################################
+
+"""
+Headless batch engine: runs Tcl scripts (--shellfile, --shellvar) without the GUI.
+
+Started with --headless=1 (FlatCAM.py), instead of making the whole App with its GUI and hiding it:
+
+* only a QCoreApplication is made: no widget, no canvas, no OpenGL context and no display are needed
+* the objects are kept in a plain collection (HeadlessCollection) and are not plotted
+* the Tcl Commands are run synchronously, in the main thread; the tasks of the worker are run when sent
+* the Non-Copper Clearing and Paint tools are made without their UI (headless_tool()), only with the
+  methods used by the Tcl Commands
+* the multiprocessing pool is made only when a job uses it
+* the messages are written to stdout, the errors to stderr and the exit code is 1 if the script failed
+
+The user Preferences (current_defaults.FlatConfig) and preprocessors are used; the relative paths in the script
+are relative to the current folder.
+"""
+
+import os
+import re
+import sys
+import logging
+import traceback
+import tkinter as tk
+from copy import deepcopy
+
+from PyQt5 import QtCore
+
+from defaults import FlatCAMDefaults
+from appIO import AppIO
+from appProcess import FCProcess, FCProcessContainer
+from appPool import JobScheduler, new_pool
+from appPreProcessor import load_preprocessors
+from appCommon.Common import ExclusionAreas, LoudDict
+from appObjects.AppObject import AppObject
+from appObjects.FlatCAMObj import FlatCAMObj
+from appParsers.ParseGerber import Gerber
+from appParsers.ParseExcellon import Excellon
+from camlib import Geometry, CNCjob
+from tclCommands.TclShell import TclShell
+
+import gettext
+import appTranslation as fcTranslate
+import builtins
+
+fcTranslate.apply_language('strings')
+if '_' not in builtins.__dict__:
+    _ = gettext.gettext
+
+log = logging.getLogger('base')
+
+
+class HeadlessShell(TclShell):
+    """
+    The Tcl shell of the batch engine: the output goes to the console.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.tcl_commands_storage = {}
+        self.init_tcl()
+
+    def open_processing(self, detail=None):
+        pass
+
+    def close_processing(self):
+        pass
+
+    def append_output(self, text):
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+    def append_raw(self, text):
+        self.append_output(text)
+
+    def append_success(self, text):
+        self.append_output(text)
+
+    def append_selected(self, text):
+        self.append_output(text)
+
+    def append_warning(self, text):
+        self.append_output(text)
+
+    def append_error(self, text):
+        sys.stderr.write(text)
+        sys.stderr.flush()
+
+    def clear_output(self):
+        pass
+
+
+class HeadlessCollection:
+    """
+    The objects of the batch engine, with the methods of appObjects.ObjectCollection used without the GUI. The
+    selection is a list of the selected objects.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+        self.objects = []
+        self.selected = []
+
+        # names of the objects that are expected to become available (see ObjectCollection)
+        self.promises = set()
+        self.plot_promises = set()
+
+    def promise(self, obj_name):
+        log.debug("Object %s has been promised." % obj_name)
+        self.promises.add(obj_name)
+
+    def has_promises(self):
+        return len(self.promises) > 0
+
+    def plot_promise(self, plot_obj_name):
+        self.plot_promises.add(plot_obj_name)
+
+    def plot_remove_promise(self, plot_obj_name):
+        self.plot_promises.discard(plot_obj_name)
+
+    def has_plot_promises(self):
+        return len(self.plot_promises) > 0
+
+    def append(self, obj, active=False, to_index=None):
+        name = obj.options["name"]
+        self.promises.discard(name)
+
+        # Prevent same name
+        while name in self.get_names():
+            match = re.search(r'(.*[^\d])?(\d+)$', name)
+            if match:
+                name = (match.group(1) or '') + str(int(match.group(2)) + 1)
+            else:
+                name += "_1"
+        obj.options["name"] = name
+
+        # a way to signal that the object was fully loaded
+        obj.load_complete = True
+
+        self.objects.append(obj)
+        self.app.should_we_save = True
+        self.app.object_status_changed.emit(obj, 'append', name)
+
+    def get_names(self):
+        return [x.options['name'] for x in self.objects]
+
+    def get_list(self):
+        return list(self.objects)
+
+    def get_bounds(self):
+        xmin = ymin = float('Inf')
+        xmax = ymax = -float('Inf')
+        for obj in self.objects:
+            try:
+                gxmin, gymin, gxmax, gymax = obj.bounds()
+                xmin, ymin = min(xmin, gxmin), min(ymin, gymin)
+                xmax, ymax = max(xmax, gxmax), max(ymax, gymax)
+            except Exception as e:
+                log.warning("DEV WARNING: Tried to get bounds of empty geometry. %s" % str(e))
+        return [xmin, ymin, xmax, ymax]
+
+    def get_by_name(self, name, isCaseSensitive=None):
+        for obj in self.objects:
+            if obj.options['name'] == name or \
+                    (isCaseSensitive is False and obj.options['name'].lower() == name.lower()):
+                return obj
+        return None
+
+    def delete(self, obj):
+        name = obj.options['name']
+        try:
+            self.app.myKeywords.remove(name)
+        except ValueError:
+            pass
+
+        self.app.object_status_changed.emit(obj, 'delete', name)
+        self.objects.remove(obj)
+        if obj in self.selected:
+            self.selected.remove(obj)
+        self.app.all_objects_list = self.get_list()
+        self.app.should_we_save = True
+
+    def delete_active(self, select_project=True):
+        if self.selected:
+            self.delete(self.selected[0])
+
+    def delete_by_name(self, name, select_project=True):
+        obj = self.get_by_name(name)
+        if obj is not None:
+            self.delete(obj)
+
+    def delete_all(self):
+        self.app.object_status_changed.emit(None, 'delete_all', '')
+        self.objects = []
+        self.selected = []
+        self.app.all_objects_list = []
+
+    def get_active(self):
+        return self.selected[0] if self.selected else None
+
+    def get_selected(self):
+        return list(self.selected)
+
+    def get_non_selected(self):
+        return [obj for obj in self.objects if obj not in self.selected]
+
+    def set_active(self, name):
+        obj = self.get_by_name(name)
+        if obj is None:
+            log.error("[ERROR] Cause: no object named %s" % str(name))
+            raise AttributeError(name)
+        if obj not in self.selected:
+            self.selected.append(obj)
+
+    def set_all_active(self):
+        self.selected = list(self.objects)
+
+    def set_exclusive_active(self, name):
+        self.set_all_inactive()
+        self.set_active(name)
+
+    def set_inactive(self, name):
+        obj = self.get_by_name(name)
+        if obj in self.selected:
+            self.selected.remove(obj)
+
+    def set_all_inactive(self):
+        self.selected = []
+
+
+class HeadlessAppObject(AppObject):
+    """
+    Makes the objects (app_obj.new_object()) and adds them to the collection; they are not plotted.
+    """
+
+    def on_object_created(self, obj, plot, auto_select, callback, callback_params):
+        log.debug("on_object_created()")
+
+        # The Collection might change the name if there is a collision
+        self.app.collection.append(obj)
+        self.app.all_objects_list = self.app.collection.get_list()
+
+        self.app.inform_shell.emit('%s: %s' % (_("Object created"), str(obj.options['name'])))
+
+        # select the just opened object but deselect the previous ones
+        self.app.collection.set_all_inactive()
+        if auto_select:
+            self.app.collection.set_active(obj.options["name"])
+
+        if callback is not None:
+            self.app.worker_task.emit({'fcn': callback, 'params': callback_params})
+
+    def on_object_changed(self, obj):
+        try:
+            xmin, ymin, xmax, ymax = obj.bounds()
+        except TypeError:
+            return
+        obj.options['xmin'] = xmin
+        obj.options['ymin'] = ymin
+        obj.options['xmax'] = xmax
+        obj.options['ymax'] = ymax
+
+        self.app.should_we_save = True
+
+    def on_object_plotted(self):
+        pass
+
+
+class HeadlessIO(AppIO):
+    """
+    File operations of the batch engine: the ones of AppIO and the projects.
+    """
+
+    def on_file_new(self, cli=None):
+        """
+        Returns the engine to its startup state: no objects and the Preferences loaded again.
+
+        :param cli:     not used; kept for the Tcl Commands
+        :return:        None
+        """
+        self.app.log.debug("on_file_new()")
+
+        # the exclusion areas have no shapes to delete
+        self.app.exc_areas.exclusion_areas_storage.clear()
+        self.app.collection.delete_all()
+        self.app.project_filename = None
+
+        self.app.load_defaults()
+        self.app.options.update(self.defaults)
+        self.app.init_tools()
+
+    def open_project(self, filename, run_from_arg=None, plot=True, cli=None, from_tcl=False):
+        """
+        Loads a project from the specified file: the objects are added to the current ones.
+
+        :param filename:        Name of the file from which to load.
+        :param run_from_arg:    not used
+        :param plot:            not used: the objects are not plotted
+        :param cli:             not used
+        :param from_tcl:        True if run from a Tcl script
+        :return:                None
+        """
+        self.app.log.debug("Opening project: " + filename)
+
+        d = self.read_project(filename, from_tcl=from_tcl)
+        if d is None:
+            return
+
+        self.app.options.update(d['options'])
+        self.app.project_filename = filename
+
+        for obj in d['objs']:
+            def obj_init(obj_inst, app_inst, obj_dict=obj):
+                obj_inst.from_dict(obj_dict)
+
+            self.app.app_obj.new_object(obj['kind'], obj['options']['name'], obj_init, plot=False)
+
+        self.inform.emit('[success] %s: %s' % (_("Project loaded from"), filename))
+
+        self.app.should_we_save = False
+        self.app.file_opened.emit("project", filename)
+
+    def save_project(self, filename, quit_action=False, silent=False, from_tcl=False):
+        """
+        Saves the current project to the specified file.
+
+        :param filename:        Name of the file in which to save.
+        :param quit_action:     not used
+        :param silent:          if True will not display status messages
+        :param from_tcl:        True if run from a Tcl script
+        :return:                None
+        """
+        self.app.log.debug("save_project()")
+
+        with self.app.proc_container.new(_("Saving Project ...")):
+            if self.write_project(filename, silent=silent) == 'fail':
+                return
+
+        self.app.project_filename = filename
+        self.app.should_we_save = False
+        self.app.file_saved.emit("project", filename)
+
+
+class HeadlessProcessContainer(FCProcessContainer):
+    """
+    Process container without the activity view.
+    """
+
+    def __init__(self):
+        super().__init__()
+
+        self.view = self
+        self.new_text = ' '
+
+    def update_view_text(self, new_text):
+        self.new_text = new_text
+
+    def set_busy(self, busy_msg, no_movie=None):
+        pass
+
+    def set_idle(self):
+        pass
+
+
+class HeadlessPreferences:
+    """
+    Saves the Preferences for the Tcl Command save_sys; the Preferences UI is not made.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    def save_defaults(self, silent=False, data_path=None, first_time=False):
+        if data_path is None:
+            data_path = self.app.data_path
+
+        self.app.defaults.propagate_defaults()
+
+        if not os.path.exists(data_path):
+            os.makedirs(data_path)
+
+        filename = os.path.join(data_path, "current_defaults.FlatConfig")
+        try:
+            self.app.defaults.write(filename=filename)
+        except Exception as e:
+            log.error("save_defaults() --> Failed to write defaults to file %s" % str(e))
+            self.app.inform.emit('[ERROR_NOTCL] %s %s' % (_("Failed to write defaults to file."), str(filename)))
+            return
+
+        if not silent:
+            self.app.inform.emit('[success] %s' % _("Preferences saved."))
+
+
+def headless_tool(tool_class, app):
+    """
+    Makes a tool of appTools (NonCopperClear, ToolPaint) without its UI: the AppTool widget and the UI of the
+    tool are not made, only the data used by the methods that the Tcl Commands call.
+
+    :param tool_class:  the tool class, a subclass of AppTool and Gerber
+    :param app:         the HeadlessApp
+    :return:            the tool
+    """
+    tool = tool_class.__new__(tool_class)
+    Gerber.__init__(tool, steps_per_circle=int(app.defaults["gerber_circle_steps"]))
+
+    tool.app = app
+    tool.ui = None
+    tool.decimals = app.decimals
+    tool.units = app.defaults['units'].upper()
+
+    tool.obj_name = ""
+    tool.ncc_obj = None
+    tool.paint_obj = None
+    tool.bound_obj_name = ""
+    tool.bound_obj = None
+    tool.sel_rect = []
+    tool.ncc_tools = {}
+    tool.paint_tools = {}
+    tool.default_data = {}
+    tool.solid_geometry = []
+    tool.flat_geometry = []
+    tool.tooldia = None
+    tool.circle_steps = int(app.defaults["gerber_circle_steps"])
+    return tool
+
+
+class HeadlessApp(QtCore.QObject):
+    """
+    The part of the App used by the Tcl Commands, the objects and the file operations, without the GUI.
+    """
+
+    # keep in sync with app_Main.App
+    version = 8.994
+    version_date = "2020/11/7"
+    beta = True
+
+    inform = QtCore.pyqtSignal([str], [str, bool])
+    inform_shell = QtCore.pyqtSignal([str], [str, bool])
+    worker_task = QtCore.pyqtSignal(dict)
+    file_opened = QtCore.pyqtSignal(str, str)
+    file_saved = QtCore.pyqtSignal(str, str)
+    object_status_changed = QtCore.pyqtSignal(object, str, str)
+    shell_command_finished = QtCore.pyqtSignal(object)
+    pool_recreated = QtCore.pyqtSignal(object)
+    thread_exception = QtCore.pyqtSignal(object)
+    replot_signal = QtCore.pyqtSignal(list)
+    cleanup = QtCore.pyqtSignal()
+
+    def __init__(self, user_defaults=True):
+        super().__init__()
+
+        self.log = log
+        self.headless = True
+        self.cmd_line_headless = 1
+        self.main_thread = QtCore.QThread.currentThread()
+
+        # there is no GUI, no canvas and no editor
+        self.ui = None
+        self.plotcanvas = None
+        self.is_legacy = False
+        self.call_source = 'app'
+
+        if sys.platform == 'win32':
+            self.data_path = os.path.join(os.environ.get('APPDATA', os.path.expanduser('~')), 'FlatCAM')
+        else:
+            self.data_path = os.path.expanduser('~') + '/.FlatCAM'
+        self.app_home = os.path.dirname(os.path.realpath(__file__))
+
+        self.inform[str].connect(self.info)
+        self.inform[str, bool].connect(self.info)
+        self.inform_shell[str].connect(self.info_shell)
+        self.inform_shell[str, bool].connect(self.info_shell)
+        self.worker_task.connect(self.run_task)
+
+        # ## Preferences
+        self.user_defaults = user_defaults
+        self.defaults = FlatCAMDefaults(beta=self.beta, version=self.version)
+        self.load_defaults()
+        self.preferencesUiManager = HeadlessPreferences(self)
+
+        if self.defaults['units'] == 'MM':
+            self.decimals = int(self.defaults['decimals_metric'])
+        else:
+            self.decimals = int(self.defaults['decimals_inch'])
+
+        self.setup_obj_classes()
+
+        self._pool = None
+        self.scheduler = JobScheduler(app=self)
+        self.abort_flag = False
+        self.proc_container = HeadlessProcessContainer()
+
+        # the preprocessors are found relative to the application folder
+        cwd = os.getcwd()
+        try:
+            os.chdir(self.app_home)
+            self.preprocessors = load_preprocessors(self)
+        finally:
+            os.chdir(cwd)
+
+        self.defaults.propagate_defaults()
+
+        self.options = LoudDict()
+        for def_key, def_val in self.defaults.items():
+            self.options[def_key] = deepcopy(def_val)
+
+        self.collection = HeadlessCollection(app=self)
+        self.all_objects_list = []
+        self.app_obj = HeadlessAppObject(app=self)
+        self.f_handlers = HeadlessIO(app=self)
+        self.exc_areas = ExclusionAreas(app=self)
+
+        self.project_filename = None
+        self.should_we_save = False
+        self.save_in_progress = False
+        self.block_autosave = True
+
+        self.ncclear_tool = None
+        self.paint_tool = None
+        self.init_tools()
+
+        self.myKeywords = []
+        self.shell = None
+        self.shell = HeadlessShell(self)
+        self.myKeywords = list(self.shell.tcl_commands_storage.keys())
+
+        # number of the errors reported by the commands and the tasks; the script failed if there are any
+        self.error_count = 0
+
+    def load_defaults(self):
+        """
+        Loads the user Preferences, if there are any. There is no canvas so the progressive plotting is not used.
+
+        :return:    None
+        """
+        self.defaults.reset_to_factory_defaults()
+
+        current_defaults_path = os.path.join(self.data_path, "current_defaults.FlatConfig")
+        if self.user_defaults and os.path.isfile(current_defaults_path):
+            self.defaults.load(filename=current_defaults_path, inform=self.inform)
+
+        for key in ("tools_iso_plotting", "tools_ncc_plotting", "tools_paint_plotting"):
+            self.defaults[key] = 'normal'
+
+    def setup_obj_classes(self):
+        FlatCAMObj.app = self
+        Gerber.app = self
+        Excellon.app = self
+        Geometry.app = self
+        CNCjob.app = self
+        FCProcess.app = self
+        FCProcessContainer.app = self
+
+    def init_tools(self):
+        from appTools.ToolNCC import NonCopperClear
+        from appTools.ToolPaint import ToolPaint
+
+        self.ncclear_tool = headless_tool(NonCopperClear, self)
+        self.paint_tool = headless_tool(ToolPaint, self)
+
+    @property
+    def pool(self):
+        # made at the first use: most scripts don't need it
+        if self._pool is None:
+            self._pool = new_pool()
+        return self._pool
+
+    @pool.setter
+    def pool(self, new_pool_obj):
+        self._pool = new_pool_obj
+
+    def clear_pool(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+    def run_task(self, task):
+        """
+        Runs a task sent to the worker (worker_task signal) right away, in the main thread.
+
+        :param task:    dictionary with the function ('fcn') and its parameters ('params')
+        :return:        None
+        """
+        try:
+            task['fcn'](*task['params'])
+        except Exception as e:
+            self.error_count += 1
+            self.thread_exception.emit(e)
+            traceback.print_exc()
+
+    # ## Messages
+    def info(self, msg, shell_echo=True):
+        match = re.search(r"\[(.*?)\](.*)", msg, re.DOTALL)
+        level, text = (match.group(1).lower(), match.group(2)) if match else ('', msg)
+
+        # the messages of the selection are for the GUI
+        if level == 'selected' or not text.strip() or shell_echo is False:
+            return
+
+        text = re.sub(r'<[^>]*>', '', text).strip()
+        if level in ('error', 'error_notcl'):
+            self.error_count += 1
+            self.shell.append_error('ERROR: %s\n' % text)
+        elif level in ('warning', 'warning_notcl'):
+            self.shell.append_output('WARNING: %s\n' % text)
+        else:
+            self.shell.append_output(text + '\n')
+
+    def info_shell(self, msg, new_line=True):
+        self.log.debug(msg)
+
+    # ## Actions used by the Tcl Commands
+    def dec_format(self, val, dec=None):
+        dec_nr = dec if dec is not None else self.decimals
+        return float('%.*f' % (dec_nr, val))
+
+    def plot_all(self, fit_view=True, muted=False, use_thread=True):
+        pass
+
+    def on_plots_updated(self):
+        pass
+
+    def delete_selection_shape(self):
+        pass
+
+    def version_check(self):
+        self.inform.emit("FlatCAM %s - %s" % (str(self.version), self.version_date))
+
+    def on_delete(self, force_deletion=False):
+        """
+        Delete the selected objects.
+
+        :param force_deletion:  not used; there is no confirmation
+        :return:                None
+        """
+        if not self.collection.get_selected():
+            self.inform.emit('[ERROR_NOTCL] %s %s' % (_("Failed."), _("No object is selected.")))
+            return
+
+        while self.collection.get_selected():
+            name = self.collection.get_active().options['name']
+            self.collection.delete_active()
+            self.inform.emit('%s: %s' % (_("Object deleted"), name))
+
+        if not self.collection.get_list():
+            self.exc_areas.exclusion_areas_storage.clear()
+
+    def on_set_zero_click(self, event, location=None, noplot=False, use_thread=True):
+        """
+        Moves all the objects so the given location is the origin.
+
+        :param event:       not used
+        :param location:    (x, y) offset applied to the objects
+        :param noplot:      not used
+        :param use_thread:  not used
+        :return:            'fail' or None
+        """
+        if location is None or len(location) != 2:
+            self.inform.emit('[ERROR_NOTCL] %s...' % _("Origin coordinates specified but incomplete."))
+            return 'fail'
+
+        for obj in self.collection.get_list():
+            obj.offset(location)
+            self.app_obj.object_changed.emit(obj)
+
+            if obj.kind == 'gerber':
+                obj.source_file = self.f_handlers.export_gerber(
+                    obj_name=obj.options["name"], filename=None, local_use=obj, use_thread=False)
+            elif obj.kind == 'excellon':
+                obj.source_file = self.f_handlers.export_excellon(
+                    obj_name=obj.options["name"], filename=None, local_use=obj, use_thread=False)
+
+        self.inform.emit('[success] %s...' % _('Origin set'))
+        self.should_we_save = True
+
+    def quit_application(self):
+        self.clear_pool()
+        QtCore.QCoreApplication.exit(0)
+
+
+def run_headless(shellfile=None, shellvar=None):
+    """
+    Runs a Tcl script without the GUI.
+
+    :param shellfile:   path of the Tcl script
+    :param shellvar:    comma separated values, set in the Tcl variables shellvar_0, shellvar_1 ...
+    :return:            exit code: 0 on success, 1 if a command failed or an error was reported, 2 if the script
+                        could not be read
+    """
+    # the messages of the commands are written to stdout; only the errors are logged
+    for logger_name in ('base', 'base2'):
+        logging.getLogger(logger_name).setLevel(logging.ERROR)
+
+    app = HeadlessApp()
+    log.debug("*******************  RUNNING HEADLESS (batch engine)  *******************")
+
+    script = []
+    if shellvar:
+        for cnt, value in enumerate(shellvar.split(',')):
+            # noinspection PyBroadException
+            try:
+                value = eval(value)
+            except Exception:
+                pass
+            command_tcl = 'set shellvar_{nr} "{cmd}"'.format(cmd=str(value), nr=str(cnt))
+            # if there are Windows paths then replace the path separator with a Unix like one
+            if sys.platform == 'win32':
+                command_tcl = command_tcl.replace('\\', '/')
+            script.append(command_tcl)
+
+    if shellfile:
+        try:
+            with open(shellfile, "r") as f:
+                script.append(f.read())
+        except Exception as e:
+            sys.stderr.write('ERROR: %s\n' % str(e))
+            return 2
+
+    try:
+        for text in script:
+            app.shell.exec_command_test(text, reraise=True)
+    except tk.TclError:
+        return 1
+    finally:
+        app.clear_pool()
+
+    return 1 if app.error_count else 0
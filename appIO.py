@@ -0,0 +1,1011 @@
+# ##########################################################
+# FlatCAM: 2D Post-processing for Manufacturing            #
+# Date: 10/18/2026                                         #
+# MIT Licence                                              #
+# ##########################################################
+
+"""
+Opening, importing, exporting and saving of the files, without the GUI.
+
+AppIO has the file operations used by the Tcl Commands; they work on the App given to it (objects collection,
+app_obj.new_object(), defaults, signals) and don't use the GUI. The File menu handlers of the GUI
+(app_Main.MenuFileHandlers) and the headless batch engine (appHeadless.py) are made on it.
+"""
+
+from PyQt5 import QtCore
+
+import simplejson as json
+import lzma
+import logging
+import traceback
+from copy import deepcopy
+from datetime import datetime
+from io import StringIO
+from xml.dom.minidom import parseString as parse_xml_string
+
+from appCommon.ProjectArchive import is_project_archive, save_project_archive, load_project_archive
+from appObjects.FlatCAMExcellon import ExcellonObject
+from appObjects.FlatCAMGeometry import GeometryObject
+from appObjects.FlatCAMGerber import GerberObject
+from appParsers.ParseHPGL2 import HPGL2
+from camlib import to_dict, dict2obj, ParseError
+
+import gettext
+import appTranslation as fcTranslate
+import builtins
+
+fcTranslate.apply_language('strings')
+if '_' not in builtins.__dict__:
+    _ = gettext.gettext
+
+log = logging.getLogger('base')
+
+
+class AppIO(QtCore.QObject):
+    """
+    File operations of the application that don't need the GUI.
+    """
+
+    def __init__(self, app):
+        super().__init__()
+
+        self.app = app
+        self.inform = self.app.inform
+        self.worker_task = self.app.worker_task
+        self.defaults = self.app.defaults
+
+    def export_svg(self, obj_name, filename, scale_stroke_factor=0.00):
+        """
+        Exports a Geometry Object to an SVG file.
+
+        :param obj_name: the name of the FlatCAM object to be saved as SVG
+        :param filename: Path to the SVG file to save to.
+        :param scale_stroke_factor: factor by which to change/scale the thickness of the features
+        :return:
+        """
+        if filename is None:
+            filename = self.defaults["global_last_save_folder"] if self.defaults["global_last_save_folder"] \
+                                                                   is not None else self.defaults["global_last_folder"]
+
+        self.app.log.debug("export_svg()")
+
+        try:
+            obj = self.app.collection.get_by_name(str(obj_name))
+        except Exception:
+            return 'fail'
+
+        with self.app.proc_container.new(_("Exporting ...")):
+            exported_svg = obj.export_svg(scale_stroke_factor=scale_stroke_factor)
+
+            # Determine bounding area for svg export
+            bounds = obj.bounds()
+            size = obj.size()
+
+            # Convert everything to strings for use in the xml doc
+            svgwidth = str(size[0])
+            svgheight = str(size[1])
+            minx = str(bounds[0])
+            miny = str(bounds[1] - size[1])
+            uom = obj.units.lower()
+
+            # Add a SVG Header and footer to the svg output from shapely
+            # The transform flips the Y Axis so that everything renders
+            # properly within svg apps such as inkscape
+            svg_header = '<svg xmlns="http://www.w3.org/2000/svg" ' \
+                         'version="1.1" xmlns:xlink="http://www.w3.org/1999/xlink" '
+            svg_header += 'width="' + svgwidth + uom + '" '
+            svg_header += 'height="' + svgheight + uom + '" '
+            svg_header += 'viewBox="' + minx + ' ' + miny + ' ' + svgwidth + ' ' + svgheight + '">'
+            svg_header += '<g transform="scale(1,-1)">'
+            svg_footer = '</g> </svg>'
+            svg_elem = svg_header + exported_svg + svg_footer
+
+            # Parse the xml through a xml parser just to add line feeds
+            # and to make it look more pretty for the output
+            svgcode = parse_xml_string(svg_elem)
+            svgcode = svgcode.toprettyxml()
+
+            try:
+                with open(filename, 'w') as fp:
+                    fp.write(svgcode)
+            except PermissionError:
+                self.inform.emit('[WARNING] %s' %
+                                 _("Permission denied, saving not possible.\n"
+                                   "Most likely another app is holding the file open and not accessible."))
+                return 'fail'
+
+            if self.defaults["global_open_style"] is False:
+                self.app.file_opened.emit("SVG", filename)
+            self.app.file_saved.emit("SVG", filename)
+            self.inform.emit('[success] %s: %s' % (_("SVG file exported to"), filename))
+
+    def export_excellon(self, obj_name, filename, local_use=None, use_thread=True):
+        """
+        Exports a Excellon Object to an Excellon file.
+
+        :param obj_name: the name of the FlatCAM object to be saved as Excellon
+        :param filename: Path to the Excellon file to save to.
+        :param local_use:
+        :param use_thread: if to be run in a separate thread
+        :return:
+        """
+
+        if filename is None:
+            if self.defaults["global_last_save_folder"]:
+                filename = self.defaults["global_last_save_folder"] + '/' + 'exported_excellon'
+            else:
+                filename = self.defaults["global_last_folder"] + '/' + 'exported_excellon'
+
+        self.app.log.debug("export_excellon()")
+
+        format_exc = ';FILE_FORMAT=%d:%d\n' % (self.defaults["excellon_exp_integer"],
+                                               self.defaults["excellon_exp_decimals"]
+                                               )
+
+        if local_use is None:
+            try:
+                obj = self.app.collection.get_by_name(str(obj_name))
+            except Exception:
+                return "Could not retrieve object: %s" % obj_name
+        else:
+            obj = local_use
+
+        if not isinstance(obj, ExcellonObject):
+            self.inform.emit('[ERROR_NOTCL] %s' %
+                             _("Failed. Only Excellon objects can be saved as Excellon files..."))
+            return
+
+        # updated units
+        eunits = self.defaults["excellon_exp_units"]
+        ewhole = self.defaults["excellon_exp_integer"]
+        efract = self.defaults["excellon_exp_decimals"]
+        ezeros = self.defaults["excellon_exp_zeros"]
+        eformat = self.defaults["excellon_exp_format"]
+        slot_type = self.defaults["excellon_exp_slot_type"]
+
+        fc_units = self.defaults['units'].upper()
+        if fc_units == 'MM':
+            factor = 1 if eunits == 'METRIC' else 0.03937
+        else:
+            factor = 25.4 if eunits == 'METRIC' else 1
+
+        def make_excellon():
+            try:
+                time_str = "{:%A, %d %B %Y at %H:%M}".format(datetime.now())
+
+                header = 'M48\n'
+                header += ';EXCELLON GENERATED BY FLATCAM v%s - www.flatcam.org - Version Date: %s\n' % \
+                          (str(self.app.version), str(self.app.version_date))
+
+                header += ';Filename: %s' % str(obj_name) + '\n'
+                header += ';Created on : %s' % time_str + '\n'
+
+                if eformat == 'dec':
+                    has_slots, excellon_code = obj.export_excellon(ewhole, efract, factor=factor, slot_type=slot_type)
+                    header += eunits + '\n'
+
+                    for tool in obj.tools:
+                        if eunits == 'METRIC':
+                            header += "T{tool}F00S00C{:.{dec}f}\n".format(float(obj.tools[tool]['tooldia']) * factor,
+                                                                          tool=str(tool),
+                                                                          dec=2)
+                        else:
+                            header += "T{tool}F00S00C{:.{dec}f}\n".format(float(obj.tools[tool]['tooldia']) * factor,
+                                                                          tool=str(tool),
+                                                                          dec=4)
+                else:
+                    if ezeros == 'LZ':
+                        has_slots, excellon_code = obj.export_excellon(ewhole, efract,
+                                                                       form='ndec', e_zeros='LZ', factor=factor,
+                                                                       slot_type=slot_type)
+                        header += '%s,%s\n' % (eunits, 'LZ')
+                        header += format_exc
+
+                        for tool in obj.tools:
+                            if eunits == 'METRIC':
+                                header += "T{tool}F00S00C{:.{dec}f}\n".format(
+                                    float(obj.tools[tool]['tooldia']) * factor,
+                                    tool=str(tool),
+                                    dec=2)
+                            else:
+                                header += "T{tool}F00S00C{:.{dec}f}\n".format(
+                                    float(obj.tools[tool]['tooldia']) * factor,
+                                    tool=str(tool),
+                                    dec=4)
+                    else:
+                        has_slots, excellon_code = obj.export_excellon(ewhole, efract,
+                                                                       form='ndec', e_zeros='TZ', factor=factor,
+                                                                       slot_type=slot_type)
+                        header += '%s,%s\n' % (eunits, 'TZ')
+                        header += format_exc
+
+                        for tool in obj.tools:
+                            if eunits == 'METRIC':
+                                header += "T{tool}F00S00C{:.{dec}f}\n".format(
+                                    float(obj.tools[tool]['tooldia']) * factor,
+                                    tool=str(tool),
+                                    dec=2)
+                            else:
+                                header += "T{tool}F00S00C{:.{dec}f}\n".format(
+                                    float(obj.tools[tool]['tooldia']) * factor,
+                                    tool=str(tool),
+                                    dec=4)
+                header += '%\n'
+                footer = 'M30\n'
+
+                exported_excellon = header
+                exported_excellon += excellon_code
+                exported_excellon += footer
+
+                if local_use is None:
+                    try:
+                        with open(filename, 'w') as fp:
+                            fp.write(exported_excellon)
+                    except PermissionError:
+                        self.inform.emit('[WARNING] %s' %
+                                         _("Permission denied, saving not possible.\n"
+                                           "Most likely another app is holding the file open and not accessible."))
+                        return 'fail'
+
+                    if self.defaults["global_open_style"] is False:
+                        self.app.file_opened.emit("Excellon", filename)
+                    self.app.file_saved.emit("Excellon", filename)
+                    self.inform.emit('[success] %s: %s' % (_("Excellon file exported to"), filename))
+                else:
+                    return exported_excellon
+            except Exception as e:
+                self.app.log.debug("App.export_excellon.make_excellon() --> %s" % str(e))
+                return 'fail'
+
+        if use_thread is True:
+
+            with self.app.proc_container.new(_("Exporting ...")):
+
+                def job_thread_exc(app_obj):
+                    ret = make_excellon()
+                    if ret == 'fail':
+                        app_obj.inform.emit('[ERROR_NOTCL] %s' % _('Could not export.'))
+                        return
+
+                self.worker_task.emit({'fcn': job_thread_exc, 'params': [self]})
+        else:
+            eret = make_excellon()
+            if eret == 'fail':
+                self.inform.emit('[ERROR_NOTCL] %s' % _('Could not export.'))
+                return 'fail'
+            if local_use is not None:
+                return eret
+
+    def export_gerber(self, obj_name, filename, local_use=None, use_thread=True):
+        """
+        Exports a Gerber Object to an Gerber file.
+
+        :param obj_name:    the name of the FlatCAM object to be saved as Gerber
+        :param filename:    Path to the Gerber file to save to.
+        :param local_use:   if the Gerber code is to be saved to a file (None) or used within FlatCAM.
+                            When not None, the value will be the actual Gerber object for which to create
+                            the Gerber code
+        :param use_thread:  if to be run in a separate thread
+        :return:
+        """
+        if filename is None:
+            filename = self.defaults["global_last_save_folder"] if self.defaults["global_last_save_folder"] \
+                                                                   is not None else self.defaults["global_last_folder"]
+
+        self.app.log.debug("export_gerber()")
+
+        if local_use is None:
+            try:
+                obj = self.app.collection.get_by_name(str(obj_name))
+            except Exception:
+                return 'fail'
+        else:
+            obj = local_use
+
+        # updated units
+        gunits = self.defaults["gerber_exp_units"]
+        gwhole = self.defaults["gerber_exp_integer"]
+        gfract = self.defaults["gerber_exp_decimals"]
+        gzeros = self.defaults["gerber_exp_zeros"]
+
+        fc_units = self.defaults['units'].upper()
+        if fc_units == 'MM':
+            factor = 1 if gunits == 'MM' else 0.03937
+        else:
+            factor = 25.4 if gunits == 'MM' else 1
+
+        def make_gerber():
+            try:
+                time_str = "{:%A, %d %B %Y at %H:%M}".format(datetime.now())
+
+                header = 'G04*\n'
+                header += 'G04 RS-274X GERBER GENERATED BY FLATCAM v%s - www.flatcam.org - Version Date: %s*\n' % \
+                          (str(self.app.version), str(self.app.version_date))
+
+                header += 'G04 Filename: %s*' % str(obj_name) + '\n'
+                header += 'G04 Created on : %s*' % time_str + '\n'
+                header += '%%FS%sAX%s%sY%s%s*%%\n' % (gzeros, gwhole, gfract, gwhole, gfract)
+                header += "%MO{units}*%\n".format(units=gunits)
+
+                for apid in obj.apertures:
+                    if obj.apertures[apid]['type'] == 'C':
+                        header += "%ADD{apid}{type},{size}*%\n".format(
+                            apid=str(apid),
+                            type='C',
+                            size=(factor * obj.apertures[apid]['size'])
+                        )
+                    elif obj.apertures[apid]['type'] == 'R':
+                        header += "%ADD{apid}{type},{width}X{height}*%\n".format(
+                            apid=str(apid),
+                            type='R',
+                            width=(factor * obj.apertures[apid]['width']),
+                            height=(factor * obj.apertures[apid]['height'])
+                        )
+                    elif obj.apertures[apid]['type'] == 'O':
+                        header += "%ADD{apid}{type},{width}X{height}*%\n".format(
+                            apid=str(apid),
+                            type='O',
+                            width=(factor * obj.apertures[apid]['width']),
+                            height=(factor * obj.apertures[apid]['height'])
+                        )
+
+                header += '\n'
+
+                # obsolete units but some software may need it
+                if gunits == 'IN':
+                    header += 'G70*\n'
+                else:
+                    header += 'G71*\n'
+
+                # Absolute Mode
+                header += 'G90*\n'
+
+                header += 'G01*\n'
+                # positive polarity
+                header += '%LPD*%\n'
+
+                footer = 'M02*\n'
+
+                gerber_code = obj.export_gerber(gwhole, gfract, g_zeros=gzeros, factor=factor)
+
+                exported_gerber = header
+                exported_gerber += gerber_code
+                exported_gerber += footer
+
+                if local_use is None:
+                    try:
+                        with open(filename, 'w') as fp:
+                            fp.write(exported_gerber)
+                    except PermissionError:
+                        self.inform.emit('[WARNING] %s' %
+                                         _("Permission denied, saving not possible.\n"
+                                           "Most likely another app is holding the file open and not accessible."))
+                        return 'fail'
+
+                    if self.defaults["global_open_style"] is False:
+                        self.app.file_opened.emit("Gerber", filename)
+                    self.app.file_saved.emit("Gerber", filename)
+                    self.inform.emit('[success] %s: %s' % (_("Gerber file exported to"), filename))
+                else:
+                    return exported_gerber
+            except Exception as e:
+                log.debug("App.export_gerber.make_gerber() --> %s" % str(e))
+                return 'fail'
+
+        if use_thread is True:
+            with self.app.proc_container.new(_("Exporting ...")):
+
+                def job_thread_grb(app_obj):
+                    ret = make_gerber()
+                    if ret == 'fail':
+                        app_obj.inform.emit('[ERROR_NOTCL] %s' % _('Could not export.'))
+                        return
+
+                self.worker_task.emit({'fcn': job_thread_grb, 'params': [self]})
+        else:
+            gret = make_gerber()
+            if gret == 'fail':
+                self.inform.emit('[ERROR_NOTCL] %s' % _('Could not export.'))
+                return 'fail'
+            if local_use is not None:
+                return gret
+
+    def export_dxf(self, obj_name, filename, local_use=None, use_thread=True):
+        """
+        Exports a Geometry Object to an DXF file.
+
+        :param obj_name:    the name of the FlatCAM object to be saved as DXF
+        :param filename:    Path to the DXF file to save to.
+        :param local_use:   if the Gerber code is to be saved to a file (None) or used within FlatCAM.
+                            When not None, the value will be the actual Geometry object for which to create
+                            the Geometry/DXF code
+        :param use_thread:  if to be run in a separate thread
+        :return:
+        """
+        if filename is None:
+            filename = self.defaults["global_last_save_folder"] if self.defaults["global_last_save_folder"] \
+                                                                   is not None else self.defaults["global_last_folder"]
+
+        self.app.log.debug("export_dxf()")
+
+        if local_use is None:
+            try:
+                obj = self.app.collection.get_by_name(str(obj_name))
+            except Exception:
+                return 'fail'
+        else:
+            obj = local_use
+
+        def make_dxf():
+            try:
+                dxf_code = obj.export_dxf()
+                if local_use is None:
+                    try:
+                        dxf_code.saveas(filename)
+                    except PermissionError:
+                        self.inform.emit('[WARNING] %s' %
+                                         _("Permission denied, saving not possible.\n"
+                                           "Most likely another app is holding the file open and not accessible."))
+                        return 'fail'
+
+                    if self.defaults["global_open_style"] is False:
+                        self.app.file_opened.emit("DXF", filename)
+                    self.app.file_saved.emit("DXF", filename)
+                    self.inform.emit('[success] %s: %s' % (_("DXF file exported to"), filename))
+                else:
+                    return dxf_code
+            except Exception as e:
+                log.debug("App.export_dxf.make_dxf() --> %s" % str(e))
+                return 'fail'
+
+        if use_thread is True:
+
+            with self.app.proc_container.new(_("Exporting ...")):
+
+                def job_thread_exc(app_obj):
+                    ret_dxf_val = make_dxf()
+                    if ret_dxf_val == 'fail':
+                        app_obj.inform.emit('[WARNING_NOTCL] %s' % _('Could not export.'))
+                        return
+
+                self.worker_task.emit({'fcn': job_thread_exc, 'params': [self]})
+        else:
+            ret = make_dxf()
+            if ret == 'fail':
+                self.inform.emit('[WARNING_NOTCL] %s' % _('Could not export.'))
+                return
+            if local_use is not None:
+                return ret
+
+    def import_svg(self, filename, geo_type='geometry', outname=None, plot=True):
+        """
+        Adds a new Geometry Object to the projects and populates
+        it with shapes extracted from the SVG file.
+
+        :param plot:        If True then the resulting object will be plotted on canvas
+        :param filename:    Path to the SVG file.
+        :param geo_type:    Type of FlatCAM object that will be created from SVG
+        :param outname:     The name given to the resulting FlatCAM object
+        :return:
+        """
+        self.app.log.debug("App.import_svg()")
+
+        obj_type = ""
+        if geo_type is None or geo_type == "geometry":
+            obj_type = "geometry"
+        elif geo_type == "gerber":
+            obj_type = "gerber"
+        else:
+            self.inform.emit('[ERROR_NOTCL] %s' %
+                             _("Not supported type is picked as parameter. Only Geometry and Gerber are supported"))
+            return
+
+        units = self.defaults['units'].upper()
+
+        def obj_init(geo_obj, app_obj):
+            geo_obj.import_svg(filename, obj_type, units=units)
+            geo_obj.multigeo = True
+
+            with open(filename) as f:
+                file_content = f.read()
+            geo_obj.source_file = file_content
+
+            # appGUI feedback
+            app_obj.inform.emit('[success] %s: %s' % (_("Opened"), filename))
+
+        with self.app.proc_container.new('%s ...' % _("Importing")):
+
+            # Object name
+            name = outname or filename.split('/')[-1].split('\\')[-1]
+
+            ret = self.app.app_obj.new_object(obj_type, name, obj_init, autoselected=False, plot=plot)
+
+            if ret == 'fail':
+                self.inform.emit('[ERROR_NOTCL]%s' % _('Import failed.'))
+                return 'fail'
+
+            # Register recent file
+            self.app.file_opened.emit("svg", filename)
+
+    def import_dxf(self, filename, geo_type='geometry', outname=None, plot=True):
+        """
+        Adds a new Geometry Object to the projects and populates
+        it with shapes extracted from the DXF file.
+
+        :param filename:    Path to the DXF file.
+        :param geo_type:    Type of FlatCAM object that will be created from DXF
+        :param outname:     Name for the imported Geometry
+        :param plot:        If True then the resulting object will be plotted on canvas
+        :return:
+        """
+        self.app.log.debug(" ********* Importing DXF as: %s ********* " % geo_type.capitalize())
+
+        obj_type = ""
+        if geo_type is None or geo_type == "geometry":
+            obj_type = "geometry"
+        elif geo_type == "gerber":
+            obj_type = geo_type
+        else:
+            self.inform.emit('[ERROR_NOTCL] %s' %
+                             _("Not supported type is picked as parameter. Only Geometry and Gerber are supported"))
+            return
+
+        units = self.defaults['units'].upper()
+
+        def obj_init(geo_obj, app_obj):
+            if obj_type == "geometry":
+                geo_obj.import_dxf_as_geo(filename, units=units)
+            elif obj_type == "gerber":
+                geo_obj.import_dxf_as_gerber(filename, units=units)
+            else:
+                return "fail"
+
+            geo_obj.multigeo = True
+            with open(filename) as f:
+                file_content = f.read()
+            geo_obj.source_file = file_content
+
+            # appGUI feedback
+            app_obj.inform.emit('[success] %s: %s' % (_("Opened"), filename))
+
+        with self.app.proc_container.new('%s ...' % _("Importing")):
+
+            # Object name
+            name = outname or filename.split('/')[-1].split('\\')[-1]
+
+            ret = self.app.app_obj.new_object(obj_type, name, obj_init, autoselected=False, plot=plot)
+
+            if ret == 'fail':
+                self.inform.emit('[ERROR_NOTCL]%s' % _('Import failed.'))
+                return 'fail'
+
+            # Register recent file
+            self.app.file_opened.emit("dxf", filename)
+
+    def open_gerber(self, filename, outname=None, plot=True, from_tcl=False):
+        """
+        Opens a Gerber file, parses it and creates a new object for
+        it in the program. Thread-safe.
+
+        :param outname:     Name of the resulting object. None causes the
+                            name to be that of the file. Str.
+        :param filename:    Gerber file filename
+        :type filename:     str
+        :param plot:        boolean, to plot or not the resulting object
+        :param from_tcl:    True if run from Tcl Shell
+        :return: None
+        """
+
+        # How the object should be initialized
+        def obj_init(gerber_obj, app_obj):
+
+            assert isinstance(gerber_obj, GerberObject), \
+                "Expected to initialize a GerberObject but got %s" % type(gerber_obj)
+
+            # Opening the file happens here
+            try:
+                gerber_obj.parse_file(filename)
+            except IOError:
+                app_obj.inform.emit('[ERROR_NOTCL] %s: %s' % (_("Failed to open file"), filename))
+                return "fail"
+            except ParseError as err:
+                app_obj.inform.emit('[ERROR_NOTCL] %s: %s. %s' % (_("Failed to parse file"), filename, str(err)))
+                app_obj.log.error(str(err))
+                return "fail"
+            except Exception as e:
+                log.debug("App.open_gerber() --> %s" % str(e))
+                msg = '[ERROR] %s' % _("An internal error has occurred. See shell.\n")
+                msg += traceback.format_exc()
+                app_obj.inform.emit(msg)
+                return "fail"
+
+            if gerber_obj.is_empty():
+                app_obj.inform.emit('[ERROR_NOTCL] %s' %
+                                    _("Object is not Gerber file or empty. Aborting object creation."))
+                return "fail"
+
+        self.app.log.debug("open_gerber()")
+
+        with self.app.proc_container.new(_("Opening ...")):
+            # Object name
+            name = outname or filename.split('/')[-1].split('\\')[-1]
+
+            # # ## Object creation # ##
+            ret_val = self.app.app_obj.new_object("gerber", name, obj_init, autoselected=False, plot=plot)
+            if ret_val == 'fail':
+                if from_tcl:
+                    filename = self.defaults['global_tcl_path'] + '/' + name
+                    ret_val = self.app.app_obj.new_object("gerber", name, obj_init, autoselected=False, plot=plot)
+                if ret_val == 'fail':
+                    self.inform.emit('[ERROR_NOTCL]%s' % _('Open Gerber failed. Probable not a Gerber file.'))
+                    return 'fail'
+
+            # Register recent file
+            self.app.file_opened.emit("gerber", filename)
+
+            # appGUI feedback
+            self.app.inform.emit('[success] %s: %s' % (_("Opened"), filename))
+
+    def open_excellon(self, filename, outname=None, plot=True, from_tcl=False):
+        """
+        Opens an Excellon file, parses it and creates a new object for
+        it in the program. Thread-safe.
+
+        :param outname:     Name of the resulting object. None causes the name to be that of the file.
+        :param filename:    Excellon file filename
+        :type filename:     str
+        :param plot:        boolean, to plot or not the resulting object
+        :param from_tcl:    True if run from Tcl Shell
+        :return:            None
+        """
+
+        self.app.log.debug("open_excellon()")
+
+        # How the object should be initialized
+        def obj_init(excellon_obj, app_obj):
+            try:
+                ret = excellon_obj.parse_file(filename=filename)
+                if ret == "fail":
+                    app_obj.log.debug("Excellon parsing failed.")
+                    self.inform.emit('[ERROR_NOTCL] %s' % _("This is not Excellon file."))
+                    return "fail"
+            except IOError:
+                app_obj.inform.emit('[ERROR_NOTCL] %s: %s' % (_("Cannot open file"), filename))
+                app_obj.log.debug("Could not open Excellon object.")
+                return "fail"
+            except Exception:
+                msg = '[ERROR_NOTCL] %s' % _("An internal error has occurred. See shell.\n")
+                msg += traceback.format_exc()
+                app_obj.inform.emit(msg)
+                return "fail"
+
+            ret = excellon_obj.create_geometry()
+            if ret == 'fail':
+                app_obj.log.debug("Could not create geometry for Excellon object.")
+                return "fail"
+
+            for tool in excellon_obj.tools:
+                if excellon_obj.tools[tool]['solid_geometry']:
+                    return
+            app_obj.inform.emit('[ERROR_NOTCL] %s: %s' % (_("No geometry found in file"), filename))
+            return "fail"
+
+        with self.app.proc_container.new(_("Opening ...")):
+            # Object name
+            name = outname or filename.split('/')[-1].split('\\')[-1]
+            ret_val = self.app.app_obj.new_object("excellon", name, obj_init, autoselected=False, plot=plot)
+            if ret_val == 'fail':
+                if from_tcl:
+                    filename = self.defaults['global_tcl_path'] + '/' + name
+                    ret_val = self.app.app_obj.new_object("excellon", name, obj_init, autoselected=False, plot=plot)
+                if ret_val == 'fail':
+                    self.inform.emit('[ERROR_NOTCL] %s' %
+                                     _('Open Excellon file failed. Probable not an Excellon file.'))
+                    return
+
+            # Register recent file
+            self.app.file_opened.emit("excellon", filename)
+
+            # appGUI feedback
+            self.inform.emit('[success] %s: %s' % (_("Opened"), filename))
+
+    def open_gcode(self, filename, outname=None, force_parsing=None, plot=True, from_tcl=False):
+        """
+        Opens a G-gcode file, parses it and creates a new object for
+        it in the program. Thread-safe.
+
+        :param filename:        G-code file filename
+        :param outname:         Name of the resulting object. None causes the name to be that of the file.
+        :param force_parsing:
+        :param plot:            If True plot the object on canvas
+        :param from_tcl:        True if run from Tcl Shell
+        :return:                None
+        """
+        self.app.log.debug("open_gcode()")
+
+        # How the object should be initialized
+        def obj_init(job_obj, app_obj_):
+            """
+            :param job_obj: the resulting object
+            :type app_obj_: App
+            """
+            app_obj_.inform.emit('%s...' % _("Reading GCode file"))
+            try:
+                f = open(filename)
+                gcode = f.read()
+                f.close()
+            except IOError:
+                app_obj_.inform.emit('[ERROR_NOTCL] %s: %s' % (_("Failed to open"), filename))
+                return "fail"
+
+            job_obj.gcode = gcode
+
+            gcode_ret = job_obj.gcode_parse(force_parsing=force_parsing)
+            if gcode_ret == "fail":
+                self.inform.emit('[ERROR_NOTCL] %s' % _("This is not GCODE"))
+                return "fail"
+
+            job_obj.create_geometry()
+
+        with self.app.proc_container.new(_("Opening ...")):
+
+            # Object name
+            name = outname or filename.split('/')[-1].split('\\')[-1]
+
+            # New object creation and file processing
+            ret_val = self.app.app_obj.new_object("cncjob", name, obj_init, autoselected=False, plot=plot)
+            if ret_val == 'fail':
+                if from_tcl:
+                    filename = self.defaults['global_tcl_path'] + '/' + name
+                    ret_val = self.app.app_obj.new_object("cncjob", name, obj_init, autoselected=False, plot=plot)
+                if ret_val == 'fail':
+                    self.inform.emit('[ERROR_NOTCL] %s' %
+                                     _("Failed to create CNCJob Object. Probable not a GCode file. "
+                                       "Try to load it from File menu.\n "
+                                       "Attempting to create a FlatCAM CNCJob Object from "
+                                       "G-Code file failed during processing"))
+                    return "fail"
+
+            # Register recent file
+            self.app.file_opened.emit("cncjob", filename)
+
+            # appGUI feedback
+            self.inform.emit('[success] %s: %s' % (_("Opened"), filename))
+
+    def open_hpgl2(self, filename, outname=None):
+        """
+        Opens a HPGL2 file, parses it and creates a new object for
+        it in the program. Thread-safe.
+
+        :param outname:     Name of the resulting object. None causes the name to be that of the file.
+        :param filename:    HPGL2 file filename
+        :return:            None
+        """
+        filename = filename
+
+        # How the object should be initialized
+        def obj_init(geo_obj, app_obj):
+
+            assert isinstance(geo_obj, GeometryObject), \
+                "Expected to initialize a GeometryObject but got %s" % type(geo_obj)
+
+            # Opening the file happens here
+            obj = HPGL2(self.app)
+            try:
+                HPGL2.parse_file(obj, filename)
+            except IOError:
+                app_obj.inform.emit('[ERROR_NOTCL] %s: %s' % (_("Failed to open file"), filename))
+                return "fail"
+            except ParseError as err:
+                app_obj.inform.emit('[ERROR_NOTCL] %s: %s. %s' % (_("Failed to parse file"), filename, str(err)))
+                app_obj.log.error(str(err))
+                return "fail"
+            except Exception as e:
+                app_obj.log.debug("App.open_hpgl2() --> %s" % str(e))
+                msg = '[ERROR] %s' % _("An internal error has occurred. See shell.\n")
+                msg += traceback.format_exc()
+                app_obj.inform.emit(msg)
+                return "fail"
+
+            geo_obj.multigeo = True
+            geo_obj.solid_geometry = deepcopy(obj.solid_geometry)
+            geo_obj.tools = deepcopy(obj.tools)
+            geo_obj.source_file = deepcopy(obj.source_file)
+
+            del obj
+
+            if not geo_obj.solid_geometry:
+                app_obj.inform.emit('[ERROR_NOTCL] %s' %
+                                    _("Object is not HPGL2 file or empty. Aborting object creation."))
+                return "fail"
+
+        self.app.log.debug("open_hpgl2()")
+
+        with self.app.proc_container.new(_("Opening ...")):
+            # Object name
+            name = outname or filename.split('/')[-1].split('\\')[-1]
+
+            # # ## Object creation # ##
+            ret = self.app.app_obj.new_object("geometry", name, obj_init, autoselected=False)
+            if ret == 'fail':
+                self.inform.emit('[ERROR_NOTCL]%s' % _('Failed. Probable not a HPGL2 file.'))
+                return 'fail'
+
+            # Register recent file
+            self.app.file_opened.emit("geometry", filename)
+
+            # appGUI feedback
+            self.inform.emit('[success] %s: %s' % (_("Opened"), filename))
+
+    def save_source_file(self, obj_name, filename):
+        """
+        Exports a FlatCAM Object to an Gerber/Excellon file.
+
+        :param obj_name: the name of the FlatCAM object for which to save it's embedded source file
+        :param filename: Path to the Gerber file to save to.
+        :return:
+        """
+
+        if filename is None:
+            filename = self.defaults["global_last_save_folder"] if self.defaults["global_last_save_folder"] \
+                                                                   is not None else self.defaults["global_last_folder"]
+
+        self.app.log.debug("save source file()")
+
+        obj = self.app.collection.get_by_name(obj_name)
+
+        file_string = StringIO(obj.source_file)
+        time_string = "{:%A, %d %B %Y at %H:%M}".format(datetime.now())
+
+        if file_string.getvalue() == '':
+            self.inform.emit('[ERROR_NOTCL] %s' %
+                             _("Save cancelled because source file is empty. Try to export the file."))
+            return 'fail'
+
+        try:
+            with open(filename, 'w') as file:
+                file.writelines('G04*\n')
+                file.writelines('G04 %s (RE)GENERATED BY FLATCAM v%s - www.flatcam.org - Version Date: %s*\n' %
+                                (obj.kind.upper(), str(self.app.version), str(self.app.version_date)))
+                file.writelines('G04 Filename: %s*\n' % str(obj_name))
+                file.writelines('G04 Created on : %s*\n' % time_string)
+
+                for line in file_string:
+                    file.writelines(line)
+        except PermissionError:
+            self.inform.emit('[WARNING] %s' %
+                             _("Permission denied, saving not possible.\n"
+                               "Most likely another app is holding the file open and not accessible."))
+            return 'fail'
+
+    def read_project(self, filename, from_tcl=False):
+        """
+        Opens and parses a project file: a binary (version 2) project, a JSON project or a LZMA compressed JSON project.
+
+        :param filename:    Name of the file from which to load.
+        :param from_tcl:    True if run from Tcl Shell; if the file is not found it is searched in the Tcl path
+        :return:            the project dictionary or None if it could not be read
+        """
+        # Open and parse an uncompressed Project file
+        try:
+            f = open(filename, 'r')
+        except IOError:
+            if from_tcl:
+                name = filename.split('/')[-1].split('\\')[-1]
+                filename = self.defaults['global_tcl_path'] + '/' + name
+                try:
+                    f = open(filename, 'r')
+                except IOError:
+                    self.app.log.error("Failed to open project file: %s" % filename)
+                    self.inform.emit('[ERROR_NOTCL] %s: %s' % (_("Failed to open project file"), filename))
+                    return
+            else:
+                self.app.log.error("Failed to open project file: %s" % filename)
+                self.inform.emit('[ERROR_NOTCL] %s: %s' % (_("Failed to open project file"), filename))
+                return
+
+        d = None
+
+        # Open a binary (version 2) Project file
+        if is_project_archive(filename):
+            f.close()
+            try:
+                d = load_project_archive(filename)
+            except Exception as e:
+                self.app.log.error("Failed to open project file: %s with error: %s" % (filename, str(e)))
+                self.inform.emit('[ERROR_NOTCL] %s: %s' % (_("Failed to open project file"), filename))
+                return
+
+        if d is None:
+            try:
+                d = json.load(f, object_hook=dict2obj)
+            except Exception as e:
+                self.app.log.error(
+                    "Failed to parse project file, trying to see if it loads as an LZMA archive: %s because %s" %
+                    (filename, str(e)))
+                f.close()
+
+                # Open and parse a compressed Project file
+                try:
+                    with lzma.open(filename) as f:
+                        file_content = f.read().decode('utf-8')
+                        d = json.loads(file_content, object_hook=dict2obj)
+                except Exception as e:
+                    self.app.log.error("Failed to open project file: %s with error: %s" % (filename, str(e)))
+                    self.inform.emit('[ERROR_NOTCL] %s: %s' % (_("Failed to open project file"), filename))
+                    return
+
+        return d
+
+    def write_project(self, filename, silent=False):
+        """
+        Serializes the objects and the options of the project and writes them to a file.
+
+        :param filename:    Name of the file in which to save.
+        :param silent:      if True will not display status messages
+        :return:            'fail' if the project could not be written
+        """
+        # Serialize the whole project
+        d = {
+            "objs":     [obj.to_dict() for obj in self.app.collection.get_list()],
+            "options":  self.app.options,
+            "version":  self.app.version
+        }
+
+        if self.defaults["global_save_binary"] is True:
+            # binary container: JSON manifest + one WKB geometry blob per object
+            compression = int(self.defaults['global_compression_level']) if \
+                self.defaults["global_save_compressed"] is True else 0
+            try:
+                save_project_archive(filename, d, compression_level=compression)
+            except IOError:
+                self.app.log.error("Failed to open file for saving: %s", filename)
+                self.inform.emit('[ERROR_NOTCL] %s' % _("The object is used by another application."))
+                return 'fail'
+            if silent is False:
+                self.inform.emit('[success] %s: %s' % (_("Project saved to"), filename))
+        elif self.defaults["global_save_compressed"] is True:
+            with lzma.open(filename, "w", preset=int(self.defaults['global_compression_level'])) as f:
+                g = json.dumps(d, default=to_dict, indent=2, sort_keys=True).encode('utf-8')
+                # # Write
+                f.write(g)
+            self.inform.emit('[success] %s: %s' % (_("Project saved to"), filename))
+        else:
+            # Open file
+            try:
+                f = open(filename, 'w')
+            except IOError:
+                self.app.log.error("Failed to open file for saving: %s", filename)
+                self.inform.emit('[ERROR_NOTCL] %s' % _("The object is used by another application."))
+                return 'fail'
+
+            # Write
+            json.dump(d, f, default=to_dict, indent=2, sort_keys=True)
+            f.close()
+
+            # verification of the saved project
+            # Open and parse
+            try:
+                saved_f = open(filename, 'r')
+            except IOError:
+                if silent is False:
+                    self.inform.emit('[ERROR_NOTCL] %s: %s %s' %
+                                     (_("Failed to verify project file"), filename, _("Retry to save it.")))
+                return 'fail'
+
+            try:
+                saved_d = json.load(saved_f, object_hook=dict2obj)
+            except Exception:
+                if silent is False:
+                    self.inform.emit('[ERROR_NOTCL] %s: %s %s' %
+                                     (_("Failed to parse saved project file"), filename, _("Retry to save it.")))
+                f.close()
+                return 'fail'
+            saved_f.close()
+
+            if silent is False:
+                if 'version' in saved_d:
+                    self.inform.emit('[success] %s: %s' % (_("Project saved to"), filename))
+                else:
+                    self.inform.emit('[ERROR_NOTCL] %s: %s %s' %
+                                     (_("Failed to parse saved project file"), filename, _("Retry to save it.")))
@@ -20,6 +20,9 @@ from appObjects.FlatCAMObj import *
 from matplotlib.backend_bases import KeyEvent as mpl_key_event
 
 from camlib import CNCjob
+from appCommon.GCodeWriter import write_gcode
+from appParsers.ParseGCode import ParsedGCode
+from appCommon.HeightMap import HeightMap
 
 from shapely.ops import unary_union
 from shapely.geometry import Point, MultiPoint, Polygon, LineString, box
@@ -161,7 +164,10 @@ class CNCJobObject(FlatCAMObj, CNCjob):
         gcodenr_re_string = r'([+-]?\d*\.\d+)'
         self.g_nr_re = re.compile(gcodenr_re_string)
 
-        if self.app.is_legacy is False:
+        if self.app.plotcanvas is None:
+            # the headless batch engine has no canvas
+            pass
+        elif self.app.is_legacy is False:
             self.text_col = self.app.plotcanvas.new_text_collection()
             self.text_col.enabled = True
             self.annotation = self.app.plotcanvas.new_text_group(collection=self.text_col)
@@ -206,6 +212,8 @@ class CNCJobObject(FlatCAMObj, CNCjob):
         }
         '''
         self.al_voronoi_geo_storage = {}
+        # True when the heights of the probe points were imported: the saved G-code is then levelled
+        self.al_heights_imported = False
 
         '''
         list of (x, y, x) tuples to store the information's for the autolevelling
@@ -219,9 +227,12 @@ class CNCJobObject(FlatCAMObj, CNCjob):
 
         self.pressed_button = None
 
-        if self.app.is_legacy is False:
+        if self.app.plotcanvas is None:
+            self.probing_shapes = None
+        elif self.app.is_legacy is False:
             self.probing_shapes = ShapeCollection(parent=self.app.plotcanvas.view.scene, layers=1)
         else:
+            from appGUI.PlotCanvasLegacy import ShapeCollectionLegacy
             self.probing_shapes = ShapeCollectionLegacy(obj=self, app=self.app, name=name + "_probing_shapes")
 
         # Attributes to be included in serialization
@@ -730,7 +741,10 @@ class CNCJobObject(FlatCAMObj, CNCjob):
     def on_add_al_probepoints(self):
         # create the solid_geo
 
-        self.solid_geo = unary_union([geo['geom'] for geo in self.gcode_parsed if geo['kind'][0] == 'C'])
+        if isinstance(self.gcode_parsed, ParsedGCode):
+            self.solid_geo = unary_union(self.gcode_parsed.geometries('C'))
+        else:
+            self.solid_geo = unary_union([geo['geom'] for geo in self.gcode_parsed if geo['kind'][0] == 'C'])
 
         # reset al table
         self.ui.al_probe_points_table.setRowCount(0)
@@ -1140,8 +1154,37 @@ class CNCJobObject(FlatCAMObj, CNCjob):
         self.ui.al_frame.show() if state else self.ui.al_frame.hide()
         self.app.defaults["cncjob_al_status"] = True if state else False
 
-    def autolevell_gcode(self):
-        pass
+    def autolevell_gcode(self, gcode=None, max_segment=None):
+        """
+        Z compensation of the G-code with the heights of the probed points (bilinear interpolation).
+
+        :param gcode:           G-code text; None for the G-code of this object
+        :type gcode:            str
+        :param max_segment:     the feed moves longer than this are split so they follow the surface; None for half
+                                of the distance between the probed points
+        :type max_segment:      float
+        :return:                the levelled G-code or None if it can't be levelled
+        :rtype:                 str
+        """
+        if gcode is None:
+            gcode = self.source_file
+
+        points = [(geo_dict['point'].x, geo_dict['point'].y, geo_dict['height'])
+                  for geo_dict in self.al_voronoi_geo_storage.values() if 'point' in geo_dict]
+        if not points or not gcode:
+            self.app.inform.emit('[WARNING_NOTCL] %s' % _("Nothing to level."))
+            return None
+
+        height_map = HeightMap(points)
+        if max_segment is None:
+            spacing = [sp for sp in (height_map.x_spacing, height_map.y_spacing) if sp > 0]
+            max_segment = min(spacing) / 2.0 if spacing else None
+
+        try:
+            return height_map.level_gcode(gcode, max_segment=max_segment, decimals=self.coords_decimals)
+        except ValueError as err:
+            self.app.inform.emit('[ERROR_NOTCL] %s' % str(err))
+            return None
 
     def autolevell_gcode_line(self, gcode_line):
         al_method = self.ui.al_method_radio.get_value()
@@ -1661,13 +1704,9 @@ class CNCJobObject(FlatCAMObj, CNCjob):
             try:
                 force_windows_line_endings = self.app.defaults['cncjob_line_ending']
                 if force_windows_line_endings and sys.platform != 'win32':
-                    with open(filename, 'w', newline='\r\n') as f:
-                        for line in lines:
-                            f.write(line)
+                    write_gcode(filename, lines, newline='\r\n')
                 else:
-                    with open(filename, 'w') as f:
-                        for line in lines:
-                            f.write(line)
+                    write_gcode(filename, lines)
             except FileNotFoundError:
                 self.app.inform.emit('[WARNING_NOTCL] %s' % _("No such file or directory"))
                 return
@@ -1789,6 +1828,7 @@ class CNCJobObject(FlatCAMObj, CNCjob):
                         y = float(line[1])
                         self.al_voronoi_geo_storage[idx]['point'] = Point((x, y))
 
+            self.al_heights_imported = True
             self.build_al_table_sig.emit()
 
     def on_grbl_autolevel(self):
@@ -2185,19 +2225,20 @@ class CNCJobObject(FlatCAMObj, CNCjob):
                 self.exc_cnc_tools[first_key]['data']['tools_drill_ppname_e']
             ].include_header
 
-        gcode = ''
+        # the G-code is kept as a list of sections (one for each tool) and written part by part, not joined
+        gcode = []
         if include_header is False:
             # detect if using multi-tool and make the Gcode summation correctly for each case
             if self.multitool is True:
                 for tooluid_key in self.cnc_tools:
                     for key, value in self.cnc_tools[tooluid_key].items():
                         if key == 'gcode':
-                            gcode += value
+                            gcode.append(value)
                             break
             else:
-                gcode += self.gcode
+                gcode.append(self.gcode)
 
-            g = preamble + '\n' + gcode + '\n' + postamble
+            g = [preamble, '\n'] + gcode + ['\n', postamble]
         else:
             # search for the GCode beginning which is usually a G20 or G21
             # fix so the preamble gets inserted in between the comments header and the actual start of GCODE
@@ -2218,16 +2259,16 @@ class CNCJobObject(FlatCAMObj, CNCjob):
                     for tooluid_key in self.exc_cnc_tools:
                         for key, value in self.exc_cnc_tools[tooluid_key].items():
                             if key == 'gcode' and value:
-                                gcode += value
+                                gcode.append(value)
                                 break
                 else:
                     for tooluid_key in self.cnc_tools:
                         for key, value in self.cnc_tools[tooluid_key].items():
                             if key == 'gcode' and value:
-                                gcode += value
+                                gcode.append(value)
                                 break
             else:
-                gcode += self.gcode
+                gcode.append(self.gcode)
 
             end_gcode = self.gcode_footer() if self.app.defaults['cncjob_footer'] is True else ''
 
@@ -2247,23 +2288,22 @@ class CNCJobObject(FlatCAMObj, CNCjob):
                             break
 
             if hpgl:
-                processed_body_gcode = ''
+                processed_body_gcode = []
                 pa_re = re.compile(r"^PA\s*(-?\d+\.\d*),?\s*(-?\d+\.\d*)*;?$")
 
                 # process body gcode
-                for gline in gcode.splitlines():
+                for gline in ''.join(gcode).splitlines():
                     match = pa_re.search(gline)
                     if match:
                         x_int = int(float(match.group(1)))
                         y_int = int(float(match.group(2)))
                         new_line = 'PA%d,%d;\n' % (x_int, y_int)
-                        processed_body_gcode += new_line
+                        processed_body_gcode.append(new_line)
                     else:
-                        processed_body_gcode += gline + '\n'
+                        processed_body_gcode.append(gline + '\n')
 
-                gcode = processed_body_gcode
-                g = self.gc_header + '\n' + self.gc_start + '\n' + preamble + '\n' + \
-                    gcode + '\n' + postamble + end_gcode
+                g = [self.gc_header, '\n', self.gc_start, '\n', preamble, '\n'] + processed_body_gcode + \
+                    ['\n', postamble, end_gcode]
             else:
                 # try:
                 #     g_idx = gcode.index('G94')
@@ -2283,16 +2323,13 @@ class CNCJobObject(FlatCAMObj, CNCjob):
                 #                          _("G-code does not have a G94 code.\n"
                 #                            "Append Code snippet will not be used.."))
                 #     g = self.gc_header + '\n' + gcode + postamble + end_gcode
-                g = ''
-                if preamble != '' and postamble != '':
-                    g = self.gc_header + self.gc_start + '\n' + preamble + '\n' + gcode + '\n' + \
-                        postamble + '\n' + end_gcode
-                if preamble == '':
-                    g = self.gc_header + self.gc_start + '\n' + gcode + '\n' + postamble + '\n' + end_gcode
-                if postamble == '':
-                    g = self.gc_header + self.gc_start + '\n' + preamble + '\n' + gcode + '\n' + end_gcode
-                if preamble == '' and postamble == '':
-                    g = self.gc_header + self.gc_start + '\n' + gcode + '\n' + end_gcode
+                g = [self.gc_header, self.gc_start, '\n']
+                if preamble != '':
+                    g += [preamble, '\n']
+                g += gcode + ['\n']
+                if postamble != '':
+                    g += [postamble, '\n']
+                g.append(end_gcode)
 
         # if toolchange custom is used, replace M6 code with the code from the Toolchange Custom Text box
         # if self.ui.toolchange_cb.get_value() is True:
@@ -2308,20 +2345,20 @@ class CNCJobObject(FlatCAMObj, CNCjob):
         #         g = g.replace('M6', m6_code)
         #         self.app.inform.emit('[success] %s' % _("Toolchange G-code was replaced by a custom code."))
 
-        lines = StringIO(g)
+        # with the autolevelling on and the probed heights imported, the G-code is levelled in bulk (HeightMap)
+        if self.app.defaults["cncjob_al_status"] is True and self.al_heights_imported:
+            levelled = self.autolevell_gcode(''.join(g))
+            if levelled is not None:
+                g = [levelled]
 
         # Write
         if filename is not None:
             try:
                 force_windows_line_endings = self.app.defaults['cncjob_line_ending']
                 if force_windows_line_endings and sys.platform != 'win32':
-                    with open(filename, 'w', newline='\r\n') as f:
-                        for line in lines:
-                            f.write(line)
+                    write_gcode(filename, g, newline='\r\n')
                 else:
-                    with open(filename, 'w') as f:
-                        for line in lines:
-                            f.write(line)
+                    write_gcode(filename, g)
             except FileNotFoundError:
                 self.app.inform.emit('[WARNING_NOTCL] %s' % _("No such file or directory"))
                 return
@@ -2339,7 +2376,7 @@ class CNCJobObject(FlatCAMObj, CNCjob):
 
             self.app.inform.emit('[success] %s: %s' % (_("Saved to"), filename))
         else:
-            return lines
+            return StringIO(''.join(g))
 
     # def on_toolchange_custom_clicked(self, signal):
     #     """
@@ -13,7 +13,7 @@
 
 from shapely.geometry import LineString
 
-from appParsers.ParseExcellon import Excellon
+from appParsers.ParseExcellon import Excellon, drill_coordinates, slot_coordinates
 from appObjects.FlatCAMObj import *
 
 import itertools
@@ -594,6 +594,10 @@ class ExcellonObject(FlatCAMObj, Excellon):
         :rtype:     list
         """
         table_tools_items = []
+        # the objects made by the headless engine (appHeadless) have no UI
+        if self.ui is None:
+            return table_tools_items
+
         for x in self.ui.tools_table.selectedItems():
             # from the columnCount we subtract a value of 1 which represent the last column (plot column)
             # which does not have text
@@ -678,15 +682,10 @@ class ExcellonObject(FlatCAMObj, Excellon):
                 for tool in self.tools:
                     excellon_code += 'T0%s\n' % str(tool) if int(tool) < 10 else 'T%s\n' % str(tool)
 
-                    for drill in self.tools[tool]['drills']:
+                    for drill_x, drill_y in (drill_coordinates(self.tools[tool]['drills']) * factor).tolist():
                         if form == 'dec':
-                            drill_x = drill.x * factor
-                            drill_y = drill.y * factor
                             excellon_code += "X{:.{dec}f}Y{:.{dec}f}\n".format(drill_x, drill_y, dec=fract)
                         elif e_zeros == 'LZ':
-                            drill_x = drill.x * factor
-                            drill_y = drill.y * factor
-
                             exc_x_formatted = "{:.{dec}f}".format(drill_x, dec=fract)
                             exc_y_formatted = "{:.{dec}f}".format(drill_y, dec=fract)
 
@@ -706,9 +705,6 @@ class ExcellonObject(FlatCAMObj, Excellon):
                             excellon_code += "X{xform}Y{yform}\n".format(xform=exc_x_formatted,
                                                                          yform=exc_y_formatted)
                         else:
-                            drill_x = drill.x * factor
-                            drill_y = drill.y * factor
-
                             exc_x_formatted = "{:.{dec}f}".format(drill_x, dec=fract).replace('.', '')
                             exc_y_formatted = "{:.{dec}f}".format(drill_y, dec=fract).replace('.', '')
 
@@ -732,12 +728,9 @@ class ExcellonObject(FlatCAMObj, Excellon):
                     else:
                         excellon_code += 'T' + str(tool) + '\n'
 
-                    for slot in self.tools[tool]['slots']:
+                    slots = slot_coordinates(self.tools[tool]['slots']) * factor
+                    for start_slot_x, start_slot_y, stop_slot_x, stop_slot_y in slots.tolist():
                         if form == 'dec':
-                            start_slot_x = slot.x * factor
-                            start_slot_y = slot.y * factor
-                            stop_slot_x = slot.x * factor
-                            stop_slot_y = slot.y * factor
                             if slot_type == 'routing':
                                 excellon_code += "G00X{:.{dec}f}Y{:.{dec}f}\nM15\n".format(start_slot_x,
                                                                                            start_slot_y,
@@ -751,11 +744,6 @@ class ExcellonObject(FlatCAMObj, Excellon):
                                 )
 
                         elif e_zeros == 'LZ':
-                            start_slot_x = slot.x * factor
-                            start_slot_y = slot.y * factor
-                            stop_slot_x = slot.x * factor
-                            stop_slot_y = slot.y * factor
-
                             start_slot_x_formatted = "{:.{dec}f}".format(start_slot_x, dec=fract).replace('.', '')
                             start_slot_y_formatted = "{:.{dec}f}".format(start_slot_y, dec=fract).replace('.', '')
                             stop_slot_x_formatted = "{:.{dec}f}".format(stop_slot_x, dec=fract).replace('.', '')
@@ -791,10 +779,6 @@ class ExcellonObject(FlatCAMObj, Excellon):
                                     xstop=stop_slot_x_formatted, ystop=stop_slot_y_formatted
                                 )
                         else:
-                            start_slot_x = slot.x * factor
-                            start_slot_y = slot.y * factor
-                            stop_slot_x = slot.x * factor
-                            stop_slot_y = slot.y * factor
                             length = whole + fract
 
                             start_slot_x_formatted = "{:.{dec}f}".format(start_slot_x, dec=fract).replace('.', '')
@@ -1191,31 +1175,27 @@ class ExcellonObject(FlatCAMObj, Excellon):
                     else:
                         self.tools[tool]['multicolor'] = None
 
-                    # tool is a dict also
-                    for geo in self.tools[tool]["solid_geometry"]:
-                        idx = self.add_shape(shape=geo,
-                                             color=geo_color if multicolored else self.outline_color,
-                                             face_color=geo_color if multicolored else self.fill_color,
-                                             visible=visible,
-                                             layer=2)
-                        try:
-                            self.shape_indexes_dict[tool].append(idx)
-                        except KeyError:
-                            self.shape_indexes_dict[tool] = [idx]
+                    # tool is a dict also; the shapes of a tool are added in bulk
+                    keys = self.add_shapes(shapes=self.tools[tool]["solid_geometry"],
+                                           color=geo_color if multicolored else self.outline_color,
+                                           face_color=geo_color if multicolored else self.fill_color,
+                                           visible=visible,
+                                           layer=2)
+                    try:
+                        self.shape_indexes_dict[tool] += keys
+                    except KeyError:
+                        self.shape_indexes_dict[tool] = keys
             else:
                 for tool in self.tools:
-                    for geo in self.tools[tool]['solid_geometry']:
-                        idx = self.add_shape(shape=geo.exterior, color='red', visible=visible)
-                        try:
-                            self.shape_indexes_dict[tool].append(idx)
-                        except KeyError:
-                            self.shape_indexes_dict[tool] = [idx]
-                        for ints in geo.interiors:
-                            idx = self.add_shape(shape=ints, color='orange', visible=visible)
-                            try:
-                                self.shape_indexes_dict[tool].append(idx)
-                            except KeyError:
-                                self.shape_indexes_dict[tool] = [idx]
+                    solid_geometry = self.tools[tool]['solid_geometry']
+                    keys = self.add_shapes(shapes=[geo.exterior for geo in solid_geometry], color='red',
+                                           visible=visible)
+                    keys += self.add_shapes(shapes=[ints for geo in solid_geometry for ints in geo.interiors],
+                                            color='orange', visible=visible)
+                    try:
+                        self.shape_indexes_dict[tool] += keys
+                    except KeyError:
+                        self.shape_indexes_dict[tool] = keys
                 # for geo in self.solid_geometry:
                 #     self.add_shape(shape=geo.exterior, color='red', visible=visible)
                 #     for ints in geo.interiors:
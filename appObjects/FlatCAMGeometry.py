@@ -14,6 +14,7 @@ from shapely.geometry import MultiLineString, LineString, LinearRing, box
 import shapely.affinity as affinity
 
 from camlib import Geometry, grace
+from appCommon.GeometryTransform import translate_matrix, scale_matrix
 
 from appObjects.FlatCAMObj import *
 
@@ -2655,6 +2656,16 @@ class GeometryObject(FlatCAMObj, Geometry):
         # Send to worker
         self.app.worker_task.emit({'fcn': job_thread, 'params': [self]})
 
+    def scale_targets(self):
+        """
+        Where the geometry changed by scale() and offset() is: the geometry of the tools (multi-geo) and the
+        solid_geometry.
+
+        :return:    list of (container, key), see appCommon.GeometryTransform.transform_targets()
+        """
+        targets = [(self.tools[tool], 'solid_geometry') for tool in self.tools] if self.multigeo is True else []
+        return targets + [(self, 'solid_geometry')]
+
     def scale(self, xfactor, yfactor=None, point=None):
         """
         Scales all geometry by a given factor.
@@ -2693,55 +2704,7 @@ class GeometryObject(FlatCAMObj, Geometry):
         else:
             px, py = point
 
-        self.geo_len = 0
-        self.old_disp_number = 0
-        self.el_count = 0
-
-        def scale_recursion(geom):
-            if type(geom) is list:
-                geoms = []
-                for local_geom in geom:
-                    geoms.append(scale_recursion(local_geom))
-                return geoms
-            else:
-                try:
-                    self.el_count += 1
-                    disp_number = int(np.interp(self.el_count, [0, self.geo_len], [0, 100]))
-                    if self.old_disp_number < disp_number <= 100:
-                        self.app.proc_container.update_view_text(' %d%%' % disp_number)
-                        self.old_disp_number = disp_number
-
-                    return affinity.scale(geom, xfactor, yfactor, origin=(px, py))
-                except AttributeError:
-                    return geom
-
-        if self.multigeo is True:
-            for tool in self.tools:
-                # variables to display the percentage of work done
-                self.geo_len = 0
-                try:
-                    self.geo_len = len(self.tools[tool]['solid_geometry'])
-                except TypeError:
-                    self.geo_len = 1
-                self.old_disp_number = 0
-                self.el_count = 0
-
-                self.tools[tool]['solid_geometry'] = scale_recursion(self.tools[tool]['solid_geometry'])
-
-        try:
-            # variables to display the percentage of work done
-            self.geo_len = 0
-            try:
-                self.geo_len = len(self.solid_geometry)
-            except TypeError:
-                self.geo_len = 1
-            self.old_disp_number = 0
-            self.el_count = 0
-
-            self.solid_geometry = scale_recursion(self.solid_geometry)
-        except AttributeError:
-            self.solid_geometry = []
-            return
+        self.transform_geometry(scale_matrix(xfactor, yfactor, origin=(px, py)), self.scale_targets())
 
         self.app.proc_container.new_text = ''
         self.app.inform.emit('[success] %s' % _("Done."))
@@ -2769,52 +2732,7 @@ class GeometryObject(FlatCAMObj, Geometry):
         if dx == 0 and dy == 0:
             return
 
-        self.geo_len = 0
-        self.old_disp_number = 0
-        self.el_count = 0
-
-        def translate_recursion(geom):
-            if type(geom) is list:
-                geoms = []
-                for local_geom in geom:
-                    geoms.append(translate_recursion(local_geom))
-                return geoms
-            else:
-                try:
-                    self.el_count += 1
-                    disp_number = int(np.interp(self.el_count, [0, self.geo_len], [0, 100]))
-                    if self.old_disp_number < disp_number <= 100:
-                        self.app.proc_container.update_view_text(' %d%%' % disp_number)
-                        self.old_disp_number = disp_number
-
-                    return affinity.translate(geom, xoff=dx, yoff=dy)
-                except AttributeError:
-                    return geom
-
-        if self.multigeo is True:
-            for tool in self.tools:
-                # variables to display the percentage of work done
-                self.geo_len = 0
-                try:
-                    self.geo_len = len(self.tools[tool]['solid_geometry'])
-                except TypeError:
-                    self.geo_len = 1
-                self.old_disp_number = 0
-                self.el_count = 0
-
-                self.tools[tool]['solid_geometry'] = translate_recursion(self.tools[tool]['solid_geometry'])
-
-        # variables to display the percentage of work done
-        self.geo_len = 0
-        try:
-            self.geo_len = len(self.solid_geometry)
-        except TypeError:
-            self.geo_len = 1
-
-        self.old_disp_number = 0
-        self.el_count = 0
-
-        self.solid_geometry = translate_recursion(self.solid_geometry)
+        self.transform_geometry(translate_matrix(dx, dy), self.scale_targets())
 
         self.app.proc_container.new_text = ''
         self.app.inform.emit('[success] %s' % _("Done."))
@@ -3045,13 +2963,17 @@ class GeometryObject(FlatCAMObj, Geometry):
             color = '#FF0000FF'
 
         visible = visible if visible else self.options['plot']
-        try:
-            for sub_el in element:
-                self.plot_element(sub_el, color=color)
 
-        except TypeError:  # Element is not iterable...
-            # if self.app.is_legacy is False:
-            self.add_shape(shape=element, color=color, visible=visible, layer=0)
+        def flatten(el, shapes):
+            try:
+                for sub_el in el:
+                    flatten(sub_el, shapes)
+            except TypeError:  # Element is not iterable...
+                shapes.append(el)
+            return shapes
+
+        # the shapes are added in bulk
+        self.add_shapes(shapes=flatten(element, []), color=color, visible=visible, layer=0)
 
     def plot(self, visible=None, kind=None, plot_tool=None):
         """
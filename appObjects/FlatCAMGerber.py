@@ -14,6 +14,7 @@
 from shapely.geometry import Point, MultiLineString, LineString, LinearRing
 
 from appParsers.ParseGerber import Gerber
+from appCommon.Common import GracefulException as grace
 from appObjects.FlatCAMObj import *
 
 import numpy as np
@@ -153,9 +154,9 @@ class GerberObject(FlatCAMObj, Gerber):
         self.calculations_finished.connect(self.update_area_chull)
 
         # Tools
-        self.ui.iso_button.clicked.connect(self.app.isolation_tool.run)
-        self.ui.generate_ncc_button.clicked.connect(self.app.ncclear_tool.run)
-        self.ui.generate_cutout_button.clicked.connect(self.app.cutout_tool.run)
+        self.ui.iso_button.clicked.connect(lambda: self.app.isolation_tool.run(toggle=False))
+        self.ui.generate_ncc_button.clicked.connect(lambda: self.app.ncclear_tool.run(toggle=False))
+        self.ui.generate_cutout_button.clicked.connect(lambda: self.app.cutout_tool.run(toggle=False))
 
         # Utilties
         self.ui.generate_bb_button.clicked.connect(self.on_generatebb_button_click)
@@ -366,8 +367,10 @@ class GerberObject(FlatCAMObj, Gerber):
 
         def buffer_task():
             with self.app.proc_container.new('%s ...' % _("Buffering")):
-                output = self.app.pool.apply_async(self.buffer_handler, args=([self.solid_geometry]))
-                self.solid_geometry = output.get()
+                try:
+                    self.solid_geometry = self.app.scheduler.apply(self.buffer_handler, self.solid_geometry)
+                except grace:
+                    return
 
                 self.app.inform.emit('[success] %s' % _("Done."))
                 self.plot_single_object.emit()
@@ -918,35 +921,29 @@ class GerberObject(FlatCAMObj, Gerber):
                 return new_color
 
         try:
+            # the shapes are added in bulk
+            shapes = []
+            for g in geometry:
+                if type(g) == Polygon or type(g) == LineString:
+                    shapes.append(g)
+                elif type(g) == Point:
+                    pass
+                else:
+                    try:
+                        for el in g:
+                            shapes.append(el)
+                    except TypeError:
+                        shapes.append(g)
+
+            multicolored = self.options['multicolored']
             if self.options["solid"]:
-                for g in geometry:
-                    if type(g) == Polygon or type(g) == LineString:
-                        self.add_shape(shape=g, color=color,
-                                       face_color=random_color() if self.options['multicolored']
-                                       else face_color, visible=visible)
-                    elif type(g) == Point:
-                        pass
-                    else:
-                        try:
-                            for el in g:
-                                self.add_shape(shape=el, color=color,
-                                               face_color=random_color() if self.options['multicolored']
-                                               else face_color, visible=visible)
-                        except TypeError:
-                            self.add_shape(shape=g, color=color,
-                                           face_color=random_color() if self.options['multicolored']
-                                           else face_color, visible=visible)
+                self.add_shapes(shapes=shapes, color=color,
+                                face_color=[random_color() for __ in shapes] if multicolored else face_color,
+                                visible=visible)
             else:
-                for g in geometry:
-                    if type(g) == Polygon or type(g) == LineString:
-                        self.add_shape(shape=g, color=random_color() if self.options['multicolored'] else 'black',
-                                       visible=visible)
-                    elif type(g) == Point:
-                        pass
-                    else:
-                        for el in g:
-                            self.add_shape(shape=el, color=random_color() if self.options['multicolored'] else 'black',
-                                           visible=visible)
+                self.add_shapes(shapes=shapes,
+                                color=[random_color() for __ in shapes] if multicolored else 'black',
+                                visible=visible)
             self.shapes.redraw(
                 # update_colors=(self.fill_color, self.outline_color),
                 # indexes=self.app.plotcanvas.shape_collection.data.keys()
@@ -995,10 +992,25 @@ class GerberObject(FlatCAMObj, Gerber):
             with self.app.proc_container.new('%s ...' % _("Plotting")):
                 try:
                     if aperture_to_plot_mark in self.apertures:
-                        for elem in app_obj.apertures[aperture_to_plot_mark]['geometry']:
+                        elements = app_obj.apertures[aperture_to_plot_mark]['geometry']
+
+                        # the flashes made from the flash template of the aperture are drawn as copies of it
+                        instanced = set()
+                        flashes = app_obj.flash_instances.get(aperture_to_plot_mark)
+                        found = flashes.instances(elements) if flashes is not None else None
+                        if found is not None:
+                            locations, instanced = found
+                            if len(locations) > 0:
+                                shape_keys = app_obj.add_mark_instances(flashes.template, locations, color=color,
+                                                                        face_color=color, visible=visibility)
+                                app_obj.mark_shapes_storage[aperture_to_plot_mark] += shape_keys
+
+                        for elem in elements:
                             if 'solid' in elem:
                                 if only_flashes and not isinstance(elem['follow'], Point):
                                     continue
+                                if id(elem) in instanced:
+                                    continue
                                 geo = elem['solid']
                                 try:
                                     for el in geo:
@@ -15,8 +15,8 @@ import inspect  # TODO: For debugging only.
 from appGUI.ObjectUI import *
 
 from appCommon.Common import LoudDict
-from appGUI.PlotCanvasLegacy import ShapeCollectionLegacy
 from appGUI.VisPyVisuals import ShapeCollection
+from appParsers.FlashInstances import translate_copies
 
 from shapely.ops import unary_union
 from shapely.geometry import Polygon, MultiPolygon
@@ -92,11 +92,16 @@ class FlatCAMObj(QtCore.QObject):
         self.axes = None
         self.kind = None  # Override with proper name
 
-        if self.app.is_legacy is False:
+        if self.app.plotcanvas is None:
+            # the headless batch engine (appHeadless.py) has no canvas: the object is not plotted
+            self.shapes = None
+            self.mark_shapes = None
+        elif self.app.is_legacy is False:
             self.shapes = self.app.plotcanvas.new_shape_group()
             self.mark_shapes = ShapeCollection(parent=self.app.plotcanvas.view.scene, layers=1)
             # self.shapes = ShapeCollection(parent=self.app.plotcanvas.view.scene, pool=self.app.pool, layers=2)
         else:
+            from appGUI.PlotCanvasLegacy import ShapeCollectionLegacy
             self.shapes = ShapeCollectionLegacy(obj=self, app=self.app, name=name)
             self.mark_shapes = ShapeCollectionLegacy(obj=self, app=self.app, name=name + "_mark_shapes")
 
@@ -203,7 +208,7 @@ class FlatCAMObj(QtCore.QObject):
             pass
 
         try:
-            self.ui.transformations_button.clicked.connect(self.app.transform_tool.run)
+            self.ui.transformations_button.clicked.connect(lambda: self.app.transform_tool.run(toggle=False))
         except (TypeError, AttributeError):
             pass
 
@@ -428,6 +433,32 @@ class FlatCAMObj(QtCore.QObject):
             key = self.shapes.add(tolerance=self.drawing_tolerance, **kwargs)
         return key
 
+    def add_shapes(self, shapes, color=None, face_color=None, **kwargs):
+        """
+        Adds a list of shapes with the same properties. In the VisPy canvas they are added in bulk, as a single
+        entry of the shape collection.
+
+        :param shapes:      list of Shapely geometries
+        :param color:       edge color or a list with a color for each shape
+        :param face_color:  face color or a list with a color for each shape
+        :param kwargs:      the other arguments of add_shape()
+        :return:            list of the keys of the added shapes
+        """
+        if self.deleted:
+            raise ObjectDeleted()
+
+        if self.app.is_legacy is False:
+            return [self.shapes.add_batch(shapes=shapes, color=color, face_color=face_color,
+                                          tolerance=self.drawing_tolerance, **kwargs)]
+
+        keys = []
+        for idx, shape in enumerate(shapes):
+            keys.append(self.shapes.add(shape=shape,
+                                        color=color[idx] if isinstance(color, list) else color,
+                                        face_color=face_color[idx] if isinstance(face_color, list) else face_color,
+                                        tolerance=self.drawing_tolerance, **kwargs))
+        return keys
+
     def add_mark_shape(self, **kwargs):
         if self.deleted:
             raise ObjectDeleted()
@@ -435,6 +466,26 @@ class FlatCAMObj(QtCore.QObject):
             key = self.mark_shapes.add(tolerance=self.drawing_tolerance, layer=0, **kwargs)
         return key
 
+    def add_mark_instances(self, shape, offsets, **kwargs):
+        """
+        Adds copies of a shape, each moved by an offset, to the mark shapes. In the VisPy canvas the shape is
+        tessellated once and added with all its copies as a single entry.
+
+        :param shape:       Shapely geometry
+        :param offsets:     array of (x, y) offsets
+        :param kwargs:      the other arguments of add_mark_shape()
+        :return:            list of the keys of the added shapes
+        """
+        if self.deleted:
+            raise ObjectDeleted()
+
+        if self.app.is_legacy is False:
+            return [self.mark_shapes.add_instances(shape=shape, offsets=offsets, tolerance=self.drawing_tolerance,
+                                                   layer=0, **kwargs)]
+
+        return [self.mark_shapes.add(shape=geo, tolerance=self.drawing_tolerance, layer=0, **kwargs)
+                for geo in translate_copies(shape, offsets)]
+
     def update_filters(self, last_ext, filter_string):
         """
         Will modify the filter string that is used when saving a file (a list of file extensions) to have the last
@@ -919,12 +970,17 @@ class FlatCAMObj(QtCore.QObject):
 
     @property
     def visible(self):
+        if self.shapes is None:
+            return self.options['plot']
         return self.shapes.visible
 
     @visible.setter
     def visible(self, value, threaded=True):
         log.debug("FlatCAMObj.visible()")
 
+        if self.shapes is None:
+            return
+
         current_visibility = self.shapes.visible
         # self.shapes.visible = value   # maybe this is slower in VisPy? use enabled property?
 
@@ -786,13 +786,10 @@ class ObjectCollection(QtCore.QAbstractItemModel):
 
             self.app.exc_editor.clear()
 
-            self.app.dblsidedtool.reset_fields()
-
-            self.app.panelize_tool.reset_fields()
-
-            self.app.cutout_tool.reset_fields()
-
-            self.app.film_tool.reset_fields()
+            # the tools not used yet have nothing to reset
+            for tool in (self.app.dblsidedtool, self.app.panelize_tool, self.app.cutout_tool, self.app.film_tool):
+                if tool.loaded:
+                    tool.reset_fields()
 
             self.beginResetModel()
 
@@ -0,0 +1,240 @@
+# ##########################################################
+# FlatCAM: 2D Post-processing for Manufacturing            #
+# Date: 10/18/2026                                         #
+# MIT Licence                                              #
+# ##########################################################
+
+"""
+Array storage for the drills and the slots of the Excellon tools.
+
+``tools[tool]['drills']`` and ``tools[tool]['slots']`` of an Excellon object are a DrillArray and a SlotArray: the
+coordinates are kept in a NumPy array (N x 2 for the drills, N x 4 for the slot start and stop) and the Shapely
+Points are made only when the storage is used as a list. The geometry creation, the transformations and the export
+use the coordinates directly (drill_coordinates(), slot_coordinates(), drill_polygons(), slot_polygons()); these
+also accept the plain lists of Points made by the other tools.
+
+This module doesn't import camlib so camlib.to_dict() can serialize the arrays (as lists of Points, like before).
+"""
+
+import logging
+
+import numpy as np
+
+from shapely.geometry import Point, LineString, Polygon
+
+try:
+    # Shapely 2.0 can make a whole array of geometries in one call
+    from shapely import points as points_array, linestrings, polygons as polygons_array, buffer as buffer_array
+except ImportError:
+    points_array = None
+
+log = logging.getLogger('base')
+
+
+class CoordinateArray:
+    """
+    Sequence of Shapely elements stored as the rows of a NumPy array of coordinates.
+
+    The parser appends rows (tuples of coordinates), the transformations work on the whole array and the Shapely
+    elements are made (and kept) only when the sequence is used, so the code that works with lists of Shapely
+    elements still works.
+    """
+
+    width = 2
+
+    def __init__(self, coords=None):
+        if coords is None:
+            coords = np.empty((0, self.width))
+        self._coords = np.asarray(coords, dtype=np.float64).reshape(-1, self.width)
+        # rows appended since the array was last used
+        self._pending = []
+        self._items = None
+
+    @property
+    def coords(self):
+        """
+        :return:    (N, width) array with the coordinates
+        """
+        if self._pending:
+            self._coords = np.concatenate((self._coords, np.array(self._pending, dtype=np.float64)))
+            self._pending = []
+        return self._coords
+
+    def row(self, item):
+        """
+        :param item:    a Shapely element or a tuple of coordinates
+        :return:        tuple of coordinates
+        """
+        raise NotImplementedError
+
+    def make_items(self, coords):
+        """
+        :param coords:  (N, width) array
+        :return:        list of the Shapely elements
+        """
+        raise NotImplementedError
+
+    def items(self):
+        if self._items is None:
+            self._items = self.make_items(self.coords)
+        return self._items
+
+    def append(self, item):
+        self._pending.append(self.row(item))
+        if self._items is not None:
+            self._items += self.make_items(np.array([self._pending[-1]], dtype=np.float64))
+
+    def extend(self, items):
+        if isinstance(items, type(self)):
+            self._coords = np.concatenate((self.coords, items.coords))
+            self._items = None
+        else:
+            for item in items:
+                self.append(item)
+
+    def affine(self, matrix):
+        """
+        :param matrix:  [a, b, d, e, xoff, yoff] as for shapely.affinity.affine_transform()
+        :return:        new array with the transformed coordinates
+        """
+        a, b, d, e, xoff, yoff = matrix
+        pts = self.coords.reshape(-1, 2)
+        new_pts = np.column_stack((a * pts[:, 0] + b * pts[:, 1] + xoff, d * pts[:, 0] + e * pts[:, 1] + yoff))
+        return type(self)(new_pts.reshape(-1, self.width))
+
+    def __len__(self):
+        return len(self._coords) + len(self._pending)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __iter__(self):
+        return iter(self.items())
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return type(self)(self.coords[item])
+        return self.items()[item]
+
+    def __setitem__(self, index, item):
+        self.coords[index] = self.row(item)
+        self._items = None
+
+    def __contains__(self, item):
+        return bool(np.any(np.all(self.coords == np.array(self.row(item), dtype=np.float64), axis=1)))
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
+
+    def __add__(self, other):
+        new = type(self)(self.coords.copy())
+        new.extend(other)
+        return new
+
+    def __radd__(self, other):
+        return list(other) + self.items()
+
+    def to_list(self):
+        return list(self.items())
+
+    def __getstate__(self):
+        # the Shapely elements are made again after a copy or in another process
+        return {'_coords': self.coords, '_pending': [], '_items': None}
+
+
+class DrillArray(CoordinateArray):
+    """
+    The drills of a tool: an (N, 2) array with the drill positions. Used as a sequence it gives Shapely Points.
+    """
+
+    width = 2
+
+    def row(self, item):
+        if isinstance(item, Point):
+            return item.x, item.y
+        return float(item[0]), float(item[1])
+
+    def make_items(self, coords):
+        if points_array is not None:
+            return list(points_array(coords))
+        return [Point(xy) for xy in coords.tolist()]
+
+
+class SlotArray(CoordinateArray):
+    """
+    The slots of a tool: an (N, 4) array with the start and the stop positions (x_start, y_start, x_stop, y_stop).
+    Used as a sequence it gives (start, stop) tuples of Shapely Points.
+    """
+
+    width = 4
+
+    def row(self, item):
+        if len(item) == 4:
+            return tuple(float(c) for c in item)
+        start, stop = item
+        if isinstance(start, Point):
+            return start.x, start.y, stop.x, stop.y
+        return float(start[0]), float(start[1]), float(stop[0]), float(stop[1])
+
+    def make_items(self, coords):
+        if points_array is not None:
+            starts = points_array(coords[:, :2])
+            stops = points_array(coords[:, 2:])
+            return list(zip(starts, stops))
+        return [(Point(x1, y1), Point(x2, y2)) for x1, y1, x2, y2 in coords.tolist()]
+
+
+def drill_coordinates(drills):
+    """
+    :param drills:  DrillArray or list of Shapely Points
+    :return:        (N, 2) array with the drill positions
+    """
+    if isinstance(drills, DrillArray):
+        return drills.coords
+    return np.array([(drill.x, drill.y) for drill in drills], dtype=np.float64).reshape(-1, 2)
+
+
+def slot_coordinates(slots):
+    """
+    :param slots:   SlotArray or list of (start, stop) tuples of Shapely Points
+    :return:        (N, 4) array with the start and the stop positions
+    """
+    if isinstance(slots, SlotArray):
+        return slots.coords
+    return np.array([(start.x, start.y, stop.x, stop.y) for start, stop in slots], dtype=np.float64).reshape(-1, 4)
+
+
+def drill_polygons(drills, radius, resolution):
+    """
+    :param drills:      DrillArray or list of Shapely Points
+    :param radius:      radius of the drill tool
+    :param resolution:  number of segments used for a quarter of circle
+    :return:            list of the circles made by the tool at each drill
+    """
+    coords = drill_coordinates(drills)
+    if len(coords) == 0:
+        return []
+
+    # the same circle, made once, is moved at each drill
+    circle = np.asarray(Point(0, 0).buffer(radius, resolution).exterior.coords)
+    if len(circle) == 0:
+        return [Point(xy).buffer(radius, resolution) for xy in coords.tolist()]
+    if points_array is not None:
+        return list(polygons_array(coords[:, None, :] + circle[None, :, :]))
+    return [Polygon(circle + xy) for xy in coords]
+
+
+def slot_polygons(slots, radius, resolution):
+    """
+    :param slots:       SlotArray or list of (start, stop) tuples
+    :param radius:      radius of the slot tool
+    :param resolution:  number of segments used for a quarter of circle
+    :return:            list of the shapes made by the tool along each slot
+    """
+    coords = slot_coordinates(slots)
+    if len(coords) == 0:
+        return []
+    if points_array is not None:
+        return list(buffer_array(linestrings(coords.reshape(-1, 2, 2)), radius, quad_segs=resolution))
+    return [LineString([(x1, y1), (x2, y2)]).buffer(radius, resolution) for x1, y1, x2, y2 in coords.tolist()]
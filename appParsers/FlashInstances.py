@@ -0,0 +1,288 @@
+# ##########################################################
+# FlatCAM: 2D Post-processing for Manufacturing            #
+# Date: 10/18/2026                                         #
+# MIT Licence                                              #
+# ##########################################################
+
+"""
+Template instanced flashes of the Gerber apertures.
+
+The flash of an aperture has the same shape wherever it is made, so the Gerber parser makes it only once, at (0, 0)
+(the template), and stores only the locations of the flashes of the aperture, in an array:
+
+* the flash polygons to join are made in bulk, by moving copies of the template, only when they are needed: at a
+  polarity change and at the end of the parsing, when the buffered geometry is joined; they are not kept
+* the geometry dictionary of a flash (FlashGeometryDict) makes its polygon from the template on first use
+* with the simplification of the Gerber geometry, the template is simplified once instead of every flash
+* the plotting of the marked apertures tessellates the template once and moves its buffers at each flash
+  (ShapeCollectionVisual.add_instances())
+
+This module doesn't import camlib.
+"""
+
+import logging
+
+import numpy as np
+
+from shapely import affinity
+
+try:
+    # Shapely 2.0 can move the coordinates of a whole array of geometries in one call
+    from shapely import transform, get_coordinates
+except ImportError:
+    transform = None
+
+log = logging.getLogger('base')
+
+
+def translate_copies(geometry, offsets):
+    """
+    :param geometry:    Shapely geometry
+    :param offsets:     array of (x, y) offsets
+    :return:            list with a copy of the geometry moved by each offset
+    """
+    offsets = np.asarray(offsets, dtype=np.float64).reshape(-1, 2)
+    if len(offsets) == 0:
+        return []
+
+    if transform is not None:
+        nr_coords = len(get_coordinates(geometry))
+        copies = np.empty(len(offsets), dtype=object)
+        copies[:] = [geometry] * len(offsets)
+        shift = np.repeat(offsets, nr_coords, axis=0)
+        return list(transform(copies, lambda coords: coords + shift))
+
+    return [affinity.translate(geometry, xoff=x, yoff=y) for x, y in offsets.tolist()]
+
+
+class FlashGeometryDict(dict):
+    """
+    The geometry dictionary of a flash made from the flash template of the aperture.
+
+    The flash polygon ('solid' or, for a flash with clear polarity, 'clear') is made from the template, and stored,
+    on first use. Until then the dictionary holds only the 'follow' Point but behaves as if it had the polygon.
+    A copy (copy(), deepcopy(), pickle) is a plain dictionary and doesn't store the polygon in this one.
+    """
+
+    def __init__(self, flashes, index, key, items=()):
+        """
+        :param flashes: the FlashInstances of the aperture
+        :param index:   the index of the flash in the FlashInstances
+        :param key:     'solid' or 'clear'
+        :param items:   the other items of the dictionary ('follow')
+        """
+        super().__init__(items)
+
+        self.flashes = flashes
+        self.index = index
+        self.key = key
+
+        # the polygon made from the template
+        self.made = None
+
+    @property
+    def lazy(self):
+        return self.made is None and not dict.__contains__(self, self.key)
+
+    @property
+    def instanced(self):
+        """
+        :return:    True if the polygon of the flash is (or will be) the one made from the template
+        """
+        return self.lazy or (self.made is not None and dict.get(self, self.key) is self.made)
+
+    def make(self):
+        if self.lazy:
+            self.made = self.flashes.flash(self.index)
+            dict.__setitem__(self, self.key, self.made)
+
+    def __missing__(self, key):
+        if key != self.key or not self.lazy:
+            raise KeyError(key)
+
+        self.make()
+        return dict.__getitem__(self, key)
+
+    def __contains__(self, key):
+        return dict.__contains__(self, key) or (key == self.key and self.lazy)
+
+    def __len__(self):
+        return dict.__len__(self) + int(self.lazy)
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def __iter__(self):
+        self.make()
+        return dict.__iter__(self)
+
+    def keys(self):
+        self.make()
+        return dict.keys(self)
+
+    def values(self):
+        self.make()
+        return dict.values(self)
+
+    def items(self):
+        self.make()
+        return dict.items(self)
+
+    def pop(self, key, *default):
+        self.make()
+        return dict.pop(self, key, *default)
+
+    def __delitem__(self, key):
+        self.make()
+        dict.__delitem__(self, key)
+
+    def copy(self):
+        # the polygon of a copy is made without storing it in this dictionary
+        geo_dict = dict(dict.items(self))
+        if self.lazy:
+            geo_dict[self.key] = self.flashes.flash(self.index)
+        return geo_dict
+
+    def __eq__(self, other):
+        self.make()
+        if isinstance(other, FlashGeometryDict):
+            other.make()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        self.make()
+        return dict.__repr__(self)
+
+    def __reduce_ex__(self, protocol):
+        return dict, (self.copy(),)
+
+
+class FlashInstances:
+    """
+    The flashes of an aperture: the flash geometry made at (0, 0) and the location of each flash.
+
+    The geometry dictionaries of the flashes (the elements of ``apertures[aperture]['geometry']``) are the
+    FlashGeometryDict returned by add(); they make the flash polygon when it is used.
+    """
+
+    def __init__(self, template, simplify_tolerance=None):
+        """
+        :param template:            the flash geometry of the aperture at (0, 0)
+        :param simplify_tolerance:  if not None the geometry returned by make_geometry() for the union is simplified
+        """
+        self.template = template
+        self.simplify_tolerance = simplify_tolerance
+        self._simplified = None
+
+        # the (x, y) locations of the flashes; the array grows by doubling, only the first len(self) rows are used
+        self._locations = np.empty((16, 2), dtype=np.float64)
+        self._count = 0
+        self._elements = []
+
+        # the number of flashes whose geometry to join is already made
+        self._done = 0
+
+    @property
+    def is_empty(self):
+        return self.template is None or self.template.is_empty
+
+    @property
+    def locations(self):
+        """
+        :return:    array of the (x, y) locations of the flashes
+        """
+        return self._locations[:self._count]
+
+    def __len__(self):
+        return self._count
+
+    def add(self, x, y, geo_dict, dark=True):
+        """
+        Records a flash.
+
+        :param x:           X coordinate of the flash
+        :param y:           Y coordinate of the flash
+        :param geo_dict:    the geometry dictionary of the flash (with the 'follow' Point)
+        :param dark:        False for a flash with clear polarity
+        :return:            the geometry dictionary to store in the aperture: a FlashGeometryDict with the items of
+                            geo_dict that makes its 'solid' (or 'clear') polygon on first use
+        """
+        if self._count == len(self._locations):
+            self._locations = np.concatenate((self._locations, np.empty_like(self._locations)))
+        self._locations[self._count] = (x, y)
+
+        flash_dict = FlashGeometryDict(self, self._count, 'solid' if dark else 'clear', geo_dict)
+        self._elements.append(flash_dict)
+        self._count += 1
+        return flash_dict
+
+    def flash(self, index):
+        """
+        :param index:   the index of a flash
+        :return:        the geometry of the flash, made from the template
+        """
+        return translate_copies(self.template, self._locations[index])[0]
+
+    def affine(self, matrix):
+        """
+        Transforms the flashes whose polygon is not made yet: the template is transformed without the offset and
+        the locations with it.
+
+        :param matrix:  [a, b, d, e, xoff, yoff] as for shapely.affinity.affine_transform()
+        :return:        None
+        """
+        a, b, d, e, xoff, yoff = matrix
+        self.template = affinity.affine_transform(self.template, [a, b, d, e, 0.0, 0.0])
+        self._simplified = None
+
+        pts = self.locations
+        self._locations = np.column_stack((a * pts[:, 0] + b * pts[:, 1] + xoff, d * pts[:, 0] + e * pts[:, 1] + yoff))
+
+    @property
+    def pending(self):
+        return self._count - self._done
+
+    def make_geometry(self):
+        """
+        Makes the geometry of the flashes recorded since the last call, to be joined by the parser. The geometry is
+        not stored in the geometry dictionaries of the flashes.
+
+        :return:    list with the geometry of the new flashes (simplified if the simplification tolerance is set)
+        """
+        start = self._done
+        self._done = self._count
+        if start == self._done:
+            return []
+
+        template = self.template
+        if self.simplify_tolerance is not None:
+            if self._simplified is None:
+                self._simplified = self.template.simplify(self.simplify_tolerance)
+            template = self._simplified
+        return translate_copies(template, self._locations[start:self._count])
+
+    def instances(self, elements):
+        """
+        The flashes that can be drawn by moving the template.
+
+        :param elements:    the geometry dictionaries of the aperture (``apertures[aperture]['geometry']``)
+        :return:            (array of the (x, y) locations of the dark flashes, set with the id() of their geometry
+                            dictionaries) or None if the geometry of a flash is no longer the one made from the
+                            template (e.g. the object was transformed) or is not in the elements
+        """
+        if self.pending or self.is_empty:
+            return None
+
+        current = {id(geo_dict) for geo_dict in elements}
+        dark = []
+        ids = set()
+        for geo_dict in self._elements:
+            if id(geo_dict) not in current or not geo_dict.instanced:
+                return None
+            if geo_dict.key == 'solid':
+                dark.append(geo_dict.index)
+                ids.add(id(geo_dict))
+        return self.locations[dark].reshape(-1, 2), ids
@@ -7,9 +7,11 @@
 # ########################################################## ##
 
 from camlib import Geometry, grace
+from appParsers.DrillArrays import DrillArray, SlotArray, drill_coordinates, slot_coordinates, drill_polygons, \
+    slot_polygons
+from appCommon.GeometryTransform import affine_params, translate_matrix, scale_matrix, mirror_matrix, rotate_matrix, \
+    skew_matrix
 
-import shapely.affinity as affinity
-from shapely.geometry import Point, LineString
 import numpy as np
 
 import re
@@ -41,8 +43,9 @@ class Excellon(Geometry):
     Key               Value
     ================  ====================================
     tooldia           Diameter of the tool
-    drills            List that store the Shapely Points for drill points
-    slots             List that store the Shapely Points for slots. Each is a tuple: (start_point, stop_point)
+    drills            DrillArray (or list) that store the Shapely Points for drill points
+    slots             SlotArray (or list) that store the Shapely Points for slots. Each is a tuple:
+                      (start_point, stop_point)
     data              dictionary which holds the options for each tool
     solid_geometry    Geometry list for each tool
     ================  ====================================
@@ -545,16 +548,13 @@ class Excellon(Geometry):
                             )
 
                             # ----------  add a slot  ------------ #
-                            slot = (
-                                Point(slot_start_x, slot_start_y),
-                                Point(slot_stop_x, slot_stop_y)
-                            )
+                            slot = (slot_start_x, slot_start_y, slot_stop_x, slot_stop_y)
                             if current_tool not in self.tools:
                                 self.tools[current_tool] = {}
                             if 'slots' in self.tools[current_tool]:
                                 self.tools[current_tool]['slots'].append(slot)
                             else:
-                                self.tools[current_tool]['slots'] = [slot]
+                                self.tools[current_tool]['slots'] = SlotArray([slot])
                             continue
 
                         # Slot coordinates with period: Use literally. ###
@@ -619,16 +619,13 @@ class Excellon(Geometry):
                             )
 
                             # ----------  add a Slot  ------------ #
-                            slot = (
-                                Point(slot_start_x, slot_start_y),
-                                Point(slot_stop_x, slot_stop_y)
-                            )
+                            slot = (slot_start_x, slot_start_y, slot_stop_x, slot_stop_y)
                             if current_tool not in self.tools:
                                 self.tools[current_tool] = {}
                             if 'slots' in self.tools[current_tool]:
                                 self.tools[current_tool]['slots'].append(slot)
                             else:
-                                self.tools[current_tool]['slots'] = [slot]
+                                self.tools[current_tool]['slots'] = SlotArray([slot])
                         continue
 
                     # ## Coordinates without period # ##
@@ -661,9 +658,9 @@ class Excellon(Geometry):
                                 if current_tool not in self.tools:
                                     self.tools[current_tool] = {}
                                 if 'drills' in self.tools[current_tool]:
-                                    self.tools[current_tool]['drills'].append(Point((coordx, coordy)))
+                                    self.tools[current_tool]['drills'].append((coordx, coordy))
                                 else:
-                                    self.tools[current_tool]['drills'] = [Point((coordx, coordy))]
+                                    self.tools[current_tool]['drills'] = DrillArray([(coordx, coordy)])
 
                                 repeat -= 1
                             current_x = coordx
@@ -715,16 +712,13 @@ class Excellon(Geometry):
                                     slot_stop_y = y
 
                                     # ----------  add a Slot  ------------ #
-                                    slot = (
-                                        Point(slot_start_x, slot_start_y),
-                                        Point(slot_stop_x, slot_stop_y)
-                                    )
+                                    slot = (slot_start_x, slot_start_y, slot_stop_x, slot_stop_y)
                                     if current_tool not in self.tools:
                                         self.tools[current_tool] = {}
                                     if 'slots' in self.tools[current_tool]:
                                         self.tools[current_tool]['slots'].append(slot)
                                     else:
-                                        self.tools[current_tool]['slots'] = [slot]
+                                        self.tools[current_tool]['slots'] = SlotArray([slot])
                                     continue
 
                             if self.match_routing_start is None and self.match_routing_stop is None:
@@ -735,9 +729,9 @@ class Excellon(Geometry):
                                 if current_tool not in self.tools:
                                     self.tools[current_tool] = {}
                                 if 'drills' in self.tools[current_tool]:
-                                    self.tools[current_tool]['drills'].append(Point((x, y)))
+                                    self.tools[current_tool]['drills'].append((x, y))
                                 else:
-                                    self.tools[current_tool]['drills'] = [Point((x, y))]
+                                    self.tools[current_tool]['drills'] = DrillArray([(x, y)])
                                 # log.debug("{:15} {:8} {:8}".format(eline, x, y))
                                 continue
 
@@ -795,16 +789,13 @@ class Excellon(Geometry):
                                 slot_stop_y = y
 
                                 # ----------  add a Slot  ------------ #
-                                slot = (
-                                    Point(slot_start_x, slot_start_y),
-                                    Point(slot_stop_x, slot_stop_y)
-                                )
+                                slot = (slot_start_x, slot_start_y, slot_stop_x, slot_stop_y)
                                 if current_tool not in self.tools:
                                     self.tools[current_tool] = {}
                                 if 'slots' in self.tools[current_tool]:
                                     self.tools[current_tool]['slots'].append(slot)
                                 else:
-                                    self.tools[current_tool]['slots'] = [slot]
+                                    self.tools[current_tool]['slots'] = SlotArray([slot])
                                 continue
 
                         if self.match_routing_start is None and self.match_routing_stop is None:
@@ -817,9 +808,9 @@ class Excellon(Geometry):
                                 if current_tool not in self.tools:
                                     self.tools[current_tool] = {}
                                 if 'drills' in self.tools[current_tool]:
-                                    self.tools[current_tool]['drills'].append(Point((x, y)))
+                                    self.tools[current_tool]['drills'].append((x, y))
                                 else:
-                                    self.tools[current_tool]['drills'] = [Point((x, y))]
+                                    self.tools[current_tool]['drills'] = DrillArray([(x, y)])
                             else:
                                 coordx = x
                                 coordy = y
@@ -833,9 +824,9 @@ class Excellon(Geometry):
                                     if current_tool not in self.tools:
                                         self.tools[current_tool] = {}
                                     if 'drills' in self.tools[current_tool]:
-                                        self.tools[current_tool]['drills'].append(Point((coordx, coordy)))
+                                        self.tools[current_tool]['drills'].append((coordx, coordy))
                                     else:
-                                        self.tools[current_tool]['drills'] = [Point((coordx, coordy))]
+                                        self.tools[current_tool]['drills'] = DrillArray([(coordx, coordy)])
 
                                     repeat -= 1
                             repeating_x = repeating_y = 0
@@ -962,9 +953,9 @@ class Excellon(Geometry):
             # Even if there are not drills or slots I just add the storage there with an empty list
             for tool in self.tools:
                 if 'drills' not in self.tools[tool]:
-                    self.tools[tool]['drills'] = []
+                    self.tools[tool]['drills'] = DrillArray()
                 if 'slots' not in self.tools[tool]:
-                    self.tools[tool]['slots'] = []
+                    self.tools[tool]['slots'] = SlotArray()
 
             log.info("Zeros: %s, Units %s." % (self.zeros, self.units))
         except Exception:
@@ -1051,34 +1042,25 @@ class Excellon(Geometry):
                 self.tools[tool]['solid_geometry'] = []
                 self.tools[tool]['data'] = {}
 
+            resolution = int(int(self.geo_steps_per_circle) / 4)
             for tool in self.tools:
-                tooldia = self.tools[tool]['tooldia']
+                radius = self.tools[tool]['tooldia'] / 2.0
 
+                # the circles and the slot shapes are made for all the tool at once
+                polys = []
                 if 'drills' in self.tools[tool]:
-                    for drill in self.tools[tool]['drills']:
-                        poly = drill.buffer(tooldia / 2.0, int(int(self.geo_steps_per_circle) / 4))
-
-                        # add poly in the tools geometry
-                        self.tools[tool]['solid_geometry'].append(poly)
-                        self.tools[tool]['data'] = deepcopy(self.default_data)
-
-                        # add poly to the total solid geometry
-                        self.solid_geometry.append(poly)
-
+                    polys += drill_polygons(self.tools[tool]['drills'], radius, resolution)
                 if 'slots' in self.tools[tool]:
-                    for slot in self.tools[tool]['slots']:
-                        start = slot[0]
-                        stop = slot[1]
+                    polys += slot_polygons(self.tools[tool]['slots'], radius, resolution)
 
-                        lines_string = LineString([start, stop])
-                        poly = lines_string.buffer(tooldia / 2.0, int(int(self.geo_steps_per_circle) / 4))
+                if polys:
+                    self.tools[tool]['data'] = deepcopy(self.default_data)
 
-                        # add poly in the tools geometry
-                        self.tools[tool]['solid_geometry'].append(poly)
-                        self.tools[tool]['data'] = deepcopy(self.default_data)
+                # add polys in the tools geometry
+                self.tools[tool]['solid_geometry'] += polys
 
-                        # add poly to the total solid geometry
-                        self.solid_geometry.append(poly)
+                # add polys to the total solid geometry
+                self.solid_geometry += polys
 
         except Exception as e:
             log.debug("appParsers.ParseExcellon.Excellon.create_geometry() -> "
@@ -1180,6 +1162,50 @@ class Excellon(Geometry):
         self.create_geometry()
         return factor
 
+    def transform_drills(self, matrix):
+        """
+        Transforms the drills and the slots of all the tools (the arrays of coordinates, at once) and makes the
+        geometry again from them.
+
+        :param matrix:  [a, b, d, e, xoff, yoff] as for shapely.affinity.affine_transform()
+        :return:        None
+        """
+        # variables to display the percentage of work done
+        self.geo_len = 0
+        try:
+            self.geo_len = len(self.tools)
+        except TypeError:
+            self.geo_len = 1
+        self.old_disp_number = 0
+        self.el_count = 0
+
+        for tool in self.tools:
+            # Transform Drills
+            if 'drills' in self.tools[tool]:
+                self.tools[tool]['drills'] = DrillArray(drill_coordinates(self.tools[tool]['drills'])).affine(matrix)
+
+            # Transform Slots
+            if 'slots' in self.tools[tool]:
+                self.tools[tool]['slots'] = SlotArray(slot_coordinates(self.tools[tool]['slots'])).affine(matrix)
+
+            # update status display
+            self.el_count += 1
+            disp_number = int(np.interp(self.el_count, [0, self.geo_len], [0, 100]))
+            if self.old_disp_number < disp_number <= 100:
+                self.app.proc_container.update_view_text(' %d%%' % disp_number)
+                self.old_disp_number = disp_number
+
+        # Recreate geometry: the solid_geometry of the tools is made from the drills and the slots
+        self.create_geometry()
+        self.app.proc_container.new_text = ''
+
+    def affine_targets(self):
+        # the drills and the slots are transformed, the geometry is made again from them
+        return [(self, 'tools')]
+
+    def apply_affine(self, matrix, targets):
+        self.transform_drills(affine_params(matrix))
+
     def scale(self, xfactor, yfactor=None, point=None):
         """
         Scales geometry on the XY plane in the object by a given factor.
@@ -1207,57 +1233,7 @@ class Excellon(Geometry):
         if xfactor == 0 and yfactor == 0:
             return
 
-        def scale_geom(obj):
-            if type(obj) is list:
-                new_obj = []
-                for g in obj:
-                    new_obj.append(scale_geom(g))
-                return new_obj
-            else:
-                try:
-                    return affinity.scale(obj, xfactor, yfactor, origin=(px, py))
-                except AttributeError:
-                    return obj
-
-        # variables to display the percentage of work done
-        self.geo_len = 0
-        try:
-            self.geo_len = len(self.tools)
-        except TypeError:
-            self.geo_len = 1
-        self.old_disp_number = 0
-        self.el_count = 0
-
-        for tool in self.tools:
-            # Scale Drills
-            if 'drills' in self.tools[tool]:
-                new_drills = []
-                for drill in self.tools[tool]['drills']:
-                    new_drills.append(affinity.scale(drill, xfactor, yfactor, origin=(px, py)))
-                self.tools[tool]['drills'] = new_drills
-
-            # Scale Slots
-            if 'slots' in self.tools[tool]:
-                new_slots = []
-                for slot in self.tools[tool]['slots']:
-                    new_start = affinity.scale(slot[0], xfactor, yfactor, origin=(px, py))
-                    new_stop = affinity.scale(slot[1], xfactor, yfactor, origin=(px, py))
-                    new_slot = (new_start, new_stop)
-                    new_slots.append(new_slot)
-                self.tools[tool]['slots'] = new_slots
-
-            # Scale solid_geometry
-            self.tools[tool]['solid_geometry'] = scale_geom(self.tools[tool]['solid_geometry'])
-
-            # update status display
-            self.el_count += 1
-            disp_number = int(np.interp(self.el_count, [0, self.geo_len], [0, 100]))
-            if self.old_disp_number < disp_number <= 100:
-                self.app.proc_container.update_view_text(' %d%%' % disp_number)
-                self.old_disp_number = disp_number
-
-        self.create_geometry()
-        self.app.proc_container.new_text = ''
+        self.transform_geometry(scale_matrix(xfactor, yfactor, origin=(px, py)), self.affine_targets())
 
     def offset(self, vect):
         """
@@ -1274,58 +1250,7 @@ class Excellon(Geometry):
         if dx == 0 and dy == 0:
             return
 
-        def offset_geom(obj):
-            try:
-                new_obj = []
-                for geo in obj:
-                    new_obj.append(offset_geom(geo))
-                return new_obj
-            except TypeError:
-                try:
-                    return affinity.translate(obj, xoff=dx, yoff=dy)
-                except AttributeError:
-                    return obj
-
-        # variables to display the percentage of work done
-        self.geo_len = 0
-        try:
-            self.geo_len = len(self.tools)
-        except TypeError:
-            self.geo_len = 1
-        self.old_disp_number = 0
-        self.el_count = 0
-
-        for tool in self.tools:
-            # Offset Drills
-            if 'drills' in self.tools[tool]:
-                new_drills = []
-                for drill in self.tools[tool]['drills']:
-                    new_drills.append(affinity.translate(drill, xoff=dx, yoff=dy))
-                self.tools[tool]['drills'] = new_drills
-
-            # Offset Slots
-            if 'slots' in self.tools[tool]:
-                new_slots = []
-                for slot in self.tools[tool]['slots']:
-                    new_start = affinity.translate(slot[0], xoff=dx, yoff=dy)
-                    new_stop = affinity.translate(slot[1], xoff=dx, yoff=dy)
-                    new_slot = (new_start, new_stop)
-                    new_slots.append(new_slot)
-                self.tools[tool]['slots'] = new_slots
-
-            # Offset solid_geometry
-            self.tools[tool]['solid_geometry'] = offset_geom(self.tools[tool]['solid_geometry'])
-
-            # update status display
-            self.el_count += 1
-            disp_number = int(np.interp(self.el_count, [0, self.geo_len], [0, 100]))
-            if self.old_disp_number < disp_number <= 100:
-                self.app.proc_container.update_view_text(' %d%%' % disp_number)
-                self.old_disp_number = disp_number
-
-        # Recreate geometry
-        self.create_geometry()
-        self.app.proc_container.new_text = ''
+        self.transform_geometry(translate_matrix(dx, dy), self.affine_targets())
 
     def mirror(self, axis, point):
         """
@@ -1338,63 +1263,7 @@ class Excellon(Geometry):
         """
         log.debug("appParsers.ParseExcellon.Excellon.mirror()")
 
-        px, py = point
-        xscale, yscale = {"X": (1.0, -1.0), "Y": (-1.0, 1.0)}[axis]
-
-        def mirror_geom(obj):
-            try:
-                new_obj = []
-                for geo in obj:
-                    new_obj.append(mirror_geom(geo))
-                return new_obj
-            except TypeError:
-                try:
-                    return affinity.scale(obj, xscale, yscale, origin=(px, py))
-                except AttributeError:
-                    return obj
-
-        # Modify data
-
-        # variables to display the percentage of work done
-        self.geo_len = 0
-        try:
-            self.geo_len = len(self.tools)
-        except TypeError:
-            self.geo_len = 1
-        self.old_disp_number = 0
-        self.el_count = 0
-
-        for tool in self.tools:
-            # Offset Drills
-            if 'drills' in self.tools[tool]:
-                new_drills = []
-                for drill in self.tools[tool]['drills']:
-                    new_drills.append(affinity.scale(drill, xscale, yscale, origin=(px, py)))
-                self.tools[tool]['drills'] = new_drills
-
-            # Offset Slots
-            if 'slots' in self.tools[tool]:
-                new_slots = []
-                for slot in self.tools[tool]['slots']:
-                    new_start = affinity.scale(slot[0], xscale, yscale, origin=(px, py))
-                    new_stop = affinity.scale(slot[1], xscale, yscale, origin=(px, py))
-                    new_slot = (new_start, new_stop)
-                    new_slots.append(new_slot)
-                self.tools[tool]['slots'] = new_slots
-
-            # Offset solid_geometry
-            self.tools[tool]['solid_geometry'] = mirror_geom(self.tools[tool]['solid_geometry'])
-
-            # update status display
-            self.el_count += 1
-            disp_number = int(np.interp(self.el_count, [0, self.geo_len], [0, 100]))
-            if self.old_disp_number < disp_number <= 100:
-                self.app.proc_container.update_view_text(' %d%%' % disp_number)
-                self.old_disp_number = disp_number
-
-        # Recreate geometry
-        self.create_geometry()
-        self.app.proc_container.new_text = ''
+        self.transform_geometry(mirror_matrix(axis, point), self.affine_targets())
 
     def skew(self, angle_x=None, angle_y=None, point=None):
         """
@@ -1422,62 +1291,10 @@ class Excellon(Geometry):
         if angle_x == 0 and angle_y == 0:
             return
 
-        def skew_geom(obj):
-            try:
-                new_obj = []
-                for g in obj:
-                    new_obj.append(skew_geom(g))
-                return new_obj
-            except TypeError:
-                try:
-                    return affinity.skew(obj, angle_x, angle_y, origin=(px, py))
-                except AttributeError:
-                    return obj
-
-        # variables to display the percentage of work done
-        self.geo_len = 0
-        try:
-            self.geo_len = len(self.tools)
-        except TypeError:
-            self.geo_len = 1
-        self.old_disp_number = 0
-        self.el_count = 0
-
         if point is None:
-            px, py = 0, 0
-        else:
-            px, py = point
+            point = (0, 0)
 
-        for tool in self.tools:
-            # Offset Drills
-            if 'drills' in self.tools[tool]:
-                new_drills = []
-                for drill in self.tools[tool]['drills']:
-                    new_drills.append(affinity.skew(drill, angle_x, angle_y, origin=(px, py)))
-                self.tools[tool]['drills'] = new_drills
-
-            # Offset Slots
-            if 'slots' in self.tools[tool]:
-                new_slots = []
-                for slot in self.tools[tool]['slots']:
-                    new_start = affinity.skew(slot[0], angle_x, angle_y, origin=(px, py))
-                    new_stop = affinity.skew(slot[1], angle_x, angle_y, origin=(px, py))
-                    new_slot = (new_start, new_stop)
-                    new_slots.append(new_slot)
-                self.tools[tool]['slots'] = new_slots
-
-            # Offset solid_geometry
-            self.tools[tool]['solid_geometry'] = skew_geom(self.tools[tool]['solid_geometry'])
-
-            # update status display
-            self.el_count += 1
-            disp_number = int(np.interp(self.el_count, [0, self.geo_len], [0, 100]))
-            if self.old_disp_number < disp_number <= 100:
-                self.app.proc_container.update_view_text(' %d%%' % disp_number)
-                self.old_disp_number = disp_number
-
-        self.create_geometry()
-        self.app.proc_container.new_text = ''
+        self.transform_geometry(skew_matrix(angle_x, angle_y, point), self.affine_targets())
 
     def rotate(self, angle, point=None):
         """
@@ -1492,68 +1309,12 @@ class Excellon(Geometry):
         if angle == 0:
             return
 
-        def rotate_geom(obj, origin=None):
-            if type(obj) is list:
-                new_obj = []
-                for g in obj:
-                    new_obj.append(rotate_geom(g))
-                return new_obj
-            else:
-                if origin:
-                    try:
-                        return affinity.rotate(obj, angle, origin=origin)
-                    except AttributeError:
-                        return obj
-                else:
-                    try:
-                        return affinity.rotate(obj, angle, origin=orig)
-                    except AttributeError:
-                        return obj
-
-        # variables to display the percentage of work done
-        self.geo_len = 0
-        try:
-            self.geo_len = len(self.tools)
-        except TypeError:
-            self.geo_len = 1
-        self.old_disp_number = 0
-        self.el_count = 0
-
         if point is None:
-            orig = 'center'
-        else:
-            orig = point
-
-        for tool in self.tools:
-            # Offset Drills
-            if 'drills' in self.tools[tool]:
-                new_drills = []
-                for drill in self.tools[tool]['drills']:
-                    new_drills.append(affinity.rotate(drill, angle, origin=orig))
-                self.tools[tool]['drills'] = new_drills
-
-            # Offset Slots
-            if 'slots' in self.tools[tool]:
-                new_slots = []
-                for slot in self.tools[tool]['slots']:
-                    new_start = affinity.rotate(slot[0], angle, origin=orig)
-                    new_stop = affinity.rotate(slot[1], angle, origin=orig)
-                    new_slot = (new_start, new_stop)
-                    new_slots.append(new_slot)
-                self.tools[tool]['slots'] = new_slots
-
-            # Offset solid_geometry
-            self.tools[tool]['solid_geometry'] = rotate_geom(self.tools[tool]['solid_geometry'], origin=orig)
-
-            # update status display
-            self.el_count += 1
-            disp_number = int(np.interp(self.el_count, [0, self.geo_len], [0, 100]))
-            if self.old_disp_number < disp_number <= 100:
-                self.app.proc_container.update_view_text(' %d%%' % disp_number)
-                self.old_disp_number = disp_number
+            # each drill and each slot end is rotated around its own center so the positions don't change
+            self.transform_geometry(translate_matrix(0.0, 0.0), self.affine_targets())
+            return
 
-        self.create_geometry()
-        self.app.proc_container.new_text = ''
+        self.transform_geometry(rotate_matrix(angle, point), self.affine_targets())
 
     def buffer(self, distance, join, factor):
         """
@@ -1568,29 +1329,8 @@ class Excellon(Geometry):
         if distance == 0:
             return
 
-        def buffer_geom(obj):
-            try:
-                new_obj = []
-                for g in obj:
-                    new_obj.append(buffer_geom(g))
-                return new_obj
-            except TypeError:
-                try:
-                    if factor is None:
-                        return obj.buffer(distance, resolution=self.geo_steps_per_circle)
-                    else:
-                        return affinity.scale(obj, xfact=distance, yfact=distance, origin='center')
-                except AttributeError:
-                    return obj
-
-        # buffer solid_geometry
-        for tool, tool_dict in list(self.tools.items()):
-            res = buffer_geom(tool_dict['solid_geometry'])
-            try:
-                __ = iter(res)
-                self.tools[tool]['solid_geometry'] = res
-            except TypeError:
-                self.tools[tool]['solid_geometry'] = [res]
+        # the solid_geometry of the tools is made again from the drills and the slots with the new diameters
+        for tool in self.tools:
             if factor is None:
                 self.tools[tool]['tooldia'] += distance
             else:
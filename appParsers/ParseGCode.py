@@ -0,0 +1,522 @@
+# ##########################################################
+# FlatCAM: 2D Post-processing for Manufacturing            #
+# Date: 10/18/2026                                         #
+# MIT Licence                                              #
+# ##########################################################
+
+"""
+Array based G-code parser.
+
+The G-code is tokenized in chunks of lines with a single regular expression and the codes used for plotting
+(G, X, Y, Z, I, J) are stored in NumPy arrays, one value for each line. The modal state (current G, X, Y, Z) is
+found with a forward fill of those arrays and the paths are made by slicing the array of visited positions where
+the tool changes height, the same way CNCjob.gcode_parse() splits them.
+
+The result, ``ParsedGCode``, keeps the vertices of the paths in a single array. It behaves like the list of
+{'geom': LineString, 'kind': ['C', 'F']} dictionaries made by CNCjob.gcode_parse(); the Shapely geometry is made
+only when that list is used (and then it is kept, so changes made to its elements are not lost). The plotting code
+can get the geometry of a kind directly from the arrays, without the list.
+
+Only the G-code made by the preprocessors that use the G, X, Y, Z codes can be parsed here; the Roland, HPGL,
+laser and solder paste preprocessors still use CNCjob.codes_split().
+"""
+
+import re
+import logging
+
+import numpy as np
+
+from shapely.geometry import LineString, MultiLineString, Point, Polygon
+
+try:
+    # Shapely 2.0 can make a whole array of geometries in one call
+    from shapely import linestrings, points, buffer as buffer_array, simplify as simplify_array, get_exterior_ring
+except ImportError:
+    linestrings = None
+
+log = logging.getLogger('base')
+
+# T=travel, C=cut, F=fast, S=slow; the kind code is 2 * travel + slow
+KINDS = (('C', 'F'), ('C', 'S'), ('T', 'F'), ('T', 'S'))
+
+CODES = ('G', 'X', 'Y', 'Z', 'I', 'J')
+
+NEWLINE = len(CODES)
+CODE_REPLACEMENTS = [(code, '%d ' % idx) for idx, code in enumerate(CODES)] + [('\n', '%d 0' % NEWLINE)]
+
+TOKEN_RE = re.compile(r'[GXYZIJ][ \t]*[-+]?(?:\d+\.?\d*|\.\d+)|\n')
+COMMENT_RE = re.compile(r'\([^\n)]*\)|;[^\n]*')
+
+
+def is_gerber_like(text):
+    """
+    :param text:    the G-code text
+    :return:        True if the text looks like a Gerber file (CNCjob.gcode_parse() refuses to parse it)
+    """
+    return '%' in text or 'MOIN' in text or 'MOMM' in text
+
+
+def ffill(values, initial):
+    """
+    Replace each NaN with the last value that is not NaN before it.
+
+    :param values:  1D numpy array of floats
+    :param initial: value used before the first value that is not NaN
+    :return:        numpy array
+    """
+    idx = np.where(np.isnan(values), 0, np.arange(1, len(values) + 1))
+    np.maximum.accumulate(idx, out=idx)
+    return np.concatenate(([initial], values))[idx]
+
+
+class GCodeArrayParser:
+    """
+    Incremental parser. The text is given with feed(), in pieces of any size, and close() returns the ParsedGCode.
+    """
+
+    # size in characters of the text tokenized at once
+    chunk_size = 1 << 22
+
+    def __init__(self, start_xy=(0, 0), steps_per_circle=64, decimals=4, hole_dia=None, hole_dias=None):
+        """
+        :param start_xy:            (x, y) position of the tool before the first move
+        :param steps_per_circle:    number of segments used for a full circle when the G2/G3 arcs are converted
+        :param decimals:            number of decimals used to round the coordinates of the drilled holes
+        :param hole_dia:            every plunge (Z < 0) makes a hole with this diameter
+        :param hole_dias:           dictionary {(x, y) rounded to decimals: diameter}; a plunge makes a hole only
+                                    where a diameter is found
+        """
+        self.start_xy = (float(start_xy[0]), float(start_xy[1]))
+        self.steps_per_circle = int(steps_per_circle)
+        self.decimals = decimals
+        self.hole_dia = hole_dia
+        self.hole_dias = hole_dias
+
+        self.tail = ''
+        self.nr_lines = 0
+        self.lines = []
+        self.values = {code: [] for code in CODES}
+
+    def feed(self, text):
+        """
+        :param text:    the next piece of G-code text
+        :return:        None
+        """
+        text = self.tail + text
+        start = 0
+        while len(text) - start > self.chunk_size:
+            end = text.find('\n', start + self.chunk_size)
+            if end == -1:
+                break
+            self.tokenize(text[start:end + 1])
+            start = end + 1
+
+        end = text.rfind('\n', start)
+        if end == -1:
+            self.tail = text[start:]
+        else:
+            self.tokenize(text[start:end + 1])
+            self.tail = text[end + 1:]
+
+    def tokenize(self, chunk):
+        line_offset = self.nr_lines
+        self.nr_lines += chunk.count('\n')
+
+        tokens = TOKEN_RE.findall(COMMENT_RE.sub('', chunk))
+        if not tokens:
+            return
+
+        # each token becomes a pair of numbers: the index of the code (NEWLINE for the end of a line) and its value;
+        # all the numbers are then converted by NumPy at once
+        text = ' '.join(tokens)
+        for code, replacement in CODE_REPLACEMENTS:
+            text = text.replace(code, replacement)
+        pairs = np.array(text.split(), dtype=float).reshape(-1, 2)
+
+        codes = pairs[:, 0].astype(np.int64)
+        newline = codes == NEWLINE
+        line = np.cumsum(newline) + line_offset
+        keep = ~newline
+        if not keep.any():
+            return
+
+        codes = codes[keep]
+        values = pairs[keep, 1]
+        line = line[keep]
+
+        # the lines are in order; owner is the index of the line of each token in line_ids
+        new_line = np.concatenate(([True], line[1:] != line[:-1]))
+        line_ids = line[new_line]
+        owner = np.cumsum(new_line) - 1
+
+        self.lines.append(line_ids)
+        for idx, code in enumerate(CODES):
+            code_values = np.full(len(line_ids), np.nan)
+            found = codes == idx
+            # when a code is repeated in a line the last one is used
+            code_values[owner[found]] = values[found]
+            self.values[code].append(code_values)
+
+    def close(self):
+        """
+        :return:    ParsedGCode
+        """
+        if self.tail:
+            self.tokenize(self.tail + '\n')
+            self.tail = ''
+
+        if self.lines:
+            columns = {code: np.concatenate(self.values[code]) for code in CODES}
+        else:
+            columns = {code: np.empty(0) for code in CODES}
+
+        return self.build(columns)
+
+    def build(self, c):
+        result = ParsedGCode()
+
+        # ## Units; the lines that set the units are not used for anything else
+        units_rows = np.isin(c['G'], (20.0, 21.0))
+        if units_rows.any():
+            result.units = {20.0: "IN", 21.0: "MM"}[c['G'][np.flatnonzero(units_rows)[-1]]]
+            c = {code: v[~units_rows] for code, v in c.items()}
+
+        nr_rows = len(c['G'])
+        has_x = ~np.isnan(c['X'])
+        has_y = ~np.isnan(c['Y'])
+        has_z = ~np.isnan(c['Z'])
+
+        g_cur = ffill(c['G'], 0.0).astype(np.int64)
+        z_cur = ffill(c['Z'], 0.0)
+        x_cur = ffill(c['X'], 0.0)
+        y_cur = ffill(c['Y'], 0.0)
+        x_prev = np.concatenate(([0.0], x_cur[:-1]))
+        y_prev = np.concatenate(([0.0], y_cur[:-1]))
+
+        move = has_x | has_y
+        kind_code = 2 * (z_cur > 0) + (g_cur > 0)
+
+        # ## Holes: made where the tool plunges, before the move on the same line
+        z_rows = np.flatnonzero(has_z)
+        hole_rows = []
+        hole_centers = []
+        hole_dia = []
+        if self.hole_dia is not None or self.hole_dias:
+            for row in np.flatnonzero(has_z & (z_cur < 0)).tolist():
+                center = (
+                    float('%.*f' % (self.decimals, x_prev[row])),
+                    float('%.*f' % (self.decimals, y_prev[row]))
+                )
+                dia = self.hole_dia if self.hole_dia is not None else self.hole_dias.get(center)
+                if dia is None:
+                    continue
+                hole_rows.append(row)
+                hole_centers.append(center)
+                hole_dia.append(dia)
+        hole_rows = np.asarray(hole_rows, dtype=np.int64)
+
+        # ## Kind of the path; set by the last move and reset by a hole
+        events = np.full(nr_rows, np.nan)
+        events[hole_rows] = 0
+        events[move] = kind_code[move]
+        kind_after = ffill(events, 0.0).astype(np.int64)
+
+        # ## Positions visited by the tool, in the order of the lines
+        linear_rows = np.flatnonzero(move & ((g_cur == 0) | (g_cur == 1)))
+        pts = np.column_stack((x_cur[linear_rows], y_cur[linear_rows]))
+        pt_rows = linear_rows
+
+        arc_rows = np.flatnonzero(move & ((g_cur == 2) | (g_cur == 3)))
+        if len(arc_rows):
+            pts, pt_rows = self.add_arcs(c, arc_rows, g_cur, x_cur, y_cur, x_prev, y_prev, pts, pt_rows)
+
+        vertices = np.vstack((np.asarray([self.start_xy]), pts.reshape(-1, 2)))
+
+        # ## Paths: the visited positions are split where the tool changes height
+        breaks = np.searchsorted(pt_rows, z_rows, side='left')
+        seg_start = np.concatenate(([0], breaks))
+        seg_end = np.concatenate((breaks, [len(pts)]))
+        seg_row = np.concatenate((z_rows, [nr_rows]))
+        seg_kind = np.concatenate((np.where(z_rows > 0, kind_after[np.maximum(z_rows - 1, 0)], 0),
+                                   [kind_after[-1] if nr_rows else 0]))
+
+        used = seg_end > seg_start
+        result.vertices = vertices
+        result.path_start = seg_start[used]
+        # the path begins with the last position of the previous path
+        result.path_end = seg_end[used] + 1
+        result.path_kind = seg_kind[used].astype(np.int8)
+        result.hole_center = np.asarray(hole_centers, dtype=np.float64).reshape(-1, 2)
+        result.hole_dia = np.asarray(hole_dia, dtype=np.float64)
+
+        # ## Order of the elements: for each height change the path that ends there and then the hole
+        entry_row = np.concatenate((seg_row[used], hole_rows))
+        entry_sub = np.concatenate((np.zeros(used.sum(), dtype=np.int64), np.ones(len(hole_rows), dtype=np.int64)))
+        entry_index = np.concatenate((np.arange(used.sum()), -1 - np.arange(len(hole_rows))))
+        result.entries = entry_index[np.lexsort((entry_sub, entry_row))]
+        return result
+
+    def add_arcs(self, c, arc_rows, g_cur, x_cur, y_cur, x_prev, y_prev, pts, pt_rows):
+        # the arcs are rare in the G-code made by FlatCAM; they are converted with the same function as before
+        from camlib import arc
+
+        arcdir = [None, None, "cw", "ccw"]
+        blocks = [pts]
+        rows = [pt_rows]
+        for row in arc_rows.tolist():
+            i_val = 0.0 if np.isnan(c['I'][row]) else c['I'][row]
+            j_val = 0.0 if np.isnan(c['J'][row]) else c['J'][row]
+            x, y = x_cur[row], y_cur[row]
+            center = [i_val + x_prev[row], j_val + y_prev[row]]
+            radius = np.sqrt(i_val ** 2 + j_val ** 2)
+            start = np.arctan2(-j_val, -i_val)
+            stop = np.arctan2(-center[1] + y, -center[0] + x)
+            arc_pts = np.asarray(arc(center, radius, start, stop, arcdir[g_cur[row]], self.steps_per_circle))
+            blocks.append(arc_pts.reshape(-1, 2))
+            rows.append(np.full(len(arc_pts), row, dtype=np.int64))
+
+        pt_rows = np.concatenate(rows)
+        order = np.argsort(pt_rows, kind='stable')
+        return np.concatenate(blocks)[order], pt_rows[order]
+
+
+def parse_gcode(text, **kwargs):
+    """
+    :param text:    G-code text
+    :param kwargs:  GCodeArrayParser parameters
+    :return:        ParsedGCode
+    """
+    parser = GCodeArrayParser(**kwargs)
+    parser.feed(text)
+    return parser.close()
+
+
+class ParsedGCode:
+    """
+    The paths and the holes found in the G-code.
+
+    * vertices:     (N, 2) array with the positions visited by the tool, starting with the start position
+    * path_start:   index in vertices of the first point of each path
+    * path_end:     index in vertices after the last point of each path
+    * path_kind:    kind code of each path (index in KINDS)
+    * hole_center:  (H, 2) array with the centers of the drilled holes
+    * hole_dia:     diameter of each hole
+    * entries:      order of the elements; i >= 0 is the path i and i < 0 is the hole -1 - i
+
+    Used as a sequence it gives the {'geom': geometry, 'kind': ['C', 'F']} dictionaries made by CNCjob.gcode_parse().
+    """
+
+    def __init__(self):
+        self.units = None
+        self.vertices = np.empty((0, 2))
+        self.path_start = np.empty(0, dtype=np.int64)
+        self.path_end = np.empty(0, dtype=np.int64)
+        self.path_kind = np.empty(0, dtype=np.int8)
+        self.hole_center = np.empty((0, 2))
+        self.hole_dia = np.empty(0)
+        self.entries = np.empty(0, dtype=np.int64)
+
+        self._items = None
+
+    # ## Sequence of dictionaries, made on first use
+    @property
+    def materialized(self):
+        """
+        :return:    True when the list of dictionaries was made; after that the arrays may not match the list anymore
+        """
+        return self._items is not None
+
+    def items(self):
+        if self._items is None:
+            paths = self.path_geometries()
+            holes = self.hole_geometries()
+            kinds = self.entry_kinds()
+            self._items = [
+                {"geom": paths[e] if e >= 0 else holes[-1 - e], "kind": list(KINDS[k])}
+                for e, k in zip(self.entries.tolist(), kinds.tolist())
+            ]
+        return self._items
+
+    def to_list(self):
+        return self.items()
+
+    def __len__(self):
+        return len(self._items) if self._items is not None else len(self.entries)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __iter__(self):
+        return iter(self.items())
+
+    def __getitem__(self, item):
+        return self.items()[item]
+
+    def __add__(self, other):
+        return self.items() + list(other)
+
+    def __radd__(self, other):
+        return list(other) + self.items()
+
+    # ## Array access
+    def entry_kinds(self):
+        """
+        :return:    kind code of each element, in order; the holes are cuts
+        """
+        kinds = np.zeros(len(self.entries), dtype=np.int64)
+        is_path = self.entries >= 0
+        kinds[is_path] = self.path_kind[self.entries[is_path]]
+        return kinds
+
+    def path_coordinates(self, selection=None):
+        """
+        :param selection:   indexes of the paths or None for all
+        :return:            (coordinates, owner) where owner is the index (in selection) of the path of each point
+        """
+        starts = self.path_start if selection is None else self.path_start[selection]
+        ends = self.path_end if selection is None else self.path_end[selection]
+        lengths = ends - starts
+        owner = np.repeat(np.arange(len(lengths)), lengths)
+        first = np.cumsum(lengths) - lengths
+        idx = np.arange(lengths.sum()) - np.repeat(first, lengths) + np.repeat(starts, lengths)
+        return self.vertices[idx], owner
+
+    def path_geometries(self, selection=None):
+        """
+        :param selection:   indexes of the paths or None for all
+        :return:            list of LineString
+        """
+        starts = self.path_start if selection is None else self.path_start[selection]
+        if len(starts) == 0:
+            return []
+
+        if linestrings is not None:
+            coords, owner = self.path_coordinates(selection)
+            return list(linestrings(coords, indices=owner))
+
+        ends = self.path_end if selection is None else self.path_end[selection]
+        return [LineString(self.vertices[s:e]) for s, e in zip(starts.tolist(), ends.tolist())]
+
+    def hole_geometries(self):
+        """
+        :return:    list of LinearRing, the outline of each hole
+        """
+        if len(self.hole_dia) == 0:
+            return []
+
+        if linestrings is not None:
+            return list(get_exterior_ring(buffer_array(points(self.hole_center), self.hole_dia / 2.0, quad_segs=16)))
+
+        return [Point(c).buffer(d / 2.0).exterior for c, d in zip(self.hole_center.tolist(), self.hole_dia.tolist())]
+
+    def geometries(self, kind=None):
+        """
+        :param kind:    'T' or 'C' to select the travel or the cut elements, None for all
+        :return:        list of the geometry elements, in order
+        """
+        if self._items is not None:
+            return [geo['geom'] for geo in self._items if kind is None or geo['kind'][0] == kind]
+
+        entries = self.entries
+        if kind is not None:
+            travel = self.entry_kinds() >= 2
+            entries = entries[travel if kind == 'T' else ~travel]
+
+        paths = self.path_geometries(entries[entries >= 0])
+        holes = self.hole_geometries()
+        result = []
+        next_path = iter(paths)
+        for e in entries.tolist():
+            result.append(next(next_path) if e >= 0 else holes[-1 - e])
+        return result
+
+    def lines(self, kind):
+        """
+        :param kind:    'T' or 'C'
+        :return:        MultiLineString with the paths (and for 'C' the hole outlines) of this kind or None
+        """
+        geos = self.geometries(kind)
+        if not geos:
+            return None
+        return MultiLineString(geos)
+
+    def annotation_points(self):
+        """
+        :return:    list of (start, end) positions of the travel paths, in order
+        """
+        travel = self.entries[self.entries >= 0]
+        travel = travel[self.path_kind[travel] >= 2]
+        starts = self.vertices[self.path_start[travel]].tolist()
+        ends = self.vertices[self.path_end[travel] - 1].tolist()
+        return [(tuple(s), tuple(e)) for s, e in zip(starts, ends)]
+
+    def bounds(self):
+        """
+        :return:    [xmin, ymin, xmax, ymax] of the paths and holes
+        """
+        boxes = []
+        if len(self.path_start):
+            coords, __ = self.path_coordinates()
+            boxes.append(np.concatenate((coords.min(axis=0), coords.max(axis=0))))
+        if len(self.hole_dia):
+            r = (self.hole_dia / 2.0)[:, None]
+            boxes.append(np.concatenate(((self.hole_center - r).min(axis=0), (self.hole_center + r).max(axis=0))))
+        if not boxes:
+            return [np.Inf, np.Inf, -np.Inf, -np.Inf]
+        boxes = np.asarray(boxes)
+        return [boxes[:, 0].min(), boxes[:, 1].min(), boxes[:, 2].max(), boxes[:, 3].max()]
+
+    def polygons(self, tooldia, resolution, tolerance, excellon=False, kind=None):
+        """
+        The shapes plotted for a tool: the paths buffered with the tool radius. For the Excellon jobs the holes
+        are filled instead.
+
+        :param tooldia:     tool diameter
+        :param resolution:  number of segments used for a quarter of circle
+        :param tolerance:   simplification tolerance
+        :param excellon:    True for the jobs made from Excellon objects
+        :param kind:        'T' or 'C' to select the travel or the cut elements, None for all
+        :return:            list of (geometry, kind letter) in order
+        """
+        kinds = self.entry_kinds()
+        letters = ['T' if k >= 2 else 'C' for k in kinds.tolist()]
+        geos = self.geometries()
+        if kind is not None:
+            geos = [g for g, k in zip(geos, letters) if k == kind]
+            letters = [k for k in letters if k == kind]
+
+        if not geos:
+            return []
+
+        distance = tooldia / 1.99999999
+        if linestrings is not None:
+            geos = np.asarray(geos, dtype=object)
+            is_letter_c = np.asarray(letters) == 'C'
+            filled = np.zeros(len(geos), dtype=bool)
+            if excellon:
+                filled = is_letter_c
+            polys = np.empty(len(geos), dtype=object)
+            for idx in np.flatnonzero(filled).tolist():
+                try:
+                    polys[idx] = Polygon(geos[idx])
+                except Exception:
+                    # deal here with unexpected plot errors due of LineStrings not valid
+                    polys[idx] = None
+            if (~filled).any():
+                polys[~filled] = buffer_array(geos[~filled], distance, quad_segs=resolution)
+            valid = np.array([p is not None for p in polys.tolist()], dtype=bool)
+            polys[valid] = simplify_array(polys[valid], tolerance)
+            return [(p, k) for p, k in zip(polys.tolist(), letters) if p is not None and not p.is_empty]
+
+        result = []
+        for geo, letter in zip(geos, letters):
+            try:
+                if excellon and letter == 'C':
+                    poly = Polygon(geo)
+                else:
+                    poly = geo.buffer(distance=distance, resolution=resolution)
+                result.append((poly.simplify(tolerance), letter))
+            except Exception:
+                # deal here with unexpected plot errors due of LineStrings not valid
+                continue
+        return result
@@ -9,11 +9,17 @@ from shapely.ops import unary_union, linemerge
 import shapely.affinity as affinity
 from shapely.geometry import box as shply_box
 from shapely.geometry import Point
+from shapely.prepared import prep
+
+from rtree import index as rtindex
 
 from lxml import etree as ET
 import ezdxf
 
 from appParsers.ParseDXF import *
+from appParsers.FlashInstances import FlashInstances, FlashGeometryDict
+from appCommon.GeometryTransform import translate_matrix, scale_matrix, mirror_matrix, rotate_matrix, skew_matrix, \
+    affine_params
 from appParsers.ParseSVG import svgparselength, getsvggeo, svgparse_viewbox
 
 import gettext
@@ -137,6 +143,10 @@ class Gerber(Geometry):
         # it allows adding data into the clear_geometry key of the self.apertures[aperture] dict
         self.is_lpc = False
 
+        # the flashes of each aperture, made from a template when they are needed (see add_flash())
+        self.flash_instances = {}
+        self._flash_batches = []
+
         self.source_file = ''
 
         # ### Parser patterns ## ##
@@ -230,6 +240,24 @@ class Gerber(Geometry):
         # from Geometry.
         self.ser_attrs += ['apertures', 'int_digits', 'frac_digits', 'aperture_macros', 'solid_geometry', 'source_file']
 
+    def to_dict(self):
+        """
+        Returns a representation of the object as a dictionary (see Geometry.to_dict()).
+
+        The geometry dictionaries of the instanced flashes make their polygon on first use but the JSON encoders
+        read the dictionaries directly, so the apertures geometry is made of plain dictionaries.
+
+        :return:    A dictionary-encoded copy of the object.
+        :rtype:     dict
+        """
+        d = super().to_dict()
+        d['apertures'] = {
+            apid: {key: [geo_dict.copy() for geo_dict in value] if key == 'geometry' else value
+                   for key, value in apvalue.items()}
+            for apid, apvalue in self.apertures.items()
+        }
+        return d
+
     def aperture_parse(self, apertureId, apertureType, apParameters):
         """
         Parse gerber aperture definition into dictionary of apertures.
@@ -258,6 +286,9 @@ class Gerber(Geometry):
         # referenced it without the zero, so this is a hack to handle that.
         apid = str(int(apertureId))
 
+        # a redefined aperture gets a new flash template; the flashes recorded before keep the old one
+        self.flash_instances.pop(apid, None)
+
         try:  # Could be empty for aperture macros
             paramList = apParameters.split('X')
         except Exception:
@@ -346,8 +377,8 @@ class Gerber(Geometry):
                             yield line
                             break
 
-            processed_lines = list(line_generator())
-            self.parse_lines(processed_lines)
+            # the lines are consumed as they are read, the file is never held whole in memory as a list of lines
+            self.parse_lines(line_generator())
 
     # @profile
     def parse_lines(self, glines):
@@ -355,7 +386,7 @@ class Gerber(Geometry):
         Main Gerber parser. Reads Gerber and populates ``self.paths``, ``self.apertures``,
         ``self.flashes``, ``self.regions`` and ``self.units``.
 
-        :param glines: Gerber code as list of strings, each element being
+        :param glines: Gerber code as an iterable of strings (a list or a generator), each element being
             one line of the source file.
         :type glines: list
         :return: None
@@ -377,6 +408,14 @@ class Gerber(Geometry):
         # applying a union for every new polygon.
         poly_buffer = []
 
+        # the dark geometry accumulated at each polarity change is stored here as spatially indexed tiles so a
+        # clear batch is subtracted only from the tiles it touches instead of from the whole accumulated geometry
+        polarity_tiles = PolarityTiles()
+        polarity_tiles.add(self.solid_geometry)
+
+        # the source lines are stored here and joined only once, at the end of the parsing
+        source_buffer = []
+
         # store here the follow geometry
         follow_buffer = []
 
@@ -421,7 +460,15 @@ class Gerber(Geometry):
 
         s_tol = float(self.app.defaults["gerber_simp_tolerance"])
 
-        self.app.inform.emit('%s %d %s.' % (_("Gerber processing. Parsing"), len(glines), _("Lines").lower()))
+        self.flash_instances = {}
+        self._flash_batches = []
+
+        try:
+            self.app.inform.emit('%s %d %s.' % (_("Gerber processing. Parsing"), len(glines), _("Lines").lower()))
+        except TypeError:
+            # the lines are streamed from a generator and the number of lines is not known in advance
+            self.app.inform.emit('%s...' % _("Gerber processing. Parsing"))
+
         try:
             for gline in glines:
                 if self.app.abort_flag:
@@ -429,7 +476,7 @@ class Gerber(Geometry):
                     raise grace
 
                 line_num += 1
-                self.source_file += gline + '\n'
+                source_buffer.append(gline)
 
                 # Cleanup #
                 gline = gline.strip(' \r\n')
@@ -491,6 +538,9 @@ class Gerber(Geometry):
 
                         path = [path[-1]]
 
+                    # the flashes recorded so far are made now, before the join
+                    poly_buffer += self.make_flashes()
+
                     # --- Apply buffer ---
                     # If added for testing of bug #83
                     # TODO: Remove when bug fixed
@@ -501,10 +551,9 @@ class Gerber(Geometry):
 
                     if buff_length > 0:
                         if current_polarity == 'D':
-                            self.solid_geometry = self.solid_geometry.union(unary_union(poly_buffer))
-
+                            polarity_tiles.add(unary_union(poly_buffer))
                         else:
-                            self.solid_geometry = self.solid_geometry.difference(unary_union(poly_buffer))
+                            polarity_tiles.subtract(unary_union(poly_buffer))
 
                         # follow_buffer = []
                         poly_buffer = []
@@ -676,27 +725,16 @@ class Gerber(Geometry):
                         try:
                             # log.debug("Bare op-code %d." % current_operation_code)
                             geo_dict = {}
-                            flash = self.create_flash_geometry(
-                                Point(current_x, current_y), self.apertures[current_aperture],
-                                self.steps_per_circle)
-
                             geo_dict['follow'] = Point([current_x, current_y])
 
-                            if not flash.is_empty:
-                                if self.app.defaults['gerber_simplification']:
-                                    poly_buffer.append(flash.simplify(s_tol))
-                                else:
-                                    poly_buffer.append(flash)
-                                if self.is_lpc is True:
-                                    geo_dict['clear'] = flash
-                                else:
-                                    geo_dict['solid'] = flash
-
+                            geo_dict = self.add_flash(current_aperture, current_x, current_y, geo_dict, poly_buffer,
+                                                      s_tol)
+                            if geo_dict is not None:
                                 if current_aperture not in self.apertures:
                                     self.apertures[current_aperture] = {}
                                 if 'geometry' not in self.apertures[current_aperture]:
                                     self.apertures[current_aperture]['geometry'] = []
-                                self.apertures[current_aperture]['geometry'].append(deepcopy(geo_dict))
+                                self.apertures[current_aperture]['geometry'].append(geo_dict)
 
                         except IndexError:
                             log.warning("Line %d: %s -> Nothing there to flash!" % (line_num, gline))
@@ -967,27 +1005,14 @@ class Gerber(Geometry):
                                     geo_dict['follow'] = geo_flash
 
                                     # this treats the case when we are storing geometry as solids
-                                    flash = self.create_flash_geometry(
-                                        Point([current_x, current_y]),
-                                        self.apertures[current_aperture],
-                                        self.steps_per_circle
-                                    )
-                                    if not flash.is_empty:
-                                        if self.app.defaults['gerber_simplification']:
-                                            poly_buffer.append(flash.simplify(s_tol))
-                                        else:
-                                            poly_buffer.append(flash)
-
-                                        if self.is_lpc is True:
-                                            geo_dict['clear'] = flash
-                                        else:
-                                            geo_dict['solid'] = flash
+                                    geo_dict = self.add_flash(current_aperture, current_x, current_y, geo_dict,
+                                                              poly_buffer, s_tol) or geo_dict
 
                                     if current_aperture not in self.apertures:
                                         self.apertures[current_aperture] = {}
                                     if 'geometry' not in self.apertures[current_aperture]:
                                         self.apertures[current_aperture]['geometry'] = []
-                                    self.apertures[current_aperture]['geometry'].append(deepcopy(geo_dict))
+                                    self.apertures[current_aperture]['geometry'].append(geo_dict)
 
                             if making_region is False:
                                 # if the aperture is rectangle then add a rectangular shape having as parameters the
@@ -1211,27 +1236,14 @@ class Gerber(Geometry):
                         geo_dict['follow'] = geo_flash
 
                         # this treats the case when we are storing geometry as solids
-                        flash = self.create_flash_geometry(
-                            Point([linear_x, linear_y]),
-                            self.apertures[current_aperture],
-                            self.steps_per_circle
-                        )
-                        if not flash.is_empty:
-                            if self.app.defaults['gerber_simplification']:
-                                poly_buffer.append(flash.simplify(s_tol))
-                            else:
-                                poly_buffer.append(flash)
-
-                            if self.is_lpc is True:
-                                geo_dict['clear'] = flash
-                            else:
-                                geo_dict['solid'] = flash
+                        geo_dict = self.add_flash(current_aperture, linear_x, linear_y, geo_dict, poly_buffer,
+                                                  s_tol) or geo_dict
 
                         if current_aperture not in self.apertures:
                             self.apertures[current_aperture] = {}
                         if 'geometry' not in self.apertures[current_aperture]:
                             self.apertures[current_aperture]['geometry'] = []
-                        self.apertures[current_aperture]['geometry'].append(deepcopy(geo_dict))
+                        self.apertures[current_aperture]['geometry'].append(geo_dict)
 
                     # maybe those lines are not exactly needed but it is easier to read the program as those coordinates
                     # are used in case that circular interpolation is encountered within the Gerber file
@@ -1503,7 +1515,11 @@ class Gerber(Geometry):
             # this treats the case when we are storing geometry as paths
             self.follow_geometry = follow_buffer
 
+            # join the tiles of the geometry accumulated so far (at the polarity changes)
+            self.solid_geometry = polarity_tiles.geometry()
+
             # this treats the case when we are storing geometry as solids
+            poly_buffer += self.make_flashes()
             try:
                 buff_length = len(poly_buffer)
             except TypeError:
@@ -1604,6 +1620,71 @@ class Gerber(Geometry):
             loc = '%s #%d %s: %s\n' % (_("Gerber Line"), line_num, _("Gerber Line Content"), gline) + repr(err)
             self.app.inform.emit('[ERROR] %s\n%s:' %
                                  (_("Gerber Parser ERROR"), loc))
+        finally:
+            # the geometry of the flashes not made yet (the parsing failed), for the apertures
+            self.make_flashes()
+
+            if source_buffer:
+                source_buffer.append('')
+                self.source_file += '\n'.join(source_buffer)
+
+    def add_flash(self, aperture_id, x, y, geo_dict, poly_buffer, simplify_tolerance):
+        """
+        Adds the geometry of a flash to the geometry dictionary of the flash ('solid' or, with the clear polarity,
+        'clear') and to the buffer of the polygons to join.
+
+        With the 'gerber_flash_instancing' preference the flash is only recorded: the flash geometry of the aperture
+        is made once, the flashes to join are made from it, in bulk, by make_flashes() and the geometry dictionary
+        of the flash is replaced by a FlashGeometryDict that makes its polygon on first use.
+
+        :param aperture_id:         the aperture that makes the flash
+        :param x:                   X coordinate of the flash
+        :param y:                   Y coordinate of the flash
+        :param geo_dict:            the geometry dictionary of the flash
+        :param poly_buffer:         list of the polygons to join
+        :param simplify_tolerance:  tolerance for the simplification of the polygons to join
+        :return:                    the geometry dictionary to store in the aperture or None if the flash has no
+                                    geometry
+        """
+        simplify_tolerance = simplify_tolerance if self.app.defaults['gerber_simplification'] else None
+
+        if self.app.defaults['gerber_flash_instancing']:
+            flashes = self.flash_instances.get(aperture_id)
+            if flashes is None:
+                template = self.create_flash_geometry(Point(0, 0), self.apertures[aperture_id], self.steps_per_circle)
+                flashes = FlashInstances(template, simplify_tolerance)
+                self.flash_instances[aperture_id] = flashes
+                self._flash_batches.append(flashes)
+
+            if flashes.is_empty:
+                return None
+            return flashes.add(x, y, geo_dict, dark=self.is_lpc is not True)
+
+        flash = self.create_flash_geometry(Point(x, y), self.apertures[aperture_id], self.steps_per_circle)
+        if flash.is_empty:
+            return None
+
+        if simplify_tolerance is not None:
+            poly_buffer.append(flash.simplify(simplify_tolerance))
+        else:
+            poly_buffer.append(flash)
+
+        if self.is_lpc is True:
+            geo_dict['clear'] = flash
+        else:
+            geo_dict['solid'] = flash
+        return geo_dict
+
+    def make_flashes(self):
+        """
+        Makes the geometry of the flashes recorded by add_flash() since the last call.
+
+        :return:    list of the flash polygons to join
+        """
+        geometry = []
+        for flashes in self._flash_batches:
+            geometry += flashes.make_geometry()
+        return geometry
 
     @staticmethod
     def create_flash_geometry(location, aperture, steps_per_circle=None):
@@ -1924,6 +2005,44 @@ class Gerber(Geometry):
             new_el = {'solid': pol, 'follow': pol}
             self.apertures['0']['geometry'].append(deepcopy(new_el))
 
+    def affine_targets(self):
+        """
+        Where the geometry changed by the transformations is: solid_geometry, follow_geometry and the geometry
+        stored in the apertures. The polygons of the instanced flashes that are not made yet are not made here: the
+        FlashInstances of their aperture is a target instead (see apply_affine()).
+
+        :return:    list of (container, key), see appCommon.GeometryTransform.transform_targets()
+        """
+        targets = [(self, 'solid_geometry'), (self, 'follow_geometry')]
+        flash_batches = {}
+        for apid in self.apertures:
+            if 'geometry' in self.apertures[apid]:
+                for geo_el in self.apertures[apid]['geometry']:
+                    lazy_key = None
+                    if isinstance(geo_el, FlashGeometryDict) and geo_el.lazy:
+                        lazy_key = geo_el.key
+                        flash_batches[id(geo_el.flashes)] = geo_el.flashes
+                    targets += [(geo_el, key) for key in ('solid', 'follow', 'clear')
+                                if key != lazy_key and key in geo_el]
+        targets += [(flashes, 'locations') for flashes in flash_batches.values()]
+        return targets
+
+    def apply_affine(self, matrix, targets):
+        """
+        Transforms the geometry of the targets, all at once, and the flashes of the FlashInstances targets.
+
+        :param matrix:  3x3 matrix
+        :param targets: list of (container, key) with the geometry to be transformed
+        :return:        None
+        """
+        geometry_targets = []
+        for container, key in targets:
+            if isinstance(container, FlashInstances):
+                container.affine(affine_params(matrix))
+            else:
+                geometry_targets.append((container, key))
+        super().apply_affine(matrix, geometry_targets)
+
     def scale(self, xfactor, yfactor=None, point=None):
         """
         Scales the objects' geometry on the XY plane by a given factor.
@@ -1974,54 +2093,11 @@ class Gerber(Geometry):
         else:
             px, py = point
 
-        # variables to display the percentage of work done
-        self.geo_len = 0
+        # the geometry stored in the Gerber apertures is scaled, too
         try:
-            self.geo_len = len(self.solid_geometry)
-        except TypeError:
-            self.geo_len = 1
-
-        self.old_disp_number = 0
-        self.el_count = 0
-
-        def scale_geom(obj):
-            if type(obj) is list:
-                new_obj = []
-                for g in obj:
-                    new_obj.append(scale_geom(g))
-                return new_obj
-            else:
-                try:
-                    self.el_count += 1
-                    disp_number = int(np.interp(self.el_count, [0, self.geo_len], [0, 99]))
-                    if self.old_disp_number < disp_number <= 100:
-                        self.app.proc_container.update_view_text(' %d%%' % disp_number)
-                        self.old_disp_number = disp_number
-
-                    return affinity.scale(obj, xfactor, yfactor, origin=(px, py))
-                except AttributeError:
-                    return obj
+            self.transform_geometry(scale_matrix(xfactor, yfactor, origin=(px, py)), self.affine_targets())
 
-        self.solid_geometry = scale_geom(self.solid_geometry)
-        self.follow_geometry = scale_geom(self.follow_geometry)
-
-        # we need to scale the geometry stored in the Gerber apertures, too
-        try:
             for apid in self.apertures:
-                new_geometry = []
-                if 'geometry' in self.apertures[apid]:
-                    for geo_el in self.apertures[apid]['geometry']:
-                        new_geo_el = {}
-                        if 'solid' in geo_el:
-                            new_geo_el['solid'] = scale_geom(geo_el['solid'])
-                        if 'follow' in geo_el:
-                            new_geo_el['follow'] = scale_geom(geo_el['follow'])
-                        if 'clear' in geo_el:
-                            new_geo_el['clear'] = scale_geom(geo_el['clear'])
-                        new_geometry.append(new_geo_el)
-
-                self.apertures[apid]['geometry'] = deepcopy(new_geometry)
-
                 try:
                     if str(self.apertures[apid]['type']) == 'R' or str(self.apertures[apid]['type']) == 'O':
                         self.apertures[apid]['width'] *= xfactor
@@ -2085,50 +2161,9 @@ class Gerber(Geometry):
         if dx == 0 and dy == 0:
             return
 
-        # variables to display the percentage of work done
-        self.geo_len = 0
-        try:
-            self.geo_len = len(self.solid_geometry)
-        except TypeError:
-            self.geo_len = 1
-
-        self.old_disp_number = 0
-        self.el_count = 0
-
-        def offset_geom(obj):
-            if type(obj) is list:
-                new_obj = []
-                for g in obj:
-                    new_obj.append(offset_geom(g))
-                return new_obj
-            else:
-                try:
-                    self.el_count += 1
-                    disp_number = int(np.interp(self.el_count, [0, self.geo_len], [0, 99]))
-                    if self.old_disp_number < disp_number <= 100:
-                        self.app.proc_container.update_view_text(' %d%%' % disp_number)
-                        self.old_disp_number = disp_number
-
-                    return affinity.translate(obj, xoff=dx, yoff=dy)
-                except AttributeError:
-                    return obj
-
-        # ## Solid geometry
-        self.solid_geometry = offset_geom(self.solid_geometry)
-        self.follow_geometry = offset_geom(self.follow_geometry)
-
-        # we need to offset the geometry stored in the Gerber apertures, too
+        # the geometry stored in the Gerber apertures is offset, too
         try:
-            for apid in self.apertures:
-                if 'geometry' in self.apertures[apid]:
-                    for geo_el in self.apertures[apid]['geometry']:
-                        if 'solid' in geo_el:
-                            geo_el['solid'] = offset_geom(geo_el['solid'])
-                        if 'follow' in geo_el:
-                            geo_el['follow'] = offset_geom(geo_el['follow'])
-                        if 'clear' in geo_el:
-                            geo_el['clear'] = offset_geom(geo_el['clear'])
-
+            self.transform_geometry(translate_matrix(dx, dy), self.affine_targets())
         except Exception as e:
             log.debug('camlib.Gerber.offset() Exception --> %s' % str(e))
             return 'fail'
@@ -2159,51 +2194,9 @@ class Gerber(Geometry):
         """
         log.debug("parseGerber.Gerber.mirror()")
 
-        px, py = point
-        xscale, yscale = {"X": (1.0, -1.0), "Y": (-1.0, 1.0)}[axis]
-
-        # variables to display the percentage of work done
-        self.geo_len = 0
-        try:
-            self.geo_len = len(self.solid_geometry)
-        except TypeError:
-            self.geo_len = 1
-
-        self.old_disp_number = 0
-        self.el_count = 0
-
-        def mirror_geom(obj):
-            if type(obj) is list:
-                new_obj = []
-                for g in obj:
-                    new_obj.append(mirror_geom(g))
-                return new_obj
-            else:
-                try:
-                    self.el_count += 1
-                    disp_number = int(np.interp(self.el_count, [0, self.geo_len], [0, 99]))
-                    if self.old_disp_number < disp_number <= 100:
-                        self.app.proc_container.update_view_text(' %d%%' % disp_number)
-                        self.old_disp_number = disp_number
-
-                    return affinity.scale(obj, xscale, yscale, origin=(px, py))
-                except AttributeError:
-                    return obj
-
-        self.solid_geometry = mirror_geom(self.solid_geometry)
-        self.follow_geometry = mirror_geom(self.follow_geometry)
-
-        # we need to mirror the geometry stored in the Gerber apertures, too
+        # the geometry stored in the Gerber apertures is mirrored, too
         try:
-            for apid in self.apertures:
-                if 'geometry' in self.apertures[apid]:
-                    for geo_el in self.apertures[apid]['geometry']:
-                        if 'solid' in geo_el:
-                            geo_el['solid'] = mirror_geom(geo_el['solid'])
-                        if 'follow' in geo_el:
-                            geo_el['follow'] = mirror_geom(geo_el['follow'])
-                        if 'clear' in geo_el:
-                            geo_el['clear'] = mirror_geom(geo_el['clear'])
+            self.transform_geometry(mirror_matrix(axis, point), self.affine_targets())
         except Exception as e:
             log.debug('camlib.Gerber.mirror() Exception --> %s' % str(e))
             return 'fail'
@@ -2231,53 +2224,12 @@ class Gerber(Geometry):
         """
         log.debug("parseGerber.Gerber.skew()")
 
-        px, py = point
-
         if angle_x == 0 and angle_y == 0:
             return
 
-        # variables to display the percentage of work done
-        self.geo_len = 0
-        try:
-            self.geo_len = len(self.solid_geometry)
-        except TypeError:
-            self.geo_len = 1
-
-        self.old_disp_number = 0
-        self.el_count = 0
-
-        def skew_geom(obj):
-            if type(obj) is list:
-                new_obj = []
-                for g in obj:
-                    new_obj.append(skew_geom(g))
-                return new_obj
-            else:
-                try:
-                    self.el_count += 1
-                    disp_number = int(np.interp(self.el_count, [0, self.geo_len], [0, 100]))
-                    if self.old_disp_number < disp_number <= 100:
-                        self.app.proc_container.update_view_text(' %d%%' % disp_number)
-                        self.old_disp_number = disp_number
-
-                    return affinity.skew(obj, angle_x, angle_y, origin=(px, py))
-                except AttributeError:
-                    return obj
-
-        self.solid_geometry = skew_geom(self.solid_geometry)
-        self.follow_geometry = skew_geom(self.follow_geometry)
-
-        # we need to skew the geometry stored in the Gerber apertures, too
+        # the geometry stored in the Gerber apertures is skewed, too
         try:
-            for apid in self.apertures:
-                if 'geometry' in self.apertures[apid]:
-                    for geo_el in self.apertures[apid]['geometry']:
-                        if 'solid' in geo_el:
-                            geo_el['solid'] = skew_geom(geo_el['solid'])
-                        if 'follow' in geo_el:
-                            geo_el['follow'] = skew_geom(geo_el['follow'])
-                        if 'clear' in geo_el:
-                            geo_el['clear'] = skew_geom(geo_el['clear'])
+            self.transform_geometry(skew_matrix(angle_x, angle_y, point), self.affine_targets())
         except Exception as e:
             log.debug('camlib.Gerber.skew() Exception --> %s' % str(e))
             return 'fail'
@@ -2294,56 +2246,16 @@ class Gerber(Geometry):
         """
         log.debug("parseGerber.Gerber.rotate()")
 
-        px, py = point
-
         if angle == 0:
             return
 
-        # variables to display the percentage of work done
-        self.geo_len = 0
-        try:
-            self.geo_len = len(self.solid_geometry)
-        except TypeError:
-            self.geo_len = 1
-
-        self.old_disp_number = 0
-        self.el_count = 0
-
-        def rotate_geom(obj):
-            if type(obj) is list:
-                new_obj = []
-                for g in obj:
-                    new_obj.append(rotate_geom(g))
-                return new_obj
-            else:
-                try:
-                    self.el_count += 1
-                    disp_number = int(np.interp(self.el_count, [0, self.geo_len], [0, 100]))
-                    if self.old_disp_number < disp_number <= 100:
-                        self.app.proc_container.update_view_text(' %d%%' % disp_number)
-                        self.old_disp_number = disp_number
-
-                    return affinity.rotate(obj, angle, origin=(px, py))
-                except AttributeError:
-                    return obj
-
-        self.solid_geometry = rotate_geom(self.solid_geometry)
-        self.follow_geometry = rotate_geom(self.follow_geometry)
-
-        # we need to rotate the geometry stored in the Gerber apertures, too
+        # the geometry stored in the Gerber apertures is rotated, too
         try:
-            for apid in self.apertures:
-                if 'geometry' in self.apertures[apid]:
-                    for geo_el in self.apertures[apid]['geometry']:
-                        if 'solid' in geo_el:
-                            geo_el['solid'] = rotate_geom(geo_el['solid'])
-                        if 'follow' in geo_el:
-                            geo_el['follow'] = rotate_geom(geo_el['follow'])
-                        if 'clear' in geo_el:
-                            geo_el['clear'] = rotate_geom(geo_el['clear'])
+            self.transform_geometry(rotate_matrix(angle, point), self.affine_targets())
         except Exception as e:
             log.debug('camlib.Gerber.rotate() Exception --> %s' % str(e))
             return 'fail'
+
         self.app.inform.emit('[success] %s' % _("Done."))
         self.app.proc_container.new_text = ''
 
@@ -2505,6 +2417,141 @@ class Gerber(Geometry):
         self.app.proc_container.new_text = ''
 
 
+class PolarityTiles:
+    """
+    Storage for the dark (LPD) geometry accumulated while parsing a Gerber file.
+
+    The polygons are kept as tiles indexed in a RTree. Polygons with many vertices (like a copper pour) are split
+    in a grid of tiles so that a clear (LPC) batch is subtracted only from the (small) tiles it touches. The cost of
+    a polarity change then depends only on the size of the clear batch and not on the size of the whole geometry.
+    The tiles are joined only once, when the geometry is requested.
+    """
+
+    def __init__(self, max_tile_points=500):
+        """
+
+        :param max_tile_points:     Polygons with more vertices than this number are split in a grid of tiles.
+        :type max_tile_points:      int
+        """
+        self.max_tile_points = max_tile_points
+
+        # Python RTree Index
+        self.rti = rtindex.Index()
+
+        # key is the tile id in the RTree, value is the tile polygon
+        self.tiles = {}
+
+        self.next_id = 0
+
+    @staticmethod
+    def polygons(geometry):
+        """
+        Yield the non empty Polygons found in a geometry (Polygon, MultiPolygon, GeometryCollection or list).
+
+        :param geometry:    Shapely geometry or list of Shapely geometries
+        :return:            generator of Polygons
+        """
+        if geometry is None:
+            return
+
+        if isinstance(geometry, list):
+            for geo in geometry:
+                yield from PolarityTiles.polygons(geo)
+            return
+
+        if geometry.is_empty:
+            return
+
+        if isinstance(geometry, Polygon):
+            yield geometry
+        elif hasattr(geometry, 'geoms'):
+            for geo in geometry.geoms:
+                yield from PolarityTiles.polygons(geo)
+
+    @staticmethod
+    def points_count(polygon):
+        return len(polygon.exterior.coords) + sum(len(interior.coords) for interior in polygon.interiors)
+
+    def split(self, polygon):
+        """
+        Split a polygon in a grid of tiles if it has more vertices than the ``max_tile_points`` limit.
+
+        :param polygon:     Shapely Polygon
+        :return:            list of Polygons
+        """
+        nr_points = self.points_count(polygon)
+        if nr_points <= self.max_tile_points:
+            return [polygon]
+
+        nr_div = min(int(np.ceil(np.sqrt(nr_points / self.max_tile_points))), 32)
+        minx, miny, maxx, maxy = polygon.bounds
+        xs = np.linspace(minx, maxx, nr_div + 1)
+        ys = np.linspace(miny, maxy, nr_div + 1)
+
+        prepared = prep(polygon)
+        tiles = []
+        for i in range(nr_div):
+            for j in range(nr_div):
+                cell = shply_box(xs[i], ys[j], xs[i + 1], ys[j + 1])
+                if not prepared.intersects(cell):
+                    continue
+                if prepared.contains(cell):
+                    tiles.append(cell)
+                    continue
+                tiles += list(self.polygons(polygon.intersection(cell)))
+        return tiles
+
+    def insert(self, tile):
+        self.tiles[self.next_id] = tile
+        self.rti.insert(self.next_id, tile.bounds)
+        self.next_id += 1
+
+    def remove(self, tile_id):
+        tile = self.tiles.pop(tile_id)
+        self.rti.delete(tile_id, tile.bounds)
+
+    def add(self, geometry):
+        """
+        Add dark geometry.
+
+        :param geometry:    Shapely geometry or list of Shapely geometries
+        :return:            None
+        """
+        for poly in self.polygons(geometry):
+            for tile in self.split(poly):
+                self.insert(tile)
+
+    def subtract(self, geometry):
+        """
+        Subtract clear geometry from the tiles that it touches.
+
+        :param geometry:    Shapely geometry or list of Shapely geometries
+        :return:            None
+        """
+        for clear_poly in self.polygons(geometry):
+            prepared = prep(clear_poly)
+            for tile_id in list(self.rti.intersection(clear_poly.bounds)):
+                tile = self.tiles[tile_id]
+                if not prepared.intersects(tile):
+                    continue
+
+                self.remove(tile_id)
+                # a tile that grew over the limit (by gaining holes) is split again
+                for new_poly in self.polygons(tile.difference(clear_poly)):
+                    for new_tile in self.split(new_poly):
+                        self.insert(new_tile)
+
+    def geometry(self):
+        """
+        Join the tiles.
+
+        :return:    the dark geometry with the clear geometry removed
+        """
+        if not self.tiles:
+            return Polygon()
+        return unary_union(list(self.tiles.values()))
+
+
 def parse_gerber_number(strnumber, int_digits, frac_digits, zeros):
     """
     Parse a single number of Gerber coordinates.
@@ -0,0 +1,187 @@
+# ##########################################################
+# FlatCAM: 2D Post-processing for Manufacturing            #
+# Date: 10/18/2026                                         #
+# MIT Licence                                              #
+# ##########################################################
+
+"""
+Windowed import of the raster images (Image Tool, Geometry.import_image()).
+
+Instead of reading the whole bands of the image, vectorizing every gray level and then scaling and flipping each
+shape:
+
+* the image is split in tiles that overlap by one pixel; each tile is read with a rasterio window, so only a tile
+  is in memory in each process, and the tiles are vectorized in the process pool (tile_polygons())
+* a tile is vectorized as a single mask (the pixels darker than the thresholds) and the scale (DPI), the flip and
+  the position of the tile are a single affine transform given to rasterio.features.shapes()
+* only the polygons that touch a side of their tile shared with another tile are joined (they overlap the polygons
+  of the next tile by a pixel); the others are kept as they are
+
+The geometry is the same as the union of the shapes of the whole image (the gray levels are joined by that union).
+"""
+
+import logging
+import warnings
+
+import numpy as np
+
+from shapely.geometry import shape
+from shapely.ops import unary_union
+
+# rasterio is slow to import: it is imported when an image is imported
+
+log = logging.getLogger('base')
+
+
+def make_tiles(width, height, tile_size):
+    """
+    Splits an image in tiles; the tiles overlap by one pixel.
+
+    :param width:       width of the image in pixels
+    :param height:      height of the image in pixels
+    :param tile_size:   the size of a tile in pixels, the overlap included
+    :return:            list of (column, row, width, height) of the tiles
+    """
+    step = max(int(tile_size) - 1, 1)
+    tiles = []
+    for row in range(0, max(height - 1, 1), step):
+        for col in range(0, max(width - 1, 1), step):
+            tiles.append((col, row, min(step + 1, width - col), min(step + 1, height - row)))
+    return tiles
+
+
+def image_mask(bands, mode, mask):
+    """
+    :param bands:   list of 2D arrays: the red, green and blue bands (a single band for a grayscale image)
+    :param mode:    'black' or 'color'
+    :param mask:    [B/W, R, G, B] thresholds
+    :return:        boolean array, True for the pixels to be imported
+    """
+    red = bands[0]
+    green = bands[1] if len(bands) > 1 else red
+    blue = bands[2] if len(bands) > 2 else red
+
+    if mode == 'black':
+        return red <= mask[0]
+    return (red <= mask[1]) | (green <= mask[2]) | (blue <= mask[3])
+
+
+def pixel_transform(scale_factor, flip, col=0, row=0):
+    """
+    :param scale_factor:    size of a pixel in the units of the geometry
+    :param flip:            if True the Y axis points up (the rows of the image go down)
+    :param col:             column of the first pixel
+    :param row:             row of the first pixel
+    :return:                Affine transform from the pixels to the geometry coordinates
+    """
+    from rasterio.transform import Affine
+
+    sign = -1.0 if flip else 1.0
+    return Affine(scale_factor, 0.0, col * scale_factor, 0.0, sign * scale_factor, sign * row * scale_factor)
+
+
+def tile_polygons(tiles, filename, mode, mask, scale_factor, flip, width, height):
+    """
+    Task that can run in the app pool: vectorizes tiles of an image.
+
+    :param tiles:           list of (column, row, width, height) of the tiles
+    :param filename:        path of the image file
+    :param mode:            'black' or 'color'
+    :param mask:            [B/W, R, G, B] thresholds
+    :param scale_factor:    size of a pixel in the units of the geometry
+    :param flip:            if True the image is flipped vertically
+    :param width:           width of the image in pixels
+    :param height:          height of the image in pixels
+    :return:                list with, for each tile, (the polygons inside the tile, the polygons that touch a side
+                            shared with another tile)
+    """
+    import rasterio
+    from rasterio.errors import NotGeoreferencedWarning
+    from rasterio.features import shapes
+    from rasterio.windows import Window
+
+    result = []
+    with warnings.catch_warnings():
+        # the images have no geographic reference
+        warnings.simplefilter('ignore', NotGeoreferencedWarning)
+        src = rasterio.open(filename)
+
+    with src:
+        nr_bands = min(src.count, 3) if mode == 'color' else 1
+        for col, row, w, h in tiles:
+            window = Window(col, row, w, h)
+            selected = image_mask([src.read(k, window=window) for k in range(1, nr_bands + 1)], mode, mask)
+            transform = pixel_transform(scale_factor, flip, col, row)
+
+            # the sides of the tile shared with another tile; the polygons are at least a pixel wide so a margin of
+            # half a pixel is safe
+            margin = scale_factor / 2.0
+            x_min = transform.c + margin if col > 0 else -np.inf
+            x_max = transform.c + w * scale_factor - margin if col + w < width else np.inf
+            y_first = transform.f
+            y_last = transform.f + transform.e * h
+            y_min = min(y_first, y_last) + margin if (row + h < height if flip else row > 0) else -np.inf
+            y_max = max(y_first, y_last) - margin if (row > 0 if flip else row + h < height) else np.inf
+
+            inside = []
+            seam = []
+            values = np.ones(selected.shape, dtype=np.uint8)
+            for geom, val in shapes(values, mask=selected, transform=transform):
+                geo = shape(geom)
+                x0, y0, x1, y1 = geo.bounds
+                if x0 < x_min or y0 < y_min or x1 > x_max or y1 > y_max:
+                    seam.append(geo)
+                else:
+                    inside.append(geo)
+            result.append((inside, seam))
+    return result
+
+
+def import_image(filename, flip=True, units='MM', dpi=96, mode='black', mask=None, tile_size=2048, scheduler=None):
+    """
+    Imports the shapes of an image, tile by tile.
+
+    :param filename:    path of the image file
+    :param flip:        if True the image is flipped vertically
+    :param units:       units of the geometry: 'MM' or 'IN'
+    :param dpi:         resolution of the image, in dots per inch
+    :param mode:        'black' or 'color'
+    :param mask:        [B/W, R, G, B] thresholds; the pixels darker or equal are imported
+    :param tile_size:   size of the tiles in pixels
+    :param scheduler:   appPool.JobScheduler used to vectorize the tiles in the process pool; None to vectorize them
+                        in the calling process
+    :return:            list of Polygons (they don't overlap)
+    """
+    import rasterio
+    from rasterio.errors import NotGeoreferencedWarning
+
+    if mask is None:
+        mask = [128, 128, 128, 128]
+
+    scale_factor = 25.4 / dpi if units.lower() == 'mm' else 1 / dpi
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', NotGeoreferencedWarning)
+        with rasterio.open(filename) as src:
+            width, height = src.width, src.height
+
+    tiles = make_tiles(width, height, tile_size)
+    args = (filename, mode, mask, scale_factor, flip, width, height)
+    if scheduler is not None:
+        found = scheduler.map(tile_polygons, tiles, args=args, chunk_size=1)
+    else:
+        found = tile_polygons(tiles, *args)
+
+    polygons = []
+    seam = []
+    for inside, on_seam in found:
+        polygons += inside
+        seam += on_seam
+
+    if seam:
+        joined = unary_union(seam)
+        polygons += list(joined.geoms) if hasattr(joined, 'geoms') else [joined]
+
+    log.debug("ParseImage.import_image() --> %d x %d pixels, %d tiles, %d polygons (%d joined at the seams)" %
+              (width, height, len(tiles), len(polygons), len(seam)))
+    return [geo for geo in polygons if not geo.is_empty]
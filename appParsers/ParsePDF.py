@@ -13,12 +13,107 @@ from shapely.geometry import Polygon, LineString, MultiPolygon
 
 from copy import copy, deepcopy
 import numpy as np
+import codecs
+import zlib
 import re
 import logging
 
 log = logging.getLogger('base')
 
 
+class PdfStreamError(Exception):
+    """
+    A content stream of the PDF file can't be decompressed or decoded.
+    """
+    pass
+
+
+def pdf_content_lines(fp, chunk_size=1 << 20):
+    """
+    Reads a PDF file a chunk at a time and yields the lines of its FlateDecode streams. Each stream is decompressed
+    with a zlib decompress object, as its data is read, and split in lines; a stream ends with a line end. The whole
+    file and the decompressed content are never in memory.
+
+    A stream is the data between the first 'stream' keyword after a 'FlateDecode' and the next 'endstream'.
+
+    :param fp:          file object opened in binary mode
+    :param chunk_size:  number of bytes read at a time
+    :return:            generator of the lines (str, without the line ends)
+    """
+    buf = b''
+    # the position in the buffer where the search continues
+    pos = 0
+    state = 'filter'
+    eof = False
+
+    decompressor = decoder = None
+    started = False
+    pending = ''
+
+    while True:
+        if state == 'filter':
+            idx = buf.find(b'FlateDecode', pos)
+            if idx != -1:
+                pos = idx + len(b'FlateDecode')
+                state = 'stream'
+                continue
+            # the end of the buffer may be the start of the keyword
+            pos = max(len(buf) - len(b'FlateDecode') + 1, pos)
+        elif state == 'stream':
+            idx = buf.find(b'stream', pos)
+            if idx != -1:
+                pos = idx + len(b'stream')
+                state = 'data'
+                decompressor = zlib.decompressobj()
+                decoder = codecs.getincrementaldecoder('utf-8')()
+                started = False
+                pending = ''
+                continue
+            pos = max(len(buf) - len(b'stream') + 1, pos)
+        else:
+            idx = buf.find(b'endstream', pos)
+            stop = idx if idx != -1 else max(len(buf) - len(b'endstream') + 1, pos)
+            data = buf[pos:stop]
+            pos = stop + len(b'endstream') if idx != -1 else stop
+
+            if not started:
+                data = data.lstrip(b'\r\n')
+                started = bool(data)
+
+            try:
+                # the data after the end of the compressed stream (e.g. the line end) is ignored
+                if data and not decompressor.eof:
+                    pending += decoder.decode(decompressor.decompress(data))
+                if idx != -1:
+                    if not decompressor.eof:
+                        raise zlib.error("incomplete or truncated stream")
+                    pending += decoder.decode(b'', final=True) + '\r\n'
+            except (zlib.error, UnicodeDecodeError) as err:
+                raise PdfStreamError(str(err))
+
+            lines = pending.splitlines(True)
+            pending = ''
+            if idx == -1 and lines:
+                # a line without its end, or ending with a '\r' that may be followed by a '\n', continues in the
+                # next data
+                if lines[-1].endswith('\r') or lines[-1].splitlines()[0] == lines[-1]:
+                    pending = lines.pop(-1)
+            for line in lines:
+                yield line.splitlines()[0]
+
+            if idx != -1:
+                state = 'filter'
+                continue
+
+        if eof:
+            break
+        chunk = fp.read(chunk_size)
+        if not chunk:
+            eof = True
+        buf = buf[pos:] + chunk
+        pos = 0
+
+
 class PdfParser(QtCore.QObject):
 
     def __init__(self, app):
@@ -81,6 +176,46 @@ class PdfParser(QtCore.QObject):
         # detect restore graphic state from graphic stack
         self.restore_gs_re = re.compile(r'^.*Q.*$')
 
+        # the operators above, in the order they are checked, with the characters a line that matches can end with
+        # (None for any character). A line is matched once, with a pattern made of the operators that can end with
+        # its last character; the first operator that matches is used, as when they were searched one after the
+        # other. The save / restore of the graphic state ('q' / 'Q') are checked apart because they don't end the
+        # handling of a line.
+        operators = [
+            ('stroke_color', self.stroke_color_re, 'G'),
+            ('fill_color', self.fill_color_re, 'g'),
+            ('transform', self.combined_transform_re, 'm'),
+            ('start_subpath', self.start_subpath_re, 'm'),
+            ('draw_line', self.draw_line_re, None),
+            ('arc_3pt', self.draw_arc_3pt_re, 'c'),
+            ('arc_2pt_c1start', self.draw_arc_2pt_c1start_re, 'v'),
+            ('arc_2pt_c2stop', self.draw_arc_2pt_c2stop_re, 'y'),
+            ('rect', self.rect_re, 'e'),
+            ('clip_path', self.clip_path_re, 'n '),
+            ('end_subpath', self.end_subpath_re, 'h'),
+            ('stroke_width', self.strokewidth_re, 'w'),
+            ('no_op', self.no_op_re, 'n'),
+            ('stroke_path', self.stroke_path__re, 'SQ \t\r\n\x0b\x0c'),
+            ('fill_path', self.fill_path_re, 'fF*|'),
+            ('fill_stroke_path', self.fill_stroke_path_re, 'B*'),
+        ]
+
+        def make_scanner(selected):
+            # for each operator the slice of its parameters in the groups of a match
+            scanner = re.compile('|'.join('(?P<%s>%s)' % (name, pattern.pattern[1:]) for name, pattern in selected))
+            groups = {}
+            for name, pattern in selected:
+                start = scanner.groupindex[name]
+                groups[name] = (start, start + pattern.groups)
+            return scanner, groups
+
+        # key: last character of a line
+        self.scanners = {}
+        for last_char in set(''.join(op[2] for op in operators if op[2] is not None)):
+            self.scanners[last_char] = make_scanner([(name, pattern) for name, pattern, ends in operators
+                                                     if ends is None or last_char in ends])
+        self.default_scanner = make_scanner([(name, pattern) for name, pattern, ends in operators if ends is None])
+
         # graphic stack where we save parameters like transformation, line_width
         # each element is a list composed of sublist elements
         # (each sublist has 2 lists each having 2 elements: first is offset like:
@@ -158,7 +293,8 @@ class PdfParser(QtCore.QObject):
         flag_clear_geo = False
 
         line_nr = 0
-        lines = pdf_content.splitlines()
+        # the content as a string or the lines (e.g. from pdf_content_lines())
+        lines = pdf_content.splitlines() if isinstance(pdf_content, str) else pdf_content
 
         for pline in lines:
             if self.app.abort_flag:
@@ -168,10 +304,11 @@ class PdfParser(QtCore.QObject):
             line_nr += 1
             log.debug("line %d: %s" % (line_nr, pline))
 
+            operator, args = self.scan(pline)
+
             # COLOR DETECTION / OBJECT DETECTION
-            match = self.stroke_color_re.search(pline)
-            if match:
-                color = [float(match.group(1)), float(match.group(2)), float(match.group(3))]
+            if operator == 'stroke_color':
+                color = [float(args[0]), float(args[1]), float(args[2])]
                 log.debug(
                     "parse_pdf() --> STROKE Color change on line: %s --> RED=%f GREEN=%f BLUE=%f" %
                     (line_nr, color[0], color[1], color[2]))
@@ -192,9 +329,8 @@ class PdfParser(QtCore.QObject):
                 continue
 
             # CLEAR GEOMETRY detection
-            match = self.fill_color_re.search(pline)
-            if match:
-                fill_color = [float(match.group(1)), float(match.group(2)), float(match.group(3))]
+            if operator == 'fill_color':
+                fill_color = [float(args[0]), float(args[1]), float(args[2])]
                 log.debug(
                     "parse_pdf() --> FILL Color change on line: %s --> RED=%f GREEN=%f BLUE=%f" %
                     (line_nr, fill_color[0], fill_color[1], fill_color[2]))
@@ -209,11 +345,10 @@ class PdfParser(QtCore.QObject):
             # TRANSFORMATIONS DETECTION #
 
             # Detect combined transformation.
-            match = self.combined_transform_re.search(pline)
-            if match:
+            if operator == 'transform':
                 # detect save graphic stack event
                 # sometimes they combine save_to_graphics_stack with the transformation on the same line
-                if match.group(1) == 'q':
+                if args[0] == 'q':
                     log.debug(
                         "parse_pdf() --> Save to GS found on line: %s --> offset=[%f, %f] ||| scale=[%f, %f]" %
                         (line_nr, offset_geo[0], offset_geo[1], scale_geo[0], scale_geo[1]))
@@ -222,29 +357,28 @@ class PdfParser(QtCore.QObject):
                     self.gs['line_width'].append(deepcopy(size))
 
                 # transformation = TRANSLATION (OFFSET)
-                if (float(match.group(3)) == 0 and float(match.group(4)) == 0) and \
-                        (float(match.group(6)) != 0 or float(match.group(7)) != 0):
+                if (float(args[2]) == 0 and float(args[3]) == 0) and \
+                        (float(args[5]) != 0 or float(args[6]) != 0):
                     log.debug(
                         "parse_pdf() --> OFFSET transformation found on line: %s --> %s" % (line_nr, pline))
 
-                    offset_geo[0] += float(match.group(6))
-                    offset_geo[1] += float(match.group(7))
+                    offset_geo[0] += float(args[5])
+                    offset_geo[1] += float(args[6])
                     # log.debug("Offset= [%f, %f]" % (offset_geo[0], offset_geo[1]))
 
                 # transformation = SCALING
-                if float(match.group(2)) != 1 and float(match.group(5)) != 1:
+                if float(args[1]) != 1 and float(args[4]) != 1:
                     log.debug(
                         "parse_pdf() --> SCALE transformation found on line: %s --> %s" % (line_nr, pline))
 
-                    scale_geo[0] *= float(match.group(2))
-                    scale_geo[1] *= float(match.group(5))
+                    scale_geo[0] *= float(args[1])
+                    scale_geo[1] *= float(args[4])
                 # log.debug("Scale= [%f, %f]" % (scale_geo[0], scale_geo[1]))
 
                 continue
 
             # detect save graphic stack event
-            match = self.save_gs_re.search(pline)
-            if match:
+            if pline.startswith('q'):
                 log.debug(
                     "parse_pdf() --> Save to GS found on line: %s --> offset=[%f, %f] ||| scale=[%f, %f]" %
                     (line_nr, offset_geo[0], offset_geo[1], scale_geo[0], scale_geo[1]))
@@ -252,8 +386,7 @@ class PdfParser(QtCore.QObject):
                 self.gs['line_width'].append(deepcopy(size))
 
             # detect restore from graphic stack event
-            match = self.restore_gs_re.search(pline)
-            if match:
+            if 'Q' in pline:
                 try:
                     restored_transform = self.gs['transform'].pop(-1)
                     offset_geo = restored_transform[0]
@@ -280,8 +413,7 @@ class PdfParser(QtCore.QObject):
             # PATH CONSTRUCTION #
 
             # Start SUBPATH
-            match = self.start_subpath_re.search(pline)
-            if match:
+            if operator == 'start_subpath':
                 # we just started a subpath so we mark it as not closed yet
                 close_subpath = False
 
@@ -291,8 +423,8 @@ class PdfParser(QtCore.QObject):
                 subpath['rectangle'] = []
 
                 # detect start point to move to
-                x = float(match.group(1)) + offset_geo[0]
-                y = float(match.group(2)) + offset_geo[1]
+                x = float(args[0]) + offset_geo[0]
+                y = float(args[1]) + offset_geo[1]
                 pt = (x * self.point_to_unit_factor * scale_geo[0],
                       y * self.point_to_unit_factor * scale_geo[1])
                 start_point = pt
@@ -305,11 +437,10 @@ class PdfParser(QtCore.QObject):
                 continue
 
             # Draw Line
-            match = self.draw_line_re.search(pline)
-            if match:
+            if operator == 'draw_line':
                 current_subpath = 'lines'
-                x = float(match.group(1)) + offset_geo[0]
-                y = float(match.group(2)) + offset_geo[1]
+                x = float(args[0]) + offset_geo[0]
+                y = float(args[1]) + offset_geo[1]
                 pt = (x * self.point_to_unit_factor * scale_geo[0],
                       y * self.point_to_unit_factor * scale_geo[1])
                 subpath['lines'].append(pt)
@@ -317,20 +448,19 @@ class PdfParser(QtCore.QObject):
                 continue
 
             # Draw Bezier 'c'
-            match = self.draw_arc_3pt_re.search(pline)
-            if match:
+            if operator == 'arc_3pt':
                 current_subpath = 'bezier'
                 start = current_point
-                x = float(match.group(1)) + offset_geo[0]
-                y = float(match.group(2)) + offset_geo[1]
+                x = float(args[0]) + offset_geo[0]
+                y = float(args[1]) + offset_geo[1]
                 c1 = (x * self.point_to_unit_factor * scale_geo[0],
                       y * self.point_to_unit_factor * scale_geo[1])
-                x = float(match.group(3)) + offset_geo[0]
-                y = float(match.group(4)) + offset_geo[1]
+                x = float(args[2]) + offset_geo[0]
+                y = float(args[3]) + offset_geo[1]
                 c2 = (x * self.point_to_unit_factor * scale_geo[0],
                       y * self.point_to_unit_factor * scale_geo[1])
-                x = float(match.group(5)) + offset_geo[0]
-                y = float(match.group(6)) + offset_geo[1]
+                x = float(args[4]) + offset_geo[0]
+                y = float(args[5]) + offset_geo[1]
                 stop = (x * self.point_to_unit_factor * scale_geo[0],
                         y * self.point_to_unit_factor * scale_geo[1])
 
@@ -339,16 +469,15 @@ class PdfParser(QtCore.QObject):
                 continue
 
             # Draw Bezier 'v'
-            match = self.draw_arc_2pt_c1start_re.search(pline)
-            if match:
+            if operator == 'arc_2pt_c1start':
                 current_subpath = 'bezier'
                 start = current_point
-                x = float(match.group(1)) + offset_geo[0]
-                y = float(match.group(2)) + offset_geo[1]
+                x = float(args[0]) + offset_geo[0]
+                y = float(args[1]) + offset_geo[1]
                 c2 = (x * self.point_to_unit_factor * scale_geo[0],
                       y * self.point_to_unit_factor * scale_geo[1])
-                x = float(match.group(3)) + offset_geo[0]
-                y = float(match.group(4)) + offset_geo[1]
+                x = float(args[2]) + offset_geo[0]
+                y = float(args[3]) + offset_geo[1]
                 stop = (x * self.point_to_unit_factor * scale_geo[0],
                         y * self.point_to_unit_factor * scale_geo[1])
 
@@ -357,15 +486,14 @@ class PdfParser(QtCore.QObject):
                 continue
 
             # Draw Bezier 'y'
-            match = self.draw_arc_2pt_c2stop_re.search(pline)
-            if match:
+            if operator == 'arc_2pt_c2stop':
                 start = current_point
-                x = float(match.group(1)) + offset_geo[0]
-                y = float(match.group(2)) + offset_geo[1]
+                x = float(args[0]) + offset_geo[0]
+                y = float(args[1]) + offset_geo[1]
                 c1 = (x * self.point_to_unit_factor * scale_geo[0],
                       y * self.point_to_unit_factor * scale_geo[1])
-                x = float(match.group(3)) + offset_geo[0]
-                y = float(match.group(4)) + offset_geo[1]
+                x = float(args[2]) + offset_geo[0]
+                y = float(args[3]) + offset_geo[1]
                 stop = (x * self.point_to_unit_factor * scale_geo[0],
                         y * self.point_to_unit_factor * scale_geo[1])
 
@@ -374,13 +502,12 @@ class PdfParser(QtCore.QObject):
                 continue
 
             # Draw Rectangle 're'
-            match = self.rect_re.search(pline)
-            if match:
+            if operator == 'rect':
                 current_subpath = 'rectangle'
-                x = (float(match.group(1)) + offset_geo[0]) * self.point_to_unit_factor * scale_geo[0]
-                y = (float(match.group(2)) + offset_geo[1]) * self.point_to_unit_factor * scale_geo[1]
-                width = (float(match.group(3)) + offset_geo[0]) * self.point_to_unit_factor * scale_geo[0]
-                height = (float(match.group(4)) + offset_geo[1]) * self.point_to_unit_factor * scale_geo[1]
+                x = (float(args[0]) + offset_geo[0]) * self.point_to_unit_factor * scale_geo[0]
+                y = (float(args[1]) + offset_geo[1]) * self.point_to_unit_factor * scale_geo[1]
+                width = (float(args[2]) + offset_geo[0]) * self.point_to_unit_factor * scale_geo[0]
+                height = (float(args[3]) + offset_geo[1]) * self.point_to_unit_factor * scale_geo[1]
                 pt1 = (x, y)
                 pt2 = (x + width, y)
                 pt3 = (x + width, y + height)
@@ -391,8 +518,7 @@ class PdfParser(QtCore.QObject):
 
             # Detect clipping path set
             # ignore this and delete the current subpath
-            match = self.clip_path_re.search(pline)
-            if match:
+            if operator == 'clip_path':
                 subpath['lines'] = []
                 subpath['bezier'] = []
                 subpath['rectangle'] = []
@@ -407,8 +533,7 @@ class PdfParser(QtCore.QObject):
                 continue
 
             # Close SUBPATH
-            match = self.end_subpath_re.search(pline)
-            if match:
+            if operator == 'end_subpath':
                 close_subpath = True
                 if current_subpath == 'lines':
                     subpath['lines'].append(start_point)
@@ -430,22 +555,19 @@ class PdfParser(QtCore.QObject):
             # PATH PAINTING #
 
             # Detect Stroke width / aperture
-            match = self.strokewidth_re.search(pline)
-            if match:
-                size = float(match.group(1))
+            if operator == 'stroke_width':
+                size = float(args[0])
                 continue
 
             # Detect No_Op command, ignore the current subpath
-            match = self.no_op_re.search(pline)
-            if match:
+            if operator == 'no_op':
                 subpath['lines'] = []
                 subpath['bezier'] = []
                 subpath['rectangle'] = []
                 continue
 
             # Stroke the path
-            match = self.stroke_path__re.search(pline)
-            if match:
+            if operator == 'stroke_path':
                 # scale the size here; some PDF printers apply transformation after the size is declared
                 applied_size = size * scale_geo[0] * self.point_to_unit_factor
                 path_geo = []
@@ -528,7 +650,7 @@ class PdfParser(QtCore.QObject):
                     if found_aperture:
                         for pdf_geo in path_geo:
                             if isinstance(pdf_geo, MultiPolygon):
-                                for poly in pdf_geo:
+                                for poly in pdf_geo.geoms:
                                     new_el = {'solid': poly, 'follow': poly.exterior}
                                     apertures_dict[copy(found_aperture)]['geometry'].append(deepcopy(new_el))
                             else:
@@ -543,7 +665,7 @@ class PdfParser(QtCore.QObject):
                         apertures_dict[str(aperture)]['geometry'] = []
                         for pdf_geo in path_geo:
                             if isinstance(pdf_geo, MultiPolygon):
-                                for poly in pdf_geo:
+                                for poly in pdf_geo.geoms:
                                     new_el = {'solid': poly, 'follow': poly.exterior}
                                     apertures_dict[str(aperture)]['geometry'].append(deepcopy(new_el))
                             else:
@@ -556,7 +678,7 @@ class PdfParser(QtCore.QObject):
                     apertures_dict[str(aperture)]['geometry'] = []
                     for pdf_geo in path_geo:
                         if isinstance(pdf_geo, MultiPolygon):
-                            for poly in pdf_geo:
+                            for poly in pdf_geo.geoms:
                                 new_el = {'solid': poly, 'follow': poly.exterior}
                                 apertures_dict[str(aperture)]['geometry'].append(deepcopy(new_el))
                         else:
@@ -566,8 +688,7 @@ class PdfParser(QtCore.QObject):
                 continue
 
             # Fill the path
-            match = self.fill_path_re.search(pline)
-            if match:
+            if operator == 'fill_path':
                 # scale the size here; some PDF printers apply transformation after the size is declared
                 applied_size = size * scale_geo[0] * self.point_to_unit_factor
                 path_geo = []
@@ -677,7 +798,7 @@ class PdfParser(QtCore.QObject):
                     try:
                         for pdf_geo in path_geo:
                             if isinstance(pdf_geo, MultiPolygon):
-                                for poly in pdf_geo:
+                                for poly in pdf_geo.geoms:
                                     new_el = {'clear': poly}
                                     apertures_dict['0']['geometry'].append(deepcopy(new_el))
                             else:
@@ -691,7 +812,7 @@ class PdfParser(QtCore.QObject):
                         apertures_dict['0']['geometry'] = []
                         for pdf_geo in path_geo:
                             if isinstance(pdf_geo, MultiPolygon):
-                                for poly in pdf_geo:
+                                for poly in pdf_geo.geoms:
                                     new_el = {'clear': poly}
                                     apertures_dict['0']['geometry'].append(deepcopy(new_el))
                             else:
@@ -702,7 +823,7 @@ class PdfParser(QtCore.QObject):
                     try:
                         for pdf_geo in path_geo:
                             if isinstance(pdf_geo, MultiPolygon):
-                                for poly in pdf_geo:
+                                for poly in pdf_geo.geoms:
                                     new_el = {'solid': poly, 'follow': poly.exterior}
                                     apertures_dict['0']['geometry'].append(deepcopy(new_el))
                             else:
@@ -716,7 +837,7 @@ class PdfParser(QtCore.QObject):
                         apertures_dict['0']['geometry'] = []
                         for pdf_geo in path_geo:
                             if isinstance(pdf_geo, MultiPolygon):
-                                for poly in pdf_geo:
+                                for poly in pdf_geo.geoms:
                                     new_el = {'solid': poly, 'follow': poly.exterior}
                                     apertures_dict['0']['geometry'].append(deepcopy(new_el))
                             else:
@@ -725,8 +846,7 @@ class PdfParser(QtCore.QObject):
                     continue
 
             # Fill and Stroke the path
-            match = self.fill_stroke_path_re.search(pline)
-            if match:
+            if operator == 'fill_stroke_path':
                 # scale the size here; some PDF printers apply transformation after the size is declared
                 applied_size = size * scale_geo[0] * self.point_to_unit_factor
                 path_geo = []
@@ -865,7 +985,7 @@ class PdfParser(QtCore.QObject):
                     if found_aperture:
                         for pdf_geo in path_geo:
                             if isinstance(pdf_geo, MultiPolygon):
-                                for poly in pdf_geo:
+                                for poly in pdf_geo.geoms:
                                     new_el = {'solid': poly, 'follow': poly.exterior}
                                     apertures_dict[copy(found_aperture)]['geometry'].append(deepcopy(new_el))
                             else:
@@ -881,7 +1001,7 @@ class PdfParser(QtCore.QObject):
                         }
                         for pdf_geo in path_geo:
                             if isinstance(pdf_geo, MultiPolygon):
-                                for poly in pdf_geo:
+                                for poly in pdf_geo.geoms:
                                     new_el = {'solid': poly, 'follow': poly.exterior}
                                     apertures_dict[str(aperture)]['geometry'].append(deepcopy(new_el))
                             else:
@@ -896,7 +1016,7 @@ class PdfParser(QtCore.QObject):
 
                     for pdf_geo in path_geo:
                         if isinstance(pdf_geo, MultiPolygon):
-                            for poly in pdf_geo:
+                            for poly in pdf_geo.geoms:
                                 new_el = {'solid': poly, 'follow': poly.exterior}
                                 apertures_dict[str(aperture)]['geometry'].append(deepcopy(new_el))
                         else:
@@ -928,7 +1048,7 @@ class PdfParser(QtCore.QObject):
 
                         for pdf_geo in fill_geo:
                             if isinstance(pdf_geo, MultiPolygon):
-                                for poly in pdf_geo:
+                                for poly in pdf_geo.geoms:
                                     new_el = {'clear': poly}
                                     apertures_dict['0']['geometry'].append(deepcopy(new_el))
                             else:
@@ -954,7 +1074,7 @@ class PdfParser(QtCore.QObject):
 
                         for pdf_geo in fill_geo:
                             if isinstance(pdf_geo, MultiPolygon):
-                                for poly in pdf_geo:
+                                for poly in pdf_geo.geoms:
                                     new_el = {'solid': poly, 'follow': poly.exterior}
                                     apertures_dict['0']['geometry'].append(deepcopy(new_el))
                             else:
@@ -985,6 +1105,18 @@ class PdfParser(QtCore.QObject):
 
         return object_dict
 
+    def scan(self, line):
+        """
+        :param line:    a line of the PDF content
+        :return:        (name of the operator, tuple of its parameters) or (None, ()) if the line has no operator
+        """
+        scanner, groups = self.scanners.get(line[-1:], self.default_scanner)
+        match = scanner.match(line)
+        if match is None:
+            return None, ()
+        start, stop = groups[match.lastgroup]
+        return match.lastgroup, match.groups()[start:stop]
+
     def bezier_to_points(self, start, c1, c2, stop):
         """
         # Equation Bezier, page 184 PDF 1.4 reference
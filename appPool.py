@@ -1,32 +1,378 @@
-from PyQt5 import QtCore
-from multiprocessing import Pool, cpu_count
-import dill
+# ##########################################################
+# FlatCAM: 2D Post-processing for Manufacturing            #
+# Date: 10/18/2026                                         #
+# MIT Licence                                              #
+# ##########################################################
 
+"""
+Job scheduler for the CPU bound work done in the process pool of the app (app.pool).
 
-def run_dill_encoded(what):
-    fun, args = dill.loads(what)
-    print("load", fun, args)
-    return fun(*args)
+The jobs are sent in task groups:
 
+    with app.scheduler.group(_("Buffering")) as group:
+        group.submit(fcn, arg1, arg2)
+        group.map(fcn, geometry_list, args=(tooldia, ))
+        results = group.results()
 
-def apply_async(pool, fun, args):
-    print("...", fun, args)
-    print("dumps", dill.dumps((fun, args)))
-    return pool.map_async(run_dill_encoded, (dill.dumps((fun, args)),))
+* the tasks of a group are sent to the pool only a few at a time (about two for each process) so an abort is
+  effective after the running tasks end and a large job doesn't fill the pool queue
+* while waiting for the results the progress of the group (finished tasks / all tasks) is shown in the
+  activity view of the app (app.proc_container.update_view_text()) and app.abort_flag is checked; on abort the
+  tasks not yet sent are dropped and GracefulException is raised
+* a progress callback given to group() is called with the result of each finished task; the text it returns is
+  shown in the activity view after the progress of the group
+* map() splits a list (e.g. of geometries) in chunks and calls the function once for each chunk
+* share() puts a NumPy array (e.g. coordinates) in shared memory; only its name is sent to the processes
 
+When there is no pool (e.g. in the tests) the tasks are run in the calling process.
+"""
 
-def func1():
-    print("func")
+from multiprocessing import Pool, shared_memory, resource_tracker
+from collections import deque
+import logging
+import os
 
+import numpy as np
 
-class WorkerPool(QtCore.QObject):
+from appCommon.Common import GracefulException as grace
 
-    def __init__(self):
-        super(WorkerPool, self).__init__()
-        self.pool = Pool(cpu_count())
+log = logging.getLogger('base')
 
-    def add_task(self, task):
-        print("adding task", task)
-        # task['fcn'](*task['params'])
-        # print self.pool.map(task['fcn'], task['params'])
-        apply_async(self.pool, func1, ())
+
+def new_pool(processes=None):
+    """
+    Makes the process pool of the app. On POSIX the resource tracker of the shared memory is started first so the
+    forked processes use the same tracker as the app; otherwise each process has its own tracker that reports the
+    shared memory attached by the process as leaked when it ends.
+
+    :param processes:   number of processes; None for the number of CPUs
+    :return:            multiprocessing pool
+    """
+    if os.name == 'posix':
+        resource_tracker.ensure_running()
+    return Pool(processes)
+
+
+class SharedArray:
+    """
+    A NumPy array kept in shared memory. When pickled (e.g. sent as a parameter of a pool task) only the name of
+    the shared memory block, the shape and the dtype are sent; the process attaches to the same memory.
+    """
+
+    def __init__(self, array):
+        """
+        :param array:   the array copied in shared memory
+        """
+        array = np.ascontiguousarray(array)
+        self.shape = array.shape
+        self.dtype = array.dtype
+        self.owner = True
+
+        self.shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        self.array = np.ndarray(self.shape, dtype=self.dtype, buffer=self.shm.buf)
+        self.array[...] = array
+
+    def __getstate__(self):
+        return {'name': self.shm.name, 'shape': self.shape, 'dtype': self.dtype.str}
+
+    def __setstate__(self, state):
+        self.shape = state['shape']
+        self.dtype = np.dtype(state['dtype'])
+        self.owner = False
+
+        self.shm = shared_memory.SharedMemory(name=state['name'])
+        self.array = np.ndarray(self.shape, dtype=self.dtype, buffer=self.shm.buf)
+
+    def __array__(self, dtype=None, copy=None):
+        return self.array if dtype is None else self.array.astype(dtype)
+
+    def __len__(self):
+        return len(self.array)
+
+    def close(self):
+        """
+        Detach from the shared memory; the owner also frees it. The array can't be used after this.
+
+        :return:    None
+        """
+        if self.shm is None:
+            return
+
+        self.array = None
+        try:
+            self.shm.close()
+            if self.owner:
+                self.shm.unlink()
+        except (BufferError, FileNotFoundError) as e:
+            # a view of the array is still used
+            log.debug("SharedArray.close() --> %s" % str(e))
+        self.shm = None
+
+    def __del__(self):
+        self.close()
+
+
+class TaskGroup:
+    """
+    A set of tasks that are waited together. Made by JobScheduler.group().
+    """
+
+    def __init__(self, scheduler, text=None, progress=None):
+        """
+        :param scheduler:   the JobScheduler
+        :param text:        description of the job shown in the activity view while waiting for the results;
+                            None if the job is part of a process already shown there
+        :param progress:    function called in this process with the result of each finished task; the text it
+                            returns (if any) is shown in the activity view
+        """
+        self.scheduler = scheduler
+        self.text = text
+        self.progress = progress
+
+        # tasks not yet sent to the pool: (index, function, arguments)
+        self.queued = deque()
+        # tasks sent to the pool: (index, AsyncResult)
+        self.running = deque()
+        # result of each task
+        self.output = []
+        # the items of the list returned by results(): (first task, last task + 1, True for a map() call)
+        self.layout = []
+        self.shared = []
+
+        self.done = 0
+        self.aborted = False
+        self.proc = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    def __len__(self):
+        return len(self.layout)
+
+    def add_task(self, fcn, args):
+        self.output.append(None)
+        self.queued.append((len(self.output) - 1, fcn, args))
+        self.dispatch()
+
+    def submit(self, fcn, *args):
+        """
+        Adds a task to the group.
+
+        :param fcn:     function run in the pool; it has to be picklable (a module function or a static method)
+        :param args:    the parameters of the function
+        :return:        the index of the task result in the list returned by results()
+        """
+        self.layout.append((len(self.output), len(self.output) + 1, False))
+        self.add_task(fcn, args)
+        return len(self.layout) - 1
+
+    def map(self, fcn, items, args=(), chunk_size=None):
+        """
+        Splits a list in chunks and adds a task for each chunk: fcn(chunk, *args). The function has to return a
+        list (e.g. one result for each element of the chunk); the lists are joined by results().
+
+        :param fcn:         function run in the pool; it has to be picklable
+        :param items:       list (e.g. of geometries)
+        :param args:        the other parameters of the function
+        :param chunk_size:  number of items of a task; by default the list is split in about 4 tasks for each process
+        :return:            the index of this map in the list returned by results()
+        """
+        items = list(items)
+        if chunk_size is None:
+            chunk_size = self.scheduler.chunk_size(len(items))
+
+        chunk_size = max(int(chunk_size), 1)
+        start = len(self.output)
+        self.layout.append((start, start + -(-len(items) // chunk_size), True))
+        for k in range(0, len(items), chunk_size):
+            self.add_task(fcn, (items[k:k + chunk_size], ) + tuple(args))
+        return len(self.layout) - 1
+
+    def share(self, array):
+        """
+        Puts an array in shared memory for the tasks of this group; it is freed when the group is closed.
+
+        :param array:   NumPy array (or anything that can be converted to an array)
+        :return:        SharedArray to be used as a parameter of the tasks
+        """
+        shared = SharedArray(array)
+        self.shared.append(shared)
+        return shared
+
+    def dispatch(self):
+        """
+        Sends the queued tasks to the pool while the number of running tasks is under the limit.
+
+        :return:    None
+        """
+        pool = self.scheduler.pool
+        while self.queued and not self.aborted:
+            if pool is None:
+                idx, fcn, args = self.queued.popleft()
+                self.output[idx] = fcn(*args)
+                self.task_done(self.output[idx])
+                continue
+
+            if len(self.running) >= self.scheduler.max_running():
+                break
+            idx, fcn, args = self.queued.popleft()
+            self.running.append((idx, pool.apply_async(fcn, args)))
+
+    def task_done(self, result):
+        self.done += 1
+        self.scheduler.check_abort(self)
+
+        message = self.progress(result) if self.progress is not None else None
+        # shown after the description of the running process (this group or the job that made the group)
+        if self.scheduler.app is not None:
+            view_text = ' %d%%' % int(100 * self.done / len(self.output))
+            if message:
+                view_text += ' - %s' % message
+            self.scheduler.app.proc_container.update_view_text(view_text)
+
+    def results(self):
+        """
+        Waits for all the tasks of the group.
+
+        :return:    list with the result of each task in the order they were submitted; the results of the
+                    tasks made by a map() call are joined in a single list, at the index returned by map()
+        """
+        if self.text is not None and self.scheduler.app is not None:
+            self.proc = self.scheduler.app.proc_container.new(self.text)
+
+        try:
+            self.dispatch()
+            while self.running:
+                idx, result = self.running[0]
+                while not result.ready():
+                    result.wait(self.scheduler.poll_interval)
+                    self.scheduler.check_abort(self)
+                self.running.popleft()
+                self.output[idx] = result.get()
+                self.task_done(self.output[idx])
+                self.dispatch()
+        finally:
+            if self.proc is not None:
+                self.proc.done()
+                self.proc = None
+
+        output = []
+        for start, stop, mapped in self.layout:
+            if mapped:
+                joined = []
+                for chunk_result in self.output[start:stop]:
+                    joined += chunk_result
+                output.append(joined)
+            else:
+                output.append(self.output[start])
+        return output
+
+    def cancel(self):
+        """
+        Drops the tasks not yet sent to the pool. The running tasks can't be stopped; their results are ignored.
+
+        :return:    None
+        """
+        self.aborted = True
+        self.queued.clear()
+        self.running.clear()
+
+    def close(self):
+        self.cancel()
+        for shared in self.shared:
+            shared.close()
+        self.shared = []
+
+
+class JobScheduler:
+    """
+    Sends jobs to the process pool of the app. See the module documentation.
+    """
+
+    def __init__(self, app=None, pool=None):
+        """
+        :param app:     the App; its pool, abort_flag and proc_container are used
+        :param pool:    a multiprocessing pool used instead of app.pool; without app and pool the tasks are run in
+                        the calling process
+        """
+        self.app = app
+        self._pool = pool
+
+        # number of running tasks for each process of the pool
+        self.tasks_per_process = 2
+        # number of tasks for each process made by map()
+        self.chunks_per_process = 4
+        # seconds between the checks of the abort flag
+        self.poll_interval = 0.05
+
+    @property
+    def pool(self):
+        # the pool of the app may be recreated (App.clear_pool())
+        if self._pool is not None:
+            return self._pool
+        return getattr(self.app, 'pool', None)
+
+    @property
+    def processes(self):
+        try:
+            return max(self.pool._processes, 1)
+        except AttributeError:
+            return 1
+
+    def max_running(self):
+        return self.processes * self.tasks_per_process
+
+    def chunk_size(self, nr_items):
+        """
+        :param nr_items:    number of items of a list given to map()
+        :return:            the number of items for each task
+        """
+        nr_chunks = self.processes * self.chunks_per_process
+        return max(-(-nr_items // nr_chunks), 1)
+
+    def group(self, text=None, progress=None):
+        """
+        :param text:        description of the job shown in the activity view; None if the job is part of a process
+                            already shown there
+        :param progress:    function called with the result of each finished task; it may return a text for the
+                            activity view
+        :return:            a new TaskGroup; use it as a context manager to free its resources when done
+        """
+        return TaskGroup(self, text=text, progress=progress)
+
+    def map(self, fcn, items, args=(), chunk_size=None, text=None):
+        """
+        Runs fcn(chunk, *args) for chunks of a list and waits for the results.
+
+        :param fcn:         function run in the pool; it has to be picklable and to return a list
+        :param items:       list (e.g. of geometries)
+        :param args:        the other parameters of the function
+        :param chunk_size:  number of items of a task; None for a size based on the number of processes
+        :param text:        description of the job shown in the activity view
+        :return:            the joined lists returned for each chunk
+        """
+        with self.group(text) as group:
+            group.map(fcn, items, args=args, chunk_size=chunk_size)
+            return group.results()[0]
+
+    def apply(self, fcn, *args, text=None):
+        """
+        Runs a single function in the pool and waits for the result.
+
+        :param fcn:     function run in the pool; it has to be picklable
+        :param args:    the parameters of the function
+        :param text:    description of the job shown in the activity view
+        :return:        the result of the function
+        """
+        with self.group(text) as group:
+            group.submit(fcn, *args)
+            return group.results()[0]
+
+    def check_abort(self, group):
+        if self.app is not None and getattr(self.app, 'abort_flag', False):
+            group.cancel()
+            raise grace
@@ -10,6 +10,10 @@ from PyQt5 import QtCore, QtWidgets
 
 from shapely.geometry import Polygon, LineString
 
+from appTools import tool_class
+
+import time
+
 import gettext
 import appTranslation as fcTranslate
 import builtins
@@ -299,3 +303,93 @@ class AppTool(QtWidgets.QWidget):
         """
         default_hint_size = super(AppTool, self).sizeHint()
         return QtCore.QSize(default_hint_size.width(), default_hint_size.height())
+
+
+class LazyTool:
+    """
+    Stand-in for a tool (plugin) that was not used yet: only the menu action of the tool is made at install.
+
+    The module of the tool is imported and the tool is made, with its UI, when the menu action is triggered or when
+    an attribute of the tool is asked for; from then on the attributes are the ones of the tool.
+    """
+
+    def __init__(self, app, class_name, tool_name, shortcut=None):
+        """
+
+        :param app:         The application this tool will run in.
+        :type app:          app_Main.App
+        :param class_name:  Name of the tool class, a key of appTools.TOOLS
+        :param tool_name:   The name of the tool, in the menu; the same as the toolName of the tool class
+        :param shortcut:    The shortcut shown in the menu
+        """
+
+        self.app = app
+        self.class_name = class_name
+        self.toolName = tool_name
+        self.shortcut = shortcut
+
+        self.menuAction = None
+        self.tool = None
+
+    @property
+    def loaded(self):
+        return self.tool is not None
+
+    def load(self):
+        """
+        Makes the tool, if it was not made yet.
+
+        :return:    the tool
+        """
+        if self.tool is None:
+            start = time.perf_counter()
+            tool = tool_class(self.class_name)(self.app)
+
+            # the tool takes over the menu action
+            if self.menuAction is not None:
+                tool.menuAction = self.menuAction
+                self.menuAction.triggered.disconnect(self.on_menu_action)
+                self.menuAction.triggered.connect(tool.run)
+
+            self.tool = tool
+            self.app.log.debug("LazyTool.load() --> %s loaded in %.3f seconds" %
+                               (self.class_name, time.perf_counter() - start))
+        return self.tool
+
+    def install(self, icon=None, separator=None, **kwargs):
+        """
+        Adds the menu action of the tool, as AppTool.install() does.
+
+        :param icon:        Icon of the menu action
+        :param separator:   If True add a separator after the menu action
+        :param kwargs:      'pos' the menu (default the Tool menu) and 'before' the action before which it is added
+        :return:            None
+        """
+        pos = kwargs['pos'] if 'pos' in kwargs else self.app.ui.menutool
+        before = kwargs['before'] if 'before' in kwargs else None
+
+        self.menuAction = QtWidgets.QAction(self.app.ui)
+        if icon is not None:
+            self.menuAction.setIcon(icon)
+
+        if self.shortcut is None:
+            self.menuAction.setText(self.toolName)
+        else:
+            self.menuAction.setText(self.toolName + '\t%s' % self.shortcut)
+
+        pos.insertAction(before, self.menuAction)
+
+        if separator is True:
+            pos.addSeparator()
+
+        self.menuAction.triggered.connect(self.on_menu_action)
+
+    def on_menu_action(self, checked=False):
+        # the first trigger of the menu action: later ones go directly to the tool
+        self.load().run(toggle=checked)
+
+    def __getattr__(self, name):
+        # only called for the attributes that are not on the stand-in
+        if name.startswith('__') or name == 'tool':
+            raise AttributeError(name)
+        return getattr(self.load(), name)
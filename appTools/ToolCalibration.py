@@ -641,8 +641,10 @@ class ToolCalibration(AppTool):
             except Exception as ee:
                 app.log.debug("ToolCalibration.new_calibrated_object.initialize_geometry() --> %s" % str(ee))
 
-            obj_init.scale(xfactor=scalex, yfactor=scaley, point=(origin_x, origin_y))
-            obj_init.skew(angle_x=skewx, angle_y=skewy, point=(origin_x, origin_y))
+            # the scale and the skew are applied together, in a single transformation
+            with obj_init.deferred_transforms():
+                obj_init.scale(xfactor=scalex, yfactor=scaley, point=(origin_x, origin_y))
+                obj_init.skew(angle_x=skewx, angle_y=skewy, point=(origin_x, origin_y))
 
             try:
                 obj_init.source_file = deepcopy(obj.source_file)
@@ -667,8 +669,10 @@ class ToolCalibration(AppTool):
             except Exception as err:
                 log.debug("ToolCalibration.new_calibrated_object.initialize_gerber() --> %s" % str(err))
 
-            obj_init.scale(xfactor=scalex, yfactor=scaley, point=(origin_x, origin_y))
-            obj_init.skew(angle_x=skewx, angle_y=skewy, point=(origin_x, origin_y))
+            # the scale and the skew are applied together, in a single transformation
+            with obj_init.deferred_transforms():
+                obj_init.scale(xfactor=scalex, yfactor=scaley, point=(origin_x, origin_y))
+                obj_init.skew(angle_x=skewx, angle_y=skewy, point=(origin_x, origin_y))
 
             try:
                 obj_init.source_file = app_obj.f_handlers.export_gerber(obj_name=obj_name, filename=None,
@@ -684,8 +688,10 @@ class ToolCalibration(AppTool):
             # slots are offset, so they need to be deep copied
             obj_init.slots = deepcopy(obj.slots)
 
-            obj_init.scale(xfactor=scalex, yfactor=scaley, point=(origin_x, origin_y))
-            obj_init.skew(angle_x=skewx, angle_y=skewy, point=(origin_x, origin_y))
+            # the scale and the skew are applied together, in a single transformation
+            with obj_init.deferred_transforms():
+                obj_init.scale(xfactor=scalex, yfactor=scaley, point=(origin_x, origin_y))
+                obj_init.skew(angle_x=skewx, angle_y=skewy, point=(origin_x, origin_y))
 
             obj_init.create_geometry()
 
@@ -10,12 +10,12 @@ from PyQt5 import QtWidgets, QtCore, QtGui
 from camlib import grace
 from appTool import AppTool
 from appGUI.GUIElements import FCDoubleSpinner, RadioSet, FCEntry, FCComboBox, FCLabel
+from appCommon.ThievingPattern import grid_centers, fill_pattern
 
 import shapely.geometry.base as base
 from shapely.ops import unary_union
 from shapely.geometry import Polygon, MultiPolygon, Point, LineString
 from shapely.geometry import box as box
-import shapely.affinity as affinity
 
 import logging
 from copy import deepcopy
@@ -713,51 +713,17 @@ class ToolCopperThieving(AppTool):
             tool_obj.app.proc_container.update_view_text(' %s' % _("Create geometry"))
 
             if fill_type == 'dot' or fill_type == 'square':
-                # build the MultiPolygon of dots/squares that will fill the entire bounding box
-                thieving_list = []
-
+                # the grid of dots/squares that fills the entire bounding box; a dot/square is made only where it's
+                # within the area to fill, by moving a dot/square made once
                 if fill_type == 'dot':
-                    radius = dot_dia / 2.0
-                    new_x = x0 + radius
-                    new_y = y0 + radius
-                    while new_x <= x1 - radius:
-                        while new_y <= y1 - radius:
-                            dot_geo = Point((new_x, new_y)).buffer(radius, resolution=64)
-                            thieving_list.append(dot_geo)
-                            new_y += dot_dia + dot_spacing
-                        new_x += dot_dia + dot_spacing
-                        new_y = y0 + radius
+                    template = Point((0, 0)).buffer(dot_dia / 2.0, 64)
+                    centers = grid_centers((x0, y0, x1, y1), dot_dia, dot_spacing)
                 else:
                     h_size = square_size / 2.0
-                    new_x = x0 + h_size
-                    new_y = y0 + h_size
-                    while new_x <= x1 - h_size:
-                        while new_y <= y1 - h_size:
-                            a, b, c, d = (Point((new_x, new_y)).buffer(h_size)).bounds
-                            square_geo = box(a, b, c, d)
-                            thieving_list.append(square_geo)
-                            new_y += square_size + square_spacing
-                        new_x += square_size + square_spacing
-                        new_y = y0 + h_size
-
-                thieving_box_geo = MultiPolygon(thieving_list)
-                dx = bounding_box.centroid.x - thieving_box_geo.centroid.x
-                dy = bounding_box.centroid.y - thieving_box_geo.centroid.y
-
-                thieving_box_geo = affinity.translate(thieving_box_geo, xoff=dx, yoff=dy)
-
-                try:
-                    _it = iter(thieving_box_geo)
-                except TypeError:
-                    thieving_box_geo = [thieving_box_geo]
-
-                thieving_geo = []
-                for dot_geo in thieving_box_geo:
-                    for geo_t in tool_obj.thief_solid_geometry:
-                        if dot_geo.within(geo_t):
-                            thieving_geo.append(dot_geo)
+                    template = box(-h_size, -h_size, h_size, h_size)
+                    centers = grid_centers((x0, y0, x1, y1), square_size, square_spacing)
 
-                tool_obj.thief_solid_geometry = thieving_geo
+                tool_obj.thief_solid_geometry = fill_pattern(tool_obj.thief_solid_geometry, template, centers)
 
             if fill_type == 'line':
                 half_thick_line = line_size / 2.0
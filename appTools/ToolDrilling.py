@@ -1657,7 +1657,7 @@ class ToolDrilling(AppTool, Excellon):
         # #############################################################################################################
         used_excellon_optimization_type = self.app.defaults["excellon_optimization_type"]
         current_platform = platform.architecture()[0]
-        if current_platform != '64bit':
+        if current_platform != '64bit' and used_excellon_optimization_type != 'K':
             used_excellon_optimization_type = 'T'
 
         # #############################################################################################################
@@ -1928,6 +1928,8 @@ class ToolDrilling(AppTool, Excellon):
                 log.debug(
                     "The total travel distance with Travelling Salesman Algorithm is: %s" %
                     str(job_obj.measured_distance))
+            elif used_excellon_optimization_type == 'K':
+                log.debug("The total travel distance with KD-Tree Algorithm is: %s" % str(job_obj.measured_distance))
             else:
                 log.debug("The total travel distance with with no optimization is: %s" %
                           str(job_obj.measured_distance))
@@ -8,6 +8,8 @@
 from PyQt5 import QtCore, QtWidgets, QtGui
 
 from appTool import AppTool
+from appCommon.FilmRaster import write_film
+from appCommon.Common import GracefulException as grace
 from appGUI.GUIElements import RadioSet, FCDoubleSpinner, FCCheckBox, \
     OptionalHideInputSection, FCComboBox, FCFileSaveDialog, FCButton, FCLabel, FCSpinner
 
@@ -19,7 +21,6 @@ from shapely.ops import unary_union
 
 from reportlab.graphics import renderPDF
 from reportlab.pdfgen import canvas
-from reportlab.graphics import renderPM
 from reportlab.lib.units import inch, mm
 from reportlab.lib.pagesizes import landscape, portrait
 
@@ -222,6 +223,9 @@ class Film(AppTool):
         elif ftype == 'png':
             filter_ext = "PNG Files (*.PNG);;" \
                          "All Files (*.*)"
+        elif ftype == 'tif':
+            filter_ext = "TIFF Files (*.TIF);;" \
+                         "All Files (*.*)"
         else:
             filter_ext = "PDF Files (*.PDF);;" \
                          "All Files (*.*)"
@@ -370,6 +374,9 @@ class Film(AppTool):
         elif ftype == 'png':
             filter_ext = "PNG Files (*.PNG);;" \
                          "All Files (*.*)"
+        elif ftype == 'tif':
+            filter_ext = "TIFF Files (*.TIF);;" \
+                         "All Files (*.*)"
         else:
             filter_ext = "PDF Files (*.PDF);;" \
                          "All Files (*.*)"
@@ -452,19 +459,11 @@ class Film(AppTool):
 
             scale_reference = 'center'
 
-            self.screen_dpi = self.app.qapp.screens()[0].logicalDotsPerInch()
-
             new_png_dpi = self.ui.png_dpi_spinner.get_value()
-            dpi_rate = new_png_dpi / self.screen_dpi
             # Determine bounding area for svg export
             bounds = box.bounds()
             tr_scale_reference = (bounds[0], bounds[1])
 
-            if dpi_rate != 1 and ftype == 'png':
-                scale_factor_x += dpi_rate
-                scale_factor_y += dpi_rate
-                scale_reference = (bounds[0], bounds[1])
-
             if box.kind.lower() == 'geometry':
                 flat_geo = []
                 if box.multigeo:
@@ -518,6 +517,16 @@ class Film(AppTool):
             bounds = transformed_box_geo.bounds
             size = bounds[2] - bounds[0], bounds[3] - bounds[1]
 
+            if ftype in ['png', 'tif']:
+                # the geometry is filled directly in the bitmap, white on the black film
+                film_bounds = (bounds[0] - boundary, bounds[1] - boundary, bounds[2] + boundary, bounds[3] + boundary)
+                return self.export_raster(obj, filename, film_bounds, new_png_dpi, scale_stroke_factor,
+                                          foreground=(255, 255, 255), background=(0, 0, 0), ftype=ftype,
+                                          scale_factor_x=scale_factor_x, scale_factor_y=scale_factor_y,
+                                          skew_factor_x=skew_factor_x, skew_factor_y=skew_factor_y,
+                                          mirror=mirror,
+                                          scale_reference=scale_reference, skew_reference=skew_reference)
+
             exported_svg = obj.export_svg(scale_stroke_factor=scale_stroke_factor,
                                           scale_factor_x=scale_factor_x, scale_factor_y=scale_factor_y,
                                           skew_factor_x=skew_factor_x, skew_factor_y=skew_factor_y,
@@ -589,19 +598,6 @@ class Film(AppTool):
                                          _("Permission denied, saving not possible.\n"
                                            "Most likely another app is holding the file open and not accessible."))
                     return 'fail'
-            elif ftype == 'png':
-                try:
-                    doc_final = StringIO(doc_final)
-                    drawing = svg2rlg(doc_final)
-                    renderPM.drawToFile(drawing, filename, 'PNG')
-
-                    # if new_png_dpi == default_dpi:
-                    #     renderPM.drawToFile(drawing, filename, 'PNG')
-                    # else:
-                    #     renderPM.drawToFile(drawing, filename, 'PNG', dpi=new_png_dpi)
-                except Exception as e:
-                    log.debug("FilmTool.export_negative() --> PNG output --> %s" % str(e))
-                    return 'fail'
             else:
                 try:
                     if self.units == 'INCH':
@@ -711,19 +707,11 @@ class Film(AppTool):
 
             scale_reference = 'center'
 
-            self.screen_dpi = self.app.qapp.screens()[0].logicalDotsPerInch()
-
             new_png_dpi = self.ui.png_dpi_spinner.get_value()
-            dpi_rate = new_png_dpi / self.screen_dpi
             # Determine bounding area for svg export
             bounds = box.bounds()
             tr_scale_reference = (bounds[0], bounds[1])
 
-            if dpi_rate != 1 and ftype == 'png':
-                scale_factor_x += dpi_rate
-                scale_factor_y += dpi_rate
-                scale_reference = (bounds[0], bounds[1])
-
             if box.kind.lower() == 'geometry':
                 flat_geo = []
                 if box.multigeo:
@@ -777,6 +765,22 @@ class Film(AppTool):
             bounds = transformed_box_geo.bounds
             size = bounds[2] - bounds[0], bounds[3] - bounds[1]
 
+            if ftype in ['png', 'tif']:
+                # the geometry is filled directly in the bitmap; the boundary is the same as for the SVG
+                boundary = 1.0 if obj.units.lower() == 'mm' else 0.0393701
+                film_bounds = (bounds[0] - boundary, bounds[1] - boundary, bounds[2] + boundary, bounds[3] + boundary)
+                foreground = QtGui.QColor(str(color))
+                opacity = float(transparency_level)
+                # the color with its opacity over the white film
+                foreground = tuple(int(round(255 * (1 - opacity) + c * opacity))
+                                   for c in (foreground.red(), foreground.green(), foreground.blue()))
+                return self.export_raster(obj, filename, film_bounds, new_png_dpi, scale_stroke_factor,
+                                          foreground=foreground, background=(255, 255, 255), ftype=ftype,
+                                          scale_factor_x=scale_factor_x, scale_factor_y=scale_factor_y,
+                                          skew_factor_x=skew_factor_x, skew_factor_y=skew_factor_y,
+                                          mirror=mirror,
+                                          scale_reference=scale_reference, skew_reference=skew_reference)
+
             exported_svg = obj.export_svg(scale_stroke_factor=scale_stroke_factor,
                                           scale_factor_x=scale_factor_x, scale_factor_y=scale_factor_y,
                                           skew_factor_x=skew_factor_x, skew_factor_y=skew_factor_y,
@@ -839,14 +843,6 @@ class Film(AppTool):
                                          _("Permission denied, saving not possible.\n"
                                            "Most likely another app is holding the file open and not accessible."))
                     return 'fail'
-            elif ftype == 'png':
-                try:
-                    doc_final = StringIO(doc_final)
-                    drawing = svg2rlg(doc_final)
-                    renderPM.drawToFile(drawing, filename, 'PNG')
-                except Exception as e:
-                    log.debug("FilmTool.export_positive() --> PNG output --> %s" % str(e))
-                    return 'fail'
             else:
                 try:
                     if self.units == 'IN':
@@ -895,6 +891,53 @@ class Film(AppTool):
                                transparency_level=transparency_level,
                                scale_factor_x=scale_factor_x, scale_factor_y=scale_factor_y)
 
+    def export_raster(self, obj, filename, bounds, dpi, scale_stroke_factor, foreground, background, ftype='png',
+                      **transform):
+        """
+        Saves the film as a raster image (PNG or TIFF), made directly from the geometry of the object.
+
+        :param obj:                 the FlatCAM object to be saved
+        :param filename:            path to the file to save to
+        :param bounds:              (xmin, ymin, xmax, ymax) of the film
+        :param dpi:                 resolution of the image
+        :param scale_stroke_factor: half of the width of the lines; 0.01 if not larger than 0, as in the SVG film
+        :param foreground:          (R, G, B) color of the features
+        :param background:          (R, G, B) color of the film
+        :param ftype:               'png' or 'tif'
+        :param transform:           the scale, skew and mirror parameters of Geometry.export_geometry()
+        :return:                    'fail' if the film could not be saved
+        """
+        geometry = obj.export_geometry(**transform)
+        stroke = scale_stroke_factor if scale_stroke_factor > 0 else 0.01
+
+        def check_abort():
+            if self.app.abort_flag:
+                # graceful abort requested by the user
+                raise grace
+
+        def progress(percentage):
+            self.app.proc_container.update_view_text(' %d%%' % percentage)
+
+        try:
+            write_film(filename, geometry, bounds, dpi, units=obj.units, stroke=stroke, foreground=foreground,
+                       background=background, ftype=ftype, check_abort=check_abort, progress=progress)
+        except PermissionError:
+            self.app.inform.emit('[WARNING] %s' %
+                                 _("Permission denied, saving not possible.\n"
+                                   "Most likely another app is holding the file open and not accessible."))
+            return 'fail'
+        except grace:
+            self.app.inform.emit('[WARNING_NOTCL] %s' % _("Cancelled."))
+            return 'fail'
+        except Exception as e:
+            log.debug("FilmTool.export_raster() --> %s" % str(e))
+            return 'fail'
+
+        if self.app.defaults["global_open_style"] is False:
+            self.app.file_opened.emit("SVG", filename)
+        self.app.file_saved.emit("SVG", filename)
+        self.app.inform.emit('[success] %s: %s' % (_("Film file exported to"), filename))
+
     def reset_fields(self):
         self.ui.tf_object_combo.setRootModelIndex(self.app.collection.index(0, 0, QtCore.QModelIndex()))
         self.ui.tf_box_combo.setRootModelIndex(self.app.collection.index(0, 0, QtCore.QModelIndex()))
@@ -1256,6 +1299,7 @@ class FilmUI:
         # File type
         self.file_type_radio = RadioSet([{'label': _('SVG'), 'value': 'svg'},
                                          {'label': _('PNG'), 'value': 'png'},
+                                         {'label': _('TIFF'), 'value': 'tif'},
                                          {'label': _('PDF'), 'value': 'pdf'}
                                          ], stretch=False)
 
@@ -1264,6 +1308,7 @@ class FilmUI:
             _("The file type of the saved film. Can be:\n"
               "- 'SVG' -> open-source vectorial format\n"
               "- 'PNG' -> raster image\n"
+              "- 'TIFF' -> raster image\n"
               "- 'PDF' -> portable document format")
         )
         grid1.addWidget(self.file_type_label, 1, 0)
@@ -1421,7 +1466,7 @@ class FilmUI:
             self.pagesize_combo.show()
             self.png_dpi_label.hide()
             self.png_dpi_spinner.hide()
-        elif val == 'png':
+        elif val in ['png', 'tif']:
             self.png_dpi_label.show()
             self.png_dpi_spinner.show()
             self.orientation_label.hide()
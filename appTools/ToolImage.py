@@ -75,6 +75,7 @@ class ToolImage(AppTool):
         self.ui.mask_r_entry.set_value(250)
         self.ui.mask_g_entry.set_value(250)
         self.ui.mask_b_entry.set_value(250)
+        self.ui.tile_size_entry.set_value(2048)
 
     def on_file_importimage(self):
         """
@@ -106,14 +107,16 @@ class ToolImage(AppTool):
             self.ui.mask_g_entry.get_value(),
             self.ui.mask_b_entry.get_value()
         ]
+        tile_size = self.ui.tile_size_entry.get_value()
 
         if filename == "":
             self.app.inform.emit(_("Cancelled."))
         else:
             self.app.worker_task.emit({'fcn': self.import_image,
-                                       'params': [filename, type_obj, dpi, mode, mask]})
+                                       'params': [filename, type_obj, dpi, mode, mask, None, tile_size]})
 
-    def import_image(self, filename, o_type=_("Gerber"), dpi=96, mode='black', mask=None, outname=None):
+    def import_image(self, filename, o_type=_("Gerber"), dpi=96, mode='black', mask=None, outname=None,
+                     tile_size=2048):
         """
         Adds a new Geometry Object to the projects and populates
         it with shapes extracted from the SVG file.
@@ -124,6 +127,8 @@ class ToolImage(AppTool):
         :param mode: black or color
         :param mask: dictate the level of detail
         :param outname: name for the resulting file
+        :param tile_size: the image is read and vectorized in tiles of this size (pixels), in the process pool;
+        0 to read the whole image at once
         :return:
         """
 
@@ -143,7 +148,8 @@ class ToolImage(AppTool):
             return
 
         def obj_init(geo_obj, app_obj):
-            geo_obj.import_image(filename, units=units, dpi=dpi, mode=mode, mask=mask)
+            geo_obj.import_image(filename, units=units, dpi=dpi, mode=mode, mask=mask, tile_size=tile_size,
+                                 scheduler=app_obj.scheduler)
             geo_obj.multigeo = False
 
         with self.app.proc_container.new('%s ...' % _("Importing")):
@@ -280,6 +286,19 @@ class ImageUI:
         )
         ti2_form_layout.addRow(self.mask_b_label, self.mask_b_entry)
 
+        # Size of the tiles in which the image is read
+        self.tile_size_entry = FCSpinner(callback=self.confirmation_message_int)
+        self.tile_size_entry.set_range(0, 99999)
+
+        self.tile_size_label = QtWidgets.QLabel("%s:" % _('Tile size'))
+        self.tile_size_label.setToolTip(
+            _("The image is read and converted in square tiles\n"
+              "of this size (pixels), in parallel.\n"
+              "Large images need less memory.\n"
+              "0 means the whole image is read at once.")
+        )
+        ti2_form_layout.addRow(self.tile_size_label, self.tile_size_entry)
+
         # Buttons
         self.import_button = QtWidgets.QPushButton(_("Import image"))
         self.import_button.setToolTip(
@@ -12,6 +12,7 @@ from appGUI.GUIElements import FCCheckBox, FCDoubleSpinner, RadioSet, FCTable, F
     FCComboBox, OptionalInputSection, FCSpinner, FCLabel, FCInputDialogSpinnerButton, FCComboBox2
 from appParsers.ParseGerber import Gerber
 from camlib import grace
+from appCommon.Clearance import gerber_polygons, smallest_gaps, minimum_clearance
 
 from copy import deepcopy
 
@@ -19,7 +20,7 @@ import numpy as np
 import simplejson as json
 import sys
 
-from shapely.ops import unary_union, nearest_points
+from shapely.ops import unary_union
 from shapely.geometry import MultiPolygon, Polygon, MultiLineString, LineString, LinearRing, Point
 
 from matplotlib.backend_bases import KeyEvent as mpl_key_event
@@ -909,49 +910,12 @@ class ToolIsolation(AppTool, Gerber):
     @staticmethod
     def find_optim_mp(aperture_storage, decimals):
         msg = 'ok'
-        total_geo = []
 
-        for ap in list(aperture_storage.keys()):
-            if 'geometry' in aperture_storage[ap]:
-                for geo_el in aperture_storage[ap]['geometry']:
-                    if 'solid' in geo_el and geo_el['solid'] is not None and geo_el['solid'].is_valid:
-                        total_geo.append(geo_el['solid'])
-
-        total_geo = MultiPolygon(total_geo)
-        total_geo = total_geo.buffer(0)
-
-        try:
-            __ = iter(total_geo)
-            geo_len = len(total_geo)
-        except TypeError:
+        min_dist = minimum_clearance(aperture_storage, decimals)
+        if min_dist is None:
             msg = ('[ERROR_NOTCL] %s' % _("The Gerber object has one Polygon as geometry.\n"
                                           "There are no distances between geometry elements to be found."))
 
-        min_dict = {}
-        idx = 1
-        for geo in total_geo:
-            for s_geo in total_geo[idx:]:
-                # minimize the number of distances by not taking into considerations
-                # those that are too small
-                dist = geo.distance(s_geo)
-                dist = float('%.*f' % (decimals, dist))
-                loc_1, loc_2 = nearest_points(geo, s_geo)
-
-                proc_loc = (
-                    (float('%.*f' % (decimals, loc_1.x)), float('%.*f' % (decimals, loc_1.y))),
-                    (float('%.*f' % (decimals, loc_2.x)), float('%.*f' % (decimals, loc_2.y)))
-                )
-
-                if dist in min_dict:
-                    min_dict[dist].append(proc_loc)
-                else:
-                    min_dict[dist] = [proc_loc]
-
-            idx += 1
-
-        min_list = list(min_dict.keys())
-        min_dist = min(min_list)
-
         return msg, min_dist
 
     # multiprocessing variant
@@ -977,8 +941,10 @@ class ToolIsolation(AppTool, Gerber):
 
                 ap_storage = fcobj.apertures
 
-                p = app_obj.pool.apply_async(self.find_optim_mp, args=(ap_storage, self.decimals))
-                res = p.get()
+                try:
+                    res = app_obj.scheduler.apply(self.find_optim_mp, ap_storage, self.decimals)
+                except grace:
+                    return 'fail'
 
                 if res[0] != 'ok':
                     app_obj.inform.emit(res[0])
@@ -1040,68 +1006,22 @@ class ToolIsolation(AppTool, Gerber):
         def job_thread(app_obj):
             with self.app.proc_container.new(_("Checking ...")):
                 try:
-                    old_disp_number = 0
-                    pol_nr = 0
                     app_obj.proc_container.update_view_text(' %d%%' % 0)
-                    total_geo = []
-
-                    for ap in list(fcobj.apertures.keys()):
-                        if 'geometry' in fcobj.apertures[ap]:
-                            for geo_el in fcobj.apertures[ap]['geometry']:
-                                if self.app.abort_flag:
-                                    # graceful abort requested by the user
-                                    raise grace
-
-                                if 'solid' in geo_el and geo_el['solid'] is not None and geo_el['solid'].is_valid:
-                                    total_geo.append(geo_el['solid'])
-
-                    total_geo = MultiPolygon(total_geo)
-                    total_geo = total_geo.buffer(0)
 
-                    try:
-                        __ = iter(total_geo)
-                        geo_len = len(total_geo)
-                        geo_len = (geo_len * (geo_len - 1)) / 2
-                    except TypeError:
+                    total_geo = gerber_polygons(fcobj.apertures)
+                    if len(total_geo) < 2:
                         msg = _("The Gerber object has one Polygon as geometry.\n"
                                 "There are no distances between geometry elements to be found.")
                         app_obj.inform.emit('[ERROR_NOTCL] %s' % msg)
                         return 'fail'
 
-                    min_dict = {}
-                    idx = 1
-                    for geo in total_geo:
-                        for s_geo in total_geo[idx:]:
-                            if self.app.abort_flag:
-                                # graceful abort requested by the user
-                                raise grace
-
-                            # minimize the number of distances by not taking into considerations those
-                            # that are too small
-                            dist = geo.distance(s_geo)
-                            dist = float('%.*f' % (self.decimals, dist))
-                            loc_1, loc_2 = nearest_points(geo, s_geo)
-
-                            proc_loc = (
-                                (float('%.*f' % (self.decimals, loc_1.x)), float('%.*f' % (self.decimals, loc_1.y))),
-                                (float('%.*f' % (self.decimals, loc_2.x)), float('%.*f' % (self.decimals, loc_2.y)))
-                            )
-
-                            if dist in min_dict:
-                                min_dict[dist].append(proc_loc)
-                            else:
-                                min_dict[dist] = [proc_loc]
-
-                            pol_nr += 1
-                            disp_number = int(np.interp(pol_nr, [0, geo_len], [0, 100]))
-
-                            if old_disp_number < disp_number <= 100:
-                                app_obj.proc_container.update_view_text(' %d%%' % disp_number)
-                                old_disp_number = disp_number
-                        idx += 1
+                    def check_abort():
+                        if self.app.abort_flag:
+                            # graceful abort requested by the user
+                            raise grace
 
-                    min_list = list(min_dict.keys())
-                    min_dist = min(min_list)
+                    min_dist = smallest_gaps(total_geo, k=1, decimals=self.decimals, check_abort=check_abort)[0][0]
+                    app_obj.proc_container.update_view_text(' %d%%' % 100)
 
                     min_dist_truncated = self.app.dec_format(float(min_dist), self.decimals)
                     self.safe_tooldia = min_dist_truncated
@@ -13,12 +13,14 @@ from appGUI.GUIElements import FCCheckBox, FCDoubleSpinner, RadioSet, FCTable, F
 from appParsers.ParseGerber import Gerber
 
 from camlib import grace
+from appCommon.Clearance import gerber_polygons, smallest_gaps, minimum_clearance
+from appCommon.ParallelClear import clear_polygons, flatten_polygons
 
 from copy import deepcopy
 
 import numpy as np
 from shapely.geometry import base
-from shapely.ops import unary_union, nearest_points
+from shapely.ops import unary_union
 from shapely.geometry import MultiPolygon, Polygon, MultiLineString, LineString, LinearRing
 
 from matplotlib.backend_bases import KeyEvent as mpl_key_event
@@ -850,49 +852,12 @@ class NonCopperClear(AppTool, Gerber):
     @staticmethod
     def find_optim_mp(aperture_storage, decimals):
         msg = 'ok'
-        total_geo = []
 
-        for ap in list(aperture_storage.keys()):
-            if 'geometry' in aperture_storage[ap]:
-                for geo_el in aperture_storage[ap]['geometry']:
-                    if 'solid' in geo_el and geo_el['solid'] is not None and geo_el['solid'].is_valid:
-                        total_geo.append(geo_el['solid'])
-
-        total_geo = MultiPolygon(total_geo)
-        total_geo = total_geo.buffer(0)
-
-        try:
-            __ = iter(total_geo)
-            geo_len = len(total_geo)
-        except TypeError:
+        min_dist = minimum_clearance(aperture_storage, decimals)
+        if min_dist is None:
             msg = ('[ERROR_NOTCL] %s' % _("The Gerber object has one Polygon as geometry.\n"
                                           "There are no distances between geometry elements to be found."))
 
-        min_dict = {}
-        idx = 1
-        for geo in total_geo:
-            for s_geo in total_geo[idx:]:
-                # minimize the number of distances by not taking into considerations
-                # those that are too small
-                dist = geo.distance(s_geo)
-                dist = float('%.*f' % (decimals, dist))
-                loc_1, loc_2 = nearest_points(geo, s_geo)
-
-                proc_loc = (
-                    (float('%.*f' % (decimals, loc_1.x)), float('%.*f' % (decimals, loc_1.y))),
-                    (float('%.*f' % (decimals, loc_2.x)), float('%.*f' % (decimals, loc_2.y)))
-                )
-
-                if dist in min_dict:
-                    min_dict[dist].append(proc_loc)
-                else:
-                    min_dict[dist] = [proc_loc]
-
-            idx += 1
-
-        min_list = list(min_dict.keys())
-        min_dist = min(min_list)
-
         return msg, min_dist
 
     # multiprocessing variant
@@ -918,8 +883,10 @@ class NonCopperClear(AppTool, Gerber):
 
                 ap_storage = fcobj.apertures
 
-                p = app_obj.pool.apply_async(self.find_optim_mp, args=(ap_storage, self.decimals))
-                res = p.get()
+                try:
+                    res = app_obj.scheduler.apply(self.find_optim_mp, ap_storage, self.decimals)
+                except grace:
+                    return 'fail'
 
                 if res[0] != 'ok':
                     app_obj.inform.emit(res[0])
@@ -985,68 +952,22 @@ class NonCopperClear(AppTool, Gerber):
         def job_thread(app_obj):
             with self.app.proc_container.new(_("Checking ...")):
                 try:
-                    old_disp_number = 0
-                    pol_nr = 0
                     app_obj.proc_container.update_view_text(' %d%%' % 0)
-                    total_geo = []
-
-                    for ap in list(fcobj.apertures.keys()):
-                        if 'geometry' in fcobj.apertures[ap]:
-                            for geo_el in fcobj.apertures[ap]['geometry']:
-                                if self.app.abort_flag:
-                                    # graceful abort requested by the user
-                                    raise grace
-
-                                if 'solid' in geo_el and geo_el['solid'] is not None and geo_el['solid'].is_valid:
-                                    total_geo.append(geo_el['solid'])
-
-                    total_geo = MultiPolygon(total_geo)
-                    total_geo = total_geo.buffer(0)
 
-                    try:
-                        __ = iter(total_geo)
-                        geo_len = len(total_geo)
-                        geo_len = (geo_len * (geo_len - 1)) / 2
-                    except TypeError:
-                        app_obj.inform.emit('[ERROR_NOTCL] %s' %
-                                            _("The Gerber object has one Polygon as geometry.\n"
-                                              "There are no distances between geometry elements to be found."))
+                    total_geo = gerber_polygons(fcobj.apertures)
+                    if len(total_geo) < 2:
+                        msg = _("The Gerber object has one Polygon as geometry.\n"
+                                "There are no distances between geometry elements to be found.")
+                        app_obj.inform.emit('[ERROR_NOTCL] %s' % msg)
                         return 'fail'
 
-                    min_dict = {}
-                    idx = 1
-                    for geo in total_geo:
-                        for s_geo in total_geo[idx:]:
-                            if self.app.abort_flag:
-                                # graceful abort requested by the user
-                                raise grace
-
-                            # minimize the number of distances by not taking into considerations
-                            # those that are too small
-                            dist = geo.distance(s_geo)
-                            dist = float('%.*f' % (self.decimals, dist))
-                            loc_1, loc_2 = nearest_points(geo, s_geo)
-
-                            proc_loc = (
-                                (float('%.*f' % (self.decimals, loc_1.x)), float('%.*f' % (self.decimals, loc_1.y))),
-                                (float('%.*f' % (self.decimals, loc_2.x)), float('%.*f' % (self.decimals, loc_2.y)))
-                            )
-
-                            if dist in min_dict:
-                                min_dict[dist].append(proc_loc)
-                            else:
-                                min_dict[dist] = [proc_loc]
-
-                            pol_nr += 1
-                            disp_number = int(np.interp(pol_nr, [0, geo_len], [0, 100]))
-
-                            if old_disp_number < disp_number <= 100:
-                                app_obj.proc_container.update_view_text(' %d%%' % disp_number)
-                                old_disp_number = disp_number
-                        idx += 1
+                    def check_abort():
+                        if self.app.abort_flag:
+                            # graceful abort requested by the user
+                            raise grace
 
-                    min_list = list(min_dict.keys())
-                    min_dist = min(min_list)
+                    min_dist = smallest_gaps(total_geo, k=1, decimals=self.decimals, check_abort=check_abort)[0][0]
+                    app_obj.proc_container.update_view_text(' %d%%' % 100)
 
                     min_dist_truncated = self.app.dec_format(float(min_dist), self.decimals)
                     self.safe_tooldia = min_dist_truncated
@@ -2138,6 +2059,69 @@ class NonCopperClear(AppTool, Gerber):
             self.app.inform_shell.emit('%s %s' % (_('Polygon could not be cleared. Location:'), str(coords)))
             return None
 
+    def clear_polygons_worker(self, polygons, tooldia, ncc_method, ncc_overlap, ncc_connect, ncc_contour, prog_plot,
+                              check_dia=None):
+        """
+        Clears a list of polygons with a tool. Without progressive plotting the polygons are cleared in the
+        processes of the pool; the paths are returned in the order of the polygons.
+
+        :param polygons:        list of Polygons
+        :param tooldia:         tool diameter
+        :param ncc_method:      0 = standard, 1 = seed, 2 = lines, 3 = combo
+        :param ncc_overlap:     overlap of the tool passes (fraction)
+        :param ncc_connect:     connect the paths
+        :param ncc_contour:     add a path around the edges
+        :param prog_plot:       if True plot the paths while clearing (done in this process)
+        :param check_dia:       if not None skip the polygons where a tool with this diameter doesn't fit
+        :return:                (list of paths, number of polygons that could not be cleared)
+        """
+        cleared_geo = []
+        poly_failed = 0
+
+        if not prog_plot:
+            results = clear_polygons(self.app.scheduler, polygons, tooldia, ncc_method, self.circle_steps,
+                                     overlap=ncc_overlap, connect=ncc_connect, contour=ncc_contour,
+                                     check_dia=check_dia)
+            for pol, res in zip(polygons, results):
+                if res is None:
+                    poly_failed += 1
+                    pt = pol.representative_point()
+                    self.app.inform_shell.emit('%s %s' % (_('Polygon could not be cleared. Location:'),
+                                                          str((pt.x, pt.y))))
+                else:
+                    cleared_geo += res
+            return cleared_geo, poly_failed
+
+        geo_len = len(polygons)
+        old_disp_number = 0
+        for pol_nr, pol in enumerate(polygons, start=1):
+            if self.app.abort_flag:
+                # graceful abort requested by the user
+                raise grace
+
+            # speedup the clearing by not trying to clear polygons that is clear they can't be
+            # cleared with the current tool. this tremendously reduce the clearing time
+            if check_dia is not None:
+                check_buff = pol.buffer(-check_dia / 2, self.circle_steps)
+                if not check_buff or check_buff.is_empty:
+                    continue
+
+            res = self.clear_polygon_worker(pol=pol, tooldia=tooldia, ncc_method=ncc_method, ncc_overlap=ncc_overlap,
+                                            ncc_connect=ncc_connect, ncc_contour=ncc_contour, prog_plot=prog_plot)
+            if res == "fail":
+                raise grace
+            if res is not None:
+                cleared_geo += res
+            else:
+                poly_failed += 1
+
+            disp_number = int(np.interp(pol_nr, [0, geo_len], [0, 100]))
+            if old_disp_number < disp_number <= 100:
+                self.app.proc_container.update_view_text(' %d%%' % disp_number)
+                old_disp_number = disp_number
+
+        return cleared_geo, poly_failed
+
     def clear_copper(self, ncc_obj, ncctooldia, isotooldia, sel_obj=None, outname=None, order=None,
                      tools_storage=None, run_threaded=True):
         """
@@ -2278,95 +2262,37 @@ class NonCopperClear(AppTool, Gerber):
                                                               has_offset=has_offset,  ncc_offset=ncc_offset,
                                                               tools_storage=tools_storage, bounding_box=bbox)
 
-                # Transform area to MultiPolygon
-                if isinstance(area, Polygon):
-                    area = MultiPolygon([area])
-
-                # variables to display the percentage of work done
-                geo_len = len(area.geoms)
-
-                old_disp_number = 0
-                log.warning("Total number of polygons to be cleared. %s" % str(geo_len))
+                # the polygons are cleaned and cleared independently, in parallel
+                polygons = flatten_polygons([p.buffer(0) for p in flatten_polygons(area)])
+                log.warning("Total number of polygons to be cleared. %s" % str(len(polygons)))
 
-                if area.geoms:
-                    if len(area.geoms) > 0:
-                        pol_nr = 0
-                        for p in area.geoms:
-                            # provide the app with a way to process the GUI events when in a blocking loop
-                            if not run_threaded:
-                                QtWidgets.QApplication.processEvents()
+                if polygons:
+                    cleared_geo, poly_failed = self.clear_polygons_worker(polygons, tooldia=tool,
+                                                                          ncc_method=ncc_method,
+                                                                          ncc_overlap=ncc_overlap,
+                                                                          ncc_connect=ncc_connect,
+                                                                          ncc_contour=ncc_contour,
+                                                                          prog_plot=prog_plot)
+                    if poly_failed > 0:
+                        app_obj.poly_not_cleared = True
 
-                            if self.app.abort_flag:
-                                # graceful abort requested by the user
-                                raise grace
+                    # check if there is a geometry at all in the cleared geometry
+                    if cleared_geo:
+                        formatted_tool = self.app.dec_format(tool, self.decimals)
+                        # find the tooluid associated with the current tool_dia so we know where to add the tool
+                        # solid_geometry
+                        for k, v in tools_storage.items():
+                            if self.app.dec_format(v['tooldia'], self.decimals) == formatted_tool:
+                                current_uid = int(k)
 
-                            # clean the polygon
-                            p = p.buffer(0)
-
-                            if p is not None and p.is_valid:
-                                poly_failed = 0
-                                try:
-                                    for pol in p:
-                                        # provide the app with a way to process the GUI events when in a blocking loop
-                                        QtWidgets.QApplication.processEvents()
-
-                                        if pol is not None and isinstance(pol, Polygon):
-                                            res = self.clear_polygon_worker(pol=pol, tooldia=tool,
-                                                                            ncc_method=ncc_method,
-                                                                            ncc_overlap=ncc_overlap,
-                                                                            ncc_connect=ncc_connect,
-                                                                            ncc_contour=ncc_contour,
-                                                                            prog_plot=prog_plot)
-                                            if res is not None:
-                                                cleared_geo += res
-                                            else:
-                                                poly_failed += 1
-                                        else:
-                                            log.warning("Expected geo is a Polygon. Instead got a %s" % str(type(pol)))
-                                except TypeError:
-                                    if isinstance(p, Polygon):
-                                        res = self.clear_polygon_worker(pol=p, tooldia=tool,
-                                                                        ncc_method=ncc_method,
-                                                                        ncc_overlap=ncc_overlap,
-                                                                        ncc_connect=ncc_connect,
-                                                                        ncc_contour=ncc_contour,
-                                                                        prog_plot=prog_plot)
-                                        if res is not None:
-                                            cleared_geo += res
-                                        else:
-                                            poly_failed += 1
-                                    else:
-                                        log.warning("Expected geo is a Polygon. Instead got a %s" % str(type(p)))
-
-                                if poly_failed > 0:
-                                    app_obj.poly_not_cleared = True
-
-                                pol_nr += 1
-                                disp_number = int(np.interp(pol_nr, [0, geo_len], [0, 100]))
-                                # log.debug("Polygons cleared: %d" % pol_nr)
-
-                                if old_disp_number < disp_number <= 100:
-                                    self.app.proc_container.update_view_text(' %d%%' % disp_number)
-                                    old_disp_number = disp_number
-                                    # log.debug("Polygons cleared: %d. Percentage done: %d%%" % (pol_nr, disp_number))
-
-                        # check if there is a geometry at all in the cleared geometry
-                        if cleared_geo:
-                            formatted_tool = self.app.dec_format(tool, self.decimals)
-                            # find the tooluid associated with the current tool_dia so we know where to add the tool
-                            # solid_geometry
-                            for k, v in tools_storage.items():
-                                if self.app.dec_format(v['tooldia'], self.decimals) == formatted_tool:
-                                    current_uid = int(k)
-
-                                    # add the solid_geometry to the current too in self.paint_tools dictionary
-                                    # and then reset the temporary list that stored that solid_geometry
-                                    v['solid_geometry'] = deepcopy(cleared_geo)
-                                    v['data']['name'] = name
-                                    geo_obj.tools[current_uid] = dict(tools_storage[current_uid])
-                                    break
-                        else:
-                            log.debug("There are no geometries in the cleared polygon.")
+                                # add the solid_geometry to the current too in self.paint_tools dictionary
+                                # and then reset the temporary list that stored that solid_geometry
+                                v['solid_geometry'] = deepcopy(cleared_geo)
+                                v['data']['name'] = name
+                                geo_obj.tools[current_uid] = dict(tools_storage[current_uid])
+                                break
+                    else:
+                        log.debug("There are no geometries in the cleared polygon.")
 
             # clean the progressive plotted shapes if it was used
             if self.app.defaults["tools_ncc_plotting"] == 'progressive':
@@ -2520,75 +2446,24 @@ class NonCopperClear(AppTool, Gerber):
                 ncc_overlap = float(tool_data_dict["tools_ncc_overlap"]) / 100.0
                 ncc_method = tool_data_dict["tools_ncc_method"]
 
-                # variables to display the percentage of work done
-                geo_len = len(area.geoms)
-                old_disp_number = 0
-                log.warning("Total number of polygons to be cleared: %s" % str(geo_len))
-
-                # def random_color():
-                #     r_color = np.random.rand(4)
-                #     r_color[3] = 0.5
-                #     return r_color
+                polygons = flatten_polygons(area)
+                log.warning("Total number of polygons to be cleared: %s" % str(len(polygons)))
 
                 # store here the geometry generated by clear operation
                 cleared_geo = []
 
                 poly_failed = 0
-                if area.geoms and len(area.geoms) > 0:
-                    pol_nr = 0
-                    for p in area.geoms:
-                        if self.app.abort_flag:
-                            # graceful abort requested by the user
-                            raise grace
-
-                        if p is not None and p.is_valid and not p.is_empty:
-                            # provide the app with a way to process the GUI events when in a blocking loop
-                            QtWidgets.QApplication.processEvents()
-
-                            # speedup the clearing by not trying to clear polygons that is clear they can't be
-                            # cleared with the current tool. this tremendously reduce the clearing time
-                            check_dist = -tool / 2
-                            check_buff = p.buffer(check_dist, self.circle_steps)
-                            if not check_buff or check_buff.is_empty:
-                                continue
-
-                            # if self.app.dec_format(float(tool), self.decimals) == 0.15:
-                            #     # for testing purposes ----------------------------------
-                            #     self.app.tool_shapes.add(p, color=self.app.defaults['global_sel_line'],
-                            #                              face_color=random_color(),
-                            #                              update=True, layer=0, tolerance=None)
-                            #     self.app.tool_shapes.add(check_buff, color=self.app.defaults['global_sel_line'],
-                            #                              face_color='#FFFFFFFF',
-                            #                              update=True, layer=0, tolerance=None)
-                            #     # -------------------------------------------------------
-
-                            # actual copper clearing is done here
-                            if isinstance(p, Polygon):
-                                res = self.clear_polygon_worker(pol=p, tooldia=tool,
-                                                                ncc_method=ncc_method,
-                                                                ncc_overlap=ncc_overlap,
-                                                                ncc_connect=ncc_connect,
-                                                                ncc_contour=ncc_contour,
-                                                                prog_plot=prog_plot)
-
-                                if res is not None:
-                                    cleared_geo += res
-                                else:
-                                    poly_failed += 1
-                            else:
-                                log.warning("Expected geo is a Polygon. Instead got a %s" % str(type(p)))
-
-                            if poly_failed > 0:
-                                app_obj.poly_not_cleared = True
-
-                            pol_nr += 1
-                            disp_number = int(np.interp(pol_nr, [0, geo_len], [0, 100]))
-                            # log.debug("Polygons cleared: %d" % pol_nr)
-
-                            if old_disp_number < disp_number <= 100:
-                                self.app.proc_container.update_view_text(' %d%%' % disp_number)
-                                old_disp_number = disp_number
-                                # log.debug("Polygons cleared: %d. Percentage done: %d%%" % (pol_nr, disp_number))
+                if polygons:
+                    # actual copper clearing is done here; the polygons where the tool doesn't fit are skipped
+                    cleared_geo, poly_failed = self.clear_polygons_worker(polygons, tooldia=tool,
+                                                                          ncc_method=ncc_method,
+                                                                          ncc_overlap=ncc_overlap,
+                                                                          ncc_connect=ncc_connect,
+                                                                          ncc_contour=ncc_contour,
+                                                                          prog_plot=prog_plot,
+                                                                          check_dia=tool)
+                    if poly_failed > 0:
+                        app_obj.poly_not_cleared = True
 
                     if self.app.abort_flag:
                         raise grace     # graceful abort requested by the user
@@ -2616,10 +2491,8 @@ class NonCopperClear(AppTool, Gerber):
                 new_area = MultiPolygon([line.buffer(tool / 1.9999999) for line in cleared_geo])
                 new_area = new_area.buffer(0.0000001)
 
-                area = area.difference(new_area)
-
-                new_area = [pol for pol in area if pol.is_valid and not pol.is_empty]
-                area = MultiPolygon(new_area)
+                # the area left for the next tool (rest machining)
+                area = MultiPolygon(flatten_polygons(area.difference(new_area)))
 
                 # speedup the clearing by not trying to clear polygons that is clear they can't be
                 # cleared with any tool. this tremendously reduce the clearing time
@@ -2765,7 +2638,8 @@ class NonCopperClear(AppTool, Gerber):
         log.debug("NCC Tool started. Reading parameters.")
         self.app.inform.emit(_("NCC Tool started. Reading parameters."))
 
-        ncc_method = method
+        # the Tcl command has no Combo method: anything else than standard or seed is cleared with lines
+        ncc_method = method if method in (0, 1) else 2
         ncc_margin = margin
         ncc_select = select_method
         overlap = overlap
@@ -3113,127 +2987,44 @@ class NonCopperClear(AppTool, Gerber):
                 except Exception:
                     continue
 
-                # Transform area to MultiPolygon
-                if type(area) is Polygon:
-                    area = MultiPolygon([area])
+                # the polygons are cleaned and cleared independently, in parallel
+                polygons = flatten_polygons([p.buffer(0) for p in flatten_polygons(area)])
+                log.warning("Total number of polygons to be cleared. %s" % str(len(polygons)))
 
-                # variables to display the percentage of work done
-                geo_len = len(area.geoms)
+                if polygons:
+                    cleared_geo[:], poly_failed = self.clear_polygons_worker(polygons, tooldia=tool,
+                                                                             ncc_method=ncc_method,
+                                                                             ncc_overlap=overlap,
+                                                                             ncc_connect=connect,
+                                                                             ncc_contour=contour,
+                                                                             prog_plot=False)
+                    if poly_failed:
+                        app_obj.poly_not_cleared = True
 
-                old_disp_number = 0
-                log.warning("Total number of polygons to be cleared. %s" % str(geo_len))
+                    # check if there is a geometry at all in the cleared geometry
+                    if cleared_geo:
+                        # Overall cleared area
+                        cleared = empty.buffer(-offset_a * (1 + overlap)).buffer(-tool / 1.999999).buffer(
+                            tool / 1.999999)
 
-                if area.geoms:
-                    if len(area.geoms) > 0:
-                        pol_nr = 0
-                        for p in area.geoms:
-                            # provide the app with a way to process the GUI events when in a blocking loop
-                            QtWidgets.QApplication.processEvents()
+                        # clean-up cleared geo
+                        cleared = cleared.buffer(0)
 
-                            if self.app.abort_flag:
-                                # graceful abort requested by the user
-                                raise grace
+                        # find the tooluid associated with the current tool_dia so we know where to add the tool
+                        # solid_geometry
+                        for k, v in tools_storage.items():
+                            if float('%.*f' % (self.decimals, v['tooldia'])) == float('%.*f' % (self.decimals,
+                                                                                                tool)):
+                                current_uid = int(k)
 
-                            # clean the polygon
-                            p = p.buffer(0)
-
-                            if p is not None and p.is_valid:
-                                poly_processed = []
-                                try:
-                                    for pol in p:
-                                        if pol is not None and isinstance(pol, Polygon):
-                                            if ncc_method == 0:    # standard
-                                                cp = self.clear_polygon(pol, tool,
-                                                                        self.circle_steps,
-                                                                        overlap=overlap, contour=contour,
-                                                                        connect=connect,
-                                                                        prog_plot=False)
-                                            elif ncc_method == 1:  # seed
-                                                cp = self.clear_polygon2(pol, tool,
-                                                                         self.circle_steps,
-                                                                         overlap=overlap, contour=contour,
-                                                                         connect=connect,
-                                                                         prog_plot=False)
-                                            else:
-                                                cp = self.clear_polygon3(pol, tool,
-                                                                         self.circle_steps,
-                                                                         overlap=overlap, contour=contour,
-                                                                         connect=connect,
-                                                                         prog_plot=False)
-                                            if cp:
-                                                cleared_geo += list(cp.get_objects())
-                                                poly_processed.append(True)
-                                            else:
-                                                poly_processed.append(False)
-                                                log.warning("Polygon in MultiPolygon can not be cleared.")
-                                        else:
-                                            log.warning("Geo in Iterable can not be cleared because it is not Polygon. "
-                                                        "It is: %s" % str(type(pol)))
-                                except TypeError:
-                                    if isinstance(p, Polygon):
-                                        if ncc_method == 0:    # standard
-                                            cp = self.clear_polygon(p, tool, self.circle_steps,
-                                                                    overlap=overlap, contour=contour, connect=connect,
-                                                                    prog_plot=False)
-                                        elif ncc_method == 1:   # seed
-                                            cp = self.clear_polygon2(p, tool, self.circle_steps,
-                                                                     overlap=overlap, contour=contour, connect=connect,
-                                                                     prog_plot=False)
-                                        else:
-                                            cp = self.clear_polygon3(p, tool, self.circle_steps,
-                                                                     overlap=overlap, contour=contour, connect=connect,
-                                                                     prog_plot=False)
-                                        if cp:
-                                            cleared_geo += list(cp.get_objects())
-                                            poly_processed.append(True)
-                                        else:
-                                            poly_processed.append(False)
-                                            log.warning("Polygon can not be cleared.")
-                                    else:
-                                        log.warning("Geo can not be cleared because it is: %s" % str(type(p)))
-
-                                p_cleared = poly_processed.count(True)
-                                p_not_cleared = poly_processed.count(False)
-
-                                if p_not_cleared:
-                                    app_obj.poly_not_cleared = True
-
-                                if p_cleared == 0:
-                                    continue
-
-                                pol_nr += 1
-                                disp_number = int(np.interp(pol_nr, [0, geo_len], [0, 100]))
-                                # log.debug("Polygons cleared: %d" % pol_nr)
-
-                                if old_disp_number < disp_number <= 100:
-                                    self.app.proc_container.update_view_text(' %d%%' % disp_number)
-                                    old_disp_number = disp_number
-                                    # log.debug("Polygons cleared: %d. Percentage done: %d%%" % (pol_nr, disp_number))
-
-                            # check if there is a geometry at all in the cleared geometry
-                        if cleared_geo:
-                            # Overall cleared area
-                            cleared = empty.buffer(-offset_a * (1 + overlap)).buffer(-tool / 1.999999).buffer(
-                                tool / 1.999999)
-
-                            # clean-up cleared geo
-                            cleared = cleared.buffer(0)
-
-                            # find the tooluid associated with the current tool_dia so we know where to add the tool
-                            # solid_geometry
-                            for k, v in tools_storage.items():
-                                if float('%.*f' % (self.decimals, v['tooldia'])) == float('%.*f' % (self.decimals,
-                                                                                                    tool)):
-                                    current_uid = int(k)
-
-                                    # add the solid_geometry to the current too in self.paint_tools dictionary
-                                    # and then reset the temporary list that stored that solid_geometry
-                                    v['solid_geometry'] = deepcopy(cleared_geo)
-                                    v['data']['name'] = name
-                                    break
-                            geo_obj.tools[current_uid] = dict(tools_storage[current_uid])
-                        else:
-                            log.debug("There are no geometries in the cleared polygon.")
+                                # add the solid_geometry to the current too in self.paint_tools dictionary
+                                # and then reset the temporary list that stored that solid_geometry
+                                v['solid_geometry'] = deepcopy(cleared_geo)
+                                v['data']['name'] = name
+                                break
+                        geo_obj.tools[current_uid] = dict(tools_storage[current_uid])
+                    else:
+                        log.debug("There are no geometries in the cleared polygon.")
 
             # delete tools with empty geometry
             # look for keys in the tools_storage dict that have 'solid_geometry' values empty
@@ -3516,133 +3307,64 @@ class NonCopperClear(AppTool, Gerber):
                 area = MultiPolygon(deepcopy(allparts))
                 allparts[:] = []
 
-                # variables to display the percentage of work done
-                geo_len = len(area.geoms)
-                old_disp_number = 0
-                log.warning("Total number of polygons to be cleared. %s" % str(geo_len))
+                # the polygons are cleaned and cleared independently, in parallel
+                polygons = flatten_polygons([p.buffer(0) for p in flatten_polygons(area)])
+                log.warning("Total number of polygons to be cleared. %s" % str(len(polygons)))
+
+                if polygons:
+                    results = clear_polygons(self.app.scheduler, polygons, tool_used, ncc_method,
+                                             self.circle_steps, overlap=overlap, connect=connect, contour=contour)
+                    for p, res in zip(polygons, results):
+                        if res is not None:
+                            cleared_geo.append(res)
+                        else:
+                            log.warning("Polygon can't be cleared.")
+                            # this polygon should be added to a list and then try clear it with
+                            # a smaller tool
+                            rest_geo.append(p)
+
+                    if self.app.abort_flag:
+                        # graceful abort requested by the user
+                        raise grace
 
-                if area.geoms:
-                    if len(area.geoms) > 0:
-                        pol_nr = 0
-                        for p in area.geoms:
+                    # check if there is a geometry at all in the cleared geometry
+                    if cleared_geo:
+                        # Overall cleared area
+                        cleared_area = list(self.flatten_list(cleared_geo))
+
+                        # cleared = MultiPolygon([p.buffer(tool_used / 2).buffer(-tool_used / 2)
+                        #                         for p in cleared_area])
+
+                        # here we store the poly's already processed in the original geometry by the current tool
+                        # into cleared_by_last_tool list
+                        # this will be sutracted from the original geometry_to_be_cleared and make data for
+                        # the next tool
+                        buffer_value = tool_used / 2
+                        for p in cleared_area:
                             if self.app.abort_flag:
                                 # graceful abort requested by the user
                                 raise grace
 
-                            # clean the polygon
-                            p = p.buffer(0)
-
-                            if p is not None and p.is_valid:
-                                # provide the app with a way to process the GUI events when in a blocking loop
-                                QtWidgets.QApplication.processEvents()
-
-                                if isinstance(p, Polygon):
-                                    try:
-                                        if ncc_method == 0:     # standard
-                                            cp = self.clear_polygon(p, tool_used,
-                                                                    self.circle_steps,
-                                                                    overlap=overlap, contour=contour, connect=connect,
-                                                                    prog_plot=False)
-                                        elif ncc_method == 1:   # seed
-                                            cp = self.clear_polygon2(p, tool_used,
-                                                                     self.circle_steps,
-                                                                     overlap=overlap, contour=contour, connect=connect,
-                                                                     prog_plot=False)
-                                        else:
-                                            cp = self.clear_polygon3(p, tool_used,
-                                                                     self.circle_steps,
-                                                                     overlap=overlap, contour=contour, connect=connect,
-                                                                     prog_plot=False)
-                                        cleared_geo.append(list(cp.get_objects()))
-                                    except Exception as ee:
-                                        log.warning("Polygon can't be cleared. %s" % str(ee))
-                                        # this polygon should be added to a list and then try clear it with
-                                        # a smaller tool
-                                        rest_geo.append(p)
-                                elif isinstance(p, MultiPolygon):
-                                    for poly_p in p:
-                                        if poly_p is not None:
-                                            # provide the app with a way to process the GUI events when
-                                            # in a blocking loop
-                                            QtWidgets.QApplication.processEvents()
-
-                                            try:
-                                                if ncc_method == 0:     # 'standard'
-                                                    cp = self.clear_polygon(poly_p, tool_used,
-                                                                            self.circle_steps,
-                                                                            overlap=overlap, contour=contour,
-                                                                            connect=connect,
-                                                                            prog_plot=False)
-                                                elif ncc_method == 1:   # 'seed'
-                                                    cp = self.clear_polygon2(poly_p, tool_used,
-                                                                             self.circle_steps,
-                                                                             overlap=overlap, contour=contour,
-                                                                             connect=connect,
-                                                                             prog_plot=False)
-                                                else:
-                                                    cp = self.clear_polygon3(poly_p, tool_used,
-                                                                             self.circle_steps,
-                                                                             overlap=overlap, contour=contour,
-                                                                             connect=connect,
-                                                                             prog_plot=False)
-                                                cleared_geo.append(list(cp.get_objects()))
-                                            except Exception as eee:
-                                                log.warning("Polygon can't be cleared. %s" % str(eee))
-                                                # this polygon should be added to a list and then try clear it with
-                                                # a smaller tool
-                                                rest_geo.append(poly_p)
-
-                                pol_nr += 1
-                                disp_number = int(np.interp(pol_nr, [0, geo_len], [0, 100]))
-                                # log.debug("Polygons cleared: %d" % pol_nr)
-
-                                if old_disp_number < disp_number <= 100:
-                                    self.app.proc_container.update_view_text(' %d%%' % disp_number)
-                                    old_disp_number = disp_number
-                                    # log.debug("Polygons cleared: %d. Percentage done: %d%%" % (pol_nr, disp_number))
-
-                        if self.app.abort_flag:
-                            # graceful abort requested by the user
-                            raise grace
-
-                        # check if there is a geometry at all in the cleared geometry
-                        if cleared_geo:
-                            # Overall cleared area
-                            cleared_area = list(self.flatten_list(cleared_geo))
-
-                            # cleared = MultiPolygon([p.buffer(tool_used / 2).buffer(-tool_used / 2)
-                            #                         for p in cleared_area])
-
-                            # here we store the poly's already processed in the original geometry by the current tool
-                            # into cleared_by_last_tool list
-                            # this will be sutracted from the original geometry_to_be_cleared and make data for
-                            # the next tool
-                            buffer_value = tool_used / 2
-                            for p in cleared_area:
-                                if self.app.abort_flag:
-                                    # graceful abort requested by the user
-                                    raise grace
-
-                                r_poly = p.buffer(buffer_value)
-                                cleared_by_last_tool.append(r_poly)
+                            r_poly = p.buffer(buffer_value)
+                            cleared_by_last_tool.append(r_poly)
 
-                            # find the tooluid associated with the current tool_dia so we know
-                            # where to add the tool solid_geometry
-                            for k, v in tools_storage.items():
-                                if float('%.*f' % (self.decimals, v['tooldia'])) == float('%.*f' % (self.decimals,
-                                                                                                    tool)):
-                                    current_uid = int(k)
+                        # find the tooluid associated with the current tool_dia so we know
+                        # where to add the tool solid_geometry
+                        for k, v in tools_storage.items():
+                            if float('%.*f' % (self.decimals, v['tooldia'])) == float('%.*f' % (self.decimals,
+                                                                                                tool)):
+                                current_uid = int(k)
 
-                                    # add the solid_geometry to the current too in self.paint_tools dictionary
-                                    # and then reset the temporary list that stored that solid_geometry
-                                    v['solid_geometry'] = deepcopy(cleared_area)
-                                    v['data']['name'] = name
-                                    cleared_area[:] = []
-                                    break
+                                # add the solid_geometry to the current too in self.paint_tools dictionary
+                                # and then reset the temporary list that stored that solid_geometry
+                                v['solid_geometry'] = deepcopy(cleared_area)
+                                v['data']['name'] = name
+                                cleared_area[:] = []
+                                break
 
-                            geo_obj.tools[current_uid] = dict(tools_storage[current_uid])
-                        else:
-                            log.debug("There are no geometries in the cleared polygon.")
+                        geo_obj.tools[current_uid] = dict(tools_storage[current_uid])
+                    else:
+                        log.debug("There are no geometries in the cleared polygon.")
 
             geo_obj.multigeo = True
             geo_obj.options["cnctooldia"] = str(tool)
@@ -3697,8 +3419,9 @@ class NonCopperClear(AppTool, Gerber):
             else:
                 app_obj.proc_container.view.set_idle()
 
-            # focus on Properties Tab
-            self.app.ui.notebook.setCurrentWidget(self.app.ui.properties_tab)
+            # focus on Properties Tab; the headless batch engine has no GUI
+            if self.app.ui is not None:
+                self.app.ui.notebook.setCurrentWidget(self.app.ui.properties_tab)
 
         if run_threaded:
             # Promise object with the new name
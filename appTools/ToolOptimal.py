@@ -11,11 +11,7 @@ from appTool import AppTool
 from appGUI.GUIElements import OptionalHideInputSection, FCTextArea, FCEntry, FCSpinner, FCCheckBox, FCComboBox, \
     FCLabel, FCButton
 from camlib import grace
-
-from shapely.geometry import MultiPolygon
-from shapely.ops import nearest_points
-
-import numpy as np
+from appCommon.Clearance import gerber_polygons, smallest_gaps
 
 import logging
 import gettext
@@ -107,6 +103,7 @@ class ToolOptimal(AppTool):
         self.ui.freq_entry.set_value('0')
 
         self.ui.precision_spinner.set_value(int(self.app.defaults["tools_opt_precision"]))
+        self.ui.distances_spinner.set_value(int(self.app.defaults["tools_opt_distances"]))
         self.ui.locations_textb.clear()
         # new cursor - select all document
         cursor = self.ui.locations_textb.textCursor()
@@ -147,73 +144,28 @@ class ToolOptimal(AppTool):
         def job_thread(app_obj):
             app_obj.inform.emit(_("Optimal Tool. Started to search for the minimum distance between copper features."))
             try:
-                old_disp_number = 0
-                pol_nr = 0
                 app_obj.proc_container.update_view_text(' %d%%' % 0)
-                total_geo = []
-
-                for ap in list(fcobj.apertures.keys()):
-                    if 'geometry' in fcobj.apertures[ap]:
-                        app_obj.inform.emit(
-                            '%s: %s' % (_("Optimal Tool. Parsing geometry for aperture"), str(ap)))
-
-                        for geo_el in fcobj.apertures[ap]['geometry']:
-                            if self.app.abort_flag:
-                                # graceful abort requested by the user
-                                raise grace
-
-                            if 'solid' in geo_el and geo_el['solid'] is not None and geo_el['solid'].is_valid:
-                                total_geo.append(geo_el['solid'])
 
                 app_obj.inform.emit(
                     _("Optimal Tool. Creating a buffer for the object geometry."))
-                total_geo = MultiPolygon(total_geo)
-                total_geo = total_geo.buffer(0)
+                total_geo = gerber_polygons(fcobj.apertures)
 
-                try:
-                    __ = iter(total_geo)
-                    geo_len = len(total_geo)
-                    geo_len = (geo_len * (geo_len - 1)) / 2
-                except TypeError:
+                if len(total_geo) < 2:
                     app_obj.inform.emit('[ERROR_NOTCL] %s' %
                                         _("The Gerber object has one Polygon as geometry.\n"
                                           "There are no distances between geometry elements to be found."))
                     return 'fail'
 
-                app_obj.inform.emit(
-                    '%s: %s' % (_("Optimal Tool. Finding the distances between each two elements. Iterations"),
-                                str(geo_len)))
-
-                self.min_dict = {}
-                idx = 1
-                for geo in total_geo:
-                    for s_geo in total_geo[idx:]:
-                        if self.app.abort_flag:
-                            # graceful abort requested by the user
-                            raise grace
-
-                        # minimize the number of distances by not taking into considerations those that are too small
-                        dist = geo.distance(s_geo)
-                        dist = float('%.*f' % (self.decimals, dist))
-                        loc_1, loc_2 = nearest_points(geo, s_geo)
-
-                        proc_loc = (
-                            (float('%.*f' % (self.decimals, loc_1.x)), float('%.*f' % (self.decimals, loc_1.y))),
-                            (float('%.*f' % (self.decimals, loc_2.x)), float('%.*f' % (self.decimals, loc_2.y)))
-                        )
-
-                        if dist in self.min_dict:
-                            self.min_dict[dist].append(proc_loc)
-                        else:
-                            self.min_dict[dist] = [proc_loc]
-
-                        pol_nr += 1
-                        disp_number = int(np.interp(pol_nr, [0, geo_len], [0, 100]))
+                def check_abort():
+                    if self.app.abort_flag:
+                        # graceful abort requested by the user
+                        raise grace
 
-                        if old_disp_number < disp_number <= 100:
-                            app_obj.proc_container.update_view_text(' %d%%' % disp_number)
-                            old_disp_number = disp_number
-                    idx += 1
+                # only the smallest distances are searched, not the distance between every two elements
+                gaps = smallest_gaps(total_geo, k=int(self.ui.distances_spinner.get_value()),
+                                     decimals=self.decimals, check_abort=check_abort)
+                self.min_dict = dict(gaps)
+                app_obj.proc_container.update_view_text(' %d%%' % 100)
 
                 app_obj.inform.emit(_("Optimal Tool. Finding the minimum distance."))
 
@@ -439,6 +391,15 @@ class OptimalUI:
         self.precision_spinner.setWrapping(True)
         form_lay.addRow(self.precision_label, self.precision_spinner)
 
+        # Number of distances to find
+        self.distances_nr_label = FCLabel('%s:' % _("Distances"))
+        self.distances_nr_label.setToolTip(_("Number of the smallest distances that are searched.\n"
+                                             "The minimum distance is the first one."))
+
+        self.distances_spinner = FCSpinner(callback=self.confirmation_message_int)
+        self.distances_spinner.set_range(1, 1000)
+        form_lay.addRow(self.distances_nr_label, self.distances_spinner)
+
         # Results Title
         self.title_res_label = FCLabel('<b>%s:</b>' % _("Minimum distance"))
         self.title_res_label.setToolTip(_("Display minimum distance between copper features."))
@@ -9,14 +9,12 @@ from PyQt5 import QtWidgets, QtCore
 
 from appTool import AppTool
 
-from appParsers.ParsePDF import PdfParser, grace
+from appParsers.ParsePDF import PdfParser, PdfStreamError, pdf_content_lines, grace
 from shapely.geometry import Point, MultiPolygon
 from shapely.ops import unary_union
 
 from copy import deepcopy
 
-import zlib
-import re
 import time
 import logging
 import traceback
@@ -45,10 +43,6 @@ class ToolPDF(AppTool):
         self.app = app
         self.decimals = self.app.decimals
 
-        self.stream_re = re.compile(b'.*?FlateDecode.*?stream(.*?)endstream', re.S)
-
-        self.pdf_decompressed = {}
-
         # key = file name and extension
         # value is a dict to store the parsed content of the PDF
         self.pdf_parsed = {}
@@ -114,36 +108,20 @@ class ToolPDF(AppTool):
             'filename': filename
         }
 
-        self.pdf_decompressed[short_name] = ''
-
         if self.app.abort_flag:
             # graceful abort requested by the user
             raise grace
 
         with self.app.proc_container.new(_("Parsing ...")):
+            # the content streams are read, decompressed and parsed a chunk at a time
             with open(filename, "rb") as f:
-                pdf = f.read()
-
-            stream_nr = 0
-            for s in re.findall(self.stream_re, pdf):
-                if self.app.abort_flag:
-                    # graceful abort requested by the user
-                    raise grace
-
-                stream_nr += 1
-                log.debug("PDF STREAM: %d\n" % stream_nr)
-                s = s.strip(b'\r\n')
                 try:
-                    self.pdf_decompressed[short_name] += (zlib.decompress(s).decode('UTF-8') + '\r\n')
-                except Exception as e:
+                    self.pdf_parsed[short_name]['pdf'] = self.parser.parse_pdf(pdf_content=pdf_content_lines(f))
+                except PdfStreamError as e:
                     self.app.inform.emit('[ERROR_NOTCL] %s: %s\n%s' % (_("Failed to open"), str(filename), str(e)))
-                    log.debug("ToolPDF.open_pdf().obj_init() --> %s" % str(e))
+                    log.debug("ToolPDF.open_pdf() --> %s" % str(e))
                     return
 
-            self.pdf_parsed[short_name]['pdf'] = self.parser.parse_pdf(pdf_content=self.pdf_decompressed[short_name])
-            # we used it, now we delete it
-            self.pdf_decompressed[short_name] = ''
-
         # removal from list is done in a multithreaded way therefore not always the removal can be done
         # try to remove until it's done
         try:
@@ -1726,6 +1726,14 @@ class ToolPaint(AppTool, Gerber):
         order = order if order is not None else self.ui.order_radio.get_value()
         tools_storage = self.paint_tools if tools_storage is None else tools_storage
 
+        # the tool made without its UI (appHeadless.headless_tool()) uses the Preferences for the rest machining
+        if self.ui is None:
+            rest_machining = self.app.defaults["tools_paint_rest"]
+            rest_offset = 0.0
+        else:
+            rest_machining = self.ui.rest_cb.get_value()
+            rest_offset = self.ui.rest_offset_entry.get_value()
+
         sorted_tools = []
         if tooldia is not None:
             try:
@@ -1932,7 +1940,7 @@ class ToolPaint(AppTool, Gerber):
             # sort the tools reversed for the rest machining
             sorted_tools.sort(reverse=True)
 
-            paint_offset = self.ui.rest_offset_entry.get_value()
+            paint_offset = rest_offset
 
             poly_buf = []
             for pol in geometry:
@@ -2167,7 +2175,7 @@ class ToolPaint(AppTool, Gerber):
 
         def job_thread(app_obj):
             try:
-                if self.ui.rest_cb.get_value():
+                if rest_machining:
                     ret = app_obj.app_obj.new_object("geometry", name, job_rest_clear, plot=plot)
                 else:
                     ret = app_obj.app_obj.new_object("geometry", name, job_normal_clear, plot=plot)
@@ -5,15 +5,16 @@
 # MIT Licence                                              #
 # ##########################################################
 
-from PyQt5 import QtWidgets, QtGui
+from PyQt5 import QtWidgets, QtCore, QtGui
 
 from appTool import AppTool
 from appGUI.GUIElements import FCDoubleSpinner, FCCheckBox, OptionalInputSection, FCComboBox, FCLabel, FCButton
 from copy import deepcopy
 
-from appPool import *
+from appCommon.Common import GracefulException as grace
+from appCommon.DesignRules import flatten, clearance_violations, hole_clearance_violations, \
+    annular_ring_violations, unique_points, make_tiles, check_tiles, CLEARANCE, HOLES, ANNULAR_RING
 # from os import getpid
-from shapely.ops import nearest_points
 from shapely.geometry import MultiPolygon, Polygon
 
 import logging
@@ -78,10 +79,6 @@ class RulesCheck(AppTool):
         # flag to signal the constrain was activated
         self.constrain_flag = False
 
-        # Multiprocessing Process Pool
-        self.pool = self.app.pool
-        self.results = None
-
         self.decimals = 4
 
     # def on_object_loaded(self, index, row):
@@ -158,23 +155,40 @@ class RulesCheck(AppTool):
         self.reset_fields()
 
     @staticmethod
-    def check_inside_gerber_clearance(gerber_obj, size, rule):
-        log.debug("RulesCheck.check_inside_gerber_clearance()")
+    def check_features(rule_title, names, kind, geoms_a, geoms_b, size):
+        """
+        Checks a rule on the features returned by one of the *_features() methods.
+
+        :return:    (rule_title, violations) as returned by the check_*() methods
+        """
+        if kind == HOLES:
+            points_list = unique_points(hole_clearance_violations(geoms_a, size))
+        elif kind == ANNULAR_RING:
+            points_list = annular_ring_violations(geoms_a, geoms_b, size)
+        else:
+            points_list = unique_points(clearance_violations(geoms_a, geoms_b, size))
 
-        rule_title = rule
+        return rule_title, [{'name': names, 'points': points_list}]
 
-        violations = []
-        obj_violations = {}
-        obj_violations.update({
-            'name': '',
-            'points': list()
-        })
+    @staticmethod
+    def check_inside_gerber_clearance(gerber_obj, size, rule):
+        log.debug("RulesCheck.check_inside_gerber_clearance()")
 
         if not gerber_obj:
             return 'Fail. Not enough Gerber objects to check Gerber 2 Gerber clearance'
 
-        obj_violations['name'] = gerber_obj['name']
+        features = RulesCheck.inside_gerber_clearance_features(gerber_obj, size, rule)
+        if features is None:
+            return rule, [{'name': gerber_obj['name'], 'points': ['Failed. Only one polygon.']}]
+
+        # only the features closer than size (found with a spatial index) are measured
+        return RulesCheck.check_features(*features)
 
+    @staticmethod
+    def inside_gerber_clearance_features(gerber_obj, size, rule):
+        """
+        :return:    the parameters of check_features() or None if the features are a single polygon
+        """
         solid_geo = []
         clear_geo = []
         for apid in gerber_obj['apertures']:
@@ -197,53 +211,28 @@ class RulesCheck(AppTool):
             total_geo = total_geo.buffer(0.000001)
 
         if isinstance(total_geo, Polygon):
-            obj_violations['points'] = ['Failed. Only one polygon.']
-            return rule_title, [obj_violations]
-        else:
-            iterations = len(total_geo)
-            iterations = (iterations * (iterations - 1)) / 2
-        log.debug("RulesCheck.check_gerber_clearance(). Iterations: %s" % str(iterations))
-
-        min_dict = {}
-        idx = 1
-        for geo in total_geo:
-            for s_geo in total_geo[idx:]:
-                # minimize the number of distances by not taking into considerations those that are too small
-                dist = geo.distance(s_geo)
-                if float(dist) < float(size):
-                    loc_1, loc_2 = nearest_points(geo, s_geo)
-
-                    dx = loc_1.x - loc_2.x
-                    dy = loc_1.y - loc_2.y
-                    loc = min(loc_1.x, loc_2.x) + (abs(dx) / 2), min(loc_1.y, loc_2.y) + (abs(dy) / 2)
-
-                    if dist in min_dict:
-                        min_dict[dist].append(loc)
-                    else:
-                        min_dict[dist] = [loc]
-            idx += 1
-        points_list = set()
-        for dist in min_dict.keys():
-            for location in min_dict[dist]:
-                points_list.add(location)
-
-        obj_violations['points'] = list(points_list)
-        violations.append(deepcopy(obj_violations))
+            return None
+        elif isinstance(total_geo, MultiPolygon):
+            total_geo = list(total_geo.geoms)
 
-        return rule_title, violations
+        return rule, gerber_obj['name'], CLEARANCE, total_geo, None, float(size)
 
     @staticmethod
     def check_gerber_clearance(gerber_list, size, rule):
         log.debug("RulesCheck.check_gerber_clearance()")
-        rule_title = rule
 
-        violations = []
-        obj_violations = {}
-        obj_violations.update({
-            'name': '',
-            'points': list()
-        })
+        features = RulesCheck.gerber_clearance_features(gerber_list, size, rule)
+        if features is None:
+            return 'Fail. Not enough Gerber objects to check Gerber 2 Gerber clearance'
 
+        # only the features closer than size (found with a spatial index) are measured
+        return RulesCheck.check_features(*features)
+
+    @staticmethod
+    def gerber_clearance_features(gerber_list, size, rule):
+        """
+        :return:    the parameters of check_features() or None if there are not enough Gerber objects
+        """
         if len(gerber_list) == 2:
             gerber_1 = gerber_list[0]
             # added it so I won't have errors of using before declaring
@@ -255,7 +244,7 @@ class RulesCheck(AppTool):
             gerber_2 = gerber_list[1]
             gerber_3 = gerber_list[2]
         else:
-            return 'Fail. Not enough Gerber objects to check Gerber 2 Gerber clearance'
+            return None
 
         total_geo_grb_1 = []
         for apid in gerber_1['apertures']:
@@ -288,43 +277,6 @@ class RulesCheck(AppTool):
         total_geo_grb_3 = MultiPolygon(total_geo_grb_3)
         total_geo_grb_3 = total_geo_grb_3.buffer(0)
 
-        if isinstance(total_geo_grb_1, Polygon):
-            len_1 = 1
-            total_geo_grb_1 = [total_geo_grb_1]
-        else:
-            len_1 = len(total_geo_grb_1)
-
-        if isinstance(total_geo_grb_3, Polygon):
-            len_3 = 1
-            total_geo_grb_3 = [total_geo_grb_3]
-        else:
-            len_3 = len(total_geo_grb_3)
-
-        iterations = len_1 * len_3
-        log.debug("RulesCheck.check_gerber_clearance(). Iterations: %s" % str(iterations))
-
-        min_dict = {}
-        for geo in total_geo_grb_1:
-            for s_geo in total_geo_grb_3:
-                # minimize the number of distances by not taking into considerations those that are too small
-                dist = geo.distance(s_geo)
-                if float(dist) < float(size):
-                    loc_1, loc_2 = nearest_points(geo, s_geo)
-
-                    dx = loc_1.x - loc_2.x
-                    dy = loc_1.y - loc_2.y
-                    loc = min(loc_1.x, loc_2.x) + (abs(dx) / 2), min(loc_1.y, loc_2.y) + (abs(dy) / 2)
-
-                    if dist in min_dict:
-                        min_dict[dist].append(loc)
-                    else:
-                        min_dict[dist] = [loc]
-
-        points_list = set()
-        for dist in min_dict.keys():
-            for location in min_dict[dist]:
-                points_list.add(location)
-
         name_list = []
         if gerber_1:
             name_list.append(gerber_1['name'])
@@ -333,11 +285,7 @@ class RulesCheck(AppTool):
         if gerber_3:
             name_list.append(gerber_3['name'])
 
-        obj_violations['name'] = name_list
-        obj_violations['points'] = list(points_list)
-        violations.append(deepcopy(obj_violations))
-
-        return rule_title, violations
+        return rule, name_list, CLEARANCE, flatten(total_geo_grb_1), flatten(total_geo_grb_3), float(size)
 
     @staticmethod
     def check_holes_size(elements, size):
@@ -369,14 +317,16 @@ class RulesCheck(AppTool):
     @staticmethod
     def check_holes_clearance(elements, size):
         log.debug("RulesCheck.check_holes_clearance()")
-        rule = _("Hole to Hole Clearance")
 
-        violations = []
-        obj_violations = {}
-        obj_violations.update({
-            'name': '',
-            'points': list()
-        })
+        # only the holes closer than size (found with a KD-tree of the hole centers) are measured
+        return RulesCheck.check_features(*RulesCheck.holes_clearance_features(elements, size))
+
+    @staticmethod
+    def holes_clearance_features(elements, size):
+        """
+        :return:    the parameters of check_features()
+        """
+        rule = _("Hole to Hole Clearance")
 
         total_geo = []
         for elem in elements:
@@ -386,40 +336,11 @@ class RulesCheck(AppTool):
                     for geo in geometry:
                         total_geo.append(geo)
 
-        min_dict = {}
-        idx = 1
-        for geo in total_geo:
-            for s_geo in total_geo[idx:]:
-
-                # minimize the number of distances by not taking into considerations those that are too small
-                dist = geo.distance(s_geo)
-                loc_1, loc_2 = nearest_points(geo, s_geo)
-
-                dx = loc_1.x - loc_2.x
-                dy = loc_1.y - loc_2.y
-                loc = min(loc_1.x, loc_2.x) + (abs(dx) / 2), min(loc_1.y, loc_2.y) + (abs(dy) / 2)
-
-                if dist in min_dict:
-                    min_dict[dist].append(loc)
-                else:
-                    min_dict[dist] = [loc]
-            idx += 1
-
-        points_list = set()
-        for dist in min_dict.keys():
-            if float(dist) < size:
-                for location in min_dict[dist]:
-                    points_list.add(location)
-
         name_list = []
         for elem in elements:
             name_list.append(elem['name'])
 
-        obj_violations['name'] = name_list
-        obj_violations['points'] = list(points_list)
-        violations.append(deepcopy(obj_violations))
-
-        return rule, violations
+        return rule, name_list, HOLES, total_geo, None, float(size)
 
     @staticmethod
     def check_traces_size(elements, size):
@@ -463,15 +384,18 @@ class RulesCheck(AppTool):
 
     @staticmethod
     def check_gerber_annular_ring(obj_list, size, rule):
-        rule_title = rule
+        features = RulesCheck.gerber_annular_ring_features(obj_list, size, rule)
+        if isinstance(features, str):
+            return features
 
-        violations = []
-        obj_violations = {}
-        obj_violations.update({
-            'name': '',
-            'points': list()
-        })
+        # only the holes closer than size to the exterior of a pad (found with a spatial index) are measured
+        return RulesCheck.check_features(*features)
 
+    @staticmethod
+    def gerber_annular_ring_features(obj_list, size, rule):
+        """
+        :return:    the parameters of check_features() or a message if there are not enough objects
+        """
         # added it so I won't have errors of using before declaring
         gerber_obj = {}
         gerber_extra_obj = {}
@@ -540,54 +464,6 @@ class RulesCheck(AppTool):
                     for geo in geometry:
                         total_geo_exc.append(geo)
 
-        if isinstance(total_geo_grb, Polygon):
-            len_1 = 1
-            total_geo_grb = [total_geo_grb]
-        else:
-            len_1 = len(total_geo_grb)
-
-        if isinstance(total_geo_exc, Polygon):
-            len_2 = 1
-            total_geo_exc = [total_geo_exc]
-        else:
-            len_2 = len(total_geo_exc)
-
-        iterations = len_1 * len_2
-        log.debug("RulesCheck.check_gerber_annular_ring(). Iterations: %s" % str(iterations))
-
-        min_dict = {}
-        dist = None
-        for geo in total_geo_grb:
-            for s_geo in total_geo_exc:
-                try:
-                    # minimize the number of distances by not taking into considerations those that are too small
-                    dist = abs(geo.exterior.distance(s_geo))
-                except Exception as e:
-                    log.debug("RulesCheck.check_gerber_annular_ring() --> %s" % str(e))
-
-                if dist > 0:
-                    if float(dist) < float(size):
-                        loc_1, loc_2 = nearest_points(geo.exterior, s_geo)
-
-                        dx = loc_1.x - loc_2.x
-                        dy = loc_1.y - loc_2.y
-                        loc = min(loc_1.x, loc_2.x) + (abs(dx) / 2), min(loc_1.y, loc_2.y) + (abs(dy) / 2)
-
-                        if dist in min_dict:
-                            min_dict[dist].append(loc)
-                        else:
-                            min_dict[dist] = [loc]
-                else:
-                    if dist in min_dict:
-                        min_dict[dist].append(s_geo.representative_point())
-                    else:
-                        min_dict[dist] = [s_geo.representative_point()]
-
-        points_list = []
-        for dist in min_dict.keys():
-            for location in min_dict[dist]:
-                points_list.append(location)
-
         name_list = []
         try:
             if gerber_obj:
@@ -612,454 +488,461 @@ class RulesCheck(AppTool):
         except KeyError:
             pass
 
-        obj_violations['name'] = name_list
-        obj_violations['points'] = points_list
-        violations.append(deepcopy(obj_violations))
-        return rule_title, violations
+        return rule, name_list, ANNULAR_RING, flatten(total_geo_grb), total_geo_exc, float(size)
 
     def execute(self):
-        self.results = []
-
         log.debug("RuleCheck() executing")
 
         def worker_job(app_obj):
             # self.app.proc_container.new(_("Working..."))
             self.app.proc_container.view.set_busy('%s' % _("Working..."))
 
-            # RULE: Check Trace Size
-            if self.ui.trace_size_cb.get_value():
-                copper_list = []
-                copper_name_1 = self.ui.copper_t_object.currentText()
-                if copper_name_1 != '' and self.ui.copper_t_cb.get_value():
-                    elem_dict = {
-                        'name': deepcopy(copper_name_1),
-                        'apertures': deepcopy(app_obj.collection.get_by_name(copper_name_1).apertures)
-                    }
-                    copper_list.append(elem_dict)
-
-                copper_name_2 = self.ui.copper_b_object.currentText()
-                if copper_name_2 != '' and self.ui.copper_b_cb.get_value():
-                    elem_dict = {
-                        'name': deepcopy(copper_name_2),
-                        'apertures': deepcopy(app_obj.collection.get_by_name(copper_name_2).apertures)
-                    }
-                    copper_list.append(elem_dict)
-
-                trace_size = float(self.ui.trace_size_entry.get_value())
-                self.results.append(self.pool.apply_async(self.check_traces_size, args=(copper_list, trace_size)))
-
-            # RULE: Check Copper to Copper Clearance
-            if self.ui.clearance_copper2copper_cb.get_value():
-
-                try:
-                    copper_copper_clearance = float(self.ui.clearance_copper2copper_entry.get_value())
-                except Exception as e:
-                    log.debug("RulesCheck.execute.worker_job() --> %s" % str(e))
-                    self.app.inform.emit('[ERROR_NOTCL] %s. %s' % (
-                        _("Copper to Copper clearance"),
-                        _("Value is not valid.")))
-                    return
-
-                if self.copper_t_cb.get_value():
-                    copper_t_obj = self.ui.copper_t_object.currentText()
-                    copper_t_dict = {}
-
-                    if copper_t_obj != '':
-                        copper_t_dict['name'] = deepcopy(copper_t_obj)
-                        copper_t_dict['apertures'] = deepcopy(app_obj.collection.get_by_name(copper_t_obj).apertures)
-
-                        self.results.append(self.pool.apply_async(self.check_inside_gerber_clearance,
-                                                                  args=(copper_t_dict,
-                                                                        copper_copper_clearance,
-                                                                        _("TOP -> Copper to Copper clearance"))))
-                if self.ui.copper_b_cb.get_value():
-                    copper_b_obj = self.ui.copper_b_object.currentText()
-                    copper_b_dict = {}
-                    if copper_b_obj != '':
-                        copper_b_dict['name'] = deepcopy(copper_b_obj)
-                        copper_b_dict['apertures'] = deepcopy(app_obj.collection.get_by_name(copper_b_obj).apertures)
-
-                        self.results.append(self.pool.apply_async(self.check_inside_gerber_clearance,
-                                                                  args=(copper_b_dict,
-                                                                        copper_copper_clearance,
-                                                                        _("BOTTOM -> Copper to Copper clearance"))))
-
-                if self.ui.copper_t_cb.get_value() is False and self.ui.copper_b_cb.get_value() is False:
-                    app_obj.inform.emit('[ERROR_NOTCL] %s. %s' % (
-                        _("Copper to Copper clearance"),
-                        _("At least one Gerber object has to be selected for this rule but none is selected.")))
-                    return
-
-            # RULE: Check Copper to Outline Clearance
-            if self.ui.clearance_copper2ol_cb.get_value() and self.ui.out_cb.get_value():
-                top_dict = {}
-                bottom_dict = {}
-                outline_dict = {}
-
-                copper_top = self.ui.copper_t_object.currentText()
-                if copper_top != '' and self.ui.copper_t_cb.get_value():
-                    top_dict['name'] = deepcopy(copper_top)
-                    top_dict['apertures'] = deepcopy(app_obj.collection.get_by_name(copper_top).apertures)
-
-                copper_bottom = self.ui.copper_b_object.currentText()
-                if copper_bottom != '' and self.ui.copper_b_cb.get_value():
-                    bottom_dict['name'] = deepcopy(copper_bottom)
-                    bottom_dict['apertures'] = deepcopy(app_obj.collection.get_by_name(copper_bottom).apertures)
-
-                copper_outline = self.ui.outline_object.currentText()
-                if copper_outline != '' and self.ui.out_cb.get_value():
-                    outline_dict['name'] = deepcopy(copper_outline)
-                    outline_dict['apertures'] = deepcopy(app_obj.collection.get_by_name(copper_outline).apertures)
-
-                try:
-                    copper_outline_clearance = float(self.ui.clearance_copper2ol_entry.get_value())
-                except Exception as e:
-                    log.debug("RulesCheck.execute.worker_job() --> %s" % str(e))
-                    app_obj.inform.emit('[ERROR_NOTCL] %s. %s' % (
-                        _("Copper to Outline clearance"),
-                        _("Value is not valid.")))
-                    return
-
-                if not top_dict and not bottom_dict or not outline_dict:
-                    app_obj.inform.emit('[ERROR_NOTCL] %s. %s' % (
-                        _("Copper to Outline clearance"),
-                        _("One of the copper Gerber objects or the Outline Gerber object is not valid.")))
-                    return
-                objs = []
-                if top_dict:
-                    objs.append(top_dict)
-                if bottom_dict:
-                    objs.append(bottom_dict)
-
-                if outline_dict:
-                    objs.append(outline_dict)
-                else:
-                    app_obj.inform.emit('[ERROR_NOTCL] %s. %s' % (
-                        _("Copper to Outline clearance"),
-                        _("Outline Gerber object presence is mandatory for this rule but it is not selected.")))
-                    return
-
-                self.results.append(self.pool.apply_async(self.check_gerber_clearance,
-                                                          args=(objs,
-                                                                copper_outline_clearance,
-                                                                _("Copper to Outline clearance"))))
-
-            # RULE: Check Silk to Silk Clearance
-            if self.ui.clearance_silk2silk_cb.get_value():
-                silk_dict = {}
-
-                try:
-                    silk_silk_clearance = float(self.ui.clearance_silk2silk_entry.get_value())
-                except Exception as e:
-                    log.debug("RulesCheck.execute.worker_job() --> %s" % str(e))
-                    app_obj.inform.emit('[ERROR_NOTCL] %s. %s' % (
-                        _("Silk to Silk clearance"),
-                        _("Value is not valid.")))
-                    return
-
-                if self.ss_t_cb.get_value():
-                    silk_obj = self.ui.ss_t_object.currentText()
-                    if silk_obj != '':
-                        silk_dict['name'] = deepcopy(silk_obj)
-                        silk_dict['apertures'] = deepcopy(app_obj.collection.get_by_name(silk_obj).apertures)
-
-                        self.results.append(self.pool.apply_async(self.check_inside_gerber_clearance,
-                                                                  args=(silk_dict,
-                                                                        silk_silk_clearance,
-                                                                        _("TOP -> Silk to Silk clearance"))))
-                if self.ui.ss_b_cb.get_value():
-                    silk_obj = self.ui.ss_b_object.currentText()
-                    if silk_obj != '':
-                        silk_dict['name'] = deepcopy(silk_obj)
-                        silk_dict['apertures'] = deepcopy(app_obj.collection.get_by_name(silk_obj).apertures)
-
-                        self.results.append(self.pool.apply_async(self.check_inside_gerber_clearance,
-                                                                  args=(silk_dict,
-                                                                        silk_silk_clearance,
-                                                                        _("BOTTOM -> Silk to Silk clearance"))))
-
-                if self.ui.ss_t_cb.get_value() is False and self.ui.ss_b_cb.get_value() is False:
-                    app_obj.inform.emit('[ERROR_NOTCL] %s. %s' % (
-                        _("Silk to Silk clearance"),
-                        _("At least one Gerber object has to be selected for this rule but none is selected.")))
-                    return
-
-            # RULE: Check Silk to Solder Mask Clearance
-            if self.ui.clearance_silk2sm_cb.get_value():
-                silk_t_dict = {}
-                sm_t_dict = {}
-                silk_b_dict = {}
-                sm_b_dict = {}
-
-                top_ss = False
-                bottom_ss = False
-                top_sm = False
-                bottom_sm = False
-
-                silk_top = self.ui.ss_t_object.currentText()
-                if silk_top != '' and self.ui.ss_t_cb.get_value():
-                    silk_t_dict['name'] = deepcopy(silk_top)
-                    silk_t_dict['apertures'] = deepcopy(app_obj.collection.get_by_name(silk_top).apertures)
-                    top_ss = True
-
-                silk_bottom = self.ui.ss_b_object.currentText()
-                if silk_bottom != '' and self.ui.ss_b_cb.get_value():
-                    silk_b_dict['name'] = deepcopy(silk_bottom)
-                    silk_b_dict['apertures'] = deepcopy(app_obj.collection.get_by_name(silk_bottom).apertures)
-                    bottom_ss = True
-
-                sm_top = self.ui.sm_t_object.currentText()
-                if sm_top != '' and self.ui.sm_t_cb.get_value():
-                    sm_t_dict['name'] = deepcopy(sm_top)
-                    sm_t_dict['apertures'] = deepcopy(app_obj.collection.get_by_name(sm_top).apertures)
-                    top_sm = True
-
-                sm_bottom = self.ui.sm_b_object.currentText()
-                if sm_bottom != '' and self.ui.sm_b_cb.get_value():
-                    sm_b_dict['name'] = deepcopy(sm_bottom)
-                    sm_b_dict['apertures'] = deepcopy(app_obj.collection.get_by_name(sm_bottom).apertures)
-                    bottom_sm = True
-
-                try:
-                    silk_sm_clearance = float(self.ui.clearance_silk2sm_entry.get_value())
-                except Exception as e:
-                    log.debug("RulesCheck.execute.worker_job() --> %s" % str(e))
-                    app_obj.inform.emit('[ERROR_NOTCL] %s. %s' % (
-                        _("Silk to Solder Mask Clearance"),
-                        _("Value is not valid.")))
-                    return
-
-                if (not silk_t_dict and not silk_b_dict) or (not sm_t_dict and not sm_b_dict):
-                    app_obj.inform.emit('[ERROR_NOTCL] %s. %s' % (
-                        _("Silk to Solder Mask Clearance"),
-                        _("One or more of the Gerber objects is not valid.")))
-                    return
-
-                if top_ss is True and top_sm is True:
-                    objs = [silk_t_dict, sm_t_dict]
-                    self.results.append(self.pool.apply_async(self.check_gerber_clearance,
-                                                              args=(objs,
-                                                                    silk_sm_clearance,
-                                                                    _("TOP -> Silk to Solder Mask Clearance"))))
-                elif bottom_ss is True and bottom_sm is True:
-                    objs = [silk_b_dict, sm_b_dict]
-                    self.results.append(self.pool.apply_async(self.check_gerber_clearance,
-                                                              args=(objs,
-                                                                    silk_sm_clearance,
-                                                                    _("BOTTOM -> Silk to Solder Mask Clearance"))))
-                else:
-                    app_obj.inform.emit('[ERROR_NOTCL] %s. %s' % (
-                        _("Silk to Solder Mask Clearance"),
-                        _("Both Silk and Solder Mask Gerber objects has to be either both Top or both Bottom.")))
-                    return
-
-            # RULE: Check Silk to Outline Clearance
-            if self.ui.clearance_silk2ol_cb.get_value():
-                top_dict = {}
-                bottom_dict = {}
-                outline_dict = {}
-
-                silk_top = self.ui.ss_t_object.currentText()
-                if silk_top != '' and self.ui.ss_t_cb.get_value():
-                    top_dict['name'] = deepcopy(silk_top)
-                    top_dict['apertures'] = deepcopy(app_obj.collection.get_by_name(silk_top).apertures)
-
-                silk_bottom = self.ui.ss_b_object.currentText()
-                if silk_bottom != '' and self.ui.ss_b_cb.get_value():
-                    bottom_dict['name'] = deepcopy(silk_bottom)
-                    bottom_dict['apertures'] = deepcopy(app_obj.collection.get_by_name(silk_bottom).apertures)
-
-                copper_outline = self.ui.outline_object.currentText()
-                if copper_outline != '' and self.ui.out_cb.get_value():
-                    outline_dict['name'] = deepcopy(copper_outline)
-                    outline_dict['apertures'] = deepcopy(app_obj.collection.get_by_name(copper_outline).apertures)
-
-                try:
-                    copper_outline_clearance = float(self.ui.clearance_copper2ol_entry.get_value())
-                except Exception as e:
-                    log.debug("RulesCheck.execute.worker_job() --> %s" % str(e))
-                    app_obj.inform.emit('[ERROR_NOTCL] %s. %s' % (
-                        _("Silk to Outline Clearance"),
-                        _("Value is not valid.")))
-                    return
-
-                if not top_dict and not bottom_dict or not outline_dict:
-                    app_obj.inform.emit('[ERROR_NOTCL] %s. %s' % (
-                        _("Silk to Outline Clearance"),
-                        _("One of the Silk Gerber objects or the Outline Gerber object is not valid.")))
-                    return
-
-                objs = []
-                if top_dict:
-                    objs.append(top_dict)
-                if bottom_dict:
-                    objs.append(bottom_dict)
-
-                if outline_dict:
-                    objs.append(outline_dict)
-                else:
-                    app_obj.inform.emit('[ERROR_NOTCL] %s. %s' % (
-                        _("Silk to Outline Clearance"),
-                        _("Outline Gerber object presence is mandatory for this rule but it is not selected.")))
-                    return
-
-                self.results.append(self.pool.apply_async(self.check_gerber_clearance,
-                                                          args=(objs,
-                                                                copper_outline_clearance,
-                                                                _("Silk to Outline Clearance"))))
-
-            # RULE: Check Minimum Solder Mask Sliver
-            if self.ui.clearance_silk2silk_cb.get_value():
-                sm_dict = {}
-
-                try:
-                    sm_sm_clearance = float(self.ui.clearance_sm2sm_entry.get_value())
-                except Exception as e:
-                    log.debug("RulesCheck.execute.worker_job() --> %s" % str(e))
-                    app_obj.inform.emit('[ERROR_NOTCL] %s. %s' % (
-                        _("Minimum Solder Mask Sliver"),
-                        _("Value is not valid.")))
-                    return
-
-                if self.ui.sm_t_cb.get_value():
-                    solder_obj = self.ui.sm_t_object.currentText()
-                    if solder_obj != '':
-                        sm_dict['name'] = deepcopy(solder_obj)
-                        sm_dict['apertures'] = deepcopy(app_obj.collection.get_by_name(solder_obj).apertures)
-
-                        self.results.append(self.pool.apply_async(self.check_inside_gerber_clearance,
-                                                                  args=(sm_dict,
-                                                                        sm_sm_clearance,
-                                                                        _("TOP -> Minimum Solder Mask Sliver"))))
-                if self.ui.sm_b_cb.get_value():
-                    solder_obj = self.ui.sm_b_object.currentText()
-                    if solder_obj != '':
-                        sm_dict['name'] = deepcopy(solder_obj)
-                        sm_dict['apertures'] = deepcopy(app_obj.collection.get_by_name(solder_obj).apertures)
-
-                        self.results.append(self.pool.apply_async(self.check_inside_gerber_clearance,
-                                                                  args=(sm_dict,
-                                                                        sm_sm_clearance,
-                                                                        _("BOTTOM -> Minimum Solder Mask Sliver"))))
-
-                if self.ui.sm_t_cb.get_value() is False and self.ui.sm_b_cb.get_value() is False:
-                    app_obj.inform.emit('[ERROR_NOTCL] %s. %s' % (
-                        _("Minimum Solder Mask Sliver"),
-                        _("At least one Gerber object has to be selected for this rule but none is selected.")))
-                    return
-
-            # RULE: Check Minimum Annular Ring
-            if self.ui.ring_integrity_cb.get_value():
-                top_dict = {}
-                bottom_dict = {}
-                exc_1_dict = {}
-                exc_2_dict = {}
-
-                copper_top = self.ui.copper_t_object.currentText()
-                if copper_top != '' and self.ui.copper_t_cb.get_value():
-                    top_dict['name'] = deepcopy(copper_top)
-                    top_dict['apertures'] = deepcopy(app_obj.collection.get_by_name(copper_top).apertures)
-
-                copper_bottom = self.ui.copper_b_object.currentText()
-                if copper_bottom != '' and self.ui.copper_b_cb.get_value():
-                    bottom_dict['name'] = deepcopy(copper_bottom)
-                    bottom_dict['apertures'] = deepcopy(app_obj.collection.get_by_name(copper_bottom).apertures)
-
-                excellon_1 = self.ui.e1_object.currentText()
-                if excellon_1 != '' and self.ui.e1_cb.get_value():
-                    exc_1_dict['name'] = deepcopy(excellon_1)
-                    exc_1_dict['tools'] = deepcopy(
-                        app_obj.collection.get_by_name(excellon_1).tools)
-
-                excellon_2 = self.ui.e2_object.currentText()
-                if excellon_2 != '' and self.ui.e2_cb.get_value():
-                    exc_2_dict['name'] = deepcopy(excellon_2)
-                    exc_2_dict['tools'] = deepcopy(
-                        app_obj.collection.get_by_name(excellon_2).tools)
+            # the rules are checked in the process pool
+            with app_obj.scheduler.group(_("Working...")) as group:
+                # the rules checked in tiles: index in the group results -> (rule title, object names)
+                tiled_rules = {}
+
+                # RULE: Check Trace Size
+                if self.ui.trace_size_cb.get_value():
+                    copper_list = []
+                    copper_name_1 = self.ui.copper_t_object.currentText()
+                    if copper_name_1 != '' and self.ui.copper_t_cb.get_value():
+                        elem_dict = {
+                            'name': deepcopy(copper_name_1),
+                            'apertures': deepcopy(app_obj.collection.get_by_name(copper_name_1).apertures)
+                        }
+                        copper_list.append(elem_dict)
+
+                    copper_name_2 = self.ui.copper_b_object.currentText()
+                    if copper_name_2 != '' and self.ui.copper_b_cb.get_value():
+                        elem_dict = {
+                            'name': deepcopy(copper_name_2),
+                            'apertures': deepcopy(app_obj.collection.get_by_name(copper_name_2).apertures)
+                        }
+                        copper_list.append(elem_dict)
+
+                    trace_size = float(self.ui.trace_size_entry.get_value())
+                    group.submit(self.check_traces_size, copper_list, trace_size)
+
+                # RULE: Check Copper to Copper Clearance
+                if self.ui.clearance_copper2copper_cb.get_value():
+
+                    try:
+                        copper_copper_clearance = float(self.ui.clearance_copper2copper_entry.get_value())
+                    except Exception as e:
+                        log.debug("RulesCheck.execute.worker_job() --> %s" % str(e))
+                        self.app.inform.emit('[ERROR_NOTCL] %s. %s' % (
+                            _("Copper to Copper clearance"),
+                            _("Value is not valid.")))
+                        return
+
+                    if self.copper_t_cb.get_value():
+                        copper_t_obj = self.ui.copper_t_object.currentText()
+                        copper_t_dict = {}
+
+                        if copper_t_obj != '':
+                            copper_t_dict['name'] = deepcopy(copper_t_obj)
+                            copper_t_dict['apertures'] = deepcopy(
+                                app_obj.collection.get_by_name(copper_t_obj).apertures)
+
+                            self.submit_rule(group, tiled_rules, self.check_inside_gerber_clearance,
+                                             copper_t_dict,
+                                             copper_copper_clearance,
+                                             _("TOP -> Copper to Copper clearance"))
+                    if self.ui.copper_b_cb.get_value():
+                        copper_b_obj = self.ui.copper_b_object.currentText()
+                        copper_b_dict = {}
+                        if copper_b_obj != '':
+                            copper_b_dict['name'] = deepcopy(copper_b_obj)
+                            copper_b_dict['apertures'] = deepcopy(
+                                app_obj.collection.get_by_name(copper_b_obj).apertures)
+
+                            self.submit_rule(group, tiled_rules, self.check_inside_gerber_clearance,
+                                             copper_b_dict,
+                                             copper_copper_clearance,
+                                             _("BOTTOM -> Copper to Copper clearance"))
+
+                    if self.ui.copper_t_cb.get_value() is False and self.ui.copper_b_cb.get_value() is False:
+                        app_obj.inform.emit('[ERROR_NOTCL] %s. %s' % (
+                            _("Copper to Copper clearance"),
+                            _("At least one Gerber object has to be selected for this rule but none is selected.")))
+                        return
+
+                # RULE: Check Copper to Outline Clearance
+                if self.ui.clearance_copper2ol_cb.get_value() and self.ui.out_cb.get_value():
+                    top_dict = {}
+                    bottom_dict = {}
+                    outline_dict = {}
+
+                    copper_top = self.ui.copper_t_object.currentText()
+                    if copper_top != '' and self.ui.copper_t_cb.get_value():
+                        top_dict['name'] = deepcopy(copper_top)
+                        top_dict['apertures'] = deepcopy(app_obj.collection.get_by_name(copper_top).apertures)
+
+                    copper_bottom = self.ui.copper_b_object.currentText()
+                    if copper_bottom != '' and self.ui.copper_b_cb.get_value():
+                        bottom_dict['name'] = deepcopy(copper_bottom)
+                        bottom_dict['apertures'] = deepcopy(app_obj.collection.get_by_name(copper_bottom).apertures)
+
+                    copper_outline = self.ui.outline_object.currentText()
+                    if copper_outline != '' and self.ui.out_cb.get_value():
+                        outline_dict['name'] = deepcopy(copper_outline)
+                        outline_dict['apertures'] = deepcopy(app_obj.collection.get_by_name(copper_outline).apertures)
+
+                    try:
+                        copper_outline_clearance = float(self.ui.clearance_copper2ol_entry.get_value())
+                    except Exception as e:
+                        log.debug("RulesCheck.execute.worker_job() --> %s" % str(e))
+                        app_obj.inform.emit('[ERROR_NOTCL] %s. %s' % (
+                            _("Copper to Outline clearance"),
+                            _("Value is not valid.")))
+                        return
+
+                    if not top_dict and not bottom_dict or not outline_dict:
+                        app_obj.inform.emit('[ERROR_NOTCL] %s. %s' % (
+                            _("Copper to Outline clearance"),
+                            _("One of the copper Gerber objects or the Outline Gerber object is not valid.")))
+                        return
+                    objs = []
+                    if top_dict:
+                        objs.append(top_dict)
+                    if bottom_dict:
+                        objs.append(bottom_dict)
+
+                    if outline_dict:
+                        objs.append(outline_dict)
+                    else:
+                        app_obj.inform.emit('[ERROR_NOTCL] %s. %s' % (
+                            _("Copper to Outline clearance"),
+                            _("Outline Gerber object presence is mandatory for this rule but it is not selected.")))
+                        return
+
+                    self.submit_rule(group, tiled_rules, self.check_gerber_clearance,
+                                     objs,
+                                     copper_outline_clearance,
+                                     _("Copper to Outline clearance"))
+
+                # RULE: Check Silk to Silk Clearance
+                if self.ui.clearance_silk2silk_cb.get_value():
+                    silk_dict = {}
+
+                    try:
+                        silk_silk_clearance = float(self.ui.clearance_silk2silk_entry.get_value())
+                    except Exception as e:
+                        log.debug("RulesCheck.execute.worker_job() --> %s" % str(e))
+                        app_obj.inform.emit('[ERROR_NOTCL] %s. %s' % (
+                            _("Silk to Silk clearance"),
+                            _("Value is not valid.")))
+                        return
+
+                    if self.ss_t_cb.get_value():
+                        silk_obj = self.ui.ss_t_object.currentText()
+                        if silk_obj != '':
+                            silk_dict['name'] = deepcopy(silk_obj)
+                            silk_dict['apertures'] = deepcopy(app_obj.collection.get_by_name(silk_obj).apertures)
+
+                            self.submit_rule(group, tiled_rules, self.check_inside_gerber_clearance,
+                                             silk_dict,
+                                             silk_silk_clearance,
+                                             _("TOP -> Silk to Silk clearance"))
+                    if self.ui.ss_b_cb.get_value():
+                        silk_obj = self.ui.ss_b_object.currentText()
+                        if silk_obj != '':
+                            silk_dict['name'] = deepcopy(silk_obj)
+                            silk_dict['apertures'] = deepcopy(app_obj.collection.get_by_name(silk_obj).apertures)
+
+                            self.submit_rule(group, tiled_rules, self.check_inside_gerber_clearance,
+                                             silk_dict,
+                                             silk_silk_clearance,
+                                             _("BOTTOM -> Silk to Silk clearance"))
+
+                    if self.ui.ss_t_cb.get_value() is False and self.ui.ss_b_cb.get_value() is False:
+                        app_obj.inform.emit('[ERROR_NOTCL] %s. %s' % (
+                            _("Silk to Silk clearance"),
+                            _("At least one Gerber object has to be selected for this rule but none is selected.")))
+                        return
+
+                # RULE: Check Silk to Solder Mask Clearance
+                if self.ui.clearance_silk2sm_cb.get_value():
+                    silk_t_dict = {}
+                    sm_t_dict = {}
+                    silk_b_dict = {}
+                    sm_b_dict = {}
+
+                    top_ss = False
+                    bottom_ss = False
+                    top_sm = False
+                    bottom_sm = False
+
+                    silk_top = self.ui.ss_t_object.currentText()
+                    if silk_top != '' and self.ui.ss_t_cb.get_value():
+                        silk_t_dict['name'] = deepcopy(silk_top)
+                        silk_t_dict['apertures'] = deepcopy(app_obj.collection.get_by_name(silk_top).apertures)
+                        top_ss = True
+
+                    silk_bottom = self.ui.ss_b_object.currentText()
+                    if silk_bottom != '' and self.ui.ss_b_cb.get_value():
+                        silk_b_dict['name'] = deepcopy(silk_bottom)
+                        silk_b_dict['apertures'] = deepcopy(app_obj.collection.get_by_name(silk_bottom).apertures)
+                        bottom_ss = True
+
+                    sm_top = self.ui.sm_t_object.currentText()
+                    if sm_top != '' and self.ui.sm_t_cb.get_value():
+                        sm_t_dict['name'] = deepcopy(sm_top)
+                        sm_t_dict['apertures'] = deepcopy(app_obj.collection.get_by_name(sm_top).apertures)
+                        top_sm = True
+
+                    sm_bottom = self.ui.sm_b_object.currentText()
+                    if sm_bottom != '' and self.ui.sm_b_cb.get_value():
+                        sm_b_dict['name'] = deepcopy(sm_bottom)
+                        sm_b_dict['apertures'] = deepcopy(app_obj.collection.get_by_name(sm_bottom).apertures)
+                        bottom_sm = True
+
+                    try:
+                        silk_sm_clearance = float(self.ui.clearance_silk2sm_entry.get_value())
+                    except Exception as e:
+                        log.debug("RulesCheck.execute.worker_job() --> %s" % str(e))
+                        app_obj.inform.emit('[ERROR_NOTCL] %s. %s' % (
+                            _("Silk to Solder Mask Clearance"),
+                            _("Value is not valid.")))
+                        return
+
+                    if (not silk_t_dict and not silk_b_dict) or (not sm_t_dict and not sm_b_dict):
+                        app_obj.inform.emit('[ERROR_NOTCL] %s. %s' % (
+                            _("Silk to Solder Mask Clearance"),
+                            _("One or more of the Gerber objects is not valid.")))
+                        return
+
+                    if top_ss is True and top_sm is True:
+                        objs = [silk_t_dict, sm_t_dict]
+                        self.submit_rule(group, tiled_rules, self.check_gerber_clearance,
+                                         objs,
+                                         silk_sm_clearance,
+                                         _("TOP -> Silk to Solder Mask Clearance"))
+                    elif bottom_ss is True and bottom_sm is True:
+                        objs = [silk_b_dict, sm_b_dict]
+                        self.submit_rule(group, tiled_rules, self.check_gerber_clearance,
+                                         objs,
+                                         silk_sm_clearance,
+                                         _("BOTTOM -> Silk to Solder Mask Clearance"))
+                    else:
+                        app_obj.inform.emit('[ERROR_NOTCL] %s. %s' % (
+                            _("Silk to Solder Mask Clearance"),
+                            _("Both Silk and Solder Mask Gerber objects has to be either both Top or both Bottom.")))
+                        return
+
+                # RULE: Check Silk to Outline Clearance
+                if self.ui.clearance_silk2ol_cb.get_value():
+                    top_dict = {}
+                    bottom_dict = {}
+                    outline_dict = {}
+
+                    silk_top = self.ui.ss_t_object.currentText()
+                    if silk_top != '' and self.ui.ss_t_cb.get_value():
+                        top_dict['name'] = deepcopy(silk_top)
+                        top_dict['apertures'] = deepcopy(app_obj.collection.get_by_name(silk_top).apertures)
+
+                    silk_bottom = self.ui.ss_b_object.currentText()
+                    if silk_bottom != '' and self.ui.ss_b_cb.get_value():
+                        bottom_dict['name'] = deepcopy(silk_bottom)
+                        bottom_dict['apertures'] = deepcopy(app_obj.collection.get_by_name(silk_bottom).apertures)
+
+                    copper_outline = self.ui.outline_object.currentText()
+                    if copper_outline != '' and self.ui.out_cb.get_value():
+                        outline_dict['name'] = deepcopy(copper_outline)
+                        outline_dict['apertures'] = deepcopy(app_obj.collection.get_by_name(copper_outline).apertures)
+
+                    try:
+                        copper_outline_clearance = float(self.ui.clearance_copper2ol_entry.get_value())
+                    except Exception as e:
+                        log.debug("RulesCheck.execute.worker_job() --> %s" % str(e))
+                        app_obj.inform.emit('[ERROR_NOTCL] %s. %s' % (
+                            _("Silk to Outline Clearance"),
+                            _("Value is not valid.")))
+                        return
+
+                    if not top_dict and not bottom_dict or not outline_dict:
+                        app_obj.inform.emit('[ERROR_NOTCL] %s. %s' % (
+                            _("Silk to Outline Clearance"),
+                            _("One of the Silk Gerber objects or the Outline Gerber object is not valid.")))
+                        return
+
+                    objs = []
+                    if top_dict:
+                        objs.append(top_dict)
+                    if bottom_dict:
+                        objs.append(bottom_dict)
+
+                    if outline_dict:
+                        objs.append(outline_dict)
+                    else:
+                        app_obj.inform.emit('[ERROR_NOTCL] %s. %s' % (
+                            _("Silk to Outline Clearance"),
+                            _("Outline Gerber object presence is mandatory for this rule but it is not selected.")))
+                        return
+
+                    self.submit_rule(group, tiled_rules, self.check_gerber_clearance,
+                                     objs,
+                                     copper_outline_clearance,
+                                     _("Silk to Outline Clearance"))
+
+                # RULE: Check Minimum Solder Mask Sliver
+                if self.ui.clearance_silk2silk_cb.get_value():
+                    sm_dict = {}
+
+                    try:
+                        sm_sm_clearance = float(self.ui.clearance_sm2sm_entry.get_value())
+                    except Exception as e:
+                        log.debug("RulesCheck.execute.worker_job() --> %s" % str(e))
+                        app_obj.inform.emit('[ERROR_NOTCL] %s. %s' % (
+                            _("Minimum Solder Mask Sliver"),
+                            _("Value is not valid.")))
+                        return
+
+                    if self.ui.sm_t_cb.get_value():
+                        solder_obj = self.ui.sm_t_object.currentText()
+                        if solder_obj != '':
+                            sm_dict['name'] = deepcopy(solder_obj)
+                            sm_dict['apertures'] = deepcopy(app_obj.collection.get_by_name(solder_obj).apertures)
+
+                            self.submit_rule(group, tiled_rules, self.check_inside_gerber_clearance,
+                                             sm_dict,
+                                             sm_sm_clearance,
+                                             _("TOP -> Minimum Solder Mask Sliver"))
+                    if self.ui.sm_b_cb.get_value():
+                        solder_obj = self.ui.sm_b_object.currentText()
+                        if solder_obj != '':
+                            sm_dict['name'] = deepcopy(solder_obj)
+                            sm_dict['apertures'] = deepcopy(app_obj.collection.get_by_name(solder_obj).apertures)
+
+                            self.submit_rule(group, tiled_rules, self.check_inside_gerber_clearance,
+                                             sm_dict,
+                                             sm_sm_clearance,
+                                             _("BOTTOM -> Minimum Solder Mask Sliver"))
+
+                    if self.ui.sm_t_cb.get_value() is False and self.ui.sm_b_cb.get_value() is False:
+                        app_obj.inform.emit('[ERROR_NOTCL] %s. %s' % (
+                            _("Minimum Solder Mask Sliver"),
+                            _("At least one Gerber object has to be selected for this rule but none is selected.")))
+                        return
+
+                # RULE: Check Minimum Annular Ring
+                if self.ui.ring_integrity_cb.get_value():
+                    top_dict = {}
+                    bottom_dict = {}
+                    exc_1_dict = {}
+                    exc_2_dict = {}
+
+                    copper_top = self.ui.copper_t_object.currentText()
+                    if copper_top != '' and self.ui.copper_t_cb.get_value():
+                        top_dict['name'] = deepcopy(copper_top)
+                        top_dict['apertures'] = deepcopy(app_obj.collection.get_by_name(copper_top).apertures)
+
+                    copper_bottom = self.ui.copper_b_object.currentText()
+                    if copper_bottom != '' and self.ui.copper_b_cb.get_value():
+                        bottom_dict['name'] = deepcopy(copper_bottom)
+                        bottom_dict['apertures'] = deepcopy(app_obj.collection.get_by_name(copper_bottom).apertures)
+
+                    excellon_1 = self.ui.e1_object.currentText()
+                    if excellon_1 != '' and self.ui.e1_cb.get_value():
+                        exc_1_dict['name'] = deepcopy(excellon_1)
+                        exc_1_dict['tools'] = deepcopy(
+                            app_obj.collection.get_by_name(excellon_1).tools)
+
+                    excellon_2 = self.ui.e2_object.currentText()
+                    if excellon_2 != '' and self.ui.e2_cb.get_value():
+                        exc_2_dict['name'] = deepcopy(excellon_2)
+                        exc_2_dict['tools'] = deepcopy(
+                            app_obj.collection.get_by_name(excellon_2).tools)
+
+                    try:
+                        ring_val = float(self.ui.ring_integrity_entry.get_value())
+                    except Exception as e:
+                        log.debug("RulesCheck.execute.worker_job() --> %s" % str(e))
+                        app_obj.inform.emit('[ERROR_NOTCL] %s. %s' % (
+                            _("Minimum Annular Ring"),
+                            _("Value is not valid.")))
+                        return
+
+                    if (not top_dict and not bottom_dict) or (not exc_1_dict and not exc_2_dict):
+                        app_obj.inform.emit('[ERROR_NOTCL] %s. %s' % (
+                            _("Minimum Annular Ring"),
+                            _("One of the Copper Gerber objects or the Excellon objects is not valid.")))
+                        return
+
+                    objs = []
+                    if top_dict:
+                        objs.append(top_dict)
+                    elif bottom_dict:
+                        objs.append(bottom_dict)
+
+                    if exc_1_dict:
+                        objs.append(exc_1_dict)
+                    elif exc_2_dict:
+                        objs.append(exc_2_dict)
+                    else:
+                        app_obj.inform.emit('[ERROR_NOTCL] %s. %s' % (
+                            _("Minimum Annular Ring"),
+                            _("Excellon object presence is mandatory for this rule but none is selected.")))
+                        return
+
+                    self.submit_rule(group, tiled_rules, self.check_gerber_annular_ring,
+                                     objs, ring_val, _("Minimum Annular Ring"))
+
+                # RULE: Check Hole to Hole Clearance
+                if self.ui.clearance_d2d_cb.get_value():
+                    exc_list = []
+                    exc_name_1 = self.ui.e1_object.currentText()
+                    if exc_name_1 != '' and self.ui.e1_cb.get_value():
+                        elem_dict = {
+                            'name': deepcopy(exc_name_1),
+                            'tools': deepcopy(app_obj.collection.get_by_name(exc_name_1).tools)
+                        }
+                        exc_list.append(elem_dict)
+
+                    exc_name_2 = self.ui.e2_object.currentText()
+                    if exc_name_2 != '' and self.ui.e2_cb.get_value():
+                        elem_dict = {
+                            'name': deepcopy(exc_name_2),
+                            'tools': deepcopy(app_obj.collection.get_by_name(exc_name_2).tools)
+                        }
+                        exc_list.append(elem_dict)
+
+                    hole_clearance = float(self.ui.clearance_d2d_entry.get_value())
+                    self.submit_rule(group, tiled_rules, self.check_holes_clearance, exc_list, hole_clearance)
+
+                # RULE: Check Holes Size
+                if self.ui.drill_size_cb.get_value():
+                    exc_list = []
+                    exc_name_1 = self.ui.e1_object.currentText()
+                    if exc_name_1 != '' and self.ui.e1_cb.get_value():
+                        elem_dict = {
+                            'name': deepcopy(exc_name_1),
+                            'tools': deepcopy(app_obj.collection.get_by_name(exc_name_1).tools)
+                        }
+                        exc_list.append(elem_dict)
+
+                    exc_name_2 = self.ui.e2_object.currentText()
+                    if exc_name_2 != '' and self.ui.e2_cb.get_value():
+                        elem_dict = {
+                            'name': deepcopy(exc_name_2),
+                            'tools': deepcopy(app_obj.collection.get_by_name(exc_name_2).tools)
+                        }
+                        exc_list.append(elem_dict)
+
+                    drill_size = float(self.ui.drill_size_entry.get_value())
+                    group.submit(self.check_holes_size, exc_list, drill_size)
 
                 try:
-                    ring_val = float(self.ui.ring_integrity_entry.get_value())
-                except Exception as e:
-                    log.debug("RulesCheck.execute.worker_job() --> %s" % str(e))
-                    app_obj.inform.emit('[ERROR_NOTCL] %s. %s' % (
-                        _("Minimum Annular Ring"),
-                        _("Value is not valid.")))
-                    return
-
-                if (not top_dict and not bottom_dict) or (not exc_1_dict and not exc_2_dict):
-                    app_obj.inform.emit('[ERROR_NOTCL] %s. %s' % (
-                        _("Minimum Annular Ring"),
-                        _("One of the Copper Gerber objects or the Excellon objects is not valid.")))
-                    return
-
-                objs = []
-                if top_dict:
-                    objs.append(top_dict)
-                elif bottom_dict:
-                    objs.append(bottom_dict)
-
-                if exc_1_dict:
-                    objs.append(exc_1_dict)
-                elif exc_2_dict:
-                    objs.append(exc_2_dict)
-                else:
-                    app_obj.inform.emit('[ERROR_NOTCL] %s. %s' % (
-                        _("Minimum Annular Ring"),
-                        _("Excellon object presence is mandatory for this rule but none is selected.")))
+                    output = group.results()
+                except grace:
+                    app_obj.proc_container.view.set_idle()
                     return
 
-                self.results.append(self.pool.apply_async(self.check_gerber_annular_ring,
-                                                          args=(objs,
-                                                                ring_val,
-                                                                _("Minimum Annular Ring"))))
-
-            # RULE: Check Hole to Hole Clearance
-            if self.ui.clearance_d2d_cb.get_value():
-                exc_list = []
-                exc_name_1 = self.ui.e1_object.currentText()
-                if exc_name_1 != '' and self.ui.e1_cb.get_value():
-                    elem_dict = {
-                        'name': deepcopy(exc_name_1),
-                        'tools': deepcopy(app_obj.collection.get_by_name(exc_name_1).tools)
-                    }
-                    exc_list.append(elem_dict)
-
-                exc_name_2 = self.ui.e2_object.currentText()
-                if exc_name_2 != '' and self.ui.e2_cb.get_value():
-                    elem_dict = {
-                        'name': deepcopy(exc_name_2),
-                        'tools': deepcopy(app_obj.collection.get_by_name(exc_name_2).tools)
-                    }
-                    exc_list.append(elem_dict)
-
-                hole_clearance = float(self.ui.clearance_d2d_entry.get_value())
-                self.results.append(self.pool.apply_async(self.check_holes_clearance, args=(exc_list, hole_clearance)))
-
-            # RULE: Check Holes Size
-            if self.ui.drill_size_cb.get_value():
-                exc_list = []
-                exc_name_1 = self.ui.e1_object.currentText()
-                if exc_name_1 != '' and self.ui.e1_cb.get_value():
-                    elem_dict = {
-                        'name': deepcopy(exc_name_1),
-                        'tools': deepcopy(app_obj.collection.get_by_name(exc_name_1).tools)
-                    }
-                    exc_list.append(elem_dict)
-
-                exc_name_2 = self.ui.e2_object.currentText()
-                if exc_name_2 != '' and self.ui.e2_cb.get_value():
-                    elem_dict = {
-                        'name': deepcopy(exc_name_2),
-                        'tools': deepcopy(app_obj.collection.get_by_name(exc_name_2).tools)
-                    }
-                    exc_list.append(elem_dict)
-
-                drill_size = float(self.ui.drill_size_entry.get_value())
-                self.results.append(self.pool.apply_async(self.check_holes_size, args=(exc_list, drill_size)))
-
-            output = []
-            for p in self.results:
-                output.append(p.get())
+            # the violations found in the tiles of a rule are joined; a violation is found only in one tile but a
+            # location may be shared by more than one pair of features
+            for idx, (rule_title, names) in tiled_rules.items():
+                output[idx] = (rule_title, [{'name': names, 'points': list(dict.fromkeys(output[idx]))}])
 
             self.tool_finished.emit(output)
             app_obj.proc_container.view.set_idle()
@@ -1068,6 +951,38 @@ class RulesCheck(AppTool):
 
         self.app.worker_task.emit({'fcn': worker_job, 'params': [self.app]})
 
+    def submit_rule(self, group, tiled_rules, check_fcn, *args):
+        """
+        Adds the check of a rule to a group of tasks. In the tiled mode (Preferences) the features of the rules that
+        measure distances are split in tiles: only the WKB of the features of a tile is sent to the process that
+        checks the tile, a large rule uses all the processes and the progress counts the finished tiles.
+
+        :param group:       TaskGroup of the scheduler
+        :param tiled_rules: dict updated with the index of the rule in the group results -> (rule title, names)
+        :param check_fcn:   one of the check_*() methods
+        :param args:        the parameters of the check_*() method
+        :return:            None
+        """
+        features_fcn = {
+            self.check_inside_gerber_clearance: self.inside_gerber_clearance_features,
+            self.check_gerber_clearance: self.gerber_clearance_features,
+            self.check_holes_clearance: self.holes_clearance_features,
+            self.check_gerber_annular_ring: self.gerber_annular_ring_features
+        }.get(check_fcn)
+
+        if self.app.defaults["tools_cr_tiled"] and features_fcn is not None:
+            features = features_fcn(*args)
+            # a failed check (not enough objects, a single polygon) is reported by check_fcn()
+            if isinstance(features, tuple):
+                rule_title, names, kind, geoms_a, geoms_b, size = features
+                nr_tiles = self.app.scheduler.processes * self.app.scheduler.chunks_per_process
+                tiles = make_tiles(kind, geoms_a, geoms_b, size, nr_tiles)
+                idx = group.map(check_tiles, tiles, args=(kind, size), chunk_size=1)
+                tiled_rules[idx] = (rule_title, names)
+                return
+
+        group.submit(check_fcn, *args)
+
     def on_tool_finished(self, res):
         def init(new_obj, app_obj):
             txt = ''
@@ -13,10 +13,8 @@ from PyQt5.QtWidgets import QVBoxLayout, QWidget, QHBoxLayout, QLabel
 from appGUI.GUIElements import _BrowserTextEdit, _ExpandableTextEdit, FCLabel
 import html
 import sys
-import traceback
 
-import tkinter as tk
-import tclCommands
+from tclCommands.TclShell import TclShell
 
 import gettext
 import appTranslation as fcTranslate
@@ -255,6 +253,9 @@ class TermWidget(QWidget):
         """
         return True
 
+    def clear_output(self):
+        self._browser.clear()
+
     def browser(self):
         return self._browser
 
@@ -279,7 +280,7 @@ class TermWidget(QWidget):
             self._edit.moveCursor(QTextCursor.End)
 
 
-class FCShell(TermWidget):
+class FCShell(TermWidget, TclShell):
     def __init__(self, app, version, *args):
         """
         Initialize the TCL Shell. A dock widget that holds the GUI interface to the FlatCAM command line.
@@ -306,72 +307,6 @@ class FCShell(TermWidget):
         self.app.ui.shell_dock.setWidget(self)
         self.app.log.debug("TCL Shell has been initialized.")
 
-    def init_tcl(self):
-        if hasattr(self, 'tcl') and self.tcl is not None:
-            # self.tcl = None
-            # new object cannot be used here as it will not remember values created for next passes,
-            # because tcl was executed in old instance of TCL
-            pass
-        else:
-            self.tcl = tk.Tcl()
-            self.setup_shell()
-
-    def setup_shell(self):
-        """
-        Creates shell functions. Runs once at startup.
-
-        :return: None
-        """
-
-        '''
-            How to implement TCL shell commands:
-
-            All parameters passed to command should be possible to set as None and test it afterwards.
-            This is because we need to see error caused in tcl,
-            if None value as default parameter is not allowed TCL will return empty error.
-            Use:
-                def mycommand(name=None,...):
-
-            Test it like this:
-            if name is None:
-
-                self.raise_tcl_error('Argument name is missing.')
-
-            When error occurred, always use raise_tcl_error, never return "some text" on error,
-            otherwise we will miss it and processing will silently continue.
-            Method raise_tcl_error  pass error into TCL interpreter, then raise python exception,
-            which is caught in exec_command and displayed in TCL shell console with red background.
-            Error in console is displayed  with TCL  trace.
-
-            This behavior works only within main thread,
-            errors with promissed tasks can be catched and detected only with log.
-            TODO: this problem have to be addressed somehow, maybe rewrite promissing to be blocking somehow for
-            TCL shell.
-
-            Kamil's comment: I will rewrite existing TCL commands from time to time to follow this rules.
-
-        '''
-
-        # Import/overwrite tcl commands as objects of TclCommand descendants
-        # This modifies the variable 'self.tcl_commands_storage'.
-        tclCommands.register_all_commands(self.app, self.tcl_commands_storage)
-
-        # Add commands to the tcl interpreter
-        for cmd in self.tcl_commands_storage:
-            self.tcl.createcommand(cmd, self.tcl_commands_storage[cmd]['fcn'])
-
-        # Make the tcl puts function return instead of print to stdout
-        self.tcl.eval('''
-            rename puts original_puts
-            proc puts {args} {
-                if {[llength $args] == 1} {
-                    return "[lindex $args 0]"
-                } else {
-                    eval original_puts $args
-                }
-            }
-            ''')
-
     def is_command_complete(self, text):
 
         # def skipQuotes(txt):
@@ -395,121 +330,6 @@ class FCShell(TermWidget):
     def child_exec_command(self, text):
         self.exec_command(text)
 
-    def exec_command(self, text, no_echo=False):
-        """
-        Handles input from the shell. See FlatCAMApp.setup_shell for shell commands.
-        Also handles execution in separated threads
-
-        :param text:        FlatCAM TclCommand with parameters
-        :param no_echo:     If True it will not try to print to the Shell because most likely the shell is hidden and it
-                            will create crashes of the _Expandable_Edit widget
-        :return:            output if there was any
-        """
-
-        self.app.defaults.report_usage('exec_command')
-
-        return self.exec_command_test(text, False, no_echo=no_echo)
-
-    def exec_command_test(self, text, reraise=True, no_echo=False):
-        """
-        Same as exec_command(...) with additional control over  exceptions.
-        Handles input from the shell. See FlatCAMApp.setup_shell for shell commands.
-
-        :param text: Input command
-        :param reraise: Re-raise TclError exceptions in Python (mostly for unittests).
-        :param no_echo: If True it will not try to print to the Shell because most likely the shell is hidden and it
-        will create crashes of the _Expandable_Edit widget
-        :return: Output from the command
-        """
-
-        tcl_command_string = str(text)
-
-        try:
-            if no_echo is False:
-                self.open_processing()  # Disables input box.
-
-            result = self.tcl.eval(str(tcl_command_string))
-            if result != 'None' and no_echo is False:
-                self.append_output(result + '\n')
-
-        except tk.TclError as e:
-            # This will display more precise answer if something in TCL shell fails
-            result = self.tcl.eval("set errorInfo")
-            self.app.log.error("Exception on Tcl Command execution: %s" % (result + '\n'))
-            if no_echo is False:
-                self.append_error('ERROR Report: ' + result + '\n')
-            # Show error in console and just return or in test raise exception
-            if reraise:
-                raise e
-        finally:
-            if no_echo is False:
-                self.close_processing()
-            pass
-        return result
-
-    def raise_tcl_unknown_error(self, unknownException):
-        """
-        Raise exception if is different type than TclErrorException
-        this is here mainly to show unknown errors inside TCL shell console.
-
-        :param unknownException:
-        :return:
-        """
-
-        if not isinstance(unknownException, self.TclErrorException):
-            self.raise_tcl_error("Unknown error: %s" % str(unknownException))
-        else:
-            raise unknownException
-
-    def display_tcl_error(self, error, error_info=None):
-        """
-        Escape bracket [ with '\' otherwise there is error
-        "ERROR: missing close-bracket" instead of real error
-
-        :param error: it may be text  or exception
-        :param error_info: Some informations about the error
-        :return: None
-        """
-
-        if isinstance(error, Exception):
-            exc_type, exc_value, exc_traceback = error_info
-            if not isinstance(error, self.TclErrorException):
-                show_trace = 1
-            else:
-                show_trace = int(self.app.defaults['global_verbose_error_level'])
-
-            if show_trace > 0:
-                trc = traceback.format_list(traceback.extract_tb(exc_traceback))
-                trc_formated = []
-                for a in reversed(trc):
-                    trc_formated.append(a.replace("    ", " > ").replace("\n", ""))
-                text = "%s\nPython traceback: %s\n%s" % (
-                    exc_value, exc_type, "\n".join(trc_formated))
-            else:
-                text = "%s" % error
-        else:
-            text = error
-
-        text = text.replace('[', '\\[').replace('"', '\\"')
-        self.tcl.eval('return -code error "%s"' % text)
-
-    def raise_tcl_error(self, text):
-        """
-        This method  pass exception from python into TCL as error, so we get stacktrace and reason
-
-        :param text: text of error
-        :return: raise exception
-        """
-
-        self.display_tcl_error(text)
-        raise self.TclErrorException(text)
-
-    class TclErrorException(Exception):
-        """
-        this exception is defined here, to be able catch it if we successfully handle all errors from shell command
-        """
-        pass
-
     # """
     # Code below is unsused. Saved for later.
     # """
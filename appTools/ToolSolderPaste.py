@@ -9,7 +9,6 @@ from appTool import AppTool
 from appCommon.Common import LoudDict
 from appGUI.GUIElements import FCComboBox, FCEntry, FCTable, FCDoubleSpinner, FCSpinner, FCFileSaveDialog, \
     FCInputSpinner
-from app_Main import log
 from camlib import distance
 from appEditors.AppTextEditor import AppTextEditor
 
@@ -22,6 +21,7 @@ from shapely.geometry import Polygon, LineString
 from shapely.ops import unary_union
 
 import traceback
+import logging
 from io import StringIO
 
 import gettext
@@ -32,6 +32,8 @@ fcTranslate.apply_language('strings')
 if '_' not in builtins.__dict__:
     _ = gettext.gettext
 
+log = logging.getLogger('base')
+
 
 class SolderPaste(AppTool):
     
@@ -13,6 +13,8 @@ from appGUI.GUIElements import FCCheckBox, FCButton, FCComboBox
 from shapely.geometry import Polygon, MultiPolygon, MultiLineString, LineString
 from shapely.ops import unary_union
 
+from appCommon.Common import GracefulException as grace
+
 import traceback
 from copy import deepcopy
 import time
@@ -83,7 +85,6 @@ class ToolSub(AppTool):
         self.sub_union = []
 
         # multiprocessing
-        self.pool = self.app.pool
         self.results = []
 
         # Signals
@@ -205,20 +206,23 @@ class ToolSub(AppTool):
                         if "clear" in s_el:
                             sub_geometry['clear'].append(s_el["clear"])
 
-                for ap_id in app_obj.target_grb_obj.apertures:
-                    # TARGET geometry
-                    target_geo = [geo for geo in app_obj.target_grb_obj.apertures[ap_id]['geometry']]
+                def aperture_done(res):
+                    msg = '%s: %s...' % (_("Finished parsing geometry for aperture"), str(res[0]))
+                    app_obj.app.inform.emit(msg)
+                    return msg
+
+                try:
+                    with app_obj.app.scheduler.group(progress=aperture_done) as group:
+                        for ap_id in app_obj.target_grb_obj.apertures:
+                            # TARGET geometry
+                            target_geo = [geo for geo in app_obj.target_grb_obj.apertures[ap_id]['geometry']]
 
-                    # send the job to the multiprocessing JOB
-                    app_obj.results.append(
-                        app_obj.pool.apply_async(app_obj.aperture_intersection, args=(ap_id, target_geo, sub_geometry))
-                    )
+                            # send the job to the multiprocessing JOB
+                            group.submit(app_obj.aperture_intersection, ap_id, target_geo, sub_geometry)
 
-                output = []
-                for p in app_obj.results:
-                    res = p.get()
-                    output.append(res)
-                    app_obj.app.inform.emit('%s: %s...' % (_("Finished parsing geometry for aperture"), str(res[0])))
+                        output = group.results()
+                except grace:
+                    return 'fail'
 
                 app_obj.app.inform.emit("%s" % _("Subtraction aperture processing finished."))
 
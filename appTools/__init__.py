@@ -1,47 +1,78 @@
+"""
+The FlatCAM Tools (plugins).
 
-from appTools.ToolCalculators import ToolCalculator
-from appTools.ToolCalibration import ToolCalibration
+The modules of the tools are imported when a tool is first used (see appTool.LazyTool): TOOLS gives the module of
+each tool class and 'from appTools import NonCopperClear' still works, it imports only the module of that tool.
+"""
 
-from appTools.ToolDblSided import DblSidedTool
-from appTools.ToolExtractDrills import ToolExtractDrills
-from appTools.ToolAlignObjects import AlignObjects
+import importlib
 
-from appTools.ToolFilm import Film
+# tool class -> module
+TOOLS = {
+    'ToolCalculator': 'appTools.ToolCalculators',
+    'ToolCalibration': 'appTools.ToolCalibration',
 
-from appTools.ToolImage import ToolImage
+    'DblSidedTool': 'appTools.ToolDblSided',
+    'ToolExtractDrills': 'appTools.ToolExtractDrills',
+    'AlignObjects': 'appTools.ToolAlignObjects',
 
-from appTools.ToolDistance import Distance
-from appTools.ToolDistanceMin import DistanceMin
+    'Film': 'appTools.ToolFilm',
 
-from appTools.ToolMove import ToolMove
+    'ToolImage': 'appTools.ToolImage',
 
-from appTools.ToolCutOut import CutOut
-from appTools.ToolNCC import NonCopperClear
-from appTools.ToolPaint import ToolPaint
-from appTools.ToolIsolation import ToolIsolation
-from appTools.ToolDrilling import ToolDrilling
-from appTools.ToolMilling import ToolMilling
+    'Distance': 'appTools.ToolDistance',
+    'DistanceMin': 'appTools.ToolDistanceMin',
 
-from appTools.ToolOptimal import ToolOptimal
+    'ToolMove': 'appTools.ToolMove',
 
-from appTools.ToolPanelize import Panelize
-from appTools.ToolPcbWizard import PcbWizard
-from appTools.ToolPDF import ToolPDF
-from appTools.ToolProperties import Properties
+    'CutOut': 'appTools.ToolCutOut',
+    'NonCopperClear': 'appTools.ToolNCC',
+    'ToolPaint': 'appTools.ToolPaint',
+    'ToolIsolation': 'appTools.ToolIsolation',
+    'ToolDrilling': 'appTools.ToolDrilling',
+    'ToolMilling': 'appTools.ToolMilling',
 
-from appTools.ToolQRCode import QRCode
-from appTools.ToolRulesCheck import RulesCheck
+    'ToolOptimal': 'appTools.ToolOptimal',
 
-from appTools.ToolCopperThieving import ToolCopperThieving
-from appTools.ToolFiducials import ToolFiducials
+    'Panelize': 'appTools.ToolPanelize',
+    'PcbWizard': 'appTools.ToolPcbWizard',
+    'ToolPDF': 'appTools.ToolPDF',
+    'Properties': 'appTools.ToolProperties',
 
-from appTools.ToolShell import FCShell
-from appTools.ToolSolderPaste import SolderPaste
-from appTools.ToolSub import ToolSub
+    'QRCode': 'appTools.ToolQRCode',
+    'RulesCheck': 'appTools.ToolRulesCheck',
 
-from appTools.ToolTransform import ToolTransform
-from appTools.ToolPunchGerber import ToolPunchGerber
+    'ToolCopperThieving': 'appTools.ToolCopperThieving',
+    'ToolFiducials': 'appTools.ToolFiducials',
 
-from appTools.ToolInvertGerber import ToolInvertGerber
-from appTools.ToolCorners import ToolCorners
-from appTools.ToolEtchCompensation import ToolEtchCompensation
\ No newline at end of file
+    'FCShell': 'appTools.ToolShell',
+    'SolderPaste': 'appTools.ToolSolderPaste',
+    'ToolSub': 'appTools.ToolSub',
+
+    'ToolTransform': 'appTools.ToolTransform',
+    'ToolPunchGerber': 'appTools.ToolPunchGerber',
+
+    'ToolInvertGerber': 'appTools.ToolInvertGerber',
+    'ToolCorners': 'appTools.ToolCorners',
+    'ToolEtchCompensation': 'appTools.ToolEtchCompensation',
+}
+
+
+def tool_class(name):
+    """
+    Imports the module of a tool.
+
+    :param name:    name of the tool class, a key of TOOLS
+    :return:        the tool class
+    """
+    try:
+        module_name = TOOLS[name]
+    except KeyError:
+        raise AttributeError("module 'appTools' has no tool %r" % name)
+    return getattr(importlib.import_module(module_name), name)
+
+
+def __getattr__(name):
+    if name in TOOLS:
+        return tool_class(name)
+    raise AttributeError("module 'appTools' has no attribute %r" % name)
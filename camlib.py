@@ -14,6 +14,7 @@ from numpy.linalg import solve, norm
 
 import platform
 from copy import deepcopy
+from contextlib import contextmanager
 
 import traceback
 from decimal import Decimal
@@ -42,11 +43,16 @@ try:
     from collections import Iterable
 except ImportError:
     from collections.abc import Iterable
-import rasterio
-from rasterio.features import shapes
 import ezdxf
 
 from appCommon.Common import GracefulException as grace
+from appCommon.DrillOrdering import order_drills
+from appCommon.PathChaining import paint_chain, touch_chain
+from appCommon.GCodeWriter import PreprocessorTemplates
+from appParsers.ParseGCode import parse_gcode, is_gerber_like, ParsedGCode
+from appParsers.DrillArrays import CoordinateArray
+from appParsers.ParseImage import import_image as import_image_tiles
+from appCommon.GeometryTransform import transform_targets, compose, mirror_matrix, rotate_matrix, skew_matrix
 
 # Commented for FlatCAM packaging with cx_freeze
 # from scipy.spatial import KDTree, Delaunay
@@ -55,9 +61,7 @@ from appCommon.Common import GracefulException as grace
 from appParsers.ParseSVG import *
 from appParsers.ParseDXF import *
 
-if platform.architecture()[0] == '64bit':
-    from ortools.constraint_solver import pywrapcp
-    from ortools.constraint_solver import routing_enums_pb2
+# rasterio and ortools (64bit only) are slow to import: they are imported where they are used
 
 import logging
 
@@ -517,6 +521,12 @@ class Geometry(object):
         # "geo_steps_per_circle": 128
     }
 
+    # process the GUI events while clearing polygons; False for a Geometry used in the processes of the pool
+    gui_events = True
+
+    # the transformations recorded inside deferred_transforms(); None when they are applied at once
+    _pending_transforms = None
+
     def __init__(self, geo_steps_per_circle=None):
         # Units (in or mm)
         self.units = self.app.defaults["units"]
@@ -547,7 +557,10 @@ class Geometry(object):
         self.old_disp_number = 0
         self.el_count = 0
 
-        if self.app.is_legacy is False:
+        if self.app.plotcanvas is None:
+            # the headless batch engine (appHeadless.py) has no canvas
+            self.temp_shapes = None
+        elif self.app.is_legacy is False:
             self.temp_shapes = self.app.plotcanvas.new_shape_collection(layers=1)
         else:
             from appGUI.PlotCanvasLegacy import ShapeCollectionLegacy
@@ -1306,7 +1319,8 @@ class Geometry(object):
         #     geos_text_f = []
         #     self.solid_geometry = [self.solid_geometry, geos_text_f]
 
-    def import_image(self, filename, flip=True, units='MM', dpi=96, mode='black', mask=None):
+    def import_image(self, filename, flip=True, units='MM', dpi=96, mode='black', mask=None, tile_size=None,
+                     scheduler=None):
         """
         Imports shapes from an IMAGE file into the object's geometry.
 
@@ -1320,58 +1334,73 @@ class Geometry(object):
         :param mode:        how to import the image: as 'black' or 'color'
         :type mode:         str
         :param mask:        level of detail for the import
+        :param tile_size:   if not None the image is read and vectorized in tiles of this size (pixels), see
+                            appParsers.ParseImage; otherwise the whole image is read at once
+        :param scheduler:   appPool.JobScheduler used to vectorize the tiles in the process pool
         :return:            None
         """
         if mask is None:
             mask = [128, 128, 128, 128]
 
-        scale_factor = 25.4 / dpi if units.lower() == 'mm' else 1 / dpi
+        if tile_size:
+            geos = import_image_tiles(filename, flip=flip, units=units, dpi=dpi, mode=mode, mask=mask,
+                                      tile_size=tile_size, scheduler=scheduler)
 
-        geos = []
-        unscaled_geos = []
+            if not self.solid_geometry:
+                # the polygons of the tiles don't overlap, no need for the union
+                self.solid_geometry = geos[0] if len(geos) == 1 else MultiPolygon(geos)
+                return
+        else:
+            import rasterio
+            from rasterio.features import shapes
 
-        with rasterio.open(filename) as src:
-            # if filename.lower().rpartition('.')[-1] == 'bmp':
-            #     red = green = blue = src.read(1)
-            #     print("BMP")
-            # elif filename.lower().rpartition('.')[-1] == 'png':
-            #     red, green, blue, alpha = src.read()
-            # elif filename.lower().rpartition('.')[-1] == 'jpg':
-            #     red, green, blue = src.read()
+            scale_factor = 25.4 / dpi if units.lower() == 'mm' else 1 / dpi
 
-            red = green = blue = src.read(1)
+            geos = []
+            unscaled_geos = []
 
-            try:
-                green = src.read(2)
-            except Exception:
-                pass
+            with rasterio.open(filename) as src:
+                # if filename.lower().rpartition('.')[-1] == 'bmp':
+                #     red = green = blue = src.read(1)
+                #     print("BMP")
+                # elif filename.lower().rpartition('.')[-1] == 'png':
+                #     red, green, blue, alpha = src.read()
+                # elif filename.lower().rpartition('.')[-1] == 'jpg':
+                #     red, green, blue = src.read()
 
-            try:
-                blue = src.read(3)
-            except Exception:
-                pass
+                red = green = blue = src.read(1)
 
-        if mode == 'black':
-            mask_setting = red <= mask[0]
-            total = red
-            log.debug("Image import as monochrome.")
-        else:
-            mask_setting = (red <= mask[1]) + (green <= mask[2]) + (blue <= mask[3])
-            total = np.zeros(red.shape, dtype=np.float32)
-            for band in red, green, blue:
-                total += band
-            total /= 3
-            log.debug("Image import as colored. Thresholds are: R = %s , G = %s, B = %s" %
-                      (str(mask[1]), str(mask[2]), str(mask[3])))
+                try:
+                    green = src.read(2)
+                except Exception:
+                    pass
 
-        for geom, val in shapes(total, mask=mask_setting):
-            unscaled_geos.append(shape(geom))
+                try:
+                    blue = src.read(3)
+                except Exception:
+                    pass
 
-        for g in unscaled_geos:
-            geos.append(scale(g, scale_factor, scale_factor, origin=(0, 0)))
+            if mode == 'black':
+                mask_setting = red <= mask[0]
+                total = red
+                log.debug("Image import as monochrome.")
+            else:
+                mask_setting = (red <= mask[1]) + (green <= mask[2]) + (blue <= mask[3])
+                total = np.zeros(red.shape, dtype=np.float32)
+                for band in red, green, blue:
+                    total += band
+                total /= 3
+                log.debug("Image import as colored. Thresholds are: R = %s , G = %s, B = %s" %
+                          (str(mask[1]), str(mask[2]), str(mask[3])))
 
-        if flip:
-            geos = [translate(scale(g, 1.0, -1.0, origin=(0, 0))) for g in geos]
+            for geom, val in shapes(total, mask=mask_setting):
+                unscaled_geos.append(shape(geom))
+
+            for g in unscaled_geos:
+                geos.append(scale(g, scale_factor, scale_factor, origin=(0, 0)))
+
+            if flip:
+                geos = [translate(scale(g, 1.0, -1.0, origin=(0, 0))) for g in geos]
 
         # Add to object
         if self.solid_geometry is None:
@@ -1476,7 +1505,8 @@ class Geometry(object):
                 raise grace
 
             # provide the app with a way to process the GUI events when in a blocking loop
-            QtWidgets.QApplication.processEvents()
+            if self.gui_events:
+                QtWidgets.QApplication.processEvents()
 
             # Can only result in a Polygon or MultiPolygon
             current = current.buffer(-tooldia * (1 - overlap), int(steps_per_circle))
@@ -1568,7 +1598,8 @@ class Geometry(object):
                 raise grace
 
             # provide the app with a way to process the GUI events when in a blocking loop
-            QtWidgets.QApplication.processEvents()
+            if self.gui_events:
+                QtWidgets.QApplication.processEvents()
 
             path = Point(seedpoint).buffer(radius, int(steps_per_circle)).exterior
             path = path.intersection(path_margin)
@@ -1682,7 +1713,8 @@ class Geometry(object):
                         raise grace
 
                     # provide the app with a way to process the GUI events when in a blocking loop
-                    QtWidgets.QApplication.processEvents()
+                    if self.gui_events:
+                        QtWidgets.QApplication.processEvents()
 
                     line = LineString([(left, y), (right, y)])
                     line = line.intersection(margin_poly)
@@ -1719,7 +1751,8 @@ class Geometry(object):
                         raise grace
 
                     # provide the app with a way to process the GUI events when in a blocking loop
-                    QtWidgets.QApplication.processEvents()
+                    if self.gui_events:
+                        QtWidgets.QApplication.processEvents()
 
                     line = LineString([(x, top), (x, bot)])
                     line = line.intersection(margin_poly)
@@ -1997,90 +2030,18 @@ class Geometry(object):
         # 10 times the tool diameter
         max_walk = max_walk or 10 * tooldia
 
-        # Assuming geolist is a flat list of flat elements
+        paths = [geo for geo in storage.get_objects() if geo is not None]
+        if not paths:
+            log.debug("camlib.Geometry.paint_connect(). Storage empty")
+            return None
 
         # ## Index first and last points in paths
         def get_pts(o):
             return [o.coords[0], o.coords[-1]]
 
-        # storage = FlatCAMRTreeStorage()
-        # storage.get_points = get_pts
-        #
-        # for shape in geolist:
-        #     if shape is not None:
-        #         # Make LlinearRings into linestrings otherwise
-        #         # When chaining the coordinates path is messed up.
-        #         storage.insert(LineString(shape))
-        #         #storage.insert(shape)
-
-        # ## Iterate over geometry paths getting the nearest each time.
-        # optimized_paths = []
         optimized_paths = FlatCAMRTreeStorage()
         optimized_paths.get_points = get_pts
-        path_count = 0
-        current_pt = (0, 0)
-        try:
-            pt, geo = storage.nearest(current_pt)
-        except StopIteration:
-            log.debug("camlib.Geometry.paint_connect(). Storage empty")
-            return None
-
-        storage.remove(geo)
-
-        geo = LineString(geo)
-        current_pt = geo.coords[-1]
-        try:
-            while True:
-                path_count += 1
-                # log.debug("Path %d" % path_count)
-
-                pt, candidate = storage.nearest(current_pt)
-                storage.remove(candidate)
-
-                candidate = LineString(candidate)
-
-                # If last point in geometry is the nearest
-                # then reverse coordinates.
-                # but prefer the first one if last == first
-                if pt != candidate.coords[0] and pt == candidate.coords[-1]:
-                    # in place coordinates update deprecated in Shapely 2.0
-                    # candidate.coords = list(candidate.coords)[::-1]
-                    candidate = LineString(list(candidate.coords)[::-1])
-
-                # Straight line from current_pt to pt.
-                # Is the toolpath inside the geometry?
-                walk_path = LineString([current_pt, pt])
-                walk_cut = walk_path.buffer(tooldia / 2, int(steps_per_circle))
-
-                if walk_cut.within(boundary) and walk_path.length < max_walk:
-                    # log.debug("Walk to path #%d is inside. Joining." % path_count)
-
-                    # Completely inside. Append...
-                    # in place coordinates update deprecated in Shapely 2.0
-                    # geo.coords = list(geo.coords) + list(candidate.coords)
-                    geo = LineString(list(geo.coords) + list(candidate.coords))
-                    # try:
-                    #     last = optimized_paths[-1]
-                    #     last.coords = list(last.coords) + list(geo.coords)
-                    # except IndexError:
-                    #     optimized_paths.append(geo)
-
-                else:
-
-                    # Have to lift tool. End path.
-                    # log.debug("Path #%d not within boundary. Next." % path_count)
-                    # optimized_paths.append(geo)
-                    optimized_paths.insert(geo)
-                    geo = candidate
-
-                current_pt = geo.coords[-1]
-
-                # Next
-                # pt, geo = storage.nearest(current_pt)
-
-        except StopIteration:  # Nothing left in storage.
-            # pass
-            optimized_paths.insert(geo)
+        optimized_paths.insert_many(paint_chain(paths, boundary, tooldia, steps_per_circle, max_walk))
 
         return optimized_paths
 
@@ -2103,101 +2064,13 @@ class Geometry(object):
         def get_pts(o):
             return [o.coords[0], o.coords[-1]]
 
-        #
-        # storage = FlatCAMRTreeStorage()
-        # storage.get_points = get_pts
-        #
-        # for shape in pathlist:
-        #     if shape is not None:
-        #         storage.insert(shape)
+        paths = [geo for geo in storage.get_objects() if geo is not None]
 
-        path_count = 0
-        pt, geo = storage.nearest(origin)
-        storage.remove(geo)
-        # optimized_geometry = [geo]
         optimized_geometry = FlatCAMRTreeStorage()
         optimized_geometry.get_points = get_pts
-        # optimized_geometry.insert(geo)
-        try:
-            while True:
-                path_count += 1
-                _, left = storage.nearest(geo.coords[0])
-
-                # If left touches geo, remove left from original
-                # storage and append to geo.
-                if type(left) == LineString:
-                    if left.coords[0] == geo.coords[0]:
-                        storage.remove(left)
-                        # geo.coords = list(geo.coords)[::-1] + list(left.coords)   # Shapely 2.0
-                        geo = LineString(list(geo.coords)[::-1] + list(left.coords))
-                        continue
-
-                    if left.coords[-1] == geo.coords[0]:
-                        storage.remove(left)
-                        # geo.coords = list(left.coords) + list(geo.coords)  # Shapely 2.0
-                        geo = LineString(list(geo.coords)[::-1] + list(left.coords))
-                        continue
-
-                    if left.coords[0] == geo.coords[-1]:
-                        storage.remove(left)
-                        # geo.coords = list(geo.coords) + list(left.coords) # Shapely 2.0
-                        geo = LineString(list(geo.coords) + list(left.coords))
-                        continue
-
-                    if left.coords[-1] == geo.coords[-1]:
-                        storage.remove(left)
-                        # geo.coords = list(geo.coords) + list(left.coords)[::-1] # Shapely 2.0
-                        geo = LineString(list(geo.coords) + list(left.coords)[::-1])
-                        continue
-
-                _, right = storage.nearest(geo.coords[-1])
-
-                # If right touches geo, remove left from original
-                # storage and append to geo.
-                if type(right) == LineString:
-                    if right.coords[0] == geo.coords[-1]:
-                        storage.remove(right)
-                        # geo.coords = list(geo.coords) + list(right.coords)  # Shapely 2.0
-                        geo = LineString(list(geo.coords) + list(right.coords))
-                        continue
-
-                    if right.coords[-1] == geo.coords[-1]:
-                        storage.remove(right)
-                        # geo.coords = list(geo.coords) + list(right.coords)[::-1]    # Shapely 2.0
-                        geo = LineString(list(geo.coords) + list(right.coords)[::-1])
-                        continue
+        optimized_geometry.insert_many(touch_chain(paths, origin=origin))
 
-                    if right.coords[0] == geo.coords[0]:
-                        storage.remove(right)
-                        # geo.coords = list(geo.coords)[::-1] + list(right.coords)    # Shapely 2.0
-                        geo = LineString(list(geo.coords)[::-1] + list(right.coords))
-                        continue
-
-                    if right.coords[-1] == geo.coords[0]:
-                        storage.remove(right)
-                        # geo.coords = list(left.coords) + list(geo.coords)   # Shapely 2.0
-                        geo = LineString(list(left.coords) + list(geo.coords))
-                        continue
-
-                # right is either a LinearRing or it does not connect
-                # to geo (nothing left to connect to geo), so we continue
-                # with right as geo.
-                storage.remove(right)
-
-                if type(right) == LinearRing:
-                    optimized_geometry.insert(right)
-                else:
-                    # Cannot extend geo any further. Put it away.
-                    optimized_geometry.insert(geo)
-
-                    # Continue with right.
-                    geo = right
-
-        except StopIteration:  # Nothing found in storage.
-            optimized_geometry.insert(geo)
-
-        # print path_count
-        log.debug("path_count = %d" % path_count)
+        log.debug("path_count = %d" % len(paths))
 
         return optimized_geometry
 
@@ -2271,15 +2144,14 @@ class Geometry(object):
         """
         self.solid_geometry = [unary_union(self.solid_geometry)]
 
-    def export_svg(self, scale_stroke_factor=0.00,
-                   scale_factor_x=None, scale_factor_y=None,
-                   skew_factor_x=None, skew_factor_y=None,
-                   skew_reference='center', scale_reference='center',
-                   mirror=None):
+    def export_geometry(self, scale_factor_x=None, scale_factor_y=None,
+                        skew_factor_x=None, skew_factor_y=None,
+                        skew_reference='center', scale_reference='center',
+                        mirror=None):
         """
-        Exports the Geometry Object as a SVG Element
+        The geometry of the Geometry Object as it is exported (SVG, film): joined, scaled, skewed and mirrored
 
-        :return: SVG Element
+        :return: Shapely geometry
         """
 
         # Make sure we see a Shapely Geometry class and not a list
@@ -2330,6 +2202,23 @@ class Geometry(object):
             if mirror == 'both':
                 geom = affinity.scale(geom_svg, -1.0, -1.0)
 
+        return geom
+
+    def export_svg(self, scale_stroke_factor=0.00,
+                   scale_factor_x=None, scale_factor_y=None,
+                   skew_factor_x=None, skew_factor_y=None,
+                   skew_reference='center', scale_reference='center',
+                   mirror=None):
+        """
+        Exports the Geometry Object as a SVG Element
+
+        :return: SVG Element
+        """
+        geom = self.export_geometry(scale_factor_x=scale_factor_x, scale_factor_y=scale_factor_y,
+                                    skew_factor_x=skew_factor_x, skew_factor_y=skew_factor_y,
+                                    skew_reference=skew_reference, scale_reference=scale_reference,
+                                    mirror=mirror)
+
         # scale_factor is a multiplication factor for the SVG stroke-width used within shapely's svg export
         # If 0 or less which is invalid then default to 0.01
         # This value appears to work for zooming, and getting the output svg line width
@@ -2342,6 +2231,69 @@ class Geometry(object):
         svg_elem = geom.svg(scale_factor=scale_stroke_factor)
         return svg_elem
 
+    def affine_targets(self):
+        """
+        Where the geometry changed by mirror(), rotate() and skew() is.
+
+        :return:    list of (container, key), see appCommon.GeometryTransform.transform_targets()
+        """
+        if self.multigeo is True:
+            return [(self.tools[tool], 'solid_geometry') for tool in self.tools]
+        return [(self, 'solid_geometry')]
+
+    def transform_geometry(self, matrix, targets):
+        """
+        Applies an affine transformation to the geometry of the targets; inside deferred_transforms() it is only
+        recorded.
+
+        :param matrix:  3x3 matrix, see appCommon.GeometryTransform
+        :param targets: list of (container, key) with the geometry to be transformed
+        :return:        None
+        """
+        if self._pending_transforms is not None:
+            self._pending_transforms.append((matrix, targets))
+            return
+        self.apply_affine(matrix, targets)
+
+    def apply_affine(self, matrix, targets):
+        """
+        Transforms the geometry of the targets, all at once.
+
+        :param matrix:  3x3 matrix
+        :param targets: list of (container, key) with the geometry to be transformed
+        :return:        None
+        """
+        self.old_disp_number = 0
+
+        def progress(disp_number):
+            if self.old_disp_number < disp_number <= 100:
+                self.app.proc_container.update_view_text(' %d%%' % disp_number)
+                self.old_disp_number = disp_number
+
+        transform_targets(targets, matrix, progress=progress)
+
+    @contextmanager
+    def deferred_transforms(self):
+        """
+        The transformations made inside the block are applied when the block ends; the consecutive transformations of
+        the same geometry are composed and applied once.
+
+        The geometry must not be used inside the block.
+        """
+        if self._pending_transforms is not None:
+            # already inside a block
+            yield self
+            return
+
+        self._pending_transforms = []
+        try:
+            yield self
+        finally:
+            pending = self._pending_transforms
+            self._pending_transforms = None
+            for matrix, targets in compose(pending):
+                self.apply_affine(matrix, targets)
+
     def mirror(self, axis, point):
         """
         Mirrors the object around a specified axis passign through
@@ -2355,56 +2307,12 @@ class Geometry(object):
         """
         log.debug("camlib.Geometry.mirror()")
 
-        px, py = point
-        xscale, yscale = {"X": (1.0, -1.0), "Y": (-1.0, 1.0)}[axis]
-
-        def mirror_geom(obj):
-            if type(obj) is list:
-                new_obj = []
-                for g in obj:
-                    new_obj.append(mirror_geom(g))
-                return new_obj
-            else:
-                try:
-                    self.el_count += 1
-                    disp_number = int(np.interp(self.el_count, [0, self.geo_len], [0, 100]))
-                    if self.old_disp_number < disp_number <= 100:
-                        self.app.proc_container.update_view_text(' %d%%' % disp_number)
-                        self.old_disp_number = disp_number
-
-                    return affinity.scale(obj, xscale, yscale, origin=(px, py))
-                except AttributeError:
-                    return obj
-
         try:
-            if self.multigeo is True:
-                for tool in self.tools:
-                    # variables to display the percentage of work done
-                    self.geo_len = 0
-                    try:
-                        self.geo_len = len(self.tools[tool]['solid_geometry'])
-                    except TypeError:
-                        self.geo_len = 1
-                    self.old_disp_number = 0
-                    self.el_count = 0
-
-                    self.tools[tool]['solid_geometry'] = mirror_geom(self.tools[tool]['solid_geometry'])
-            else:
-                # variables to display the percentage of work done
-                self.geo_len = 0
-                try:
-                    self.geo_len = len(self.solid_geometry)
-                except TypeError:
-                    self.geo_len = 1
-                self.old_disp_number = 0
-                self.el_count = 0
-
-                self.solid_geometry = mirror_geom(self.solid_geometry)
+            self.transform_geometry(mirror_matrix(axis, point), self.affine_targets())
             self.app.inform.emit('[success] %s...' % _('Object was mirrored'))
         except AttributeError:
             self.app.inform.emit('[ERROR_NOTCL] %s %s' % (_("Failed."), _("No object is selected.")))
 
-
         self.app.proc_container.new_text = ''
 
     def rotate(self, angle, point):
@@ -2416,58 +2324,14 @@ class Geometry(object):
         counter-clockwise and negative are clockwise rotations.
 
         :param point:
-        The point of origin can be a keyword 'center' for the bounding box
-        center (default), 'centroid' for the geometry's centroid, a Point object
-        or a coordinate tuple (x0, y0).
+        The point of origin, a coordinate tuple (x0, y0).
 
         See shapely manual for more information: http://toblerity.org/shapely/manual.html#affine-transformations
         """
         log.debug("camlib.Geometry.rotate()")
 
-        px, py = point
-
-        def rotate_geom(obj):
-            try:
-                new_obj = []
-                for g in obj:
-                    new_obj.append(rotate_geom(g))
-                return new_obj
-            except TypeError:
-                try:
-                    self.el_count += 1
-                    disp_number = int(np.interp(self.el_count, [0, self.geo_len], [0, 100]))
-                    if self.old_disp_number < disp_number <= 100:
-                        self.app.proc_container.update_view_text(' %d%%' % disp_number)
-                        self.old_disp_number = disp_number
-
-                    return affinity.rotate(obj, angle, origin=(px, py))
-                except AttributeError:
-                    return obj
-
         try:
-            if self.multigeo is True:
-                for tool in self.tools:
-                    # variables to display the percentage of work done
-                    self.geo_len = 0
-                    try:
-                        self.geo_len = len(self.tools[tool]['solid_geometry'])
-                    except TypeError:
-                        self.geo_len = 1
-                    self.old_disp_number = 0
-                    self.el_count = 0
-
-                    self.tools[tool]['solid_geometry'] = rotate_geom(self.tools[tool]['solid_geometry'])
-            else:
-                # variables to display the percentage of work done
-                self.geo_len = 0
-                try:
-                    self.geo_len = len(self.solid_geometry)
-                except TypeError:
-                    self.geo_len = 1
-                self.old_disp_number = 0
-                self.el_count = 0
-
-                self.solid_geometry = rotate_geom(self.solid_geometry)
+            self.transform_geometry(rotate_matrix(angle, point), self.affine_targets())
             self.app.inform.emit('[success] %s...' % _('Object was rotated'))
         except AttributeError:
             self.app.inform.emit('[ERROR_NOTCL] %s %s' % (_("Failed."), _("No object is selected.")))
@@ -2481,9 +2345,7 @@ class Geometry(object):
         :param angle_x:
         :param angle_y:
         angle_x, angle_y : float, float
-            The shear angle(s) for the x and y axes respectively. These can be
-            specified in either degrees (default) or radians by setting
-            use_radians=True.
+            The shear angle(s) for the x and y axes respectively, in degrees.
 
         :param point:   Origin point for Skew
         point: tuple of coordinates (x,y)
@@ -2492,63 +2354,14 @@ class Geometry(object):
         """
         log.debug("camlib.Geometry.skew()")
 
-        px, py = point
-
-        def skew_geom(obj):
-            try:
-                new_obj = []
-                for g in obj:
-                    new_obj.append(skew_geom(g))
-                return new_obj
-            except TypeError:
-                try:
-                    self.el_count += 1
-                    disp_number = int(np.interp(self.el_count, [0, self.geo_len], [0, 100]))
-                    if self.old_disp_number < disp_number <= 100:
-                        self.app.proc_container.update_view_text(' %d%%' % disp_number)
-                        self.old_disp_number = disp_number
-
-                    return affinity.skew(obj, angle_x, angle_y, origin=(px, py))
-                except AttributeError:
-                    return obj
-
         try:
-            if self.multigeo is True:
-                for tool in self.tools:
-                    # variables to display the percentage of work done
-                    self.geo_len = 0
-                    try:
-                        self.geo_len = len(self.tools[tool]['solid_geometry'])
-                    except TypeError:
-                        self.geo_len = 1
-                    self.old_disp_number = 0
-                    self.el_count = 0
-
-                    self.tools[tool]['solid_geometry'] = skew_geom(self.tools[tool]['solid_geometry'])
-            else:
-                # variables to display the percentage of work done
-                self.geo_len = 0
-                try:
-                    self.geo_len = len(self.solid_geometry)
-                except TypeError:
-                    self.geo_len = 1
-                self.old_disp_number = 0
-                self.el_count = 0
-
-                self.solid_geometry = skew_geom(self.solid_geometry)
+            self.transform_geometry(skew_matrix(angle_x, angle_y, point), self.affine_targets())
             self.app.inform.emit('[success] %s...' % _('Object was skewed'))
         except AttributeError:
             self.app.inform.emit('[ERROR_NOTCL] %s %s' % (_("Failed."), _("No object is selected.")))
 
         self.app.proc_container.new_text = ''
 
-        # if type(self.solid_geometry) == list:
-        #     self.solid_geometry = [affinity.skew(g, angle_x, angle_y, origin=(px, py))
-        #                            for g in self.solid_geometry]
-        # else:
-        #     self.solid_geometry = affinity.skew(self.solid_geometry, angle_x, angle_y,
-        #                                         origin=(px, py))
-
     def buffer(self, distance, join, factor):
         """
 
@@ -2731,6 +2544,9 @@ class CNCjob(Geometry):
 
         self.pp_solderpaste_name = None
 
+        # templates compiled from the preprocessor methods; see doformat_xy()
+        self.pp_templates = PreprocessorTemplates(app_log=self.app.log)
+
         # Controls if the move from Z_Toolchange to Z_Move is done fast with G0 or normally with G1
         self.f_plunge = None
 
@@ -2822,6 +2638,31 @@ class CNCjob(Geometry):
     def doformat(self, fun, **kwargs):
         return self.doformat2(fun, **kwargs) + "\n"
 
+    def doformat_xy(self, fun, x, y, **kwargs):
+        """
+        Same as doformat() for the preprocessor methods that make a move to a (x, y) position. The preprocessor method
+        is compiled in a template (see appCommon.GCodeWriter) that is reused while the other attributes don't change.
+
+        :param fun:     One of the preprocessor methods: rapid_code, linear_code, lift_code, down_code, up_to_zero_code
+        :param x:       X coordinate
+        :param y:       Y coordinate
+        :param kwargs:  keyword args which will update attributes of the current class
+        :return:        Gcode line
+        :rtype:         str
+        """
+        return self.pp_templates.renderer(fun, self.postdata, kwargs)(x, y)
+
+    def xy_formatter(self, fun, **kwargs):
+        """
+        To be used in loops where only the coordinates change.
+
+        :param fun:     One of the preprocessor methods: rapid_code, linear_code, lift_code, down_code, up_to_zero_code
+        :param kwargs:  keyword args which will update attributes of the current class
+        :return:        a function that takes the (x, y) coordinates and returns the Gcode line
+        :rtype:         function
+        """
+        return self.pp_templates.renderer(fun, self.postdata, kwargs)
+
     def doformat2(self, fun, **kwargs):
         """
         This method will call one of the current preprocessor methods having as parameters all the attributes of
@@ -2921,6 +2762,9 @@ class CNCjob(Geometry):
             log.warning('OR-tools metaheuristics - Specify an instance greater than 0.')
             return optimized_path
 
+        from ortools.constraint_solver import pywrapcp
+        from ortools.constraint_solver import routing_enums_pb2
+
         manager = pywrapcp.RoutingIndexManager(tsp_size, num_routes, depot)
         routing = pywrapcp.RoutingModel(manager)
         search_parameters = pywrapcp.DefaultRoutingSearchParameters()
@@ -2986,6 +2830,8 @@ class CNCjob(Geometry):
             log.warning('Specify an instance greater than 0.')
             return optimized_path
 
+        from ortools.constraint_solver import pywrapcp
+
         manager = pywrapcp.RoutingIndexManager(tsp_size, num_routes, depot)
         routing = pywrapcp.RoutingModel(manager)
         search_parameters = pywrapcp.DefaultRoutingSearchParameters()
@@ -3024,6 +2870,34 @@ class CNCjob(Geometry):
         return optimized_path
         # ############################################# ##
 
+    def optimized_kdtree(self, locations, start=None, opt_time=0):
+        """
+        Nearest neighbour walk on a KD-tree followed by a 2-opt/Or-opt improvement limited in time.
+        Runs in O(N log N) for the walk so it can be used for drill jobs with tens of thousands of holes.
+
+        :param locations:   List of tuples with x, y coordinates
+        :type locations:    list
+        :param start:       a tuple with a x,y coordinates of the start point (the current position of the tool)
+        :type start:        tuple
+        :param opt_time:    the maximum time (seconds) used to improve the path found by the nearest neighbour walk
+        :type opt_time:     float
+        :return:            List of indexes in the locations list, in the optimized order
+        :rtype:             list
+        """
+        if not locations:
+            log.warning('KD-Tree optimization - Specify an instance greater than 0.')
+            return []
+
+        if self.app.abort_flag:
+            # graceful abort requested by the user
+            raise grace
+
+        if float(opt_time) == 0:
+            opt_time = 3
+        # the initial order improved in the given time: a nearest neighbour walk or the order on a Hilbert curve
+        initial = self.app.defaults["excellon_kdtree_initial"]
+        return order_drills(locations, start=start, time_limit=float(opt_time), initial=initial)
+
     def optimized_travelling_salesman(self, points, start=None):
         """
         As solving the problem in the brute force way is too slow,
@@ -3130,7 +3004,7 @@ class CNCjob(Geometry):
         log.debug("Creating CNC Job from Excellon for tool: %s" % str(tool))
 
         self.exc_tools = deepcopy(tools)
-        t_gcode = ''
+        t_gcode = []
 
         # holds the temporary coordinates of the processed drill point
         locx, locy = first_pt
@@ -3147,6 +3021,8 @@ class CNCjob(Geometry):
             log.debug("Using OR-Tools Basic drill path optimization.")
         elif opt_type == 'T':
             log.debug("Using Travelling Salesman drill path optimization.")
+        elif opt_type == 'K':
+            log.debug("Using KD-Tree drill path optimization.")
         else:
             log.debug("Using no path optimization.")
 
@@ -3277,6 +3153,13 @@ class CNCjob(Geometry):
             if not locations:
                 return 'fail'
             optimized_path = self.optimized_travelling_salesman(locations)
+        elif opt_type == 'K':
+            locations = self.create_tool_data_array(points=points)
+            # if there are no locations then go to the next tool
+            if not locations:
+                return 'fail'
+            opt_time = self.app.defaults["excellon_search_time"]
+            optimized_path = self.optimized_kdtree(locations=locations, start=first_pt, opt_time=opt_time)
         else:
             # it's actually not optimized path but here we build a list of (x,y) coordinates
             # out of the tool's drills
@@ -3304,15 +3187,15 @@ class CNCjob(Geometry):
             # t_gcode += start_gcode
 
         # do the ToolChange event
-        t_gcode += self.doformat(p.z_feedrate_code)
-        t_gcode += self.doformat(p.toolchange_code, toolchangexy=(temp_locx, temp_locy))
-        t_gcode += self.doformat(p.z_feedrate_code)
+        t_gcode.append(self.doformat(p.z_feedrate_code))
+        t_gcode.append(self.doformat(p.toolchange_code, toolchangexy=(temp_locx, temp_locy)))
+        t_gcode.append(self.doformat(p.z_feedrate_code))
 
         # Spindle start
-        t_gcode += self.doformat(p.spindle_code)
+        t_gcode.append(self.doformat(p.spindle_code))
         # Dwell time
         if self.dwell is True:
-            t_gcode += self.doformat(p.dwell_code)
+            t_gcode.append(self.doformat(p.dwell_code))
 
         current_tooldia = self.app.dec_format(float(tools[tool]["tooldia"]), self.decimals)
         self.app.inform.emit(
@@ -3362,26 +3245,26 @@ class CNCjob(Geometry):
 
                     if travel[0] is not None:
                         # move to next point
-                        t_gcode += self.doformat(p.rapid_code, x=locx, y=locy)
+                        t_gcode.append(self.doformat_xy(p.rapid_code, locx, locy))
 
                         # raise to safe Z (travel[0]) each time because safe Z may be different
                         self.z_move = travel[0]
-                        t_gcode += self.doformat(p.lift_code, x=locx, y=locy)
+                        t_gcode.append(self.doformat_xy(p.lift_code, locx, locy))
 
                         # restore z_move
                         self.z_move = tool_dict['tools_drill_travelz']
                     else:
                         if prev_z is not None:
                             # move to next point
-                            t_gcode += self.doformat(p.rapid_code, x=locx, y=locy)
+                            t_gcode.append(self.doformat_xy(p.rapid_code, locx, locy))
 
                             # we assume that previously the z_move was altered therefore raise to
                             # the travel_z (z_move)
                             self.z_move = tool_dict['tools_drill_travelz']
-                            t_gcode += self.doformat(p.lift_code, x=locx, y=locy)
+                            t_gcode.append(self.doformat_xy(p.lift_code, locx, locy))
                         else:
                             # move to next point
-                            t_gcode += self.doformat(p.rapid_code, x=locx, y=locy)
+                            t_gcode.append(self.doformat_xy(p.rapid_code, locx, locy))
 
                     # store prev_z
                     prev_z = travel[0]
@@ -3398,33 +3281,33 @@ class CNCjob(Geometry):
                         if abs(doc) < abs(self.z_cut) < (abs(doc) + self.z_depthpercut):
                             self.z_cut = doc
                         # Move down the drill bit
-                        t_gcode += self.doformat(p.down_code, x=locx, y=locy)
+                        t_gcode.append(self.doformat_xy(p.down_code, locx, locy))
 
                         # Update the distance travelled down with the current one
                         self.measured_down_distance += abs(self.z_cut) + abs(self.z_move)
 
                         if self.f_retract is False:
-                            t_gcode += self.doformat(p.up_to_zero_code, x=locx, y=locy)
+                            t_gcode.append(self.doformat_xy(p.up_to_zero_code, locx, locy))
                             self.measured_up_to_zero_distance += abs(self.z_cut)
                             self.measured_lift_distance += abs(self.z_move)
                         else:
                             self.measured_lift_distance += abs(self.z_cut) + abs(self.z_move)
 
-                        t_gcode += self.doformat(p.lift_code, x=locx, y=locy)
+                        t_gcode.append(self.doformat_xy(p.lift_code, locx, locy))
 
                 else:
-                    t_gcode += self.doformat(p.down_code, x=locx, y=locy)
+                    t_gcode.append(self.doformat_xy(p.down_code, locx, locy))
 
                     self.measured_down_distance += abs(self.z_cut) + abs(self.z_move)
 
                     if self.f_retract is False:
-                        t_gcode += self.doformat(p.up_to_zero_code, x=locx, y=locy)
+                        t_gcode.append(self.doformat_xy(p.up_to_zero_code, locx, locy))
                         self.measured_up_to_zero_distance += abs(self.z_cut)
                         self.measured_lift_distance += abs(self.z_move)
                     else:
                         self.measured_lift_distance += abs(self.z_cut) + abs(self.z_move)
 
-                    t_gcode += self.doformat(p.lift_code, x=locx, y=locy)
+                    t_gcode.append(self.doformat_xy(p.lift_code, locx, locy))
 
                 self.measured_distance += abs(distance_euclidian(locx, locy, temp_locx, temp_locy))
                 temp_locx = locx
@@ -3445,12 +3328,12 @@ class CNCjob(Geometry):
         self.z_cut = deepcopy(old_zcut)
 
         if is_last:
-            t_gcode += self.doformat(p.spindle_stop_code)
+            t_gcode.append(self.doformat(p.spindle_stop_code))
             # Move to End position
-            t_gcode += self.doformat(p.end_code, x=0, y=0)
+            t_gcode.append(self.doformat(p.end_code, x=0, y=0))
 
         self.app.inform.emit('%s %s' % (_("Finished G-Code generation for tool:"), str(tool)))
-        return t_gcode, (locx, locy), start_gcode
+        return ''.join(t_gcode), (locx, locy), start_gcode
 
     # used in Geometry (and soon in Tool Milling)
     def geometry_tool_gcode_gen(self, tool, tools, first_pt, tolerance, is_first=False, is_last=False,
@@ -4087,7 +3970,8 @@ class CNCjob(Geometry):
         if current_platform == '64bit':
             used_excellon_optimization_type = self.excellon_optimization_type
         else:
-            used_excellon_optimization_type = 'T'
+            # the OR-Tools based optimizations are not available in 32bit mode
+            used_excellon_optimization_type = 'K' if self.excellon_optimization_type == 'K' else 'T'
 
         # #############################################################################################################
         # #############################################################################################################
@@ -4100,6 +3984,8 @@ class CNCjob(Geometry):
             log.debug("Using OR-Tools Basic drill path optimization.")
         elif used_excellon_optimization_type == 'T':
             log.debug("Using Travelling Salesman drill path optimization.")
+        elif used_excellon_optimization_type == 'K':
+            log.debug("Using KD-Tree drill path optimization.")
         else:
             log.debug("Using no path optimization.")
 
@@ -4178,6 +4064,15 @@ class CNCjob(Geometry):
                     for point in points[tool]:
                         altPoints.append((point.coords.xy[0][0], point.coords.xy[1][0]))
                     optimized_path = self.optimized_travelling_salesman(altPoints)
+                elif used_excellon_optimization_type == 'K':
+                    if tool in points:
+                        locations = self.create_tool_data_array(points=points[tool])
+                    # if there are no locations then go to the next tool
+                    if not locations:
+                        continue
+                    opt_time = self.app.defaults["excellon_search_time"]
+                    optimized_path = self.optimized_kdtree(locations=locations, start=(self.oldx, self.oldy),
+                                                           opt_time=opt_time)
                 else:
                     # it's actually not optimized path but here we build a list of (x,y) coordinates
                     # out of the tool's drills
@@ -4414,6 +4309,15 @@ class CNCjob(Geometry):
                 for point in all_points:
                     altPoints.append((point.coords.xy[0][0], point.coords.xy[1][0]))
                 optimized_path = self.optimized_travelling_salesman(altPoints)
+            elif used_excellon_optimization_type == 'K':
+                if all_points:
+                    locations = self.create_tool_data_array(points=all_points)
+                # if there are no locations then go to the next tool
+                if not locations:
+                    return 'fail'
+                opt_time = self.app.defaults["excellon_search_time"]
+                optimized_path = self.optimized_kdtree(locations=locations, start=(self.oldx, self.oldy),
+                                                       opt_time=opt_time)
             else:
                 # it's actually not optimized path but here we build a list of (x,y) coordinates
                 # out of the tool's drills
@@ -4574,6 +4478,8 @@ class CNCjob(Geometry):
             log.debug("The total travel distance with OR-TOOLS Basic Algorithm is: %s" % str(measured_distance))
         elif used_excellon_optimization_type == 'T':
             log.debug("The total travel distance with Travelling Salesman Algorithm is: %s" % str(measured_distance))
+        elif used_excellon_optimization_type == 'K':
+            log.debug("The total travel distance with KD-Tree Algorithm is: %s" % str(measured_distance))
         else:
             log.debug("The total travel distance with with no optimization is: %s" % str(measured_distance))
 
@@ -6347,6 +6253,22 @@ class CNCjob(Geometry):
                 match = re.search(r'^\s*([A-Z])\s*([\+\-\.\d\s]+)', gline)
         return command
 
+    def array_parser_supported(self):
+        """
+        The array based parser (appParsers.ParseGCode) reads the G, X, Y, Z codes. The G-code made by the Roland,
+        HPGL, ISEL ICP, laser and solder paste preprocessors is parsed line by line with codes_split().
+
+        :return:    True if the G-code of this job can be parsed with the array based parser
+        :rtype:     bool
+        """
+        names = [self.pp_excellon_name or '', self.pp_geometry_name or '']
+        for name in names:
+            if 'Roland' in name or 'hpgl' in name or 'ICP' in name or 'laser' in name.lower():
+                return False
+        if self.pp_solderpaste_name is not None:
+            return False
+        return True
+
     def gcode_parse(self, force_parsing=None):
         """
         G-Code parser (from self.gcode). Generates dictionary with
@@ -6398,6 +6320,33 @@ class CNCjob(Geometry):
                     if len(pos_xy) != 2:
                         pos_xy = (0, 0)
 
+        if self.array_parser_supported():
+            if (force_parsing is False or force_parsing is None) and is_gerber_like(self.gcode):
+                return "fail"
+
+            self.app.inform.emit('%s: %d' % (_("Parsing GCode file. Number of lines"), self.gcode.count('\n') + 1))
+
+            hole_dias = None
+            if self.origin_kind == 'excellon':
+                hole_dias = {}
+                for tool_dict in self.exc_tools.values():
+                    for drill_pt in tool_dict.get('drills', []):
+                        point_in_dict_coords = (
+                            float('%.*f' % (self.decimals, drill_pt.x)),
+                            float('%.*f' % (self.decimals, drill_pt.y))
+                        )
+                        # the first tool that has a drill in this position gives the hole diameter
+                        hole_dias.setdefault(point_in_dict_coords, tool_dict['tooldia'])
+
+            geometry = parse_gcode(self.gcode, start_xy=pos_xy, steps_per_circle=self.steps_per_circle,
+                                   decimals=self.decimals, hole_dias=hole_dias)
+            if geometry.units is not None:
+                self.units = geometry.units
+
+            self.app.inform.emit('%s...' % _("Creating Geometry from the parsed GCode file. "))
+            self.gcode_parsed = geometry
+            return geometry
+
         path = [pos_xy]
         # path = [(0, 0)]
 
@@ -6566,6 +6515,24 @@ class CNCjob(Geometry):
         # lifted or lowered.
         pos_xy = start_pt
 
+        if self.array_parser_supported():
+            if (force_parsing is False or force_parsing is None) and is_gerber_like(gcode):
+                return "fail"
+
+            self.app.inform.emit(
+                '%s: %s. %s: %d' % (_("Parsing GCode file for tool diameter"),
+                                    str(dia), _("Number of lines"),
+                                    gcode.count('\n') + 1)
+            )
+            geometry = parse_gcode(gcode, start_xy=pos_xy, steps_per_circle=self.steps_per_circle,
+                                   decimals=self.decimals, hole_dia=dia)
+            if geometry.units is not None:
+                self.units = geometry.units
+
+            self.app.inform.emit('%s: %s' % (_("Creating Geometry from the parsed GCode file for tool diameter"),
+                                             str(dia)))
+            return geometry
+
         path = [pos_xy]
         # path = [(0, 0)]
 
@@ -6752,6 +6719,11 @@ class CNCjob(Geometry):
         if isinstance(tooldia, list):
             tooldia = tooldia[0] if tooldia[0] is not None else self.tooldia
 
+        # the G-code parsed in arrays is plotted without making the list of dictionaries
+        if isinstance(gcode_parsed, ParsedGCode) and not gcode_parsed.materialized:
+            return self.plot_parsed_arrays(gcode_parsed, tooldia=tooldia, color=color, tool_tolerance=tool_tolerance,
+                                           obj=obj, visible=visible, kind=kind)
+
         if tooldia == 0:
             for geo in gcode_parsed:
                 if kind == 'all':
@@ -6828,6 +6800,62 @@ class CNCjob(Geometry):
                 self.app.inform.emit('[ERROR_NOTCL] %s...' % _('G91 coordinates not implemented'))
                 return 'fail'
 
+    def plot_parsed_arrays(self, parsed, tooldia, color, tool_tolerance, obj, visible, kind):
+        """
+        Same as plot2() for the G-code parsed by appParsers.ParseGCode. The shapes are made from the arrays of the
+        parsed G-code, all at once. For a zero tool diameter all the lines of a kind are added as a single shape.
+
+        :param parsed:          ParsedGCode
+        :param tooldia:         Tool diameter
+        :param color:           dict with the travel ('T') and cut ('C') colors
+        :param tool_tolerance:  Tolerance when drawing the toolshape
+        :param obj:             The object for which to plot
+        :param visible:         Visibility status
+        :param kind:            Can be: "travel", "cut", "all"
+        :return:                None or 'fail'
+        """
+        kinds = {'all': ('T', 'C'), 'travel': ('T', ), 'cut': ('C', )}[kind]
+
+        if tooldia == 0:
+            for k in kinds:
+                if self.app.is_legacy is False:
+                    lines = parsed.lines(k)
+                    if lines is not None:
+                        obj.add_shape(shape=lines, color=color[k][1], visible=visible)
+                else:
+                    lines = parsed.geometries(k)
+                    if lines:
+                        obj.add_shape(shape=lines, color=color[k][1], visible=visible)
+            return
+
+        self.coordinates_type = self.app.defaults["cncjob_coords_type"]
+        if self.coordinates_type != "G90":
+            self.app.inform.emit('[ERROR_NOTCL] %s...' % _('G91 coordinates not implemented'))
+            return 'fail'
+
+        # For Absolute coordinates type G90
+        if tooldia not in obj.annotations_dict:
+            obj.annotations_dict[tooldia] = {
+                'pos': [],
+                'text': []
+            }
+        annotations = obj.annotations_dict[tooldia]
+        known_positions = set(annotations['pos'])
+        path_num = 0
+        for start_end in parsed.annotation_points():
+            for position in start_end:
+                if position not in known_positions:
+                    path_num += 1
+                    known_positions.add(position)
+                    annotations['pos'].append(position)
+                    annotations['text'].append(str(path_num))
+
+        polygons = parsed.polygons(tooldia, resolution=self.steps_per_circle, tolerance=tool_tolerance,
+                                   excellon=self.origin_kind == 'excellon', kind=None if kind == 'all' else kinds[0])
+        for poly, letter in polygons:
+            obj.add_shape(shape=poly, color=color[letter][1], face_color=color[letter][0],
+                          visible=visible, layer=1 if letter == 'C' else 2)
+
     def plot_annotations(self, obj, visible=True):
         """
         Plot annotations.
@@ -6903,7 +6931,10 @@ class CNCjob(Geometry):
         # self.solid_geometry = unary_union([geo['geom'] for geo in self.gcode_parsed])
 
         # This is much faster but not so nice to look at as you can see different segments of the geometry
-        self.solid_geometry = [geo['geom'] for geo in self.gcode_parsed]
+        if isinstance(self.gcode_parsed, ParsedGCode):
+            self.solid_geometry = self.gcode_parsed.geometries()
+        else:
+            self.solid_geometry = [geo['geom'] for geo in self.gcode_parsed]
 
         return self.solid_geometry
 
@@ -7017,7 +7048,7 @@ class CNCjob(Geometry):
         else:
             target_linear = linear
 
-        gcode = ""
+        gcode = []
 
         # path = list(target_linear.coords)
         path = self.segment(target_linear.coords)
@@ -7047,26 +7078,26 @@ class CNCjob(Geometry):
 
                 if travel[0] is not None:
                     # move to next point
-                    gcode += self.doformat(p.rapid_code, x=locx, y=locy)
+                    gcode.append(self.doformat_xy(p.rapid_code, locx, locy))
 
                     # raise to safe Z (travel[0]) each time because safe Z may be different
                     self.z_move = travel[0]
-                    gcode += self.doformat(p.lift_code, x=locx, y=locy)
+                    gcode.append(self.doformat_xy(p.lift_code, locx, locy))
 
                     # restore z_move
                     self.z_move = z_move
                 else:
                     if prev_z is not None:
                         # move to next point
-                        gcode += self.doformat(p.rapid_code, x=locx, y=locy)
+                        gcode.append(self.doformat_xy(p.rapid_code, locx, locy))
 
                         # we assume that previously the z_move was altered therefore raise to
                         # the travel_z (z_move)
                         self.z_move = z_move
-                        gcode += self.doformat(p.lift_code, x=locx, y=locy)
+                        gcode.append(self.doformat_xy(p.lift_code, locx, locy))
                     else:
                         # move to next point
-                        gcode += self.doformat(p.rapid_code, x=locx, y=locy)
+                        gcode.append(self.doformat_xy(p.rapid_code, locx, locy))
 
                 # store prev_z
                 prev_z = travel[0]
@@ -7076,12 +7107,14 @@ class CNCjob(Geometry):
         # Move down to cutting depth
         if down:
             # Different feedrate for vertical cut?
-            gcode += self.doformat(p.z_feedrate_code)
+            gcode.append(self.doformat(p.z_feedrate_code))
             # gcode += self.doformat(p.feedrate_code)
-            gcode += self.doformat(p.down_code, x=first_x, y=first_y, z_cut=z_cut)
-            gcode += self.doformat(p.feedrate_code, feedrate=feedrate)
+            gcode.append(self.doformat_xy(p.down_code, first_x, first_y, z_cut=z_cut))
+            gcode.append(self.doformat(p.feedrate_code, feedrate=feedrate))
 
         # Cutting...
+        # the preprocessor linear move is compiled once for all the points of the path
+        linear_code = self.xy_formatter(p.linear_code, z=z_cut)
         prev_x = first_x
         prev_y = first_y
         for pt in path[1:]:
@@ -7101,14 +7134,14 @@ class CNCjob(Geometry):
                 next_x = pt[0]
                 next_y = pt[1]
 
-            gcode += self.doformat(p.linear_code, x=next_x, y=next_y, z=z_cut)  # Linear motion to point
+            gcode.append(linear_code(next_x, next_y))  # Linear motion to point
             prev_x = pt[0]
             prev_y = pt[1]
 
         # Up to travelling height.
         if up:
-            gcode += self.doformat(p.lift_code, x=prev_x, y=prev_y, z_move=z_move)  # Stop cutting
-        return gcode
+            gcode.append(self.doformat_xy(p.lift_code, prev_x, prev_y, z_move=z_move))  # Stop cutting
+        return ''.join(gcode)
 
     def linear2gcode_extra(self, linear, dia, extracut_length, tolerance=0, down=True, up=True,
                            z_cut=None, z_move=None, zdownrate=None,
@@ -7163,7 +7196,7 @@ class CNCjob(Geometry):
         else:
             target_linear = linear
 
-        gcode = ""
+        gcode = []
 
         path = list(target_linear.coords)
         p = self.pp_geometry
@@ -7191,26 +7224,26 @@ class CNCjob(Geometry):
 
                 if travel[0] is not None:
                     # move to next point
-                    gcode += self.doformat(p.rapid_code, x=locx, y=locy)
+                    gcode.append(self.doformat_xy(p.rapid_code, locx, locy))
 
                     # raise to safe Z (travel[0]) each time because safe Z may be different
                     self.z_move = travel[0]
-                    gcode += self.doformat(p.lift_code, x=locx, y=locy)
+                    gcode.append(self.doformat_xy(p.lift_code, locx, locy))
 
                     # restore z_move
                     self.z_move = z_move
                 else:
                     if prev_z is not None:
                         # move to next point
-                        gcode += self.doformat(p.rapid_code, x=locx, y=locy)
+                        gcode.append(self.doformat_xy(p.rapid_code, locx, locy))
 
                         # we assume that previously the z_move was altered therefore raise to
                         # the travel_z (z_move)
                         self.z_move = z_move
-                        gcode += self.doformat(p.lift_code, x=locx, y=locy)
+                        gcode.append(self.doformat_xy(p.lift_code, locx, locy))
                     else:
                         # move to next point
-                        gcode += self.doformat(p.rapid_code, x=locx, y=locy)
+                        gcode.append(self.doformat_xy(p.rapid_code, locx, locy))
 
                 # store prev_z
                 prev_z = travel[0]
@@ -7221,14 +7254,16 @@ class CNCjob(Geometry):
         if down:
             # Different feedrate for vertical cut?
             if self.z_feedrate is not None:
-                gcode += self.doformat(p.z_feedrate_code)
+                gcode.append(self.doformat(p.z_feedrate_code))
                 # gcode += self.doformat(p.feedrate_code)
-                gcode += self.doformat(p.down_code, x=first_x, y=first_y, z_cut=z_cut)
-                gcode += self.doformat(p.feedrate_code, feedrate=feedrate)
+                gcode.append(self.doformat_xy(p.down_code, first_x, first_y, z_cut=z_cut))
+                gcode.append(self.doformat(p.feedrate_code, feedrate=feedrate))
             else:
-                gcode += self.doformat(p.down_code, x=first_x, y=first_y, z_cut=z_cut)  # Start cutting
+                gcode.append(self.doformat_xy(p.down_code, first_x, first_y, z_cut=z_cut))  # Start cutting
 
         # Cutting...
+        # the preprocessor linear move is compiled once for all the points of the path
+        linear_code = self.xy_formatter(p.linear_code, z=z_cut)
         prev_x = first_x
         prev_y = first_y
         for pt in path[1:]:
@@ -7249,7 +7284,7 @@ class CNCjob(Geometry):
                 next_x = pt[0]
                 next_y = pt[1]
 
-            gcode += self.doformat(p.linear_code, x=next_x, y=next_y, z=z_cut)  # Linear motion to point
+            gcode.append(linear_code(next_x, next_y))  # Linear motion to point
             prev_x = next_x
             prev_y = next_y
 
@@ -7276,28 +7311,28 @@ class CNCjob(Geometry):
             new_y = extra_path[0][1]
 
             # this is an extra line therefore lift the milling bit
-            gcode += self.doformat(p.lift_code, x=prev_x, y=prev_y, z_move=z_move)  # lift
+            gcode.append(self.doformat_xy(p.lift_code, prev_x, prev_y, z_move=z_move))  # lift
 
             # move fast to the new first point
-            gcode += self.doformat(p.rapid_code, x=new_x, y=new_y)
+            gcode.append(self.doformat_xy(p.rapid_code, new_x, new_y))
 
             # lower the milling bit
             # Different feedrate for vertical cut?
             if self.z_feedrate is not None:
-                gcode += self.doformat(p.z_feedrate_code)
-                gcode += self.doformat(p.down_code, x=new_x, y=new_y, z_cut=z_cut)
-                gcode += self.doformat(p.feedrate_code, feedrate=feedrate)
+                gcode.append(self.doformat(p.z_feedrate_code))
+                gcode.append(self.doformat_xy(p.down_code, new_x, new_y, z_cut=z_cut))
+                gcode.append(self.doformat(p.feedrate_code, feedrate=feedrate))
             else:
-                gcode += self.doformat(p.down_code, x=new_x, y=new_y, z_cut=z_cut)  # Start cutting
+                gcode.append(self.doformat_xy(p.down_code, new_x, new_y, z_cut=z_cut))  # Start cutting
 
             # start cutting the extra line
             last_pt = extra_path[0]
             for pt in extra_path[1:]:
-                gcode += self.doformat(p.linear_code, x=pt[0], y=pt[1])
+                gcode.append(self.doformat_xy(p.linear_code, pt[0], pt[1]))
                 last_pt = pt
 
             # go back to the original point
-            gcode += self.doformat(p.linear_code, x=path[0][0], y=path[0][1])
+            gcode.append(self.doformat_xy(p.linear_code, path[0][0], path[0][1]))
             last_pt = path[0]
         else:
             # go to the point that is 5% in length before the end (therefore 95% length from start of the line),
@@ -7315,23 +7350,23 @@ class CNCjob(Geometry):
             new_y = extra_path[0][1]
 
             # this is an extra line therefore lift the milling bit
-            gcode += self.doformat(p.lift_code, x=prev_x, y=prev_y, z_move=z_move)  # lift
+            gcode.append(self.doformat_xy(p.lift_code, prev_x, prev_y, z_move=z_move))  # lift
 
             # move fast to the new first point
-            gcode += self.doformat(p.rapid_code, x=new_x, y=new_y)
+            gcode.append(self.doformat_xy(p.rapid_code, new_x, new_y))
 
             # lower the milling bit
             # Different feedrate for vertical cut?
             if self.z_feedrate is not None:
-                gcode += self.doformat(p.z_feedrate_code)
-                gcode += self.doformat(p.down_code, x=new_x, y=new_y, z_cut=z_cut)
-                gcode += self.doformat(p.feedrate_code, feedrate=feedrate)
+                gcode.append(self.doformat(p.z_feedrate_code))
+                gcode.append(self.doformat_xy(p.down_code, new_x, new_y, z_cut=z_cut))
+                gcode.append(self.doformat(p.feedrate_code, feedrate=feedrate))
             else:
-                gcode += self.doformat(p.down_code, x=new_x, y=new_y, z_cut=z_cut)  # Start cutting
+                gcode.append(self.doformat_xy(p.down_code, new_x, new_y, z_cut=z_cut))  # Start cutting
 
             # start cutting the extra line
             for pt in extra_path[1:]:
-                gcode += self.doformat(p.linear_code, x=pt[0], y=pt[1])
+                gcode.append(self.doformat_xy(p.linear_code, pt[0], pt[1]))
 
             # ---------------------------------------------
             # second half
@@ -7342,7 +7377,7 @@ class CNCjob(Geometry):
             # start cutting the extra line
             last_pt = extra_path[0]
             for pt in extra_path[1:]:
-                gcode += self.doformat(p.linear_code, x=pt[0], y=pt[1])
+                gcode.append(self.doformat_xy(p.linear_code, pt[0], pt[1]))
                 last_pt = pt
 
             # ---------------------------------------------
@@ -7354,7 +7389,7 @@ class CNCjob(Geometry):
             # start cutting the extra line
             last_pt = extra_path[0]
             for pt in extra_path[1:]:
-                gcode += self.doformat(p.linear_code, x=pt[0], y=pt[1])
+                gcode.append(self.doformat_xy(p.linear_code, pt[0], pt[1]))
                 last_pt = pt
 
         # if extracut_length == 0.0:
@@ -7377,9 +7412,9 @@ class CNCjob(Geometry):
 
         # Up to travelling height.
         if up:
-            gcode += self.doformat(p.lift_code, x=last_pt[0], y=last_pt[1], z_move=z_move)  # Stop cutting
+            gcode.append(self.doformat_xy(p.lift_code, last_pt[0], last_pt[1], z_move=z_move))  # Stop cutting
 
-        return gcode
+        return ''.join(gcode)
 
     def point2gcode(self, point, dia, z_move=None, old_point=(0, 0)):
         """
@@ -7395,7 +7430,7 @@ class CNCjob(Geometry):
         :return:                    G-code to cut on the Point feature.
         :rtype:                     str
         """
-        gcode = ""
+        gcode = []
 
         if self.app.abort_flag:
             # graceful abort requested by the user
@@ -7429,26 +7464,26 @@ class CNCjob(Geometry):
 
             if travel[0] is not None:
                 # move to next point
-                gcode += self.doformat(p.rapid_code, x=locx, y=locy)
+                gcode.append(self.doformat_xy(p.rapid_code, locx, locy))
 
                 # raise to safe Z (travel[0]) each time because safe Z may be different
                 self.z_move = travel[0]
-                gcode += self.doformat(p.lift_code, x=locx, y=locy)
+                gcode.append(self.doformat_xy(p.lift_code, locx, locy))
 
                 # restore z_move
                 self.z_move = z_move
             else:
                 if prev_z is not None:
                     # move to next point
-                    gcode += self.doformat(p.rapid_code, x=locx, y=locy)
+                    gcode.append(self.doformat_xy(p.rapid_code, locx, locy))
 
                     # we assume that previously the z_move was altered therefore raise to
                     # the travel_z (z_move)
                     self.z_move = z_move
-                    gcode += self.doformat(p.lift_code, x=locx, y=locy)
+                    gcode.append(self.doformat_xy(p.lift_code, locx, locy))
                 else:
                     # move to next point
-                    gcode += self.doformat(p.rapid_code, x=locx, y=locy)
+                    gcode.append(self.doformat_xy(p.rapid_code, locx, locy))
 
             # store prev_z
             prev_z = travel[0]
@@ -7456,14 +7491,14 @@ class CNCjob(Geometry):
         # gcode += self.doformat(p.linear_code, x=first_x, y=first_y)  # Move to first point
 
         if self.z_feedrate is not None:
-            gcode += self.doformat(p.z_feedrate_code)
-            gcode += self.doformat(p.down_code, x=first_x, y=first_y, z_cut=self.z_cut)
-            gcode += self.doformat(p.feedrate_code)
+            gcode.append(self.doformat(p.z_feedrate_code))
+            gcode.append(self.doformat_xy(p.down_code, first_x, first_y, z_cut=self.z_cut))
+            gcode.append(self.doformat(p.feedrate_code))
         else:
-            gcode += self.doformat(p.down_code, x=first_x, y=first_y, z_cut=self.z_cut)  # Start cutting
+            gcode.append(self.doformat_xy(p.down_code, first_x, first_y, z_cut=self.z_cut))  # Start cutting
 
-        gcode += self.doformat(p.lift_code, x=first_x, y=first_y)  # Stop cutting
-        return gcode
+        gcode.append(self.doformat_xy(p.lift_code, first_x, first_y))  # Stop cutting
+        return ''.join(gcode)
 
     def export_svg(self, scale_stroke_factor=0.00):
         """
@@ -8151,6 +8186,8 @@ def to_dict(obj):
 
     * ApertureMacro
     * BaseGeometry
+    * ParsedGCode (as the list of dictionaries made by CNCjob.gcode_parse())
+    * DrillArray, SlotArray (as the lists of Points / tuples of Points used before)
 
     :param obj:     Shapely geometry.
     :type obj:      BaseGeometry
@@ -8167,6 +8204,8 @@ def to_dict(obj):
             "__class__": "Shply",
             "__inst__": sdumps(obj)
         }
+    if isinstance(obj, (ParsedGCode, CoordinateArray)):
+        return obj.to_list()
     return obj
 
 
@@ -8654,6 +8693,34 @@ class FlatCAMRTreeStorage(FlatCAMRTree):
         # super(FlatCAMRTreeStorage, self).insert(idx, obj)
         super().insert(idx, obj)
 
+    def insert_many(self, objs):
+        """
+        Insert a list of objects. When the storage is empty the RTree index is bulk loaded, which is much faster
+        than inserting the objects one by one.
+
+        :param objs:    list of objects
+        :return:        None
+        """
+        if self.objects:
+            for obj in objs:
+                self.insert(obj)
+            return
+
+        items = []
+        for obj in objs:
+            idx = len(self.objects)
+            self.objects.append(obj)
+            self.indexes[id(obj)] = idx
+
+            self.grow_obj2points(idx)
+            for pt in self.get_points(obj):
+                self.obj2points[idx].append(len(self.points2obj))
+                items.append((len(self.points2obj), (pt[0], pt[1], pt[0], pt[1]), idx))
+                self.points2obj.append(idx)
+
+        if items:
+            self.rti = rtindex.Index(iter(items))
+
     # @profile
     def remove(self, obj):
         # See note about self.indexes in insert().
@@ -94,8 +94,11 @@ class FlatCAMDefaults:
         "global_send_stats": True,
         "global_worker_number": int((os.cpu_count()) / 2) if os.cpu_count() > 4 else 2,
         "global_tolerance": 0.005,
+        "global_tess_cache_size": 256,
+        "global_tess_cache_disk": False,
 
         "global_save_compressed": True,
+        "global_save_binary": False,
         "global_compression_level": 3,
         "global_autosave": False,
         "global_autosave_timeout": 300000,
@@ -207,6 +210,7 @@ class FlatCAMDefaults:
         "gerber_delayed_buffering": True,
         "gerber_simplification": False,
         "gerber_simp_tolerance": 0.0005,
+        "gerber_flash_instancing": True,
 
         # Gerber Export
         "gerber_exp_units": 'IN',
@@ -247,6 +251,7 @@ class FlatCAMDefaults:
         "excellon_optimization_type": 'B',
 
         "excellon_search_time": 3,
+        "excellon_kdtree_initial": 'nn',
         "excellon_save_filters": "Excellon File .txt (*.txt);;Excellon File .drd (*.drd);;"
                                  "Excellon File .drill (*.drill);;"
                                  "Excellon File .drl (*.drl);;Excellon File .exc (*.exc);;"
@@ -627,6 +632,7 @@ class FlatCAMDefaults:
 
         # Optimal Tool
         "tools_opt_precision": 4,
+        "tools_opt_distances": 10,
 
         # Check Rules Tool
         "tools_cr_trace_size": True,
@@ -649,6 +655,7 @@ class FlatCAMDefaults:
         "tools_cr_h2h_val": 0.3,
         "tools_cr_dh": True,
         "tools_cr_dh_val": 0.3,
+        "tools_cr_tiled": True,
 
         # QRCode Tool
         "tools_qrcode_version": 1,
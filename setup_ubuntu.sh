@@ -30,7 +30,6 @@ sudo -H python3 -m pip install --upgrade \
 	cycler \
 	python-dateutil \
 	kiwisolver \
-	dill \
 	vispy \
 	pyopengl \
 	setuptools \
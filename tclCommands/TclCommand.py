@@ -1,6 +1,5 @@
 import sys
 import re
-import app_Main
 import abc
 import collections
 from PyQt5 import QtCore
@@ -53,7 +52,8 @@ class TclCommand(object):
         if self.app is None:
             raise TypeError('Expected app to be FlatCAMApp instance.')
 
-        if not isinstance(self.app, app_Main.App):
+        # the FlatCAM App or the headless App of the batch engine (appHeadless.py): anything with a Tcl shell
+        if not hasattr(self.app, 'shell'):
             raise TypeError('Expected FlatCAMApp, got %s.' % type(app))
 
         self.log = self.app.log
@@ -413,6 +413,11 @@ class TclCommandSignaled(TclCommand):
             else:
                 passed_timeout = self.app.defaults['global_background_timeout']
 
+            # the headless batch engine (appHeadless.py) runs the tasks when they are sent: nothing to wait for
+            if getattr(self.app, 'headless', False) is True:
+                self.output = self.execute(args, unnamed_args)
+                return self.output
+
             # set detail for processing, it will be there until next open or close
             self.app.shell.open_processing(self.get_current_command())
 
@@ -51,5 +51,5 @@ class TclCommandClearShell(TclCommand):
         :return:
         """
         self.app.inform.emit("Tcl Shell Editor cleared ...")
-        self.app.shell._browser.clear()
+        self.app.shell.clear_output()
         pass
@@ -0,0 +1,5 @@
+"""
+Benchmarks of FlatCAM on synthetic boards, run with 'python -m tests.benchmarks' (see __main__.py).
+
+The results (wall time, peak RSS and counters of each phase) are written as JSON, to compare the releases.
+"""
@@ -0,0 +1,78 @@
+# ##########################################################
+# FlatCAM: 2D Post-processing for Manufacturing            #
+# Date: 10/18/2026                                         #
+# MIT Licence                                              #
+# ##########################################################
+
+"""
+Runs the benchmarks, from the FlatCAM folder:
+
+    python -m tests.benchmarks --seed 0 --scale 2 --repeat 3 --output results.json
+    python -m tests.benchmarks --only gerber_parse,isolation
+    python -m tests.benchmarks --list
+    python -m tests.benchmarks --compare old.json new.json
+"""
+
+import sys
+import json
+import argparse
+
+from tests.benchmarks.suite import BENCHMARKS, run_suite, compare
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m tests.benchmarks',
+                                     description="FlatCAM benchmarks on synthetic boards.")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the synthetic board")
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help="size of the board: 1 is 16 cells of 12.7 mm, the work grows with the scale")
+    parser.add_argument('--repeat', type=int, default=1, help="runs of each benchmark; the fastest is kept")
+    parser.add_argument('--only', default=None, help="comma separated names of the benchmarks to run")
+    parser.add_argument('--output', default=None, help="JSON file for the results; default is stdout")
+    parser.add_argument('--in-process', action='store_true',
+                        help="run the benchmarks in this process: faster, but the peak RSS is of all of them")
+    parser.add_argument('--verbose', action='store_true', help="show the messages of the commands")
+    parser.add_argument('--list', action='store_true', help="list the benchmarks")
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help="compare two JSON results")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print('\n'.join(BENCHMARKS))
+        return 0
+
+    if args.compare:
+        results = []
+        for filename in args.compare:
+            with open(filename) as f:
+                results.append(json.load(f))
+        print(compare(*results))
+        return 0
+
+    names = None
+    if args.only:
+        names = [name.strip() for name in args.only.split(',') if name.strip()]
+        unknown = [name for name in names if name not in BENCHMARKS]
+        if unknown:
+            parser.error("unknown benchmarks: %s" % ', '.join(unknown))
+
+    def report(name, result):
+        status = "%.3f s" % result['wall_time'] if result['status'] == 'ok' else "ERROR: %s" % result['error']
+        rss = "" if result['peak_rss_mb'] is None else ", %s MB" % result['peak_rss_mb']
+        sys.stderr.write("%-16s %s%s\n" % (name, status, rss))
+
+    results = run_suite(seed=args.seed, scale=args.scale, repeat=args.repeat, names=names,
+                        isolate=not args.in_process, verbose=args.verbose, callback=report)
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    # 1 if a benchmark failed
+    return int(any(result['status'] != 'ok' for result in results['benchmarks'].values()))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,298 @@
+# ##########################################################
+# FlatCAM: 2D Post-processing for Manufacturing            #
+# Date: 10/18/2026                                         #
+# MIT Licence                                              #
+# ##########################################################
+
+"""
+Synthetic boards for the benchmarks, made from a seed: the same seed and scale give the same files.
+
+The board is a grid of 12.7 mm cells. Each cell has a component (through-hole pads with drills, SMD pads or a pin
+header) or a copper pour with clearances. Traces with rounded corners join random pads. The number of cells is
+16 * scale, so the work of most of the benchmarks grows linearly with the scale.
+
+The board is written as:
+
+* a Gerber copper layer (RS-274X, mm): flashes of round, rectangular and obround pads, traces with arcs (G75),
+  regions (G36/G37) and clear polarity (LPC)
+* an Excellon drill file (mm, decimal coordinates) with the through-hole and mounting holes
+* an SVG and a DXF drawing of the pads and traces
+* a G-code file with feed moves and arcs
+"""
+
+import os
+import math
+import random
+
+CELL = 12.7
+
+# Gerber apertures: D code -> (template, size)
+APERTURES = {
+    10: ('C', '1.600000'),
+    11: ('R', '1.500000X0.800000'),
+    12: ('O', '1.800000X1.200000'),
+    13: ('C', '0.250000'),
+    14: ('C', '0.500000'),
+    15: ('C', '5.000000'),
+}
+TRACE_APERTURES = (13, 13, 13, 14)
+
+
+class SyntheticBoard:
+    """
+    The elements of a synthetic board; write() makes the files.
+    """
+
+    def __init__(self, seed=0, scale=1.0):
+        """
+        :param seed:    seed of the random generator
+        :param scale:   size of the board; 1 is 16 cells of 12.7 mm (a 50 x 50 mm board)
+        """
+        self.seed = seed
+        self.scale = scale
+        rng = random.Random(seed)
+
+        self.nr_cells = max(1, int(round(16 * scale)))
+        self.columns = int(math.ceil(math.sqrt(self.nr_cells)))
+        self.rows = int(math.ceil(self.nr_cells / float(self.columns)))
+        self.width = self.columns * CELL + 2 * CELL
+        self.height = self.rows * CELL + 2 * CELL
+
+        # (x, y, aperture) of the pads; (x, y, drill diameter) of the holes
+        self.pads = []
+        self.drills = []
+        # list of (aperture, points, corner radius) of the traces
+        self.traces = []
+        # (outline points, clear circles (x, y, radius)) of the copper pours
+        self.pours = []
+
+        for cell in range(self.nr_cells):
+            x0 = CELL + (cell % self.columns) * CELL
+            y0 = CELL + (cell // self.columns) * CELL
+            kind = rng.choice(('dip', 'dip', 'smd', 'header', 'pour'))
+            if kind == 'dip':
+                pins = rng.choice((2, 3, 4))
+                aperture = rng.choice((10, 12))
+                for row_x in (x0 + 2.54, x0 + 2.54 + 7.62):
+                    for pin in range(pins):
+                        self.add_pad(row_x, y0 + 2.54 + pin * 2.54, aperture, 0.8)
+            elif kind == 'smd':
+                for pin in range(rng.choice((2, 3, 4))):
+                    self.add_pad(x0 + 3.0 + pin * 2.0, y0 + CELL / 2.0, 11, None)
+            elif kind == 'header':
+                for pin in range(4):
+                    self.add_pad(x0 + 1.5 + pin * 2.54, y0 + 3.0, 10, 1.0)
+            else:
+                outline = [(x0 + 1.0, y0 + 1.0), (x0 + CELL - 1.0, y0 + 1.0), (x0 + CELL - 1.0, y0 + CELL - 1.0),
+                           (x0 + 1.0, y0 + CELL - 1.0)]
+                clear = [(x0 + rng.uniform(3.0, CELL - 3.0), y0 + rng.uniform(3.0, CELL - 3.0), 1.2)
+                         for __ in range(rng.randint(1, 3))]
+                self.pours.append((outline, clear))
+
+        # mounting holes in the corners
+        for x, y in ((CELL / 2.0, CELL / 2.0), (self.width - CELL / 2.0, CELL / 2.0),
+                     (CELL / 2.0, self.height - CELL / 2.0), (self.width - CELL / 2.0, self.height - CELL / 2.0)):
+            self.add_pad(x, y, 15, 3.2)
+
+        # traces between random pads, horizontal then vertical, with a rounded corner
+        signal_pads = [pad for pad in self.pads if pad[2] != 15]
+        for __ in range(len(signal_pads) // 2):
+            (x1, y1, __a), (x2, y2, __b) = rng.sample(signal_pads, 2)
+            self.traces.append((rng.choice(TRACE_APERTURES), [(x1, y1), (x2, y1), (x2, y2)], 1.0))
+
+        # the G-code: zig-zag passes with a rounded turn at the end of each pass
+        self.gcode_passes = max(1, int(round(400 * scale)))
+
+    def add_pad(self, x, y, aperture, drill):
+        self.pads.append((x, y, aperture))
+        if drill is not None:
+            self.drills.append((x, y, drill))
+
+    # ## Gerber
+
+    @staticmethod
+    def gerber_xy(x, y):
+        return 'X%dY%d' % (int(round(x * 10000)), int(round(y * 10000)))
+
+    def gerber(self):
+        lines = ['G04 FlatCAM benchmark board, seed %d, scale %s*' % (self.seed, self.scale),
+                 '%FSLAX34Y34*%', '%MOMM*%', '%LPD*%']
+        for code in sorted(APERTURES):
+            template, size = APERTURES[code]
+            lines.append('%%ADD%d%s,%s*%%' % (code, template, size))
+        lines += ['G01*', 'G75*']
+
+        # the pours, with the clearances
+        for outline, clear in self.pours:
+            lines.append('%LPD*%')
+            lines.append('G36*')
+            lines.append(self.gerber_xy(*outline[0]) + 'D02*')
+            for point in outline[1:] + outline[:1]:
+                lines.append(self.gerber_xy(*point) + 'D01*')
+            lines.append('G37*')
+            lines.append('%LPC*%')
+            for x, y, radius in clear:
+                lines.append('G36*')
+                lines.append(self.gerber_xy(x + radius, y) + 'D02*')
+                lines.append('G03*')
+                lines.append(self.gerber_xy(x + radius, y) + 'I%dJ0D01*' % int(round(-radius * 10000)))
+                lines.append('G01*')
+                lines.append('G37*')
+        lines.append('%LPD*%')
+
+        # the pads
+        current = None
+        for x, y, aperture in self.pads:
+            if aperture != current:
+                lines.append('D%d*' % aperture)
+                current = aperture
+            lines.append(self.gerber_xy(x, y) + 'D03*')
+
+        # the traces
+        for aperture, points, radius in self.traces:
+            lines.append('D%d*' % aperture)
+            lines += self.gerber_trace(points, radius)
+
+        lines.append('M02*')
+        return '\n'.join(lines) + '\n'
+
+    def gerber_trace(self, points, radius):
+        (x1, y1), (x2, y2), (x3, y3) = points
+        lines = [self.gerber_xy(x1, y1) + 'D02*']
+        sx = math.copysign(1.0, x2 - x1)
+        sy = math.copysign(1.0, y3 - y2)
+        if abs(x2 - x1) <= radius or abs(y3 - y2) <= radius:
+            lines.append(self.gerber_xy(x2, y2) + 'D01*')
+            lines.append(self.gerber_xy(x3, y3) + 'D01*')
+            return lines
+
+        # the corner is a quarter of circle: counter-clockwise for a left turn
+        lines.append(self.gerber_xy(x2 - sx * radius, y2) + 'D01*')
+        lines.append('G03*' if sx * sy > 0 else 'G02*')
+        lines.append(self.gerber_xy(x2, y2 + sy * radius) + 'I0J%dD01*' % int(round(sy * radius * 10000)))
+        lines.append('G01*')
+        lines.append(self.gerber_xy(x3, y3) + 'D01*')
+        return lines
+
+    # ## Excellon
+
+    def excellon(self):
+        diameters = sorted(set(dia for __, __, dia in self.drills))
+        lines = ['M48', 'METRIC,LZ']
+        for nr, dia in enumerate(diameters, start=1):
+            lines.append('T%dC%.3f' % (nr, dia))
+        lines.append('%')
+        for nr, dia in enumerate(diameters, start=1):
+            lines.append('T%d' % nr)
+            for x, y, drill in self.drills:
+                if drill == dia:
+                    lines.append('X%.3fY%.3f' % (x, y))
+        lines.append('M30')
+        return '\n'.join(lines) + '\n'
+
+    # ## SVG
+
+    def pad_size(self, aperture):
+        template, size = APERTURES[aperture]
+        sizes = [float(val) for val in size.split('X')]
+        return template, sizes[0], sizes[-1]
+
+    def svg(self):
+        # the Y axis of the SVG goes down: it is flipped by the import
+        elements = []
+        for x, y, aperture in self.pads:
+            template, w, h = self.pad_size(aperture)
+            if template == 'C':
+                elements.append('<circle cx="%.3f" cy="%.3f" r="%.3f"/>' % (x, self.height - y, w / 2.0))
+            elif template == 'O':
+                elements.append('<ellipse cx="%.3f" cy="%.3f" rx="%.3f" ry="%.3f"/>' %
+                                (x, self.height - y, w / 2.0, h / 2.0))
+            else:
+                elements.append('<rect x="%.3f" y="%.3f" width="%.3f" height="%.3f"/>' %
+                                (x - w / 2.0, self.height - y - h / 2.0, w, h))
+        for outline, clear in self.pours:
+            path = 'M ' + ' L '.join('%.3f %.3f' % (px, self.height - py) for px, py in outline) + ' Z'
+            elements.append('<path d="%s"/>' % path)
+        for aperture, points, __ in self.traces:
+            width = float(APERTURES[aperture][1])
+            path = 'M ' + ' L '.join('%.3f %.3f' % (px, self.height - py) for px, py in points)
+            elements.append('<path d="%s" fill="none" stroke="black" stroke-width="%.3f"/>' % (path, width))
+
+        return ('<?xml version="1.0" encoding="UTF-8" standalone="no"?>\n'
+                '<svg xmlns="http://www.w3.org/2000/svg" version="1.1" width="%.3fmm" height="%.3fmm" '
+                'viewBox="0 0 %.3f %.3f">\n%s\n</svg>\n' %
+                (self.width, self.height, self.width, self.height, '\n'.join(elements)))
+
+    # ## DXF
+
+    def write_dxf(self, filename):
+        import ezdxf
+
+        doc = ezdxf.new('R2010')
+        doc.units = ezdxf.units.MM
+        msp = doc.modelspace()
+        for x, y, aperture in self.pads:
+            template, w, h = self.pad_size(aperture)
+            if template == 'C':
+                msp.add_circle((x, y), w / 2.0)
+            else:
+                msp.add_lwpolyline([(x - w / 2.0, y - h / 2.0), (x + w / 2.0, y - h / 2.0),
+                                    (x + w / 2.0, y + h / 2.0), (x - w / 2.0, y + h / 2.0)], close=True)
+        for outline, clear in self.pours:
+            msp.add_lwpolyline(outline, close=True)
+            for x, y, radius in clear:
+                msp.add_arc((x, y), radius, 0, 180)
+                msp.add_arc((x, y), radius, 180, 360)
+        for __, points, __r in self.traces:
+            for start, stop in zip(points[:-1], points[1:]):
+                msp.add_line(start, stop)
+        doc.saveas(filename)
+
+    # ## G-code
+
+    def gcode(self):
+        lines = ['(FlatCAM benchmark G-code)', 'G21', 'G90', 'G94', 'F120.00', 'G00 Z2.0000', 'M03 S10000',
+                 'G00 X0.0000 Y0.0000', 'G01 Z-0.1000 F50.00', 'F120.00']
+        step = 0.4
+        length = self.width
+        for nr in range(self.gcode_passes):
+            y = nr * step
+            x_end = length if nr % 2 == 0 else 0.0
+            lines.append('G01 X%.4f Y%.4f' % (x_end, y))
+            # the turn to the next pass is a half circle
+            lines.append('%s X%.4f Y%.4f I0.0000 J%.4f' % ('G03' if nr % 2 == 0 else 'G02', x_end, y + step,
+                                                         step / 2.0))
+        lines += ['G00 Z2.0000', 'M05', 'G00 X0.0000 Y0.0000', 'M30']
+        return '\n'.join(lines) + '\n'
+
+    def write(self, folder):
+        """
+        Writes the files of the board.
+
+        :param folder:  folder of the files; it must exist
+        :return:        dict with the path of each file: gerber, excellon, svg, dxf and gcode
+        """
+        files = {
+            'gerber': os.path.join(folder, 'board.gbr'),
+            'excellon': os.path.join(folder, 'board.drl'),
+            'svg': os.path.join(folder, 'board.svg'),
+            'dxf': os.path.join(folder, 'board.dxf'),
+            'gcode': os.path.join(folder, 'board.nc'),
+        }
+        for kind, text in (('gerber', self.gerber()), ('excellon', self.excellon()), ('svg', self.svg()),
+                           ('gcode', self.gcode())):
+            with open(files[kind], 'w') as f:
+                f.write(text)
+        self.write_dxf(files['dxf'])
+        return files
+
+    def stats(self):
+        return {
+            'cells': self.nr_cells,
+            'size_mm': [round(self.width, 3), round(self.height, 3)],
+            'pads': len(self.pads),
+            'drills': len(self.drills),
+            'traces': len(self.traces),
+            'pours': len(self.pours),
+            'gcode_passes': self.gcode_passes,
+        }
@@ -0,0 +1,422 @@
+# ##########################################################
+# FlatCAM: 2D Post-processing for Manufacturing            #
+# Date: 10/18/2026                                         #
+# MIT Licence                                              #
+# ##########################################################
+
+"""
+The benchmarks: each one runs Tcl Commands in the headless engine (appHeadless.HeadlessApp) on the files of a
+synthetic board (boards.SyntheticBoard) and records:
+
+* the wall time of the benchmark and of each of its phases (one phase for each Tcl Command)
+* the peak RSS of the process, and the RSS once the App is made (start_rss_mb); each benchmark is run in its own
+  process (spawned) so it is not hidden by the benchmarks run before
+* counters of the work done: polygons, drills, lines of G-code, size of the files
+
+A benchmark that fails (Tcl error or an error reported by the command) has the status 'error' and the error message;
+the other benchmarks are still run.
+"""
+
+import io
+import os
+import sys
+import time
+import shutil
+import logging
+import datetime
+import platform
+import tempfile
+import traceback
+import subprocess
+import contextlib
+import collections
+import multiprocessing
+import tkinter as tk
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import resource
+except ImportError:
+    # Windows
+    resource = None
+
+from tests.benchmarks.boards import SyntheticBoard
+
+log = logging.getLogger('base')
+
+# name -> function(run, files)
+BENCHMARKS = collections.OrderedDict()
+
+
+def benchmark(name):
+    def register(fcn):
+        BENCHMARKS[name] = fcn
+        return fcn
+    return register
+
+
+class BenchmarkError(Exception):
+    pass
+
+
+def peak_rss_mb():
+    """
+    :return:    peak resident set size of this process in MB, None if it is not known (Windows)
+    """
+    if resource is None:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, KB on the other systems
+    if sys.platform == 'darwin':
+        return round(maxrss / 1048576.0, 1)
+    return round(maxrss / 1024.0, 1)
+
+
+def count_geometry(geo):
+    """
+    :param geo:     Shapely geometry, or (nested) list of geometries
+    :return:        number of the simple geometries (polygons, lines, points)
+    """
+    if geo is None:
+        return 0
+    if isinstance(geo, (list, tuple)):
+        return sum(count_geometry(item) for item in geo)
+    if hasattr(geo, 'geoms'):
+        return sum(count_geometry(item) for item in geo.geoms)
+    return 0 if geo.is_empty else 1
+
+
+class Run:
+    """
+    One run of a benchmark, in a new HeadlessApp.
+    """
+
+    def __init__(self, app, folder):
+        """
+        :param app:     HeadlessApp
+        :param folder:  folder for the files written by the benchmark
+        """
+        self.app = app
+        self.folder = folder
+        self.phases = collections.OrderedDict()
+        self.counters = collections.OrderedDict()
+
+    def path(self, filename):
+        return os.path.join(self.folder, filename).replace('\\', '/')
+
+    def step(self, phase, command, outname=None):
+        """
+        Runs a Tcl Command as a phase of the benchmark.
+
+        :param phase:       name of the phase
+        :param command:     Tcl Command
+        :param outname:     name of the object made by the command; it is checked that it exists
+        :return:            the object named outname, None if there is no outname
+        """
+        errors = self.app.error_count
+        start = time.perf_counter()
+        try:
+            self.app.shell.exec_command_test(command, reraise=True, no_echo=True)
+        except tk.TclError as e:
+            raise BenchmarkError("%s: %s" % (phase, str(e).strip()))
+        finally:
+            self.phases[phase] = self.phases.get(phase, 0.0) + time.perf_counter() - start
+
+        if self.app.error_count > errors:
+            raise BenchmarkError("%s: the command reported an error" % phase)
+        if outname is None:
+            return None
+        obj = self.app.collection.get_by_name(outname)
+        if obj is None:
+            raise BenchmarkError("%s: the object %s was not made" % (phase, outname))
+        return obj
+
+    def count(self, name, value):
+        self.counters[name] = value
+
+    def count_file(self, name, filename):
+        with open(filename, 'rb') as f:
+            lines = sum(1 for __ in f)
+        self.count(name + '_bytes', os.path.getsize(filename))
+        self.count(name + '_lines', lines)
+
+
+# ## The benchmarks
+
+@benchmark('gerber_parse')
+def gerber_parse(run, files):
+    obj = run.step('open_gerber', 'open_gerber %s -outname board' % files['gerber'], 'board')
+    run.count('apertures', len(obj.apertures))
+    run.count('polygons', count_geometry(obj.solid_geometry))
+
+
+@benchmark('excellon_parse')
+def excellon_parse(run, files):
+    obj = run.step('open_excellon', 'open_excellon %s -outname drills' % files['excellon'], 'drills')
+    run.count('tools', len(obj.tools))
+    run.count('drills', sum(len(tool.get('drills', [])) for tool in obj.tools.values()))
+
+
+@benchmark('svg_import')
+def svg_import(run, files):
+    obj = run.step('open_svg', 'open_svg %s -type geometry -outname drawing' % files['svg'], 'drawing')
+    run.count('geometries', count_geometry(obj.solid_geometry))
+
+
+@benchmark('dxf_import')
+def dxf_import(run, files):
+    obj = run.step('open_dxf', 'open_dxf %s -type geometry -outname drawing' % files['dxf'], 'drawing')
+    run.count('geometries', count_geometry(obj.solid_geometry))
+
+
+@benchmark('isolation')
+def isolation(run, files):
+    run.step('open_gerber', 'open_gerber %s -outname board' % files['gerber'], 'board')
+    obj = run.step('isolate', 'isolate board -dia 0.2 -passes 2 -overlap 10 -combine 1 -outname board_iso',
+                   'board_iso')
+    run.count('paths', count_geometry(obj.solid_geometry))
+
+
+@benchmark('ncc')
+def ncc(run, files):
+    run.step('open_gerber', 'open_gerber %s -outname board' % files['gerber'], 'board')
+    obj = run.step('ncc', 'ncc board -tooldia 0.3,1 -overlap 40 -margin 1 -method lines -all 1 -outname board_ncc',
+                   'board_ncc')
+    run.count('paths', count_geometry(obj.solid_geometry))
+
+
+@benchmark('paint')
+def paint(run, files):
+    run.step('open_gerber', 'open_gerber %s -outname board' % files['gerber'], 'board')
+    obj = run.step('paint', 'paint board -tooldia 0.3 -overlap 40 -method standard -all 1 -outname board_paint',
+                   'board_paint')
+    run.count('paths', count_geometry(obj.solid_geometry))
+
+
+@benchmark('panelize')
+def panelize(run, files):
+    run.step('open_gerber', 'open_gerber %s -outname board' % files['gerber'], 'board')
+    obj = run.step('panelize', 'panelize board -rows 3 -columns 3 -spacing_columns 2 -spacing_rows 2 '
+                               '-outname panel', 'panel')
+    run.count('polygons', count_geometry(obj.solid_geometry))
+
+
+@benchmark('drill_gcode')
+def drill_gcode(run, files):
+    run.step('open_excellon', 'open_excellon %s -outname drills' % files['excellon'], 'drills')
+    run.step('drillcncjob', 'drillcncjob drills -drilled_dias all -drillz -1.6 -outname drills_cnc', 'drills_cnc')
+    filename = run.path('drills.nc')
+    run.step('write_gcode', 'write_gcode drills_cnc %s' % filename)
+    run.count_file('gcode', filename)
+
+
+@benchmark('milling_gcode')
+def milling_gcode(run, files):
+    run.step('open_excellon', 'open_excellon %s -outname drills' % files['excellon'], 'drills')
+    obj = run.step('milldrills', 'milldrills drills -milled_dias all -tooldia 0.6 -outname drills_mill',
+                   'drills_mill')
+    run.count('paths', count_geometry(obj.solid_geometry))
+    run.step('cncjob', 'cncjob drills_mill -dia 0.6 -z_cut -1.6 -z_move 2 -feedrate 120 -outname drills_mill_cnc',
+             'drills_mill_cnc')
+    filename = run.path('drills_mill.nc')
+    run.step('write_gcode', 'write_gcode drills_mill_cnc %s' % filename)
+    run.count_file('gcode', filename)
+
+
+@benchmark('gcode_parse')
+def gcode_parse(run, files):
+    obj = run.step('open_gcode', 'open_gcode %s -outname job' % files['gcode'], 'job')
+    run.count_file('gcode', files['gcode'])
+    run.count('paths', len(obj.gcode_parsed or []))
+
+
+@benchmark('project')
+def project(run, files):
+    run.step('open_gerber', 'open_gerber %s -outname board' % files['gerber'], 'board')
+    run.step('open_excellon', 'open_excellon %s -outname drills' % files['excellon'], 'drills')
+    run.step('drillcncjob', 'drillcncjob drills -drilled_dias all -drillz -1.6 -outname drills_cnc', 'drills_cnc')
+
+    filename = run.path('board.FlatPrj')
+    run.step('save_project', 'save_project %s' % filename)
+    run.count('project_bytes', os.path.getsize(filename))
+    run.step('new', 'new')
+    run.step('open_project', 'open_project %s' % filename)
+    run.count('objects', len(run.app.collection.get_names()))
+
+
+# ## Running
+
+def run_benchmark(name, files, repeat=1, verbose=False):
+    """
+    Runs a benchmark in this process.
+
+    :param name:        name of the benchmark, a key of BENCHMARKS
+    :param files:       files of the board, see SyntheticBoard.write()
+    :param repeat:      number of runs; the time and the phases are of the fastest run
+    :param verbose:     if False the messages of the commands are not shown
+    :return:            dict with the result
+    """
+    from PyQt5 import QtCore
+    from appHeadless import HeadlessApp
+
+    QtCore.QCoreApplication.instance() or QtCore.QCoreApplication(sys.argv)
+
+    result = collections.OrderedDict([
+        ('status', 'ok'),
+        ('error', None),
+        ('wall_time', None),
+        ('runs', []),
+        ('start_rss_mb', None),
+        ('peak_rss_mb', None),
+        ('phases', collections.OrderedDict()),
+        ('counters', collections.OrderedDict()),
+    ])
+
+    output = io.StringIO()
+    levels = {}
+    if not verbose:
+        for logger_name in ('base', 'base2'):
+            levels[logger_name] = logging.getLogger(logger_name).level
+            logging.getLogger(logger_name).setLevel(logging.CRITICAL)
+
+    folder = tempfile.mkdtemp(prefix='flatcam_bench_')
+    try:
+        for __ in range(max(1, repeat)):
+            # the start of the App is not measured
+            app = HeadlessApp(user_defaults=False)
+            if result['start_rss_mb'] is None:
+                result['start_rss_mb'] = peak_rss_mb()
+            run = Run(app, folder)
+            start = time.perf_counter()
+            try:
+                if verbose:
+                    BENCHMARKS[name](run, files)
+                else:
+                    with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+                        BENCHMARKS[name](run, files)
+            except BenchmarkError as e:
+                result['status'] = 'error'
+                # the message of the failed command is more useful than the name of the phase
+                detail = first_error(output.getvalue())
+                result['error'] = "%s (%s)" % (str(e), detail) if detail else str(e)
+            except Exception as e:
+                result['status'] = 'error'
+                result['error'] = "%s: %s" % (type(e).__name__, str(e))
+                log.debug(traceback.format_exc())
+            finally:
+                app.clear_pool()
+            wall_time = time.perf_counter() - start
+
+            result['runs'].append(round(wall_time, 4))
+            if result['wall_time'] is None or wall_time < result['wall_time']:
+                result['wall_time'] = round(wall_time, 4)
+                result['phases'] = collections.OrderedDict((phase, round(duration, 4))
+                                                           for phase, duration in run.phases.items())
+            result['counters'] = run.counters
+            if result['status'] == 'error':
+                break
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+        for logger_name, level in levels.items():
+            logging.getLogger(logger_name).setLevel(level)
+
+    result['peak_rss_mb'] = peak_rss_mb()
+    return result
+
+
+def first_error(text):
+    """
+    :param text:    messages of the commands
+    :return:        the first error message, None if there is none; the next ones are usually caused by it (the
+                    open commands try again with the default path)
+    """
+    errors = [line.strip() for line in text.splitlines()
+              if 'failed because' in line or (line.startswith('ERROR:') and 'internal error' not in line)]
+    return errors[0] if errors else None
+
+
+def git_commit():
+    folder = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=folder,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(seed=0, scale=1.0, repeat=1, names=None, isolate=True, verbose=False, callback=None):
+    """
+    Makes the synthetic board and runs the benchmarks on it.
+
+    :param seed:        seed of the board
+    :param scale:       size of the board, see SyntheticBoard
+    :param repeat:      number of runs of each benchmark
+    :param names:       names of the benchmarks to run; all if None
+    :param isolate:     run each benchmark in its own process, so its peak RSS is measured
+    :param verbose:     show the messages of the commands
+    :param callback:    function(name, result) called when a benchmark is done
+    :return:            dict with the results, can be written as JSON
+    """
+    from appHeadless import HeadlessApp
+
+    names = list(BENCHMARKS) if names is None else list(names)
+    for name in names:
+        if name not in BENCHMARKS:
+            raise ValueError("Unknown benchmark: %s" % name)
+
+    board = SyntheticBoard(seed=seed, scale=scale)
+    folder = tempfile.mkdtemp(prefix='flatcam_board_')
+    try:
+        files = {kind: path.replace('\\', '/') for kind, path in board.write(folder).items()}
+        board_stats = board.stats()
+        board_stats['file_bytes'] = {kind: os.path.getsize(path) for kind, path in files.items()}
+
+        results = collections.OrderedDict()
+        for name in names:
+            if isolate:
+                context = multiprocessing.get_context('spawn')
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                    result = executor.submit(run_benchmark, name, files, repeat, verbose).result()
+            else:
+                result = run_benchmark(name, files, repeat, verbose)
+            results[name] = result
+            if callback is not None:
+                callback(name, result)
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    return collections.OrderedDict([
+        ('flatcam_version', HeadlessApp.version),
+        ('git_commit', git_commit()),
+        ('python', platform.python_version()),
+        ('platform', platform.platform()),
+        ('date', datetime.datetime.now().isoformat(timespec='seconds')),
+        ('seed', seed),
+        ('scale', scale),
+        ('repeat', repeat),
+        ('isolated', isolate),
+        ('board', board_stats),
+        ('benchmarks', results),
+    ])
+
+
+def compare(old, new):
+    """
+    :param old:     results of run_suite()
+    :param new:     results of run_suite()
+    :return:        text of a table with the wall time and the peak RSS of the benchmarks in both results
+    """
+    lines = ["%-16s %10s %10s %7s %10s %10s" % ("benchmark", "old (s)", "new (s)", "ratio", "old (MB)", "new (MB)")]
+    for name, new_result in new['benchmarks'].items():
+        old_result = old['benchmarks'].get(name)
+        if old_result is None:
+            continue
+        if old_result['status'] != 'ok' or new_result['status'] != 'ok':
+            lines.append("%-16s %s -> %s" % (name, old_result['status'], new_result['status']))
+            continue
+
+        ratio = new_result['wall_time'] / old_result['wall_time'] if old_result['wall_time'] else float('nan')
+        lines.append("%-16s %10.3f %10.3f %7.2f %10s %10s" % (
+            name, old_result['wall_time'], new_result['wall_time'], ratio,
+            old_result['peak_rss_mb'], new_result['peak_rss_mb']))
+    return '\n'.join(lines)
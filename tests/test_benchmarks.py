@@ -0,0 +1,91 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+from PyQt5 import QtCore
+
+from tests.benchmarks import suite
+from tests.benchmarks.boards import SyntheticBoard
+
+
+class SyntheticBoardTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_seed(self):
+        board = SyntheticBoard(seed=3, scale=0.5)
+        self.assertEqual(board.gerber(), SyntheticBoard(seed=3, scale=0.5).gerber())
+        self.assertNotEqual(board.gerber(), SyntheticBoard(seed=4, scale=0.5).gerber())
+        self.assertEqual(board.stats()['cells'], 8)
+
+        # the corners have the mounting holes
+        self.assertEqual(len([drill for drill in board.drills if drill[2] == 3.2]), 4)
+        self.assertGreater(len(SyntheticBoard(seed=3, scale=4).pads), len(board.pads))
+
+    def test_files(self):
+        files = SyntheticBoard(seed=0, scale=0.25).write(self.folder)
+        self.assertEqual(sorted(files), ['dxf', 'excellon', 'gcode', 'gerber', 'svg'])
+        for filename in files.values():
+            self.assertGreater(os.path.getsize(filename), 0)
+
+        with open(files['gerber']) as f:
+            gerber = f.read()
+        self.assertIn('%MOMM*%', gerber)
+        self.assertTrue(gerber.endswith('M02*\n'))
+
+
+class SuiteTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.qapp = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication(sys.argv)
+
+    def tearDown(self):
+        suite.BENCHMARKS.pop('failing', None)
+
+    def test_run(self):
+        board = SyntheticBoard(seed=0, scale=0.25)
+        results = suite.run_suite(seed=0, scale=0.25, repeat=2, names=['excellon_parse', 'drill_gcode'],
+                                  isolate=False)
+        self.assertEqual(results['board']['drills'], len(board.drills))
+        self.assertEqual(list(results['benchmarks']), ['excellon_parse', 'drill_gcode'])
+
+        result = results['benchmarks']['excellon_parse']
+        self.assertEqual(result['status'], 'ok')
+        self.assertEqual(len(result['runs']), 2)
+        self.assertEqual(result['wall_time'], min(result['runs']))
+        self.assertEqual(result['counters']['drills'], len(board.drills))
+
+        result = results['benchmarks']['drill_gcode']
+        self.assertEqual(list(result['phases']), ['open_excellon', 'drillcncjob', 'write_gcode'])
+        self.assertGreater(result['counters']['gcode_lines'], len(board.drills))
+        if result['peak_rss_mb'] is not None:
+            self.assertGreaterEqual(result['peak_rss_mb'], result['start_rss_mb'])
+
+        self.assertIn('excellon_parse', suite.compare(results, results))
+
+    def test_error(self):
+        @suite.benchmark('failing')
+        def failing(run, files):
+            run.step('drillcncjob', 'drillcncjob missing -drilled_dias all')
+
+        results = suite.run_suite(scale=0.25, names=['failing', 'excellon_parse'], isolate=False)
+        result = results['benchmarks']['failing']
+        self.assertEqual(result['status'], 'error')
+        self.assertTrue(result['error'].startswith('drillcncjob: '))
+        self.assertIn('drillcncjob', result['phases'])
+        # the next benchmarks are still run
+        self.assertEqual(results['benchmarks']['excellon_parse']['status'], 'ok')
+
+        with self.assertRaises(ValueError):
+            suite.run_suite(names=['missing'], isolate=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from shapely.geometry import Point, box
+from shapely.ops import nearest_points, unary_union
+
+from appCommon import Clearance
+from appCommon.Clearance import smallest_gaps, gerber_polygons, minimum_clearance, sample_boundaries
+
+
+def brute_force(polygons, decimals):
+    # the pair loop used before by the Optimal, NCC and Isolation Tools
+    min_dict = {}
+    for k, geo in enumerate(polygons):
+        for s_geo in polygons[k + 1:]:
+            dist = round(geo.distance(s_geo), decimals)
+            loc_1, loc_2 = nearest_points(geo, s_geo)
+            proc_loc = ((round(loc_1.x, decimals), round(loc_1.y, decimals)),
+                        (round(loc_2.x, decimals), round(loc_2.y, decimals)))
+            min_dict.setdefault(dist, []).append(proc_loc)
+    return min_dict
+
+
+class ClearanceTest(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        features = [box(x, y, x + 0.8, y + 0.5) for x, y in rng.uniform(0, 25, (150, 2))] + \
+                   [Point(x, y).buffer(0.3, 16) for x, y in rng.uniform(0, 25, (80, 2))]
+        self.polygons = list(unary_union(features).geoms)
+
+    def check_same_as_brute_force(self, k):
+        expected = brute_force(self.polygons, 4)
+        gaps = smallest_gaps(self.polygons, k=k, decimals=4)
+        self.assertEqual([dist for dist, __ in gaps], sorted(expected)[:k])
+        for dist, locations in gaps:
+            self.assertEqual(len(locations), len(expected[dist]))
+
+    def test_smallest_gaps(self):
+        self.check_same_as_brute_force(1)
+        self.check_same_as_brute_force(15)
+
+    def test_fallbacks(self):
+        with mock.patch.object(Clearance, 'cKDTree', None):
+            self.check_same_as_brute_force(5)
+        with mock.patch.object(Clearance, 'STRtree', None):
+            self.check_same_as_brute_force(5)
+
+    def test_all_distances(self):
+        # more distances asked than there are pairs
+        polygons = [box(0, 0, 1, 1), box(2, 0, 3, 1), box(5, 0, 6, 1)]
+        gaps = smallest_gaps(polygons, k=10, decimals=4)
+        self.assertEqual([dist for dist, __ in gaps], [1.0, 2.0, 4.0])
+        (loc_1, loc_2), = gaps[0][1]
+        self.assertEqual((loc_1[0], loc_2[0]), (1.0, 2.0))
+
+    def test_sampling(self):
+        points, owners = sample_boundaries([box(0, 0, 10, 10)], max_points=400)
+        self.assertGreaterEqual(len(points), 400)
+        self.assertTrue(np.all(owners == 0))
+        self.assertTrue(np.all((points >= 0) & (points <= 10)))
+
+    def test_apertures(self):
+        apertures = {
+            '10': {'geometry': [{'solid': box(0, 0, 1, 1)}, {'solid': box(0.5, 0, 1.5, 1)}]},
+            '11': {'geometry': [{'solid': box(3, 0, 4, 1)}, {'follow': box(9, 9, 10, 10)}]},
+        }
+        self.assertEqual(len(gerber_polygons(apertures)), 2)
+        self.assertEqual(minimum_clearance(apertures, 4), 1.5)
+        self.assertIsNone(minimum_clearance({'10': apertures['10']}, 4))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from shapely.geometry import Point, box
+from shapely.ops import nearest_points
+
+from appCommon import DesignRules
+from appCommon.DesignRules import clearance_violations, hole_clearance_violations, annular_ring_violations, \
+    unique_points, make_tiles, check_tiles, CLEARANCE, HOLES, ANNULAR_RING
+from appPool import JobScheduler
+
+
+def brute_force(geoms_a, geoms_b, size):
+    # the pair loop used before by the Rules Check Tool
+    points = set()
+    pairs = [(a, b) for k, a in enumerate(geoms_a) for b in geoms_a[k + 1:]] if geoms_b is None else \
+        [(a, b) for a in geoms_a for b in geoms_b]
+    for geo, s_geo in pairs:
+        dist = geo.distance(s_geo)
+        if float(dist) < float(size):
+            loc_1, loc_2 = nearest_points(geo, s_geo)
+            dx = loc_1.x - loc_2.x
+            dy = loc_1.y - loc_2.y
+            points.add((min(loc_1.x, loc_2.x) + (abs(dx) / 2), min(loc_1.y, loc_2.y) + (abs(dy) / 2)))
+    return points
+
+
+class DesignRulesTest(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.pads = [box(x, y, x + 0.8, y + 0.5) for x, y in rng.uniform(0, 20, (150, 2))]
+        self.holes = [Point(x, y).buffer(r, 16) for (x, y), r in zip(rng.uniform(0, 20, (150, 2)),
+                                                                       rng.uniform(0.1, 0.4, 150))]
+
+    def check_same_as_brute_force(self):
+        self.assertEqual(set(unique_points(clearance_violations(self.pads, None, 0.3))),
+                         brute_force(self.pads, None, 0.3))
+        self.assertEqual(set(unique_points(clearance_violations(self.pads, self.holes, 0.2))),
+                         brute_force(self.pads, self.holes, 0.2))
+
+    def test_clearance(self):
+        self.check_same_as_brute_force()
+
+    def test_clearance_rtree(self):
+        with mock.patch.object(DesignRules, 'STRtree', None):
+            self.check_same_as_brute_force()
+
+    def test_holes(self):
+        found = hole_clearance_violations(self.holes, 0.25)
+        self.assertTrue(found)
+        self.assertEqual(set(unique_points(found)), brute_force(self.holes, None, 0.25))
+
+        with mock.patch.object(DesignRules, 'cKDTree', None):
+            self.assertEqual(hole_clearance_violations(self.holes, 0.25), found)
+
+    def test_annular_ring(self):
+        pad = Point(0, 0).buffer(1.0, 32)
+        holes = [
+            Point(0, 0).buffer(0.5, 32),    # ring of 0.5
+            Point(0, 0.6).buffer(0.2, 32),  # ring of 0.2
+            Point(0, 1.0).buffer(0.2, 32),  # breaks out
+        ]
+        self.assertEqual(len(annular_ring_violations([pad], holes, 0.3)), 2)
+        # the hole that breaks out is reported at the hole
+        found = annular_ring_violations([pad], holes, 0.1)
+        self.assertEqual(len(found), 1)
+        self.assertTrue(holes[2].contains(Point(found[0])))
+
+    def test_tiles(self):
+        scheduler = JobScheduler()
+        pads = [Point(0, 0).buffer(1.0, 32), Point(12, 7).buffer(1.0, 32)] + self.pads
+        holes = [Point(0, 0.9).buffer(0.2, 32), Point(12, 7.3).buffer(0.3, 32)] + self.holes
+
+        for kind, geoms_a, geoms_b, size, expected in [
+            (CLEARANCE, self.pads, None, 0.3, unique_points(clearance_violations(self.pads, None, 0.3))),
+            (CLEARANCE, self.pads, self.holes, 0.2, unique_points(clearance_violations(self.pads, self.holes, 0.2))),
+            (HOLES, self.holes, None, 0.25, unique_points(hole_clearance_violations(self.holes, 0.25))),
+            (ANNULAR_RING, pads, holes, 0.3, annular_ring_violations(pads, holes, 0.3)),
+        ]:
+            tiles = make_tiles(kind, geoms_a, geoms_b, size, 16)
+            self.assertGreater(len(tiles), 1)
+            found = scheduler.map(check_tiles, tiles, args=(kind, size), chunk_size=1)
+            # each violation is found in a single tile
+            self.assertEqual(len(found), len(set(found)), kind)
+            self.assertEqual(set(found), set(expected), kind)
+
+    def test_empty(self):
+        self.assertEqual(clearance_violations([], None, 1.0), [])
+        self.assertEqual(hole_clearance_violations([], 1.0), [])
+        self.assertEqual(annular_ring_violations([], self.holes, 1.0), [])
+        self.assertEqual(make_tiles(CLEARANCE, self.pads, [], 1.0, 4), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
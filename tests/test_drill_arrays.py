@@ -0,0 +1,97 @@
+import copy
+import pickle
+import unittest
+from unittest import mock
+
+import numpy as np
+import simplejson as json
+
+from shapely import affinity
+from shapely.geometry import Point, LineString
+
+from camlib import to_dict
+from appParsers import DrillArrays
+from appParsers.DrillArrays import DrillArray, SlotArray, drill_coordinates, slot_coordinates, drill_polygons, \
+    slot_polygons
+
+
+class DrillArraysTest(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.RandomState(3)
+        self.coords = rng.uniform(-50, 50, (200, 2))
+        self.slot_coords = rng.uniform(-50, 50, (20, 4))
+
+    def test_sequence(self):
+        drills = DrillArray()
+        self.assertFalse(drills)
+        drills.append((1, 2))
+        drills.append(Point(3, 4))
+        drills += [Point(5, 6)]
+        self.assertEqual(len(drills), 3)
+        self.assertEqual([(pt.x, pt.y) for pt in drills], [(1, 2), (3, 4), (5, 6)])
+        self.assertTrue(Point(3, 4) in drills)
+        self.assertFalse(Point(4, 3) in drills)
+        self.assertTrue(drills[1].equals(Point(3, 4)))
+        self.assertEqual(len([] + drills), 3)
+
+        # appended after the Points were made
+        drills.append((7, 8))
+        self.assertTrue(list(drills)[-1].equals(Point(7, 8)))
+
+        slots = SlotArray()
+        slots.append((Point(0, 0), Point(1, 1)))
+        slots.append(((2, 2), (3, 3)))
+        start, stop = slots[1]
+        self.assertEqual((start.x, stop.y), (2, 3))
+        self.assertTrue((Point(0, 0), Point(1, 1)) in slots)
+
+    def test_copy(self):
+        drills = DrillArray(self.coords)
+        for new in (copy.deepcopy(drills), pickle.loads(pickle.dumps(drills))):
+            np.testing.assert_array_equal(new.coords, drills.coords)
+
+    def test_serialize(self):
+        # saved as the list of Points used before
+        drills = DrillArray(self.coords[:2])
+        saved = json.loads(json.dumps({'drills': drills}, default=to_dict))
+        self.assertEqual(len(saved['drills']), 2)
+        self.assertEqual(saved['drills'][0]['__class__'], 'Shply')
+
+    def test_affine(self):
+        drills = DrillArray(self.coords)
+        slots = SlotArray(self.slot_coords)
+        transforms = [
+            ([2.0, 0.0, 0.0, 3.0, 1.0 - 2.0, 1.0 - 3.0], lambda g: affinity.scale(g, 2, 3, origin=(1, 1))),
+            ([1.0, 0.0, 0.0, 1.0, 4.0, -2.0], lambda g: affinity.translate(g, 4, -2)),
+        ]
+        for matrix, fcn in transforms:
+            expected = np.array([(p.x, p.y) for p in (fcn(Point(xy)) for xy in self.coords)])
+            np.testing.assert_allclose(drills.affine(matrix).coords, expected)
+
+            expected = np.array([fcn(Point(c[:2])).coords[0] + fcn(Point(c[2:])).coords[0] for c in self.slot_coords])
+            np.testing.assert_allclose(slots.affine(matrix).coords, expected)
+
+    def test_polygons(self):
+        points = [Point(xy) for xy in self.coords]
+        np.testing.assert_array_equal(drill_coordinates(points), self.coords)
+
+        for poly, pt in zip(drill_polygons(DrillArray(self.coords), 0.4, 16), points):
+            self.assertAlmostEqual(poly.symmetric_difference(pt.buffer(0.4, 16)).area, 0.0)
+
+        slots = [(Point(c[:2]), Point(c[2:])) for c in self.slot_coords]
+        np.testing.assert_array_equal(slot_coordinates(slots), self.slot_coords)
+        for poly, (start, stop) in zip(slot_polygons(slots, 0.5, 16), slots):
+            self.assertAlmostEqual(poly.symmetric_difference(LineString([start, stop]).buffer(0.5, 16)).area, 0.0)
+
+        self.assertEqual(drill_polygons([], 0.4, 16), [])
+
+    def test_no_arrays(self):
+        # Shapely before 2.0
+        with mock.patch.object(DrillArrays, 'points_array', None):
+            self.test_sequence()
+            self.test_polygons()
+
+
+if __name__ == '__main__':
+    unittest.main()
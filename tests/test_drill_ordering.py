@@ -0,0 +1,97 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+import numpy as np
+from PyQt5 import QtCore
+
+import camlib
+from appHeadless import HeadlessApp
+from appCommon import DrillOrdering
+from appCommon.DrillOrdering import order_drills, nearest_neighbour_order, improve_order, hilbert_order, \
+    path_length
+
+
+class DrillOrderingTest(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.RandomState(7)
+        self.coords = rng.uniform(0, 100, (500, 2))
+
+    def test_line(self):
+        coords = [(0, 0), (10, 0), (6, 0)]
+        self.assertEqual(order_drills(coords, start=(0, 0)), [0, 2, 1])
+
+    def test_grid(self):
+        coords = [(i, j) for i in range(5) for j in range(5)]
+        path = order_drills(coords, start=(0, 0))
+        self.assertEqual(sorted(path), list(range(25)))
+        self.assertAlmostEqual(path_length(coords, path, start=(0, 0)), 24.0)
+
+    def test_permutation(self):
+        for initial in ('nn', 'hilbert'):
+            path = order_drills(self.coords, start=(0, 0), time_limit=1, initial=initial)
+            self.assertEqual(sorted(path), list(range(len(self.coords))))
+
+    def test_improvement(self):
+        nn_path = nearest_neighbour_order(self.coords, start=(0, 0))
+        improved = improve_order(self.coords, nn_path, time_limit=2)
+
+        self.assertEqual(sorted(improved), list(range(len(self.coords))))
+        self.assertEqual(improved[0], nn_path[0])
+        self.assertLess(path_length(self.coords, improved, (0, 0)), path_length(self.coords, nn_path, (0, 0)))
+
+    def test_nearest_neighbour_matches_greedy(self):
+        coords = [tuple(pt) for pt in self.coords[:200]]
+        must_visit = list(coords)
+        current = (0, 0)
+        expected = []
+        while must_visit:
+            nearest = min(must_visit, key=lambda pt: np.hypot(pt[0] - current[0], pt[1] - current[1]))
+            expected.append(coords.index(nearest))
+            must_visit.remove(nearest)
+            current = nearest
+
+        self.assertEqual(nearest_neighbour_order(coords, start=(0, 0)), expected)
+
+    def test_rtree_fallback(self):
+        kdtree = DrillOrdering.cKDTree
+        DrillOrdering.cKDTree = None
+        try:
+            path = order_drills(self.coords, start=(0, 0), time_limit=0.5)
+        finally:
+            DrillOrdering.cKDTree = kdtree
+        self.assertEqual(sorted(path), list(range(len(self.coords))))
+
+    def test_hilbert(self):
+        coords = [(0, 0), (0, 1), (1, 1), (1, 0)]
+        self.assertEqual(hilbert_order(coords).tolist(), [0, 1, 2, 3])
+
+    def test_empty(self):
+        self.assertEqual(order_drills([]), [])
+
+
+class KDTreeInitialOrderTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.qapp = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication(sys.argv)
+
+    def test_preference(self):
+        drill_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'gerber_files', 'detector_drill.txt')
+        app = HeadlessApp(user_defaults=False)
+        app.shell.exec_command_test('open_excellon %s -outname drills' % drill_file.replace('\\', '/'), no_echo=True)
+
+        for initial in ('nn', 'hilbert'):
+            app.shell.exec_command_test('set_sys excellon_kdtree_initial %s' % initial, no_echo=True)
+            with mock.patch.object(camlib, 'order_drills', wraps=camlib.order_drills) as order:
+                app.shell.exec_command_test('drillcncjob drills -drilled_dias all -opt_type K -outname cnc_%s' %
+                                            initial, no_echo=True)
+            self.assertTrue(order.called)
+            self.assertEqual({call.kwargs['initial'] for call in order.call_args_list}, {initial})
+        self.assertEqual(app.error_count, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
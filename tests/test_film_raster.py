@@ -0,0 +1,85 @@
+import os
+import shutil
+import tempfile
+import unittest
+import warnings
+
+import numpy as np
+import rasterio
+from rasterio.errors import NotGeoreferencedWarning
+
+from shapely.geometry import Point, LineString, box
+from shapely.ops import unary_union
+
+from appCommon.FilmRaster import film_shapes, write_film
+
+
+class FilmRasterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.geometry = [
+            box(1, 1, 4, 3),
+            Point(7, 7).buffer(1.5, 32),
+            LineString([(1, 8), (5, 5)]),
+        ]
+        self.bounds = (0, 0, 10, 10)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def read(self, name):
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', NotGeoreferencedWarning)
+            with rasterio.open(os.path.join(self.folder, name)) as src:
+                return src.read()
+
+    def check_film(self, name, strip_height):
+        width, height = write_film(os.path.join(self.folder, name), self.geometry, self.bounds, 254,
+                                   stroke=0.1, ftype=name.rsplit('.', 1)[1], strip_height=strip_height)
+        # 10 pixels for each mm
+        self.assertEqual((width, height), (100, 100))
+
+        pixels = self.read(name)
+        self.assertEqual(pixels.shape, (1, 100, 100))
+        # black geometry on white
+        self.assertEqual(set(np.unique(pixels).tolist()), {0, 255})
+        self.assertEqual(pixels[0, 80, 25], 0)      # inside the box, near the bottom
+        self.assertEqual(pixels[0, 30, 70], 0)      # center of the circle
+        self.assertEqual(pixels[0, 15, 85], 255)
+
+        # the filled area is the area of the shapes
+        area = unary_union(film_shapes(self.geometry, 0.1)).area
+        filled = np.count_nonzero(pixels[0] == 0) * 0.01
+        self.assertAlmostEqual(filled, area, delta=0.05 * area)
+        return pixels
+
+    def test_png(self):
+        single = self.check_film('film.png', 512)
+        strips = self.check_film('strips.png', 7)
+        np.testing.assert_array_equal(single, strips)
+
+    def test_tif(self):
+        single = self.check_film('film.tif', 512)
+        strips = self.check_film('strips.tif', 7)
+        np.testing.assert_array_equal(single, strips)
+        np.testing.assert_array_equal(single, self.check_film('film.png', 512))
+
+    def test_rgb(self):
+        write_film(os.path.join(self.folder, 'color.png'), self.geometry, self.bounds, 254, stroke=0.1,
+                   foreground=(200, 30, 40), background=(255, 255, 255), strip_height=16)
+        pixels = self.read('color.png')
+        self.assertEqual(pixels.shape, (3, 100, 100))
+        self.assertEqual(pixels[:, 30, 70].tolist(), [200, 30, 40])
+        self.assertEqual(pixels[:, 15, 85].tolist(), [255, 255, 255])
+
+    def test_inches(self):
+        # 1 x 0.5 in at 100 DPI
+        width, height = write_film(os.path.join(self.folder, 'inch.png'), [box(0.2, 0.1, 0.4, 0.3)],
+                                   (0, 0, 1, 0.5), 100, units='IN')
+        self.assertEqual((width, height), (100, 50))
+        self.assertEqual(np.count_nonzero(self.read('inch.png')[0] == 0), 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,193 @@
+import os
+import sys
+import json
+import pickle
+import shutil
+import tempfile
+import unittest
+from copy import deepcopy
+from unittest import mock
+
+import numpy as np
+
+from PyQt5 import QtCore
+from shapely.geometry import Point
+
+from appHeadless import HeadlessApp
+from appParsers import FlashInstances as flash_module
+from appParsers.FlashInstances import FlashInstances, FlashGeometryDict, translate_copies
+from appParsers.ParseGerber import Gerber
+from camlib import to_dict
+
+GERBER = """%FSLAX24Y24*%
+%MOIN*%
+%ADD10C,0.0500*%
+%ADD11R,0.0600X0.0400*%
+D10*
+X0Y0D03*
+X1000Y0D03*
+X2000Y1000D03*
+D11*
+X5000Y5000D03*
+M02*
+"""
+
+
+class FlashInstancesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.apertures = [
+            {'type': 'C', 'size': 0.5},
+            {'type': 'R', 'width': 0.8, 'height': 0.4},
+            {'type': 'O', 'width': 1.2, 'height': 0.6},
+            {'type': 'O', 'width': 0.4, 'height': 1.0},
+            {'type': 'P', 'diam': 1.0, 'nVertices': 5, 'rotation': 15},
+        ]
+        self.locations = np.random.default_rng(5).uniform(-20, 20, (40, 2))
+
+    def check_same_as_flashes(self):
+        for aperture in self.apertures:
+            template = Gerber.create_flash_geometry(Point(0, 0), aperture, 64)
+            copies = translate_copies(template, self.locations)
+            self.assertEqual(len(copies), len(self.locations))
+            for (x, y), geo in zip(self.locations.tolist(), copies):
+                flash = Gerber.create_flash_geometry(Point(x, y), aperture, 64)
+                self.assertTrue(flash.equals_exact(geo, 1e-9), aperture['type'])
+
+    def test_translate(self):
+        self.check_same_as_flashes()
+        self.assertEqual(translate_copies(Point(0, 0).buffer(1), []), [])
+
+    def test_translate_affinity(self):
+        with mock.patch.object(flash_module, 'transform', None):
+            self.check_same_as_flashes()
+
+    def test_make_geometry(self):
+        template = Point(0, 0).buffer(1.0, 16)
+        flashes = FlashInstances(template)
+        elements = []
+        for k, (x, y) in enumerate(self.locations.tolist()):
+            elements.append(flashes.add(x, y, {'follow': Point(x, y)}, dark=k % 4 != 0))
+
+        # the locations are kept in an array
+        np.testing.assert_array_equal(flashes.locations, self.locations)
+
+        # the geometry to join is made only when asked
+        self.assertEqual(flashes.pending, len(elements))
+        self.assertIsNone(flashes.instances(elements))
+
+        geometry = flashes.make_geometry()
+        self.assertEqual(len(geometry), len(elements))
+        self.assertEqual(flashes.pending, 0)
+        self.assertEqual(flashes.make_geometry(), [])
+
+        # and it is not stored in the geometry dictionaries
+        self.assertTrue(all(geo_dict.made is None for geo_dict in elements))
+        self.assertEqual(len(elements[1]), 2)
+        self.assertIn('solid', elements[1])
+        self.assertNotIn('clear', elements[1])
+
+        locations, ids = flashes.instances(elements)
+        np.testing.assert_allclose(locations, self.locations[[k for k in range(len(elements)) if k % 4 != 0]])
+        self.assertEqual(ids, {id(geo_dict) for k, geo_dict in enumerate(elements) if k % 4 != 0})
+
+        # the polygon of a flash is made on first use
+        for k, geo_dict in enumerate(elements):
+            key = 'solid' if k % 4 != 0 else 'clear'
+            self.assertTrue(geo_dict[key].equals_exact(Point(geo_dict['follow']).buffer(1.0, 16), 1e-9))
+            self.assertIs(geo_dict.get(key), geo_dict[key])
+        self.assertEqual(sorted(elements[0]), ['clear', 'follow'])
+        self.assertIsNotNone(flashes.instances(elements))
+
+        # a changed flash is no longer a copy of the template
+        elements[1]['solid'] = elements[1]['solid'].buffer(0.1)
+        self.assertIsNone(flashes.instances(elements))
+
+    def test_geometry_dict(self):
+        flashes = FlashInstances(Point(0, 0).buffer(1.0, 16))
+        geo_dict = flashes.add(3.0, 4.0, {'follow': Point(3, 4)})
+        other = flashes.add(3.0, 4.0, {'follow': Point(3, 4)})
+        self.assertEqual(geo_dict.made, None)
+
+        # the copies are plain dictionaries with the polygon
+        for geo_copy in (geo_dict.copy(), deepcopy(other), pickle.loads(pickle.dumps(geo_dict)), dict(other)):
+            self.assertIs(type(geo_copy), dict)
+            self.assertAlmostEqual(geo_copy['solid'].centroid.x, 3.0)
+        self.assertTrue(geo_dict.lazy)
+        self.assertEqual(geo_dict, other)
+
+        geo_dict = flashes.add(1.0, 2.0, {'follow': Point(1, 2)})
+        self.assertAlmostEqual(geo_dict.pop('solid').centroid.y, 2.0)
+        self.assertNotIn('solid', geo_dict)
+        self.assertFalse(geo_dict.instanced)
+        with self.assertRaises(KeyError):
+            __ = geo_dict['solid']
+
+    def test_simplified(self):
+        flashes = FlashInstances(Point(0, 0).buffer(1.0, 64), simplify_tolerance=0.01)
+        geo_dict = flashes.add(3.0, 4.0, {})
+
+        joined = flashes.make_geometry()
+        # the geometry of the aperture is not simplified, only the one to join
+        self.assertEqual(len(geo_dict['solid'].exterior.coords), 257)
+        self.assertLess(len(joined[0].exterior.coords), 257)
+        self.assertAlmostEqual(joined[0].centroid.x, 3.0)
+
+    def test_empty(self):
+        self.assertTrue(FlashInstances(None).is_empty)
+        flashes = FlashInstances(Point(0, 0).buffer(1.0))
+        self.assertFalse(flashes.is_empty)
+        self.assertEqual(flashes.make_geometry(), [])
+        locations, ids = flashes.instances([])
+        self.assertEqual(locations.shape, (0, 2))
+
+
+class GerberFlashesTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.qapp = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication(sys.argv)
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.filename = os.path.join(self.folder, 'flashes.gbr').replace('\\', '/')
+        with open(self.filename, 'w') as f:
+            f.write(GERBER)
+
+        self.app = HeadlessApp(user_defaults=False)
+        self.app.shell.exec_command_test('open_gerber %s -outname flashes' % self.filename, no_echo=True)
+        self.obj = self.app.collection.get_by_name('flashes')
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_lazy(self):
+        elements = self.obj.apertures['10']['geometry']
+        # the unit conversion (inch to mm) moved the locations, the polygons are not made
+        self.assertTrue(all(isinstance(geo_dict, FlashGeometryDict) and geo_dict.lazy for geo_dict in elements))
+        np.testing.assert_allclose(self.obj.flash_instances['10'].locations, [[0, 0], [2.54, 0], [5.08, 2.54]])
+
+        self.app.shell.exec_command_test('offset flashes 1 2', no_echo=True)
+        self.assertTrue(elements[1].lazy)
+        locations, ids = self.obj.flash_instances['10'].instances(elements)
+        np.testing.assert_allclose(locations, [[1, 2], [3.54, 2], [6.08, 4.54]])
+
+        solid = elements[1]['solid']
+        self.assertAlmostEqual(solid.centroid.x, 3.54)
+        self.assertAlmostEqual(solid.centroid.y, 2.0)
+        self.assertAlmostEqual(solid.bounds[2] - solid.bounds[0], 1.27)
+        self.assertFalse(elements[1].lazy)
+        self.assertIsNotNone(self.obj.flash_instances['10'].instances(elements))
+
+        rect = self.obj.apertures['11']['geometry'][0]['solid']
+        np.testing.assert_allclose(rect.bounds, [13.7 - 0.762, 14.7 - 0.508, 13.7 + 0.762, 14.7 + 0.508])
+        self.assertEqual(self.app.error_count, 0)
+
+    def test_to_dict(self):
+        text = json.dumps(self.obj.to_dict(), default=to_dict)
+        self.assertEqual(text.count('"solid": {"__class__": "Shply"'), 4)
+        self.assertTrue(self.obj.apertures['10']['geometry'][0].lazy)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+
+import numpy as np
+
+from shapely.geometry import LineString, LinearRing
+from shapely import affinity
+
+from appParsers.ParseGCode import GCodeArrayParser, parse_gcode, is_gerber_like
+
+GCODE = """(FlatCAM - Version X1.0 Y2.0)
+G21
+G00 Z2.0000
+G00 X1.0000 Y1.0000
+G01 Z-0.1000
+G01 F120.00
+G01 X2.0000 Y1.0000
+X2.0000 Y2.0000 ; same G01
+G00 Z2.0000
+G00 X5.0000 Y6.0000
+G01 Z-1.0000
+G00 Z2.0000
+G00 X0 Y0
+"""
+
+
+class GCodeParserTest(unittest.TestCase):
+
+    def test_paths(self):
+        parsed = parse_gcode(GCODE, start_xy=(0, 0))
+        self.assertEqual(parsed.units, 'MM')
+
+        expected = [
+            (['T', 'F'], [(0, 0), (1, 1)]),
+            (['C', 'S'], [(1, 1), (2, 1), (2, 2)]),
+            (['T', 'F'], [(2, 2), (5, 6)]),
+            (['T', 'F'], [(5, 6), (0, 0)]),
+        ]
+        self.assertEqual(len(parsed), len(expected))
+        for geo, (kind, coords) in zip(parsed, expected):
+            self.assertIsInstance(geo['geom'], LineString)
+            self.assertEqual(geo['kind'], kind)
+            self.assertEqual(list(geo['geom'].coords), coords)
+
+    def test_holes(self):
+        parsed = parse_gcode(GCODE, hole_dias={(1.0, 1.0): 0.8}, decimals=4)
+        holes = [geo for geo in parsed if isinstance(geo['geom'], LinearRing)]
+        self.assertEqual(len(holes), 1)
+        self.assertAlmostEqual(holes[0]['geom'].centroid.x, 1.0)
+        self.assertAlmostEqual(holes[0]['geom'].length, np.pi * 0.8, places=2)
+
+        # a hole is made for every plunge when the diameter is known
+        parsed = parse_gcode(GCODE, hole_dia=0.5)
+        self.assertEqual(sum(isinstance(geo['geom'], LinearRing) for geo in parsed), 2)
+
+    def test_arc(self):
+        parsed = parse_gcode("G01 Z-1\nG01 X1 Y0\nG03 X0 Y1 I-1 J0\n", steps_per_circle=16)
+        coords = np.asarray(parsed[-1]['geom'].coords)
+        np.testing.assert_allclose(np.hypot(coords[1:, 0], coords[1:, 1]), 1.0)
+        np.testing.assert_allclose(coords[-1], (0, 1), atol=1e-12)
+
+    def test_incremental(self):
+        whole = parse_gcode(GCODE)
+
+        parser = GCodeArrayParser()
+        parser.chunk_size = 16
+        for k in range(0, len(GCODE), 7):
+            parser.feed(GCODE[k:k + 7])
+        pieces = parser.close()
+
+        np.testing.assert_array_equal(whole.vertices, pieces.vertices)
+        np.testing.assert_array_equal(whole.entries, pieces.entries)
+        np.testing.assert_array_equal(whole.path_kind, pieces.path_kind)
+
+    def test_arrays_and_list(self):
+        parsed = parse_gcode(GCODE)
+        self.assertEqual(len(parsed.geometries('T')), 3)
+        self.assertEqual(len(parsed.lines('C').geoms), 1)
+        self.assertEqual(parsed.bounds(), [0, 0, 5, 6])
+        self.assertFalse(parsed.materialized)
+
+        # the changes made to the elements are kept
+        for geo in parsed:
+            geo['geom'] = affinity.translate(geo['geom'], 10, 0)
+        self.assertTrue(parsed.materialized)
+        self.assertEqual(parsed[0]['geom'].coords[0], (10, 0))
+        self.assertEqual(parsed.geometries()[0].coords[0], (10, 0))
+
+    def test_gerber_like(self):
+        self.assertTrue(is_gerber_like("%MOIN*%\n"))
+        self.assertFalse(is_gerber_like(GCODE))
+
+    def test_empty(self):
+        parsed = parse_gcode("")
+        self.assertEqual(len(parsed), 0)
+        self.assertEqual(parsed.geometries(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
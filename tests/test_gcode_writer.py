@@ -0,0 +1,83 @@
+import io
+import unittest
+
+from appCommon.GCodeWriter import compile_template, PreprocessorTemplates, GCodeBuffer
+
+
+class FixedPointPP:
+
+    coordinate_format = "%.*f"
+
+    def linear_code(self, p):
+        return ('G01 X' + self.coordinate_format + ' Y' + self.coordinate_format) % \
+               (p.coords_decimals, p.x, p.coords_decimals, p.y) + ' F%.2f' % p.feedrate
+
+    def swapped_code(self, p):
+        return 'G01 Y%.3f X%.3f ; 100%%' % (p.y, p.x)
+
+    def scaled_code(self, p):
+        return 'PA%d,%d;' % (int(p.x * 40), int(p.y * 40))
+
+
+class GCodeWriterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.pp = FixedPointPP()
+        self.attributes = {'coords_decimals': 4, 'feedrate': 120.0, 'units': 'MM'}
+
+    def test_compile(self):
+        template, order, names = compile_template(self.pp.linear_code, self.attributes)
+
+        self.assertEqual(template, 'G01 X%.4f Y%.4f F120.00')
+        self.assertEqual(order, ('x', 'y'))
+        self.assertEqual(names, frozenset(['coords_decimals', 'feedrate']))
+
+    def test_swapped(self):
+        template, order, __ = compile_template(self.pp.swapped_code, self.attributes)
+        self.assertEqual(order, ('y', 'x'))
+        self.assertEqual(template % (2, 1), 'G01 Y2.000 X1.000 ; 100%')
+
+    def test_not_compiled(self):
+        self.assertIsNone(compile_template(self.pp.scaled_code, self.attributes))
+
+        templates = PreprocessorTemplates()
+        render = templates.renderer(self.pp.scaled_code, self.attributes, {})
+        self.assertEqual(render(1.0, 2.0), 'PA40,80;\n')
+
+    def test_renderer(self):
+        templates = PreprocessorTemplates()
+        render = templates.renderer(self.pp.linear_code, self.attributes, {})
+        self.assertEqual(render(1.23456, -7), 'G01 X1.2346 Y-7.0000 F120.00\n')
+        self.assertIs(templates.renderer(self.pp.linear_code, self.attributes, {}), render)
+
+        # the template follows the attributes read by the preprocessor
+        render = templates.renderer(self.pp.linear_code, self.attributes, {'feedrate': 50})
+        self.assertEqual(render(0, 0), 'G01 X0.0000 Y0.0000 F50.00\n')
+
+        # but not the ones it does not read
+        attributes = dict(self.attributes, units='IN')
+        self.assertEqual(templates.renderer(self.pp.linear_code, attributes, {})(0, 0),
+                         'G01 X0.0000 Y0.0000 F120.00\n')
+
+    def test_buffer(self):
+        stream = io.StringIO()
+        buffer = GCodeBuffer(stream=stream, chunk_size=2)
+        buffer.extend(['a\n', 'b\n', 'c\n'])
+        self.assertEqual(stream.getvalue(), 'a\nb\n')
+        buffer.flush()
+        self.assertEqual(stream.getvalue(), 'a\nb\nc\n')
+
+    def test_buffer_size(self):
+        # a large section is written when it is added
+        stream = io.StringIO()
+        buffer = GCodeBuffer(stream=stream, flush_size=10)
+        buffer.extend(['G21\n', 'G01 X1.0000 Y2.0000\n'])
+        self.assertEqual(stream.getvalue(), 'G21\nG01 X1.0000 Y2.0000\n')
+        buffer.write('M05\n')
+        self.assertEqual(len(buffer), 1)
+        buffer.flush()
+        self.assertEqual(stream.getvalue(), 'G21\nG01 X1.0000 Y2.0000\nM05\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+import unittest
+
+import numpy as np
+
+from shapely import affinity
+from shapely.geometry import Point, LineString, MultiPolygon, box
+
+from appCommon.GeometryTransform import translate_matrix, scale_matrix, mirror_matrix, rotate_matrix, \
+    skew_matrix, transform_geometries, transform_targets, compose
+from appParsers.ParseGerber import Gerber
+
+
+class Signal:
+    def emit(self, *args):
+        pass
+
+
+class ProcContainer:
+    new_text = ''
+
+    def update_view_text(self, text):
+        pass
+
+
+class App:
+    inform = Signal()
+    proc_container = ProcContainer()
+
+
+def make_gerber():
+    grb = Gerber.__new__(Gerber)
+    grb.app = App()
+
+    pads = [Point(3 * i, 2 * j).buffer(0.5, 8) for i in range(10) for j in range(10)]
+    grb.solid_geometry = [pads[:50], MultiPolygon(pads[50:60])] + pads[60:]
+    grb.follow_geometry = [pad.centroid for pad in pads]
+    grb.apertures = {
+        '10': {'type': 'C', 'size': 1.0, 'geometry': [{'solid': pad, 'follow': pad.centroid} for pad in pads]},
+        '11': {'type': 'R', 'size': 2.0, 'width': 2.0, 'height': 1.0,
+               'geometry': [{'solid': box(0, 0, 2, 1), 'follow': Point(1, 0.5)}, {'clear': box(5, 5, 6, 6)}]},
+    }
+    return grb
+
+
+def gerber_geometry(grb):
+    found = []
+
+    def walk(value):
+        if isinstance(value, list):
+            for item in value:
+                walk(item)
+        elif value is not None:
+            found.append(value)
+
+    walk(grb.solid_geometry)
+    walk(grb.follow_geometry)
+    for aperture in grb.apertures.values():
+        for geo_el in aperture['geometry']:
+            for key in ('solid', 'follow', 'clear'):
+                if key in geo_el:
+                    walk(geo_el[key])
+    return found
+
+
+class GeometryTransformTest(unittest.TestCase):
+
+    def setUp(self):
+        self.geometry = [
+            box(1, 2, 4, 3),
+            Point(7, 7).buffer(1.5, 16),
+            LineString([(1, 8), (5, 5), (6, 9)]),
+            Point(2, -3),
+            MultiPolygon([box(0, 0, 1, 1), box(2, 2, 3, 3)]),
+        ]
+
+    def check(self, matrix, reference):
+        result = transform_geometries(self.geometry, matrix)
+        for geo, expected in zip(result, [reference(geo) for geo in self.geometry]):
+            self.assertTrue(geo.equals_exact(expected, 1e-12), "%s != %s" % (geo.wkt, expected.wkt))
+
+    def test_matrices(self):
+        self.check(translate_matrix(1.5, -2), lambda geo: affinity.translate(geo, 1.5, -2))
+        self.check(scale_matrix(2, 0.5, (1, 1)), lambda geo: affinity.scale(geo, 2, 0.5, origin=(1, 1)))
+        self.check(mirror_matrix('X', (0, 3)), lambda geo: affinity.scale(geo, 1, -1, origin=(0, 3)))
+        self.check(mirror_matrix('Y', (4, 0)), lambda geo: affinity.scale(geo, -1, 1, origin=(4, 0)))
+        self.check(rotate_matrix(90, (2, 5)), lambda geo: affinity.rotate(geo, 90, origin=(2, 5)))
+        self.check(rotate_matrix(-27.5, (2, 5)), lambda geo: affinity.rotate(geo, -27.5, origin=(2, 5)))
+        self.check(skew_matrix(10, -20, (3, 1)), lambda geo: affinity.skew(geo, 10, -20, origin=(3, 1)))
+
+    def test_z_is_kept(self):
+        line = LineString([(0, 0, 5), (1, 1, 6)])
+        moved = transform_geometries([line, box(0, 0, 1, 1)], translate_matrix(1, 2))
+        self.assertEqual(list(moved[0].coords), [(1, 2, 5), (2, 3, 6)])
+        self.assertEqual(moved[1].bounds, (1, 2, 2, 3))
+
+    def test_targets(self):
+        shared = [box(0, 0, 1, 1), [Point(1, 1), 'text'], None]
+        tool = {'solid_geometry': shared, 'data': {}}
+        other = {'solid_geometry': shared}
+
+        self.assertEqual(transform_targets([(tool, 'solid_geometry'), (tool, 'missing')], translate_matrix(1, 0)), 2)
+        self.assertEqual(tool['solid_geometry'][0].bounds, (1, 0, 2, 1))
+        self.assertEqual(tool['solid_geometry'][1], [Point(2, 1), 'text'])
+        self.assertIsNone(tool['solid_geometry'][2])
+        # the lists are new lists
+        self.assertEqual(other['solid_geometry'][0].bounds, (0, 0, 1, 1))
+
+    def test_compose(self):
+        targets = [({'solid_geometry': None}, 'solid_geometry')]
+        first = scale_matrix(2, 3, (1, 1))
+        second = skew_matrix(5, 0, (1, 1))
+
+        composed = compose([(first, targets), (second, targets), (first, [(targets[0][0], 'other')])])
+        self.assertEqual(len(composed), 2)
+        np.testing.assert_allclose(composed[0][0], second @ first)
+
+
+class GerberTransformTest(unittest.TestCase):
+
+    def test_gerber_operations(self):
+        operations = [
+            ('offset', ((1.5, -2.25),), lambda geo: affinity.translate(geo, 1.5, -2.25)),
+            ('scale', (1.5, 0.5, (3, 4)), lambda geo: affinity.scale(geo, 1.5, 0.5, origin=(3, 4))),
+            ('mirror', ('X', (2, 7)), lambda geo: affinity.scale(geo, 1.0, -1.0, origin=(2, 7))),
+            ('rotate', (33.3, (5, 6)), lambda geo: affinity.rotate(geo, 33.3, origin=(5, 6))),
+            ('skew', (10, -5, (1, 2)), lambda geo: affinity.skew(geo, 10, -5, origin=(1, 2))),
+        ]
+        for name, args, reference in operations:
+            grb = make_gerber()
+            expected = [reference(geo) for geo in gerber_geometry(grb)]
+            getattr(grb, name)(*args)
+
+            result = gerber_geometry(grb)
+            self.assertEqual(len(result), len(expected))
+            for geo, ref in zip(result, expected):
+                self.assertTrue(geo.equals_exact(ref, 1e-12), name)
+
+        grb = make_gerber()
+        grb.scale(2, 2)
+        self.assertEqual(grb.apertures['10']['size'], 2.0)
+        self.assertEqual(grb.apertures['11']['width'], 4.0)
+
+    def test_deferred_transforms(self):
+        grb = make_gerber()
+        expected = [affinity.skew(affinity.scale(geo, 1.01, 0.98, origin=(3, 4)), 0.1, -0.2, origin=(3, 4))
+                    for geo in gerber_geometry(grb)]
+
+        with grb.deferred_transforms():
+            grb.scale(1.01, 0.98, point=(3, 4))
+            grb.skew(0.1, -0.2, (3, 4))
+            # not applied yet
+            self.assertEqual(grb.solid_geometry[0][0].bounds, (-0.5, -0.5, 0.5, 0.5))
+            self.assertEqual(len(grb._pending_transforms), 2)
+
+        self.assertIsNone(grb._pending_transforms)
+        for geo, ref in zip(gerber_geometry(grb), expected):
+            self.assertTrue(geo.equals_exact(ref, 1e-9))
+
+
+if __name__ == '__main__':
+    unittest.main()
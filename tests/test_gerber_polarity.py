@@ -0,0 +1,47 @@
+import unittest
+
+from shapely.geometry import Point, box
+from shapely.ops import unary_union
+
+from appParsers.ParseGerber import PolarityTiles
+
+
+class PolarityTilesTest(unittest.TestCase):
+
+    def test_dark_only(self):
+        tiles = PolarityTiles()
+        tiles.add([box(0, 0, 1, 1), box(0.5, 0, 2, 1)])
+
+        self.assertAlmostEqual(tiles.geometry().area, 2.0)
+
+    def test_clear_after_dark(self):
+        pour = box(0, 0, 100, 80)
+        clears = [Point(5 + 10 * i, 5 + 10 * j).buffer(2) for i in range(9) for j in range(7)]
+
+        tiles = PolarityTiles(max_tile_points=50)
+        tiles.add(pour)
+        for clear in clears:
+            tiles.subtract(clear)
+        # the pour was split in tiles
+        self.assertGreater(len(tiles.tiles), 1)
+
+        expected = pour.difference(unary_union(clears))
+        self.assertAlmostEqual(tiles.geometry().symmetric_difference(expected).area, 0.0, places=6)
+
+    def test_dark_after_clear(self):
+        tiles = PolarityTiles()
+        tiles.add(box(0, 0, 10, 10))
+        tiles.subtract(box(2, 2, 8, 8))
+        tiles.add(box(4, 4, 6, 6))
+
+        self.assertAlmostEqual(tiles.geometry().area, 100 - 36 + 4)
+
+    def test_empty(self):
+        tiles = PolarityTiles()
+        tiles.subtract(box(0, 0, 1, 1))
+
+        self.assertTrue(tiles.geometry().is_empty)
+
+
+if __name__ == '__main__':
+    unittest.main()
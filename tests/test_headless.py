@@ -0,0 +1,123 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import tkinter as tk
+
+from PyQt5 import QtCore
+
+from appHeadless import HeadlessApp, run_headless
+
+GERBER_FILES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'gerber_files')
+
+
+class HeadlessTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.qapp = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication(sys.argv)
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.drill_file = os.path.join(GERBER_FILES, 'detector_drill.txt').replace('\\', '/')
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def script(self, text):
+        filename = os.path.join(self.folder, 'job.tcl')
+        with open(filename, 'w') as f:
+            f.write(text)
+        return filename
+
+    def test_no_gui(self):
+        self.assertNotIn('app_Main', sys.modules)
+        self.assertNotIn('appGUI.MainGUI', sys.modules)
+
+    def test_run_script(self):
+        gcode_file = os.path.join(self.folder, 'drills.nc').replace('\\', '/')
+        script = self.script('open_excellon $shellvar_0 -outname drills\n'
+                             'drillcncjob drills -drilled_dias all -drillz -1.6 -outname drills_cnc\n'
+                             'write_gcode drills_cnc %s\n' % gcode_file)
+
+        self.assertEqual(run_headless(script, self.drill_file), 0)
+        with open(gcode_file) as f:
+            gcode = f.read()
+        self.assertIn('G01 Z-1.6000', gcode)
+
+    def test_autolevel(self):
+        height_map = os.path.join(self.folder, 'heights.txt')
+        with open(height_map, 'w') as f:
+            f.write('0 0 0.5\n100 0 0.5\n0 100 0.5\n100 100 0.5\n')
+
+        app = HeadlessApp(user_defaults=False)
+        app.shell.exec_command_test('open_excellon %s -outname drills' % self.drill_file, no_echo=True)
+        app.shell.exec_command_test('drillcncjob drills -drilled_dias all -drillz -1.6 -outname drills_cnc',
+                                    no_echo=True)
+        cnc = app.collection.get_by_name('drills_cnc')
+        cnc.import_height_map(height_map)
+
+        # the saved G-code is levelled only with the autolevelling on
+        self.assertIn('G01 Z-1.6000', cnc.export_gcode(to_file=True).getvalue())
+        app.defaults['cncjob_al_status'] = True
+        gcode = cnc.export_gcode(to_file=True).getvalue()
+        self.assertNotIn('G01 Z-1.6000', gcode)
+        self.assertIn('G01 Z-1.1000', gcode)
+        self.assertEqual(app.error_count, 0)
+
+    def test_failed_script(self):
+        self.assertEqual(run_headless(self.script('drillcncjob missing -drilled_dias all\n')), 1)
+        self.assertEqual(run_headless(os.path.join(self.folder, 'missing.tcl')), 2)
+
+    def test_collection(self):
+        app = HeadlessApp(user_defaults=False)
+        app.shell.exec_command_test('open_excellon %s -outname drills' % self.drill_file, no_echo=True)
+        app.shell.exec_command_test('open_excellon %s -outname drills' % self.drill_file, no_echo=True)
+        self.assertEqual(app.collection.get_names(), ['drills', 'drills_1'])
+        # the opened files are not selected
+        self.assertEqual(app.collection.get_selected(), [])
+
+        app.collection.set_active('drills_1')
+        self.assertEqual([obj.options['name'] for obj in app.collection.get_selected()], ['drills_1'])
+
+        app.on_delete()
+        self.assertEqual(app.collection.get_names(), ['drills'])
+        result = app.shell.exec_command_test('delete drills_1', no_echo=True)
+        self.assertTrue(result.startswith('Command failed'))
+        self.assertEqual(app.collection.get_names(), ['drills'])
+
+        with self.assertRaises(tk.TclError):
+            app.shell.exec_command_test('offset drills_1 1 1', no_echo=True)
+        self.assertEqual(app.error_count, 0)
+
+    def test_project(self):
+        project = os.path.join(self.folder, 'job.FlatPrj').replace('\\', '/')
+        app = HeadlessApp(user_defaults=False)
+        app.shell.exec_command_test('open_excellon %s -outname drills' % self.drill_file, no_echo=True)
+        app.shell.exec_command_test('offset drills 1 2', no_echo=True)
+        bounds = app.collection.get_by_name('drills').bounds()
+        app.shell.exec_command_test('save_project %s' % project, no_echo=True)
+
+        app.shell.exec_command_test('new', no_echo=True)
+        self.assertEqual(app.collection.get_names(), [])
+
+        app.shell.exec_command_test('open_project %s' % project, no_echo=True)
+        self.assertEqual(app.collection.get_names(), ['drills'])
+        for loaded, saved in zip(app.collection.get_by_name('drills').bounds(), bounds):
+            self.assertAlmostEqual(loaded, saved)
+        self.assertEqual(app.error_count, 0)
+
+        # the binary project container
+        app.defaults['global_save_binary'] = True
+        app.shell.exec_command_test('save_project %s' % project, no_echo=True)
+        app.shell.exec_command_test('new', no_echo=True)
+        app.shell.exec_command_test('open_project %s' % project, no_echo=True)
+        self.assertEqual(app.collection.get_names(), ['drills'])
+        for loaded, saved in zip(app.collection.get_by_name('drills').bounds(), bounds):
+            self.assertAlmostEqual(loaded, saved)
+        self.assertEqual(app.error_count, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from appCommon.HeightMap import HeightMap, grid_axis
+from appCommon.bilinearInterpolator import bilinearInterpolator
+
+
+def probe_grid(nr_x, nr_y, step, heights, noise=0.0, seed=0):
+    rng = np.random.default_rng(seed)
+    xs, ys = np.meshgrid(np.arange(nr_x) * step, np.arange(nr_y) * step)
+    xs = xs.ravel() + rng.normal(0, noise, xs.size) if noise else xs.ravel()
+    ys = ys.ravel() + rng.normal(0, noise, ys.size) if noise else ys.ravel()
+    points = np.column_stack((xs, ys, heights(xs, ys)))
+    rng.shuffle(points)
+    return points
+
+
+class HeightMapTest(unittest.TestCase):
+
+    def test_grid_axis(self):
+        self.assertEqual(grid_axis([0, 0, 2, 2, 4, 4]), (0.0, 4.0, 2.0, 3))
+        self.assertEqual(grid_axis([1.5, 1.5]), (1.5, 1.5, 0.0, 1))
+
+    def test_grid(self):
+        points = probe_grid(5, 4, 2.0, lambda x, y: x + 10 * y, noise=1e-4)
+        hmap = HeightMap(points)
+        self.assertEqual((hmap.x_count, hmap.y_count), (5, 4))
+
+        # each node has the probed point next to it
+        grid = hmap.probed_grid
+        self.assertEqual(grid.shape, (5, 4, 3))
+        nodes_x, nodes_y = np.meshgrid(np.arange(5) * 2.0, np.arange(4) * 2.0, indexing='ij')
+        np.testing.assert_allclose(grid[:, :, 0], nodes_x, atol=1e-3)
+        np.testing.assert_allclose(grid[:, :, 1], nodes_y, atol=1e-3)
+
+    def test_interpolate(self):
+        # a plane is interpolated exactly
+        hmap = HeightMap(probe_grid(6, 5, 2.0, lambda x, y: 0.1 * x - 0.05 * y + 1))
+        pts = np.array([[1.0, 1.0], [3.3, 7.1], [10.0, 8.0], [0.0, 0.0]])
+        np.testing.assert_allclose(hmap.interpolate(pts), 0.1 * pts[:, 0] - 0.05 * pts[:, 1] + 1, atol=1e-12)
+
+        # outside the grid: on the border or at the corner
+        np.testing.assert_allclose(hmap.interpolate([[-5, 4], [20, 4], [-5, -5], [20, 20]]),
+                                   [1 - 0.2, 2 - 0.2, 1, 2 - 0.4 + 0])
+
+    def test_bilinear_interpolator(self):
+        points = probe_grid(6, 4, 2.0, lambda x, y: np.sin(x) + np.cos(y))
+        folder = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(folder, 'points.csv')
+            np.savetxt(filename, points, delimiter=',')
+            interpolator = bilinearInterpolator(filename)
+        finally:
+            os.remove(filename)
+            os.rmdir(folder)
+
+        self.assertEqual((interpolator.xCount, interpolator.yCount), (6, 4))
+        pts = np.array([[0.5, 0.5], [3.7, 1.2], [9.9, 5.9], [-1.0, 3.0], [12.0, 7.0]])
+        expected = [interpolator.Interpolate(pt) for pt in pts]
+        np.testing.assert_allclose(interpolator.interpolate(pts), expected, atol=1e-12)
+
+
+class LevelGCodeTest(unittest.TestCase):
+
+    def setUp(self):
+        # the surface rises by 0.01 for each unit on X
+        self.hmap = HeightMap(probe_grid(11, 3, 1.0, lambda x, y: 0.01 * x))
+
+    def test_level(self):
+        gcode = '\n'.join([
+            'G90',
+            'G00 Z2.0000',
+            'G00 X0.0000 Y0.0000',
+            'G01 Z-0.1000 F50',
+            'G01 X10.0000 Y0.0000 F120 (cut)',
+            'G00 Z2.0000',
+        ]) + '\n'
+        lines = self.hmap.level_gcode(gcode, max_segment=2.5).splitlines()
+
+        self.assertEqual(lines[:4], ['G90', 'G00 Z2.0000', 'G00 X0.0000 Y0.0000 Z2.0000', 'G01 Z-0.1000 F50'])
+        # the cut is split in 4 segments; the other words stay on the first one
+        self.assertEqual(lines[4:8], ['G01 X2.5000 Y0.0000 Z-0.0750 F120 (cut)',
+                                      'X5.0000 Y0.0000 Z-0.0500',
+                                      'X7.5000 Y0.0000 Z-0.0250',
+                                      'X10.0000 Y0.0000 Z0.0000'])
+        self.assertEqual(lines[8], 'G00 Z2.1000')
+
+    def test_not_split(self):
+        gcode = 'G90\nG0 X0 Y0 Z1\nG1 X10 Z-0.1\n'
+        self.assertEqual(self.hmap.level_gcode(gcode, decimals=2), 'G90\nG0 X0.00 Y0.00 Z1.00\nG1 X10.00 Z0.00\n')
+
+    def test_comments(self):
+        gcode = 'G90\nG0 X0 Y0 Z1\nG01 X10 Y0 F200 (cut to X10)\nX5 Y0 (G1 back to X5) ; Y0\n'
+        lines = self.hmap.level_gcode(gcode, decimals=2).splitlines()
+        # the words in the comments are not levelled
+        self.assertEqual(lines[2], 'G01 X10.00 Y0.00 Z1.10 F200 (cut to X10)')
+        self.assertEqual(lines[3], 'X5.00 Y0.00 Z1.05 (G1 back to X5) ; Y0')
+
+    def test_non_modal(self):
+        gcode = '\n'.join([
+            'G90',
+            'G0 X5 Y0 Z2',
+            'G38.2 Z-10 F10',
+            'G92 Z0',
+            'G0 Z1',
+            'G4 P1',
+            'G0 Z1',
+            'G53 G0 Z-5',
+            'G28 X0 Y0',
+            'G10 L20 P1 X0 Y0',
+            'G0 X5 Y0 Z1',
+        ]) + '\n'
+        lines = self.hmap.level_gcode(gcode).splitlines()
+
+        self.assertEqual(lines[1], 'G0 X5.0000 Y0.0000 Z2.0500')
+        # the probing, the offsets, the moves in machine coordinates and home are not levelled
+        for idx in (2, 3, 5, 7, 8, 9):
+            self.assertEqual(lines[idx], gcode.splitlines()[idx])
+        # the position is known after G92 and after a dwell
+        self.assertEqual(lines[4], 'G0 Z1.0500')
+        self.assertEqual(lines[6], 'G0 Z1.0500')
+        self.assertEqual(lines[10], 'G0 X5.0000 Y0.0000 Z1.0500')
+
+    def test_unknown_position(self):
+        # after a return to home the position is known again with the next move on both axes
+        lines = self.hmap.level_gcode('G90\nG0 X5 Y0 Z2\nG28\nG0 Z1\nG0 X5 Y0\nG1 Z-1\n').splitlines()
+        self.assertEqual(lines[2:], ['G28', 'G0 Z1.0000', 'G0 X5.0000 Y0.0000 Z1.0500', 'G1 Z-0.9500'])
+
+    def test_incremental(self):
+        with self.assertRaises(ValueError):
+            self.hmap.level_gcode('G91\nG1 X1 Z-1\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
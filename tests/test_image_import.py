@@ -0,0 +1,91 @@
+import os
+import shutil
+import tempfile
+import unittest
+import warnings
+
+import numpy as np
+import rasterio
+from rasterio.errors import NotGeoreferencedWarning
+
+from shapely.geometry import box, MultiPolygon
+from shapely.ops import unary_union
+
+from appParsers.ParseImage import make_tiles, import_image
+from appPool import JobScheduler
+
+
+class ImageImportTest(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+
+        rng = np.random.default_rng(5)
+        # dark blobs: a coarse random image scaled up, with noise
+        coarse = rng.uniform(0, 255, (8, 10))
+        self.gray = np.kron(coarse, np.ones((6, 6)))[:45, :57]
+        self.gray = np.clip(self.gray + rng.uniform(-40, 40, self.gray.shape), 0, 255).astype(np.uint8)
+        self.color = np.stack([self.gray, self.gray[::-1], np.roll(self.gray, 7, axis=1)])
+
+        self.gray_file = os.path.join(self.folder, 'gray.png')
+        self.color_file = os.path.join(self.folder, 'color.png')
+        for filename, bands in [(self.gray_file, self.gray[None]), (self.color_file, self.color)]:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', NotGeoreferencedWarning)
+                dst = rasterio.open(filename, 'w', driver='PNG', width=bands.shape[2], height=bands.shape[1],
+                                    count=len(bands), dtype='uint8')
+            with dst:
+                dst.write(bands)
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    @staticmethod
+    def pixels(selected, size, flip):
+        # the union of a square for each selected pixel
+        sign = -1 if flip else 1
+        rows, cols = np.nonzero(selected)
+        return unary_union([box(c * size, sign * r * size, (c + 1) * size, sign * (r + 1) * size)
+                            for r, c in zip(rows.tolist(), cols.tolist())])
+
+    def check(self, polygons, expected):
+        geo = MultiPolygon(polygons)
+        self.assertTrue(geo.is_valid)
+        self.assertAlmostEqual(geo.area, expected.area, places=9)
+        self.assertLess(geo.symmetric_difference(expected).area, 1e-9)
+
+    def test_tiles(self):
+        self.assertEqual(make_tiles(10, 10, 2048), [(0, 0, 10, 10)])
+        tiles = make_tiles(10, 7, 4)
+        # the tiles cover the image and overlap by a pixel
+        self.assertEqual(sorted({t[0] for t in tiles}), [0, 3, 6])
+        self.assertEqual(sorted({t[1] for t in tiles}), [0, 3])
+        self.assertTrue(all(c + w <= 10 and r + h <= 7 for c, r, w, h in tiles))
+        self.assertEqual(max(c + w for c, r, w, h in tiles), 10)
+        self.assertEqual(max(r + h for c, r, w, h in tiles), 7)
+
+    def test_black(self):
+        size = 25.4 / 300
+        for flip in (True, False):
+            expected = self.pixels(self.gray <= 100, size, flip)
+            for tile_size in (2048, 16, 5):
+                self.check(import_image(self.gray_file, flip=flip, dpi=300, mode='black', mask=[100, 0, 0, 0],
+                                        tile_size=tile_size), expected)
+
+    def test_color(self):
+        mask = [0, 60, 90, 40]
+        selected = (self.color[0] <= 60) | (self.color[1] <= 90) | (self.color[2] <= 40)
+        expected = self.pixels(selected, 1 / 96, True)
+        for tile_size in (2048, 12):
+            self.check(import_image(self.color_file, units='IN', mode='color', mask=mask, tile_size=tile_size),
+                       expected)
+
+    def test_scheduler(self):
+        expected = import_image(self.gray_file, mask=[100] * 4, tile_size=10)
+        found = import_image(self.gray_file, mask=[100] * 4, tile_size=10, scheduler=JobScheduler())
+        self.assertEqual(len(found), len(expected))
+        self.check(found, unary_union(expected))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import unittest
+
+import numpy as np
+
+from shapely.geometry import Point
+
+from appCommon.Common import GracefulException
+from appPool import JobScheduler, SharedArray, new_pool
+
+
+def areas(chunk, factor):
+    return [geo.area * factor for geo in chunk]
+
+
+def add(a, b):
+    return a + b
+
+
+def shared_sum(shared, start, stop):
+    return float(np.asarray(shared)[start:stop].sum())
+
+
+class FakeProcContainer:
+    def __init__(self):
+        self.texts = []
+
+    def update_view_text(self, text):
+        self.texts.append(text)
+
+
+class FakeApp:
+    def __init__(self, pool):
+        self.pool = pool
+        self.abort_flag = False
+        self.proc_container = FakeProcContainer()
+
+
+class JobSchedulerTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = new_pool(2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.close()
+        cls.pool.join()
+
+    def setUp(self):
+        self.geometry = [Point(0, 0).buffer(r, 4) for r in np.linspace(0.1, 2, 37)]
+        self.expected = [geo.area * 2 for geo in self.geometry]
+
+    def test_map(self):
+        scheduler = JobScheduler(pool=self.pool)
+        self.assertEqual(scheduler.map(areas, self.geometry, args=(2, ), chunk_size=5), self.expected)
+        self.assertEqual(scheduler.map(areas, self.geometry, args=(2, )), self.expected)
+        self.assertEqual(scheduler.map(areas, [], args=(2, )), [])
+
+    def test_group(self):
+        scheduler = JobScheduler(pool=self.pool)
+        scheduler.tasks_per_process = 1
+        with scheduler.group() as group:
+            first = group.submit(add, 1, 2)
+            mapped = group.map(areas, self.geometry, args=(2, ), chunk_size=3)
+            last = group.submit(add, 'a', 'b')
+            output = group.results()
+
+        self.assertEqual(len(output), 3)
+        self.assertEqual(output[first], 3)
+        self.assertEqual(output[mapped], self.expected)
+        self.assertEqual(output[last], 'ab')
+
+    def test_without_pool(self):
+        scheduler = JobScheduler()
+        self.assertEqual(scheduler.map(areas, self.geometry, args=(2, ), chunk_size=4), self.expected)
+        self.assertEqual(scheduler.apply(add, 2, 3), 5)
+
+    def test_progress_and_abort(self):
+        app = FakeApp(self.pool)
+        scheduler = JobScheduler(app=app)
+        scheduler.map(areas, self.geometry, args=(2, ), chunk_size=10)
+        self.assertEqual(app.proc_container.texts, [' 25%', ' 50%', ' 75%', ' 100%'])
+
+        app.abort_flag = True
+        with self.assertRaises(GracefulException):
+            scheduler.map(areas, self.geometry, args=(2, ), chunk_size=10)
+
+    def test_progress_callback(self):
+        app = FakeApp(self.pool)
+        scheduler = JobScheduler(app=app)
+        finished = []
+
+        def progress(result):
+            finished.append(result)
+            return 'sum %d' % result
+
+        with scheduler.group(progress=progress) as group:
+            group.submit(add, 1, 2)
+            group.submit(add, 3, 4)
+            group.results()
+
+        self.assertEqual(finished, [3, 7])
+        self.assertEqual(app.proc_container.texts, [' 50% - sum 3', ' 100% - sum 7'])
+
+    def test_shared_array(self):
+        coords = np.arange(1000, dtype=np.float64).reshape(-1, 2)
+        scheduler = JobScheduler(pool=self.pool)
+        with scheduler.group() as group:
+            shared = group.share(coords)
+            self.assertIsInstance(shared, SharedArray)
+            group.submit(shared_sum, shared, 0, 250)
+            group.submit(shared_sum, shared, 250, 500)
+            output = group.results()
+        self.assertEqual(output, [coords[:250].sum(), coords[250:].sum()])
+        # freed when the group is closed
+        self.assertIsNone(shared.shm)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import sys
+import time
+import unittest
+import logging
+
+from PyQt5 import QtCore
+
+import appTools
+from appTool import LazyTool
+from appCommon.StartupTimer import StartupTimer
+
+
+class DummyTool:
+    toolName = "Dummy Tool"
+
+    def __init__(self, app):
+        app.made += 1
+        self.menuAction = None
+        self.runs = []
+        self.value = 42
+
+    def run(self, toggle=True):
+        self.runs.append(toggle)
+
+
+class DummyMenu:
+
+    def __init__(self):
+        self.actions = []
+
+    def insertAction(self, before, action):
+        self.actions.append(action)
+
+    def addSeparator(self):
+        self.actions.append(None)
+
+
+class DummyApp:
+
+    def __init__(self):
+        self.made = 0
+        self.log = logging.getLogger('base')
+        self.ui = None
+
+
+class LazyToolTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.qapp = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication(sys.argv)
+
+    def setUp(self):
+        appTools.TOOLS['DummyTool'] = __name__
+        self.app = DummyApp()
+        self.menu = DummyMenu()
+        self.tool = LazyTool(self.app, 'DummyTool', "Dummy Tool", shortcut='Alt+Y')
+
+    def tearDown(self):
+        del appTools.TOOLS['DummyTool']
+
+    def test_install(self):
+        self.tool.install(pos=self.menu, separator=True)
+        self.assertEqual(len(self.menu.actions), 2)
+        self.assertEqual(self.menu.actions[0].text(), "Dummy Tool\tAlt+Y")
+        # the name is known without making the tool
+        self.assertEqual(self.tool.toolName, "Dummy Tool")
+        self.assertFalse(self.tool.loaded)
+        self.assertEqual(self.app.made, 0)
+
+    def test_menu_action(self):
+        self.tool.install(pos=self.menu)
+        self.tool.menuAction.trigger()
+        self.assertTrue(self.tool.loaded)
+        self.assertIs(self.tool.tool.menuAction, self.tool.menuAction)
+
+        # the tool is made once; then the menu action runs the tool directly
+        self.tool.menuAction.trigger()
+        self.assertEqual(self.app.made, 1)
+        self.assertEqual(self.tool.runs, [False, False])
+
+    def test_attributes(self):
+        self.assertEqual(self.tool.value, 42)
+        self.assertIsInstance(self.tool.tool, DummyTool)
+        self.assertEqual(self.app.made, 1)
+        with self.assertRaises(AttributeError):
+            self.tool.missing
+
+    def test_registry(self):
+        self.assertIs(appTools.DummyTool, DummyTool)
+        with self.assertRaises(AttributeError):
+            appTools.tool_class('MissingTool')
+        with self.assertRaises(AttributeError):
+            appTools.MissingTool
+
+        for name, module_name in appTools.TOOLS.items():
+            if name != 'DummyTool':
+                self.assertEqual(appTools.tool_class(name).__module__, module_name)
+
+
+class StartupTimerTest(unittest.TestCase):
+
+    def test_report(self):
+        timer = StartupTimer(start=time.perf_counter() - 0.5)
+        self.assertGreaterEqual(timer.phase("Imports"), 0.5)
+        timer.phase("Main window")
+        self.assertEqual([name for name, __ in timer.phases], ["Imports", "Main window"])
+        self.assertAlmostEqual(timer.total, sum(duration for __, duration in timer.phases))
+
+        lines = timer.report().splitlines()
+        self.assertEqual(lines[0], "Start-up timing:")
+        self.assertEqual([line.split()[0] for line in lines[1:]], ["Imports", "Main", "Total"])
+        self.assertTrue(lines[-1].endswith(" ms"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+
+from shapely.geometry import Point, Polygon, MultiPolygon, box
+
+from appCommon.ParallelClear import ClearGeometry, clear_polygons, flatten_polygons, clear_polygon, \
+    STANDARD, COMBO
+from appPool import JobScheduler, new_pool
+
+
+def paths_equal(first, second):
+    return len(first) == len(second) and all(a.equals(b) for a, b in zip(first, second))
+
+
+class ParallelClearTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = new_pool(2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.close()
+        cls.pool.join()
+
+    def setUp(self):
+        self.polygons = [
+            box(0, 0, 10, 5),
+            Point(20, 0).buffer(4, 16),
+            Point(0, 20).buffer(6, 16),
+            box(30, 0, 31, 30),
+            # too thin for the tool
+            box(40, 0, 40.1, 5),
+        ]
+
+    def test_flatten(self):
+        multi = MultiPolygon(self.polygons[:2])
+        self.assertEqual(len(flatten_polygons([multi, self.polygons[2], None])), 3)
+        self.assertEqual(flatten_polygons(Polygon()), [])
+
+    def test_methods(self):
+        geo = ClearGeometry()
+        # Combo falls back to the next method when a method makes no paths
+        for method in (STANDARD, COMBO):
+            paths = clear_polygon(geo, self.polygons[0], 0.5, method, 16, 0.15, True, True)
+            self.assertTrue(paths, method)
+        self.assertIsNone(clear_polygon(geo, self.polygons[-1], 0.5, STANDARD, 16, 0.15, True, True))
+
+    def test_same_as_serial(self):
+        serial = [clear_polygon(ClearGeometry(), pol, 0.5, STANDARD, 16, 0.15, True, True) for pol in self.polygons]
+
+        for scheduler in (JobScheduler(), JobScheduler(pool=self.pool)):
+            results = clear_polygons(scheduler, self.polygons, 0.5, STANDARD, 16, overlap=0.15, chunk_size=1)
+            self.assertEqual(len(results), len(self.polygons))
+            self.assertIsNone(results[-1])
+            for expected, res in zip(serial[:-1], results[:-1]):
+                self.assertTrue(paths_equal(expected, res))
+
+    def test_check_dia(self):
+        results = clear_polygons(JobScheduler(pool=self.pool), self.polygons, 0.5, STANDARD, 16, check_dia=0.8)
+        # the thin polygon is skipped, not failed
+        self.assertEqual(results[-1], [])
+        self.assertTrue(all(results[:-1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
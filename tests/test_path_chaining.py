@@ -0,0 +1,90 @@
+import unittest
+
+import numpy as np
+from shapely.geometry import LineString, LinearRing, box
+
+from appCommon import PathChaining
+from appCommon.PathChaining import EndpointIndex, paint_chain, touch_chain
+
+
+class EndpointIndexTest(unittest.TestCase):
+
+    def test_nearest_with_removal(self):
+        rng = np.random.RandomState(3)
+        endpoints = rng.uniform(0, 10, (400, 2))
+        index = EndpointIndex(endpoints)
+
+        removed = set()
+        for path_idx in range(0, 200, 2):
+            index.remove(path_idx)
+            removed.add(path_idx)
+
+        alive = [row for row in range(400) if row // 2 not in removed]
+        expected = min(alive, key=lambda r: np.hypot(*(endpoints[r] - (5, 5))))
+        self.assertEqual(index.nearest((5, 5)), expected)
+
+        for path_idx in range(200):
+            index.remove(path_idx)
+        self.assertIsNone(index.nearest((5, 5)))
+
+    def test_rtree_fallback(self):
+        kdtree = PathChaining.cKDTree
+        PathChaining.cKDTree = None
+        try:
+            index = EndpointIndex([(0, 0), (1, 0), (5, 5), (6, 5)])
+            self.assertEqual(index.nearest((5.9, 5)), 3)
+            index.remove(1)
+            self.assertEqual(index.nearest((5.9, 5)), 1)
+        finally:
+            PathChaining.cKDTree = kdtree
+
+
+class PaintChainTest(unittest.TestCase):
+
+    def setUp(self):
+        self.boundary = box(0, 0, 5, 5)
+
+    def test_walk(self):
+        paths = [LineString([(1, 1), (1, 4)]), LineString([(2, 4), (2, 1)])]
+        result = paint_chain(paths, self.boundary, 0.2, 16, max_walk=2)
+
+        self.assertEqual(len(result), 1)
+        self.assertEqual(list(result[0].coords), [(1, 1), (1, 4), (2, 4), (2, 1)])
+
+    def test_no_walk_outside(self):
+        boundary = box(0, 0, 5, 5).difference(box(1.2, 3, 1.8, 6))
+        paths = [LineString([(1, 1), (1, 4)]), LineString([(2, 4), (2, 1)])]
+
+        self.assertEqual(len(paint_chain(paths, boundary, 0.2, 16, max_walk=2)), 2)
+
+    def test_ring(self):
+        paths = [
+            LinearRing([(1, 1), (1, 2), (2, 2), (2, 1)]),
+            LinearRing([(0.5, 0.5), (0.5, 2.5), (2.5, 2.5), (2.5, 0.5)])
+        ]
+        result = paint_chain(paths, self.boundary, 0.1, 16, max_walk=1)
+
+        self.assertEqual(len(result), 1)
+        self.assertAlmostEqual(result[0].length, 4 + 8 + np.hypot(0.5, 0.5))
+
+
+class TouchChainTest(unittest.TestCase):
+
+    def test_both_ends(self):
+        paths = [
+            LineString([(1, 0), (2, 0)]),
+            LineString([(3, 0), (2, 0)]),
+            LineString([(0, 0), (1, 0)]),
+        ]
+        result = touch_chain(paths, origin=(1.5, 0))
+
+        self.assertEqual(len(result), 1)
+        self.assertEqual(len(result[0].coords), 4)
+        self.assertTrue(result[0].equals(LineString([(0, 0), (3, 0)])))
+
+    def test_empty(self):
+        self.assertEqual(touch_chain([]), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
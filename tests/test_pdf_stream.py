@@ -0,0 +1,104 @@
+import io
+import unittest
+import zlib
+
+from appParsers.ParsePDF import PdfParser, PdfStreamError, pdf_content_lines
+
+
+class App:
+    defaults = {'gerber_circle_steps': 16, 'units': 'MM'}
+    abort_flag = False
+
+
+CONTENT = [
+    '1 w',
+    '0 0 0 RG',
+    'q 1 0 0 1 10 20 cm',
+    '10 10 m',
+    '50 10 l',
+    '50 40 l',
+    'S',
+    'Q',
+    '1 0 0 RG',
+    '2.5 w',
+    '5 5 20 30 re',
+    'S',
+    '1 1 1 rg',
+    '103 100 m',
+    '103 101.66 101.66 103 100 103 c',
+    '98.34 103 97 101.66 97 100 c',
+    '97 98.34 98.34 97 100 97 c',
+    '101.66 97 103 98.34 103 100 c',
+    'h',
+    'f',
+]
+
+
+def make_pdf(streams, line_end='\n'):
+    pdf = b'%PDF-1.4\n'
+    for k, lines in enumerate(streams):
+        data = zlib.compress(line_end.join(lines).encode('utf-8'))
+        pdf += b'%d 0 obj\n<< /Length %d /Filter /FlateDecode >>\nstream\r\n' % (k + 1, len(data)) + data + \
+            b'\r\nendstream\nendobj\n'
+        # a stream that is not compressed is skipped
+        pdf += b'%d 0 obj\n<< /Length 3 >>\nstream\nabc\nendstream\nendobj\n' % (k + 100)
+    return pdf + b'%%EOF\n'
+
+
+class PdfStreamTest(unittest.TestCase):
+
+    def test_lines(self):
+        streams = [CONTENT[:7], CONTENT[7:], ['']]
+        expected = CONTENT[:7] + CONTENT[7:] + ['']
+        for line_end in ['\n', '\r\n', '\r']:
+            pdf = make_pdf(streams, line_end)
+            for chunk_size in [1, 2, 5, 9, 64, 1 << 20]:
+                found = list(pdf_content_lines(io.BytesIO(pdf), chunk_size))
+                self.assertEqual(found, expected, (line_end, chunk_size))
+
+    def test_errors(self):
+        pdf = make_pdf([CONTENT])
+        # a truncated zlib stream
+        start = pdf.index(b'stream\r\n') + len(b'stream\r\n')
+        truncated = pdf[:start + 10] + pdf[pdf.index(b'\r\nendstream'):]
+        with self.assertRaises(PdfStreamError):
+            list(pdf_content_lines(io.BytesIO(truncated), 16))
+
+        # not UTF-8 text
+        data = zlib.compress(b'\xff\xfe 1 w')
+        pdf = b'<< /Filter /FlateDecode >>\nstream\n' + data + b'\nendstream\n'
+        with self.assertRaises(PdfStreamError):
+            list(pdf_content_lines(io.BytesIO(pdf), 4))
+
+    def test_scan(self):
+        parser = PdfParser(App())
+        self.assertEqual(parser.scan('q 1 0 0 1 10 20 cm'), ('transform', ('q', '1', '0', '0', '1', '10', '20')))
+        self.assertEqual(parser.scan('10 10 m'), ('start_subpath', ('10', '10')))
+        self.assertEqual(parser.scan('50 40 l'), ('draw_line', ('50', '40')))
+        self.assertEqual(parser.scan('0.5 0 1 RG'), ('stroke_color', ('0.5', '0', '1')))
+        self.assertEqual(parser.scan('5 5 20 30 re'), ('rect', ('5', '5', '20', '30')))
+        self.assertEqual(parser.scan('S Q'), ('stroke_path', ()))
+        self.assertEqual(parser.scan('W n'), ('clip_path', ()))
+        self.assertEqual(parser.scan('n'), ('no_op', ()))
+        self.assertEqual(parser.scan('f*'), ('fill_path', ()))
+        self.assertEqual(parser.scan('B*'), ('fill_stroke_path', ()))
+        self.assertEqual(parser.scan('BT /F1 12 Tf'), (None, ()))
+        self.assertEqual(parser.scan(''), (None, ()))
+
+    def test_parse(self):
+        pdf = make_pdf([CONTENT[:7], CONTENT[7:]], '\r\n')
+        expected = PdfParser(App()).parse_pdf('\r\n'.join(CONTENT))
+        found = PdfParser(App()).parse_pdf(pdf_content_lines(io.BytesIO(pdf), 7))
+
+        self.assertEqual(sorted(found), sorted(expected))
+        # two colors and the clear (white filled) circle
+        self.assertEqual(sorted(found), [0, 1, 2])
+        for layer in found:
+            for ap in found[layer]:
+                self.assertEqual(found[layer][ap]['size'], expected[layer][ap]['size'])
+                self.assertEqual([{k: geo.wkt for k, geo in el.items()} for el in found[layer][ap]['geometry']],
+                                 [{k: geo.wkt for k, geo in el.items()} for el in expected[layer][ap]['geometry']])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+
+from shapely.geometry import Point, LineString, Polygon, MultiPolygon
+
+from camlib import ApertureMacro
+from appCommon.ProjectArchive import save_project_archive, load_project_archive, is_project_archive, \
+    pack_geometry_blob, unpack_geometry_blob
+
+
+class ProjectArchiveTest(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.filename = tempfile.mkstemp(suffix='.FlatPrj')
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def test_blob(self):
+        records = [b'abc', b'', b'defgh']
+        self.assertEqual(unpack_geometry_blob(pack_geometry_blob(records)), records)
+
+    def test_roundtrip(self):
+        am = ApertureMacro(name='TEST')
+        am.raw = '1,1,0.5,0,0*'
+        am.parse_content()
+
+        poly = Polygon([(0, 0), (1, 0), (1, 1)])
+        gerber = {
+            'kind': 'gerber',
+            'options': {'name': 'top.gbr', 'plot': True},
+            'solid_geometry': MultiPolygon([poly, Point(5, 5).buffer(1)]),
+            'follow_geometry': [LineString([(0, 0), (1, 1)])],
+            'apertures': {'10': {'type': 'C', 'size': 0.1, 'geometry': [{'solid': poly, 'follow': Point(0, 0)}]}},
+            'aperture_macros': {'TEST': am},
+            'source_file': 'G04*\n'
+        }
+        empty = {
+            'kind': 'geometry',
+            'options': {'name': 'empty'},
+            'solid_geometry': []
+        }
+        project = {'objs': [gerber, empty], 'options': {'units': 'MM'}, 'version': 8.994}
+
+        save_project_archive(self.filename, project, compression_level=3)
+        self.assertTrue(is_project_archive(self.filename))
+
+        d = load_project_archive(self.filename)
+        self.assertEqual(d['options'], {'units': 'MM'})
+        self.assertEqual(d['version'], 8.994)
+        self.assertEqual([o['kind'] for o in d['objs']], ['gerber', 'geometry'])
+
+        obj = d['objs'][0]
+        self.assertEqual(obj['options']['name'], 'top.gbr')
+        self.assertTrue(obj['solid_geometry'].equals(gerber['solid_geometry']))
+        self.assertTrue(obj['follow_geometry'][0].equals(gerber['follow_geometry'][0]))
+        self.assertTrue(obj['apertures']['10']['geometry'][0]['solid'].equals(poly))
+        self.assertIsInstance(obj['aperture_macros']['TEST'], ApertureMacro)
+        self.assertEqual(obj['source_file'], 'G04*\n')
+
+        self.assertEqual(d['objs'][1]['solid_geometry'], [])
+        self.assertNotIn('tools', d['objs'][1])
+
+    def test_not_archive(self):
+        with open(self.filename, 'w') as f:
+            f.write('{"objs": []}')
+        self.assertFalse(is_project_archive(self.filename))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import unittest
+
+import numpy as np
+
+from shapely.geometry import Point, LineString, MultiPolygon, box
+
+from shapely.affinity import translate
+
+from vispy.gloo.context import FakeCanvas
+
+from appGUI.VisPyVisuals import _shape_buffers, _shape_buffers_batch, _join_shape_buffers, _set_batch_buffers, \
+    _instance_buffers, ShapeCollectionVisual
+from appGUI.VisPyTessellationCache import TessellationCache
+
+
+class ShapeBatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.shapes = [box(0, 0, 1, 1), LineString([(0, 0), (2, 2), (3, 0)]), Point(5, 5).buffer(1, 4)]
+
+    def test_batch_buffers(self):
+        line_pts, mesh_vertices, mesh_tris, line_counts, tri_counts = \
+            _shape_buffers_batch((self.shapes, 0.01, True, True))
+
+        self.assertEqual(line_pts.shape[1], 2)
+        self.assertEqual(len(line_pts), line_counts.sum())
+        self.assertEqual(len(mesh_tris), tri_counts.sum())
+        self.assertEqual(tri_counts[1], 0)
+
+        # the triangles of each shape are the same as when translated alone
+        start = 0
+        vertex_start = 0
+        for geo, nr_tris in zip(self.shapes, tri_counts):
+            __, vertices, tris = _shape_buffers(geo, 0.01)
+            np.testing.assert_allclose(mesh_vertices[mesh_tris[start:start + nr_tris]],
+                                       np.asarray(vertices)[tris].reshape(-1, 2))
+            start += nr_tris
+            vertex_start += len(vertices)
+        self.assertEqual(vertex_start, len(mesh_vertices))
+
+    def test_join(self):
+        whole = _shape_buffers_batch((self.shapes, 0.01, True, True))
+        parts = [_shape_buffers_batch((self.shapes[:1], 0.01, True, True)),
+                 _shape_buffers_batch((self.shapes[1:], 0.01, True, True))]
+        for a, b in zip(whole, _join_shape_buffers(parts)):
+            np.testing.assert_array_equal(a, b)
+
+    def test_colors(self):
+        buffers = _shape_buffers_batch((self.shapes, 0.01, True, True))
+
+        data = {'color': 'black', 'face_color': ['red', 'green', 'blue']}
+        _set_batch_buffers(data, buffers)
+        self.assertEqual(data['line_colors'].shape, (len(data['line_pts']), 4))
+        self.assertEqual(len(data['mesh_colors']), len(data['mesh_tris']) // 3)
+        # the last triangle is of the last shape
+        np.testing.assert_array_equal(data['mesh_colors'][-1], (0, 0, 1, 1))
+
+    def test_instances(self):
+        offsets = np.array([(0.0, 0.0), (10.0, -2.5), (3.25, 7.0)])
+        for geo in (self.shapes[2], MultiPolygon([box(0, 0, 1, 1), box(2, 0, 3, 2)])):
+            copies = [translate(part, x, y) for x, y in offsets.tolist() for part in getattr(geo, 'geoms', [geo])]
+            expected = _shape_buffers_batch((copies, 0.0, True, True))
+            buffers = _instance_buffers(geo, offsets, 0.0)
+            # the buffers of the shape are moved, not made again
+            for a, b in zip(buffers[:3], expected[:3]):
+                np.testing.assert_allclose(a, b)
+            # the counts are of each copy
+            self.assertEqual(len(buffers[3]), len(offsets))
+            self.assertEqual(buffers[4].sum(), len(buffers[2]))
+
+    def test_empty(self):
+        buffers = _shape_buffers_batch(([], 0.01, True, True))
+        self.assertEqual(buffers[0].shape, (0, 2))
+        self.assertEqual(len(buffers[2]), 0)
+
+    def test_batch_key_and_cache(self):
+        key = TessellationCache.batch_key(self.shapes, 0.01, face=True, edge=True)
+        self.assertNotEqual(key, TessellationCache.batch_key(self.shapes[:2], 0.01, face=True, edge=True))
+        self.assertNotEqual(key, TessellationCache.key(self.shapes[0], 0.01, face=True, edge=True))
+
+        cache = TessellationCache()
+        buffers = _shape_buffers_batch((self.shapes, 0.01, True, True))
+        cache.put(key, buffers)
+        for a, b in zip(buffers, cache.get(key)):
+            np.testing.assert_array_equal(a, b)
+
+
+class ShapeCollectionColorTest(unittest.TestCase):
+
+    def setUp(self):
+        # the visuals are updated without a window
+        self.canvas = FakeCanvas()
+        self.collection = ShapeCollectionVisual(layers=3)
+
+    def test_update_color(self):
+        # a multicolored list of shapes (Gerber object), then a shape added alone
+        self.collection.add_batch([box(2, 0, 3, 1), box(4, 0, 5, 1)], color=['#FF0000FF', '#0000FFFF'],
+                                  face_color=['#FF0000FF', '#0000FFFF'], layer=1)
+        key = self.collection.add(box(0, 0, 1, 1), color='#000000FF', face_color='#00FF00FF', layer=1)
+        self.collection.redraw()
+
+        self.collection.redraw(indexes=[key], update_colors=('#FFFF00FF', '#FFFFFFFF'))
+
+        # the buffers of the shapes added alone are first
+        face_colors = self.collection._meshes[1]._meshdata.get_face_colors()
+        np.testing.assert_array_equal(face_colors, [(1, 1, 0, 1)] * 2 + [(1, 0, 0, 1)] * 2 + [(0, 0, 1, 1)] * 2)
+
+        line_colors = np.asarray(self.collection._lines[1]._color)
+        self.assertEqual(len(line_colors), len(self.collection.data[key]['line_pts']) * 3)
+        np.testing.assert_array_equal(line_colors[0], (1, 1, 1, 1))
+        np.testing.assert_array_equal(line_colors[-1], (0, 0, 1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from shapely.geometry import Point, LineString
+
+from appGUI.VisPyTessellationCache import TessellationCache
+
+
+def buffers(nr_points):
+    line_pts = [(float(i), 0.0) for i in range(nr_points)]
+    mesh_vertices = [(0.0, 0.0), (1.0, 0.0), (0.0, 1.0)]
+    return line_pts, mesh_vertices, [0, 1, 2]
+
+
+class TessellationCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_key(self):
+        circle = Point(0, 0).buffer(1)
+        key = TessellationCache.key(circle, 0.01, face=True, edge=True)
+
+        self.assertEqual(key, TessellationCache.key(Point(0, 0).buffer(1), 0.01, face=True, edge=True))
+        self.assertNotEqual(key, TessellationCache.key(circle, 0.02, face=True, edge=True))
+        self.assertNotEqual(key, TessellationCache.key(circle, 0.01, face=False, edge=True))
+        self.assertNotEqual(key, TessellationCache.key(Point(0, 1).buffer(1), 0.01, face=True, edge=True))
+        self.assertIsNone(TessellationCache.key(None, 0.01, face=True, edge=True))
+
+        # the 'glu' and the 'vispy' collections don't share the buffers
+        self.assertNotEqual(TessellationCache.key(circle, 0.01, face=True, edge=True, triangulation='glu'),
+                            TessellationCache.key(circle, 0.01, face=True, edge=True, triangulation='vispy'))
+        self.assertNotEqual(TessellationCache.batch_key([circle], 0.01, True, True, triangulation='glu'),
+                            TessellationCache.batch_key([circle], 0.01, True, True, triangulation='vispy'))
+
+    def test_get_put(self):
+        cache = TessellationCache()
+        key = cache.key(LineString([(0, 0), (1, 1)]), 0.01, face=False, edge=True)
+        self.assertIsNone(cache.get(key))
+
+        cache.put(key, buffers(4))
+        line_pts, mesh_vertices, mesh_tris = cache.get(key)
+        np.testing.assert_array_equal(line_pts, buffers(4)[0])
+        np.testing.assert_array_equal(mesh_tris, [0, 1, 2])
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_lru(self):
+        one_entry = sum(np.asarray(b).nbytes for b in buffers(10))
+        cache = TessellationCache(max_bytes=2 * one_entry)
+        for key in ('a', 'b'):
+            cache.put(key, buffers(10))
+        cache.get('a')
+        cache.put('c', buffers(10))
+
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('c'))
+        self.assertLessEqual(cache.nbytes, 2 * one_entry)
+
+    def test_disabled(self):
+        cache = TessellationCache(max_bytes=0)
+        cache.put('a', buffers(10))
+        self.assertIsNone(cache.get('a'))
+
+    def test_disk(self):
+        cache = TessellationCache(disk_dir=self.tmp_dir, disk_min_points=100)
+        cache.put('small', buffers(10))
+        cache.put('large', buffers(200))
+        self.assertEqual(len(os.listdir(self.tmp_dir)), 1)
+
+        # a new cache (e.g. after a restart) finds the large shape on disk
+        cache = TessellationCache(disk_dir=self.tmp_dir, disk_min_points=100)
+        self.assertIsNone(cache.get('small'))
+        line_pts, mesh_vertices, mesh_tris = cache.get('large')
+        np.testing.assert_array_equal(line_pts, buffers(200)[0])
+        np.testing.assert_array_equal(mesh_vertices, buffers(200)[1])
+        self.assertEqual(mesh_tris.tolist(), [0, 1, 2])
+
+    def test_prune_disk(self):
+        cache = TessellationCache(disk_dir=self.tmp_dir, disk_min_points=1)
+        for key in ('a', 'b', 'c'):
+            cache.put(key, buffers(100))
+        size = os.path.getsize(cache.file_path('a'))
+
+        cache.disk_max_bytes = 2 * size
+        cache.prune_disk()
+        self.assertEqual(len(os.listdir(self.tmp_dir)), 2)
+
+    def test_prune_disk_on_save(self):
+        cache = TessellationCache(disk_dir=self.tmp_dir, disk_min_points=1)
+        cache.put('a', buffers(100))
+        size = os.path.getsize(cache.file_path('a'))
+
+        # the disk cache is kept under the limit while the shapes are saved
+        cache.disk_max_bytes = 4 * size
+        for key in ('b', 'c', 'd', 'e', 'f', 'g'):
+            cache.put(key, buffers(100))
+            self.assertLessEqual(len(os.listdir(self.tmp_dir)), 4)
+        self.assertTrue(os.path.exists(cache.file_path('g')))
+
+    def test_3d_not_cached(self):
+        cache = TessellationCache()
+        cache.put('a', ([(0.0, 0.0, 1.0)], [], []))
+        self.assertIsNone(cache.get('a'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from shapely.geometry import Point, MultiPolygon, box
+from shapely.ops import unary_union
+
+from appCommon import ThievingPattern
+from appCommon.ThievingPattern import grid_steps, grid_centers, fill_pattern
+
+
+def brute_force(areas, template, centers):
+    # each shape of the grid tested against each area, as the Copper Thieving Tool did before
+    found = []
+    for x, y in centers.tolist():
+        geo = Point(x, y).buffer(1.0, 16) if template == 'dot' else box(x - 0.5, y - 0.5, x + 0.5, y + 0.5)
+        if any(geo.within(area) for area in areas):
+            found.append(geo)
+    return found
+
+
+class ThievingPatternTest(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        copper = unary_union([Point(x, y).buffer(r, 16) for (x, y), r in zip(rng.uniform(0, 40, (40, 2)),
+                                                                              rng.uniform(0.5, 2.5, 40))])
+        areas = box(0, 0, 40, 30).difference(copper.buffer(0.4))
+        self.areas = list(getattr(areas, 'geoms', [areas]))
+        self.templates = {'dot': Point(0, 0).buffer(1.0, 16), 'square': box(-0.5, -0.5, 0.5, 0.5)}
+
+    def test_grid_steps(self):
+        # the same values as adding the step in a loop
+        expected = []
+        value = 0.1
+        while value <= 9.9:
+            expected.append(value)
+            value += 0.7
+        np.testing.assert_array_equal(grid_steps(0.1, 9.9, 0.7), expected)
+        self.assertEqual(len(grid_steps(0.0, 1.0, 0.0)), 0)
+        self.assertEqual(len(grid_steps(2.0, 1.0, 0.5)), 0)
+
+    def test_grid_centers(self):
+        centers = grid_centers((0, 0, 10, 5), 1.0, 0.5)
+        # column by column, centered in the rectangle
+        self.assertEqual(centers[0, 0], centers[1, 0])
+        np.testing.assert_allclose(centers.mean(axis=0), (5, 2.5))
+        self.assertGreaterEqual(centers.min(), 0.5)
+        self.assertEqual(grid_centers((0, 0, 0.5, 5), 1.0, 0.5).shape, (0, 2))
+
+    def check_same_as_brute_force(self):
+        for kind, size in (('dot', 2.0), ('square', 1.0)):
+            centers = grid_centers((0, 0, 40, 30), size, 0.3)
+            found = fill_pattern(self.areas, self.templates[kind], centers)
+            expected = brute_force(self.areas, kind, centers)
+            self.assertTrue(found)
+            self.assertEqual(len(found), len(expected), kind)
+            for a, b in zip(found, expected):
+                self.assertTrue(a.equals_exact(b, 1e-9), kind)
+
+    def test_fill(self):
+        self.check_same_as_brute_force()
+
+    def test_fill_rtree(self):
+        with mock.patch.object(ThievingPattern, 'STRtree', None):
+            self.check_same_as_brute_force()
+
+    def test_multipolygon_areas(self):
+        centers = grid_centers((0, 0, 40, 30), 1.0, 0.3)
+        found = fill_pattern(MultiPolygon(self.areas), self.templates['square'], centers)
+        self.assertEqual(len(found), len(fill_pattern(self.areas, self.templates['square'], centers)))
+
+    def test_empty(self):
+        self.assertEqual(fill_pattern([], self.templates['dot'], grid_centers((0, 0, 10, 10), 1.0, 0.5)), [])
+        self.assertEqual(fill_pattern(self.areas, self.templates['dot'], np.zeros((0, 2))), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
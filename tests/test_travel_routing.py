@@ -0,0 +1,108 @@
+import logging
+import unittest
+
+import numpy as np
+
+from shapely.geometry import LineString, Polygon, box
+
+from appCommon.Common import ExclusionAreas
+from appCommon.TravelRouting import TravelRouter
+
+
+def path_length(start_point, route):
+    points = np.array([start_point] + [xy for __, xy in route])
+    return float(np.hypot(*np.diff(points, axis=0).T).sum())
+
+
+class TravelRouterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.areas = [
+            {'shape': box(20, 20, 40, 30), 'strategy': 'around', 'overz': 5.0},
+            {'shape': Polygon([(10, 60), (30, 70), (20, 90)]), 'strategy': 'around', 'overz': 5.0},
+            {'shape': box(60, 50, 70, 90), 'strategy': 'over', 'overz': 7.0},
+        ]
+        self.router = TravelRouter(self.areas, 0.5)
+
+    def test_straight_travel(self):
+        self.assertEqual(self.router.route((0, 0), (10, 5)), [[None, (10, 5)]])
+        # near an area, in its bounding box
+        self.assertEqual(self.router.route((19, 19), (41, 19)), [[None, (41, 19)]])
+
+    def test_around(self):
+        route = self.router.route((30, 10), (30, 40))
+        self.assertEqual(route[-1], [None, (30, 40)])
+        self.assertTrue(all(z is None for z, __ in route))
+
+        # the path doesn't enter the buffered area and goes around its shorter side
+        buffered = box(19.5, 19.5, 40.5, 30.5)
+        path = LineString([(30, 10)] + [xy for __, xy in route])
+        self.assertFalse(path.relate_pattern(buffered.buffer(-1e-9), 'T********'))
+        self.assertAlmostEqual(path_length((30, 10), route), 2 * np.hypot(10.5, 9.5) + 11.0, places=6)
+
+    def test_two_areas(self):
+        # the shortest path passes between the rectangle and the triangle
+        route = self.router.route((30, 15), (20, 95))
+        path = LineString([(30, 15)] + [xy for __, xy in route])
+        for area in self.areas[:2]:
+            self.assertFalse(path.relate_pattern(area['shape'].buffer(0.5 - 1e-6, join_style=2), 'T********'))
+
+    def test_over(self):
+        route = self.router.route((50, 70), (80, 70))
+        self.assertEqual(route, [[7.0, (59.5, 70.0)], [None, (70.5, 70.0)], [None, (80, 70)]])
+
+    def test_inside_area(self):
+        # the travel starts in an 'around' area: it is not avoided
+        self.assertEqual(self.router.route((30, 25), (30, 40)), [[None, (30, 40)]])
+
+    def test_no_areas(self):
+        router = TravelRouter([], 0.5)
+        self.assertEqual(router.route((0, 0), (100, 100)), [[None, (100, 100)]])
+
+
+class DummyApp:
+
+    def __init__(self):
+        self.log = logging.getLogger('base')
+        self.is_legacy = False
+        self.plotcanvas = None
+        self.defaults = {'units': 'MM'}
+
+
+class ExclusionAreasRouterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.exc_areas = ExclusionAreas(DummyApp())
+        self.storage = self.exc_areas.exclusion_areas_storage
+        self.storage.append({'shape': box(20, 20, 40, 30), 'strategy': 'around', 'overz': 5.0})
+
+    def test_cache(self):
+        router = self.exc_areas.travel_router(1.0)
+        self.assertIs(self.exc_areas.travel_router(1.0), router)
+        self.assertIsNot(self.exc_areas.travel_router(2.0), router)
+
+        self.storage[0]['strategy'] = 'over'
+        self.assertIsNot(self.exc_areas.travel_router(1.0), router)
+
+    def test_same_areas(self):
+        area = (box(20, 20, 40, 30), 'around', 5.0)
+        self.assertTrue(ExclusionAreas.same_areas([area], [area]))
+        # an equal shape is not the same shape
+        self.assertFalse(ExclusionAreas.same_areas([area], [(box(20, 20, 40, 30), 'around', 5.0)]))
+        self.assertFalse(ExclusionAreas.same_areas([area], [(area[0], 'over', 5.0)]))
+        self.assertFalse(ExclusionAreas.same_areas([area], []))
+
+    def test_new_area(self):
+        self.assertEqual(self.exc_areas.travel_coordinates((70, 10), (70, 40), 1.0), [[None, (70, 40)]])
+
+        # an area is deleted and another one is drawn, with the same strategy and over Z: the new shape can get the
+        # id() of the deleted one
+        for x in range(50, 450, 20):
+            del self.storage[0]
+            self.storage.append({'shape': box(x - 5, 20, x + 5, 30), 'strategy': 'around', 'overz': 5.0})
+            route = self.exc_areas.travel_coordinates((x, 10), (x, 40), 1.0)
+            path = LineString([(x, 10)] + [xy for __, xy in route])
+            self.assertFalse(path.intersects(self.storage[0]['shape']))
+
+if __name__ == '__main__':
+    unittest.main()